@@ -1,8 +1,11 @@
 # config.py - 통합 설정 관리 (공유 파일 경로 사용)
 
+import copy
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 # 프로젝트 경로 설정
 PROJECT_ROOT = Path(__file__).parent  # ai_workflow_production/
@@ -13,12 +16,16 @@ SHARED_ENV_FILE = MAIN_PROJECT_ROOT / ".env"
 SHARED_CREDENTIALS = MAIN_PROJECT_ROOT / "credentials_new.json"
 SHARED_TOKEN = MAIN_PROJECT_ROOT / "token_new.json"
 
-# 환경변수 로드 (공유 .env 파일에서)
-load_dotenv(SHARED_ENV_FILE)
+# 선택 설정 파일 (JSON, 섹션별 override). 환경변수로 경로 변경 가능
+CONFIG_FILE_ENV = 'AI_WORKFLOW_CONFIG_FILE'
+DEFAULT_CONFIG_FILE = PROJECT_ROOT / "config.local.json"
 
-# 로그 디렉토리 (현재 프로젝트 내)
+# 로그 디렉토리 (현재 프로젝트 내, ensure_environment()에서 생성)
 LOGS_DIR = PROJECT_ROOT / "logs"
-LOGS_DIR.mkdir(exist_ok=True)
+
+# .env 로드/디렉토리 생성은 import 시점이 아니라 최초 설정 조회 시 1회만 수행
+_environment_loaded = False
+_process_env_keys = frozenset()  # .env 로드 전부터 있던 환경변수 (.env보다 우선)
 
 # Gmail 설정 (공유 파일 경로 사용)
 GMAIL_CONFIG = {
@@ -37,9 +44,168 @@ GMAIL_CONFIG = {
 GEMINI_CONFIG = {
     'API_KEY_ENV': 'GEMINI_API_KEY',
     'MODEL': 'gemini-2.5-flash-lite',
-    'BASE_URL': 'https://generativelanguage.googleapis.com/v1',
+    'BASE_URL': 'https://generativelanguage.googleapis.com/v1beta',  # responseSchema는 v1beta에서 제공
+    'MAX_TOKENS': 2048,
+    'TEMPERATURE': 0.7,
+    'RESPONSE_SCHEMA': True,   # 추출/combined/일괄 추출은 responseSchema로 JSON 출력 강제 (자유 텍스트 파싱 실패 방지)
+    'STREAM': True,            # streamGenerateContent(SSE) 사용 - 추출은 JSON이 닫히면 조기 종료
+    'STALL_TIMEOUT': 10,       # 스트림 청크 사이 최대 대기 (초), 초과 시 정지로 보고 실패 처리 → failover
+    'STREAM_TIMEOUT': 60       # 스트림 전체 상한 (초)
+}
+
+# OpenAI API 설정 (OpenAI 호환 서버면 BASE_URL_ENV로 주소 변경 가능)
+OPENAI_CONFIG = {
+    'API_KEY_ENV': 'OPENAI_API_KEY',
+    'BASE_URL': 'https://api.openai.com/v1',
+    'BASE_URL_ENV': 'OPENAI_BASE_URL',   # 예: http://127.0.0.1:8787/v1 (로컬 대체 서버)
+    'MODELS': {                          # 작업별 모델
+        'extract': 'gpt-4o-mini',
+        'reply': 'gpt-4o-mini',
+        'combined': 'gpt-4o-mini',       # 추출 + 답변 1회 호출
+        'extract_batch': 'gpt-4o-mini'   # 여러 이메일 추출 1회 호출
+    },
+    'TEMPERATURES': {
+        'extract': 0.0,
+        'reply': 0.7,
+        'combined': 0.3,
+        'extract_batch': 0.0
+    },
     'MAX_TOKENS': 2048,
-    'TEMPERATURE': 0.7
+    'CONNECT_TIMEOUT': 5,
+    'READ_TIMEOUT': 60,
+    'POOL_MAXSIZE': 10                   # keep-alive 커넥션 풀 크기
+}
+
+# 외부 API 공용 HTTP 세션 (Gemini/OpenAI/Salesforce, 서비스별 keep-alive 커넥션 풀)
+HTTP_POOL_CONFIG = {
+    'POOL_CONNECTIONS': 4,       # 세션당 커넥션 풀을 유지할 호스트 수
+    'POOL_MAXSIZE': 10,          # 호스트당 keep-alive 커넥션 상한
+    'POOL_BLOCK': False,         # True면 호스트당 동시 연결을 POOL_MAXSIZE로 강제 (초과 요청은 대기)
+    'CONNECT_TIMEOUT': 5,        # 연결(TCP/TLS) 타임아웃 (초) - 응답 대기보다 짧게
+    'READ_TIMEOUTS': {           # 서비스별 응답 읽기 타임아웃 (초)
+        'gemini': 60,
+        'salesforce': 20,
+        'default': 30
+    }
+}
+
+# AI 제공자 라우팅 ("ai" 서비스 = 여러 제공자를 묶은 라우터)
+LLM_ROUTER_CONFIG = {
+    'ROUTES': {                       # 작업별 제공자 우선순위 (앞에서부터 시도, 실패/타임아웃 시 다음)
+        'extract': ['openai', 'gemini'],
+        'reply': ['openai', 'gemini'],
+        'combined': ['openai', 'gemini'],
+        'extract_batch': ['openai', 'gemini']
+    },
+    'TIMEOUTS': {                     # 제공자 1회 호출 타임아웃 (초), 초과 시 다음 제공자로 failover
+        'extract': 20,
+        'reply': 45,
+        'combined': 45,
+        'extract_batch': 60           # 응답 길이가 이메일 수에 비례
+    },
+    'LATENCY_WINDOW': 200,            # 제공자/작업별 최근 지연 샘플 수
+    'HEDGE': {
+        'ENABLED': True,
+        'TASKS': ['extract'],         # hedge 대상 작업
+        'PERCENTILE': 95,             # 1순위 제공자가 이 백분위 지연을 넘기면 2순위에 동시 요청
+        'MIN_SAMPLES': 20,            # 백분위 계산 최소 샘플 (그 전에는 INITIAL_DELAY 사용)
+        'INITIAL_DELAY': 5.0,         # 샘플 부족 시 hedge 대기 (초)
+        'MIN_DELAY': 0.2,             # hedge 대기 하한 (초)
+        'MAX_RATIO': 0.1              # 전체 호출 대비 hedge 비율 상한 (추가 비용 제한)
+    }
+}
+
+# 메일 사전 필터 (Gmail 본문 조회 전 헤더만으로 자동 응답/반송/메일링 리스트 제외 + 발신자별 답장 한도/답장 루프 감지)
+MAIL_FILTER_CONFIG = {
+    'ENABLED': True,
+    'BULK_PRECEDENCE': ['bulk', 'list', 'junk', 'auto_reply'],  # 제외할 Precedence 값
+    'BOUNCE_SENDERS': ['mailer-daemon', 'postmaster'],          # 제외할 발신 주소 로컬 파트 (접두사)
+    'MAX_REPLIES_PER_SENDER': 3,       # 발신자별 REPLY_WINDOW_SECONDS 동안 보낼 최대 답장 수 (실제 발송 기준)
+    'REPLY_WINDOW_SECONDS': 86400,
+    'LOOP_MAX_MESSAGES': 5,            # LOOP_WINDOW_SECONDS 안에 같은 발신자 메일이 이만큼 오면 루프로 판단
+    'LOOP_WINDOW_SECONDS': 600,
+    'LOOP_MAX_SUBJECT_MARKERS': 3,     # 제목에 우리 답장 표식("추가 정보 요청" 등)이 이만큼 쌓이면 루프로 판단
+    'LOOP_COOLDOWN_SECONDS': 86400,    # 루프로 판단한 발신자 메일 제외 기간
+    'MAX_TRACKED_IDS': 10000,          # 판단 결과를 기억할 메시지 수 (제외한 메일은 다음 조회에서 헤더도 받지 않음)
+    'STATE_FILE': str(LOGS_DIR / 'mail_filter_state.json')  # 재시작 후에도 답장 한도/차단 유지
+}
+
+# 메일 사전 분류 (LLM 호출 전 문의 / 문의 아님 / 불확실 - 뉴스레터·영수증·부재중 회신·반송·스팸은 추출/답장 없이 건너뜀)
+TRIAGE_CONFIG = {
+    'ENABLED': True,
+    'MODEL_FILE': str(LOGS_DIR / 'triage_model.json'),  # scripts/train_triage.py로 학습 (없으면 모든 메일 처리)
+    'INQUIRY_MIN_PROB': 0.9,         # 문의 확률이 이 이상이면 문의
+    'NON_INQUIRY_MIN_PROB': 0.99,    # 문의가 아닐 확률이 이 이상일 때만 건너뜀 (그 사이는 불확실 → 문의와 같이 처리)
+    'SKIP_NON_INQUIRY': True         # False면 분류 결과만 기록 (건너뛰지 않고 관찰)
+}
+
+# 규칙 기반 사전 추출 (LLM 호출 전 라벨/서명/자기소개/전화번호 패턴으로 필드 확정, 남은 필드만 LLM)
+PRE_EXTRACT_CONFIG = {
+    'ENABLED': True,
+    'MIN_CONFIDENCE': 0.85   # 확정 기준 (라벨 0.95, 서명/전화·이메일 패턴 0.9, 자기소개 0.85, 맺음말/부서 소개 0.8)
+}
+
+# 고객 정보 일괄 추출 (한 사이클의 새 이메일 여러 건을 LLM 1회 호출로 추출 - 지시문/요청 오버헤드 분산)
+BATCH_EXTRACT_CONFIG = {
+    'ENABLED': True,
+    'MIN_EMAILS': 2,             # 규칙 추출 후 LLM이 필요한 이메일이 이보다 적으면 1건씩 추출
+    'MAX_EMAILS': 10,            # 요청 1회 최대 이메일 수 (응답 길이/부분 실패 영향 제한)
+    'MAX_INPUT_TOKENS': 6000     # 요청 1회 본문 토큰 합계 상한 (추정치, 넘으면 다음 요청으로 나눔)
+}
+
+# 지난 메일 대량 처리 (backfill 모드 - OpenAI Batch API로 추출/답변 작성 후 결과를 이메일에 연결해 발송/Lead 생성)
+BATCH_JOB_CONFIG = {
+    'LOOKBACK_DAYS': 30,                      # 조회 기간 (일)
+    'MAX_EMAILS': 500,                        # 조회 상한 (Gmail messages.list 1회 최대 500)
+    'COMPLETION_WINDOW': '24h',               # 배치 완료 기한 (Batch API 지원 값)
+    'POLL_INTERVAL': 30,                      # 상태 확인 간격 (초)
+    'MAX_WAIT': 86400,                        # 대기 상한 (초), 넘으면 취소 → 남은 이메일은 실시간 경로로 처리
+    'JOB_DIR': str(LOGS_DIR / 'batch_jobs')   # 요청/결과 JSONL과 배치 상태 보관
+}
+
+# 정형 답변 템플릿 (담당자 배정 / 추가 정보 요청) - 맞춤 답변이 필요한 메일만 LLM으로 작성
+REPLY_TEMPLATE_CONFIG = {
+    'ENABLED': True,
+    'CUSTOM_KEYWORDS': ['불만', '항의', '환불', '해지', '취소', '장애', '오류', '긴급', '클레임', '보상',
+                        'refund', 'complaint', 'cancel', 'urgent', 'outage'],
+    'MAX_QUESTIONS': 2,        # 질문 문장이 이보다 많으면 LLM (템플릿으로 답할 수 없음)
+    'MIN_HANGUL_RATIO': 0.2    # 한글 비율이 이보다 낮으면 LLM (영문 메일 등, 템플릿은 한국어)
+}
+
+# LLM 입력 토큰 예산 (본문 정리 후 작업별 예산을 넘으면 앞부분 + 서명/연락처가 있는 끝부분만 남김)
+PROMPT_BUDGET_CONFIG = {
+    'ENABLED': True,
+    'MAX_INPUT_TOKENS': {        # 작업별 이메일 본문 토큰 예산 (프롬프트 지시문 제외, 한국어/영어 추정치)
+        'extract': 1500,
+        'reply': 1000,
+        'combined': 1500
+    },
+    'TAIL_RATIO': 0.3,           # 예산 중 끝부분(서명/연락처)에 배정할 비율
+    'MAX_SCAN_CHARS': 50000      # 정리 전에 먼저 자를 최대 글자 수 (200KB 뉴스레터도 처리 시간 상한)
+}
+
+# LLM 응답 캐시 (키 = 제공자 + 모델 + 프롬프트 템플릿 버전 + 파라미터 + 정규화된 내용의 해시)
+LLM_CACHE_CONFIG = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 1000,              # 메모리 LRU 항목 수
+    'TTL_SECONDS': 86400,             # 24시간 (0이면 만료 없음)
+    'DB_FILE': str(LOGS_DIR / 'llm_cache.sqlite3'),  # 재시작 후에도 유지되는 디스크 단계 (None이면 메모리만)
+    'MAX_DB_ENTRIES': 20000
+}
+
+# LLM 요청 속도 제한 (제공자별 RPM/TPM 토큰 버킷 - 보내기 전에 허용량을 받아 429를 피함)
+RATE_LIMIT_CONFIG = {
+    'ENABLED': True,
+    'DB_FILE': str(LOGS_DIR / 'rate_limit.sqlite3'),  # 같은 파일을 쓰는 프로세스끼리 한도 공유 (None이면 프로세스 내부만)
+    'LIMITS': {                       # 계정 등급의 분당 한도 (없는 제공자/항목은 제한 안 함)
+        'gemini': {'RPM': 30, 'TPM': 1000000},    # gemini-2.0-flash-lite 무료 등급
+        'openai': {'RPM': 500, 'TPM': 200000}     # gpt-4o-mini Tier 1
+    },
+    'HEADROOM': 0.9,                  # 한도의 이 비율까지만 사용 (제공자 측 집계 오차 여유)
+    'BURST_SECONDS': 6,               # 버킷 용량 = 이 시간 동안 채워지는 양 (한 번에 몰아 보낼 수 있는 양)
+                                      # HEADROOM × (60 + BURST_SECONDS) ≤ 60이면 어떤 1분 창에서도 한도를 넘지 않음
+    'MAX_WAIT': 30,                   # 허용량을 이 시간 안에 못 받으면 보내지 않고 실패 (라우터가 다른 제공자로)
+    'THROTTLE_SECONDS': 10            # 429에 Retry-After가 없을 때 모든 워커가 멈추는 시간
 }
 
 # Salesforce 설정
@@ -60,8 +226,74 @@ WORKFLOW_CONFIG = {
     'EMAIL_CHECK_INTERVAL': 300,        # 5분
     'MAX_EMAILS_PER_CHECK': 10,
     'EMAIL_LOOKBACK_MINUTES': 15,
-    'RETRY_ATTEMPTS': 3,
-    'RETRY_DELAY': 5
+    'RETRY_ATTEMPTS': 3,                # 서비스 호출 재시도 횟수 (BaseService.execute_with_retry)
+    'RETRY_DELAY': 5,                   # 재시도 간격 (초, n번째 재시도는 RETRY_DELAY × n)
+    'LLM_MODE': 'combined'              # combined(추출 + 답변 1회 호출) / two_call(추출 → 답변 2회 호출)
+}
+
+# 서킷 브레이커 설정 (ServiceManager가 서비스별로 관리)
+CIRCUIT_BREAKER_CONFIG = {
+    'FAILURE_RATE_THRESHOLD': 0.5,  # 윈도우 내 실패율이 이 값 이상이면 open
+    'WINDOW_SECONDS': 60,           # 실패율 계산 윈도우
+    'MIN_CALLS': 5,                 # 판단에 필요한 최소 호출 수
+    'COOLDOWN_SECONDS': 60,         # open 유지 시간 (이후 half-open)
+    'HALF_OPEN_MAX_CALLS': 1,       # half-open 시험 호출 수
+    'RETRY_QUEUE_MAX': 500,         # 지연 작업 최대 보관 수
+    'RETRY_MAX_ATTEMPTS': 5,        # 지연 작업 최대 재시도 횟수
+    'SERVICES': {                   # 서비스별 override
+        'ai': {'MIN_CALLS': 3, 'COOLDOWN_SECONDS': 120}
+    }
+}
+
+# 시작(서비스 초기화) 설정: 서비스는 병렬로 초기화됨
+STARTUP_CONFIG = {
+    'CRITICAL_SERVICES': ['gmail'],   # 준비될 때까지 기다리는 서비스 (나머지는 백그라운드)
+    'INIT_TIMEOUTS': {                # 서비스별 초기화 타임아웃 (초)
+        'gmail': 60,
+        'ai': 15,
+        'salesforce': 20
+    },
+    'DEFAULT_INIT_TIMEOUT': 30,
+    'INIT_RETRY_INTERVAL': 300        # 초기화 실패 서비스 재시도 간격 (초)
+}
+
+# 헬스 체크 설정 (서비스별 liveness 프로브)
+HEALTH_CONFIG = {
+    'PROBE_TIMEOUT': 5,        # 프로브별 타임아웃 (초)
+    'CACHE_TTL': 30,           # 프로브 결과 캐시 시간 (초)
+    'HTTP_HOST': '127.0.0.1',
+    'HTTP_PORT': None,                  # --health-port로 지정 (없으면 HTTP_PORT_ENV)
+    'HTTP_PORT_ENV': 'HEALTH_HTTP_PORT'  # 설정 시 monitor 모드에서 /healthz 제공
+}
+
+# 응답 대기 시간(freshness) SLA 설정: Gmail internalDate → 답장 발송 / Lead 생성
+FRESHNESS_CONFIG = {
+    'SLA_SECONDS': {
+        'reply': 900,       # 15분
+        'lead': 1200        # 20분
+    },
+    'WINDOW_SIZE': 500,     # 메일박스/단계별 rolling 샘플 수
+    'MIN_SAMPLES': 20,      # 알림 판단 최소 샘플 수
+    'ALERT_COOLDOWN': 1800, # 동일 알림 재발송 간격 (초)
+    'ALERT_WEBHOOK_ENV': 'FRESHNESS_ALERT_WEBHOOK',
+    'STATE_FILE': str(LOGS_DIR / 'freshness_stats.json')
+}
+
+# 프로파일링 설정 (main.py --profile)
+PROFILING_CONFIG = {
+    'OUTPUT_DIR': str(LOGS_DIR / 'profiles'),
+    'EVERY': 1,          # N번째 사이클마다 프로파일링
+    'RETENTION': 50,     # 보관할 사이클 수
+    'TOP_N': 25          # 요약에 포함할 상위 항목 수
+}
+
+# 메모리 상한 / 감시 설정 (장기 실행 모니터 모드)
+MEMORY_CONFIG = {
+    'MAX_PROCESSED_IDS': 10000,  # processed_emails 최대 보관 수 (초과 시 오래된 ID부터 제거)
+    'SAMPLE_EVERY': 10,          # N 사이클마다 RSS 샘플링
+    'TRACEMALLOC': False,        # True면 증가하는 할당 위치까지 보고 (오버헤드 있음)
+    'TOP_N': 10,
+    'RSS_WARN_MB': 512
 }
 
 # 로깅 설정
@@ -73,6 +305,108 @@ LOGGING_CONFIG = {
     'BACKUP_COUNT': 5
 }
 
+# 트레이싱 설정 (이메일 단위 스팬 → OTLP 호환 JSONL / 컬렉터)
+TRACING_CONFIG = {
+    'ENABLED': True,
+    'SERVICE_NAME': 'ai_workflow_production',
+    'EXPORT_FILE': str(LOGS_DIR / 'traces' / 'spans.jsonl'),
+    'OTLP_ENDPOINT_ENV': 'OTEL_EXPORTER_OTLP_ENDPOINT'  # 예: http://localhost:4318
+}
+
+# 설정 hot reload (monitor 모드에서 .env / 설정 파일 변경 감지)
+RELOAD_CONFIG = {
+    'ENABLED': True,
+    'POLL_SECONDS': 5      # 파일 변경 확인 간격 (대기 중에도 확인)
+}
+
+# .env로 조정 가능한 운영 파라미터: 환경변수명 -> (섹션, 키, 타입)
+ENV_TUNABLES = {
+    'EMAIL_CHECK_INTERVAL': ('WORKFLOW_CONFIG', 'EMAIL_CHECK_INTERVAL', int),
+    'MAX_EMAILS_PER_CHECK': ('WORKFLOW_CONFIG', 'MAX_EMAILS_PER_CHECK', int),
+    'EMAIL_LOOKBACK_MINUTES': ('WORKFLOW_CONFIG', 'EMAIL_LOOKBACK_MINUTES', int),
+    'RETRY_ATTEMPTS': ('WORKFLOW_CONFIG', 'RETRY_ATTEMPTS', int),
+    'RETRY_DELAY': ('WORKFLOW_CONFIG', 'RETRY_DELAY', float),
+    'LLM_MODE': ('WORKFLOW_CONFIG', 'LLM_MODE', str)
+}
+
+# 재시작 없이 반영되는 항목 (그 외 항목은 변경되어도 재시작 후 반영)
+HOT_RELOAD_KEYS = {
+    'WORKFLOW_CONFIG': ('EMAIL_CHECK_INTERVAL', 'MAX_EMAILS_PER_CHECK', 'EMAIL_LOOKBACK_MINUTES',
+                        'RETRY_ATTEMPTS', 'RETRY_DELAY', 'LLM_MODE'),
+    'CIRCUIT_BREAKER_CONFIG': ('FAILURE_RATE_THRESHOLD', 'WINDOW_SECONDS', 'MIN_CALLS',
+                               'COOLDOWN_SECONDS', 'HALF_OPEN_MAX_CALLS', 'RETRY_MAX_ATTEMPTS', 'SERVICES'),
+    'FRESHNESS_CONFIG': ('SLA_SECONDS', 'MIN_SAMPLES', 'ALERT_COOLDOWN'),
+    'BATCH_EXTRACT_CONFIG': ('ENABLED', 'MIN_EMAILS', 'MAX_EMAILS', 'MAX_INPUT_TOKENS'),
+    'MEMORY_CONFIG': ('MAX_PROCESSED_IDS', 'SAMPLE_EVERY', 'RSS_WARN_MB'),
+    'LLM_CACHE_CONFIG': ('MAX_ENTRIES', 'TTL_SECONDS', 'MAX_DB_ENTRIES'),
+    'RATE_LIMIT_CONFIG': ('LIMITS', 'HEADROOM', 'BURST_SECONDS', 'MAX_WAIT', 'THROTTLE_SECONDS'),
+    'TRIAGE_CONFIG': ('ENABLED', 'MODEL_FILE', 'INQUIRY_MIN_PROB', 'NON_INQUIRY_MIN_PROB', 'SKIP_NON_INQUIRY')
+}
+
+# 검증 규칙: (섹션, 키) -> (타입, 최소값, 최대값)
+VALIDATION_RULES = {
+    ('WORKFLOW_CONFIG', 'EMAIL_CHECK_INTERVAL'): (int, 1, None),
+    ('WORKFLOW_CONFIG', 'MAX_EMAILS_PER_CHECK'): (int, 1, 500),
+    ('WORKFLOW_CONFIG', 'EMAIL_LOOKBACK_MINUTES'): (int, 1, None),
+    ('WORKFLOW_CONFIG', 'RETRY_ATTEMPTS'): (int, 1, 20),
+    ('WORKFLOW_CONFIG', 'RETRY_DELAY'): (float, 0, None),
+    ('GEMINI_CONFIG', 'MAX_TOKENS'): (int, 1, None),
+    ('GEMINI_CONFIG', 'TEMPERATURE'): (float, 0, 2),
+    ('GEMINI_CONFIG', 'STALL_TIMEOUT'): (float, 0.5, None),
+    ('GEMINI_CONFIG', 'STREAM_TIMEOUT'): (float, 1, None),
+    ('OPENAI_CONFIG', 'MAX_TOKENS'): (int, 1, None),
+    ('OPENAI_CONFIG', 'CONNECT_TIMEOUT'): (float, 0.1, None),
+    ('OPENAI_CONFIG', 'READ_TIMEOUT'): (float, 1, None),
+    ('OPENAI_CONFIG', 'POOL_MAXSIZE'): (int, 1, None),
+    ('HTTP_POOL_CONFIG', 'POOL_CONNECTIONS'): (int, 1, None),
+    ('HTTP_POOL_CONFIG', 'POOL_MAXSIZE'): (int, 1, None),
+    ('HTTP_POOL_CONFIG', 'CONNECT_TIMEOUT'): (float, 0.1, None),
+    ('LLM_ROUTER_CONFIG', 'LATENCY_WINDOW'): (int, 10, None),
+    ('MAIL_FILTER_CONFIG', 'MAX_REPLIES_PER_SENDER'): (int, 1, None),
+    ('MAIL_FILTER_CONFIG', 'REPLY_WINDOW_SECONDS'): (float, 0, None),
+    ('MAIL_FILTER_CONFIG', 'LOOP_MAX_MESSAGES'): (int, 2, None),
+    ('MAIL_FILTER_CONFIG', 'LOOP_WINDOW_SECONDS'): (float, 1, None),
+    ('MAIL_FILTER_CONFIG', 'LOOP_MAX_SUBJECT_MARKERS'): (int, 1, None),
+    ('MAIL_FILTER_CONFIG', 'LOOP_COOLDOWN_SECONDS'): (float, 0, None),
+    ('MAIL_FILTER_CONFIG', 'MAX_TRACKED_IDS'): (int, 100, None),
+    ('TRIAGE_CONFIG', 'INQUIRY_MIN_PROB'): (float, 0.5, 1),
+    ('TRIAGE_CONFIG', 'NON_INQUIRY_MIN_PROB'): (float, 0.5, 1),
+    ('PRE_EXTRACT_CONFIG', 'MIN_CONFIDENCE'): (float, 0, 1),
+    ('BATCH_EXTRACT_CONFIG', 'MIN_EMAILS'): (int, 1, None),
+    ('BATCH_EXTRACT_CONFIG', 'MAX_EMAILS'): (int, 1, 50),
+    ('BATCH_EXTRACT_CONFIG', 'MAX_INPUT_TOKENS'): (int, 500, None),
+    ('BATCH_JOB_CONFIG', 'LOOKBACK_DAYS'): (int, 1, None),
+    ('BATCH_JOB_CONFIG', 'MAX_EMAILS'): (int, 1, 500),
+    ('BATCH_JOB_CONFIG', 'POLL_INTERVAL'): (float, 0.1, None),
+    ('BATCH_JOB_CONFIG', 'MAX_WAIT'): (float, 1, None),
+    ('REPLY_TEMPLATE_CONFIG', 'MAX_QUESTIONS'): (int, 0, None),
+    ('REPLY_TEMPLATE_CONFIG', 'MIN_HANGUL_RATIO'): (float, 0, 1),
+    ('PROMPT_BUDGET_CONFIG', 'TAIL_RATIO'): (float, 0, 0.9),
+    ('PROMPT_BUDGET_CONFIG', 'MAX_SCAN_CHARS'): (int, 1000, None),
+    ('LLM_CACHE_CONFIG', 'MAX_ENTRIES'): (int, 1, None),
+    ('LLM_CACHE_CONFIG', 'TTL_SECONDS'): (float, 0, None),
+    ('LLM_CACHE_CONFIG', 'MAX_DB_ENTRIES'): (int, 1, None),
+    ('RATE_LIMIT_CONFIG', 'HEADROOM'): (float, 0.1, 1),
+    ('RATE_LIMIT_CONFIG', 'BURST_SECONDS'): (float, 1, 60),
+    ('RATE_LIMIT_CONFIG', 'MAX_WAIT'): (float, 0, None),
+    ('RATE_LIMIT_CONFIG', 'THROTTLE_SECONDS'): (float, 0, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'FAILURE_RATE_THRESHOLD'): (float, 0, 1),
+    ('CIRCUIT_BREAKER_CONFIG', 'WINDOW_SECONDS'): (float, 1, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'MIN_CALLS'): (int, 1, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'COOLDOWN_SECONDS'): (float, 0, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'HALF_OPEN_MAX_CALLS'): (int, 1, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'RETRY_QUEUE_MAX'): (int, 1, None),
+    ('CIRCUIT_BREAKER_CONFIG', 'RETRY_MAX_ATTEMPTS'): (int, 1, None),
+    ('HEALTH_CONFIG', 'PROBE_TIMEOUT'): (float, 0.1, None),
+    ('HEALTH_CONFIG', 'CACHE_TTL'): (float, 0, None),
+    ('FRESHNESS_CONFIG', 'WINDOW_SIZE'): (int, 1, None),
+    ('FRESHNESS_CONFIG', 'MIN_SAMPLES'): (int, 1, None),
+    ('FRESHNESS_CONFIG', 'ALERT_COOLDOWN'): (float, 0, None),
+    ('MEMORY_CONFIG', 'MAX_PROCESSED_IDS'): (int, 100, None),
+    ('MEMORY_CONFIG', 'SAMPLE_EVERY'): (int, 1, None),
+    ('RELOAD_CONFIG', 'POLL_SECONDS'): (float, 0.1, None)
+}
+
 # 환경별 설정
 ENVIRONMENT_CONFIGS = {
     'development': {
@@ -86,6 +420,9 @@ ENVIRONMENT_CONFIGS = {
         },
         'SALESFORCE_CONFIG': {
             'DEFAULT_SANDBOX': True
+        },
+        'FRESHNESS_CONFIG': {
+            'MIN_SAMPLES': 5
         }
     },
     'production': {
@@ -103,36 +440,290 @@ ENVIRONMENT_CONFIGS = {
     }
 }
 
+class ConfigError(ValueError):
+    """설정 값 검증 실패"""
+
+
+def ensure_environment() -> None:
+    """공유 .env 로드 및 로그 디렉토리 생성 (최초 1회)"""
+    global _environment_loaded, _process_env_keys
+    if _environment_loaded:
+        return
+    from dotenv import load_dotenv
+    _process_env_keys = frozenset(os.environ)
+    load_dotenv(SHARED_ENV_FILE)
+    LOGS_DIR.mkdir(exist_ok=True)
+    _environment_loaded = True
+
 def get_env_variable(var_name: str, default: str = None, required: bool = True) -> str:
     """환경변수 안전하게 가져오기"""
+    ensure_environment()
     value = os.getenv(var_name, default)
     if required and value is None:
         raise ValueError(f"필수 환경변수가 설정되지 않았습니다: {var_name}")
     return value
 
-def load_environment_config(environment: str = 'development'):
-    """환경별 설정 로드"""
+
+@dataclass(frozen=True)
+class WorkflowSettings:
+    """WORKFLOW_CONFIG의 타입 지정 뷰"""
+    email_check_interval: int
+    max_emails_per_check: int
+    email_lookback_minutes: int
+    retry_attempts: int
+    retry_delay: float
+    llm_mode: str = 'combined'
+
+    @classmethod
+    def from_section(cls, section: Mapping) -> 'WorkflowSettings':
+        return cls(
+            email_check_interval=int(section['EMAIL_CHECK_INTERVAL']),
+            max_emails_per_check=int(section['MAX_EMAILS_PER_CHECK']),
+            email_lookback_minutes=int(section['EMAIL_LOOKBACK_MINUTES']),
+            retry_attempts=int(section['RETRY_ATTEMPTS']),
+            retry_delay=float(section['RETRY_DELAY']),
+            llm_mode=section.get('LLM_MODE', 'combined')
+        )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """
+    컴파일된 환경 설정 (불변)
+
+    기존 코드와 같이 config['WORKFLOW_CONFIG']['EMAIL_CHECK_INTERVAL'] 형태로 조회하며,
+    섹션은 읽기 전용 매핑(리스트는 튜플)이라 실행 중 다른 모듈이 값을 바꿀 수 없음
+    """
+    environment: str
+    workflow: WorkflowSettings
+    sections: Mapping[str, Mapping[str, Any]]
+    sources: Tuple[str, ...] = ()
+
+    def __getitem__(self, section: str) -> Mapping[str, Any]:
+        return self.sections[section]
+
+    def __contains__(self, section: object) -> bool:
+        return section in self.sections
+
+    def get(self, section: str, default=None):
+        return self.sections.get(section, default)
+
+    def keys(self):
+        return self.sections.keys()
+
+    def items(self):
+        return self.sections.items()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """수정 가능한 일반 dict 사본"""
+        return _thaw(self.sections)
+
+    def diff(self, other: 'AppConfig') -> Dict[Tuple[str, str], Tuple[Any, Any]]:
+        """other 대비 변경된 항목: (섹션, 키) -> (이전 값, 새 값)"""
+        changes = {}
+        for section_name in set(self.sections) | set(other.sections):
+            old_section = self.sections.get(section_name, {})
+            new_section = other.sections.get(section_name, {})
+            for key in set(old_section) | set(new_section):
+                if old_section.get(key) != new_section.get(key):
+                    changes[(section_name, key)] = (old_section.get(key), new_section.get(key))
+        return changes
+
+
+def _deep_merge(target: Dict, overrides: Mapping) -> Dict:
+    """중첩 dict까지 병합 (SLA_SECONDS, SERVICES 등 일부 키만 override 가능)"""
+    for key, value in overrides.items():
+        if isinstance(value, Mapping) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def config_file_path() -> Optional[Path]:
+    """선택 설정 파일 경로 (AI_WORKFLOW_CONFIG_FILE 또는 config.local.json, 없으면 None)"""
+    path = Path(os.getenv(CONFIG_FILE_ENV) or DEFAULT_CONFIG_FILE)
+    return path if path.exists() else None
+
+
+def _read_config_file(path: Path, environment: str) -> Dict:
+    """
+    JSON 설정 파일 읽기
+
+    최상위 섹션은 모든 환경에 적용되고, "environments": {"production": {...}}는 해당 환경에만 적용됨
+    """
+    import json  # 설정 파일이 있을 때만 로드
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"설정 파일을 읽을 수 없습니다 ({path}): {e}")
+    if not isinstance(data, dict):
+        raise ConfigError(f"설정 파일 최상위는 객체여야 합니다: {path}")
+
+    per_environment = data.pop('environments', {}) or {}
+    return _deep_merge(data, per_environment.get(environment, {}))
+
+
+def _env_tunable_overrides() -> Dict:
+    """
+    ENV_TUNABLES 값 수집
+
+    .env는 매번 다시 읽어 변경을 반영하고, .env 로드 전부터 설정된 프로세스 환경변수는 그대로 우선함
+    """
+    from dotenv import dotenv_values
+    env_file_values = dotenv_values(SHARED_ENV_FILE) if SHARED_ENV_FILE.exists() else {}
+
+    overrides: Dict[str, Dict] = {}
+    for var_name, (section_name, key, cast) in ENV_TUNABLES.items():
+        raw = os.environ.get(var_name) if var_name in _process_env_keys else env_file_values.get(var_name)
+        if raw in (None, ''):
+            continue
+        try:
+            value = cast(raw)
+        except ValueError:
+            raise ConfigError(f"{var_name} 값이 올바르지 않습니다: {raw!r}")
+        overrides.setdefault(section_name, {})[key] = value
+    return overrides
+
+
+def _validate(sections: Dict) -> None:
+    """VALIDATION_RULES 검사 (모든 오류를 모아 ConfigError 1회 발생)"""
+    errors = []
+    for (section_name, key), (expected, minimum, maximum) in VALIDATION_RULES.items():
+        value = sections.get(section_name, {}).get(key)
+        if value is None:
+            continue
+        allowed = (int, float) if expected is float else (expected,)
+        if isinstance(value, bool) or not isinstance(value, allowed):
+            errors.append(f"{section_name}.{key}: {expected.__name__} 필요 (현재 {value!r})")
+        elif minimum is not None and value < minimum:
+            errors.append(f"{section_name}.{key}: {minimum} 이상이어야 함 (현재 {value})")
+        elif maximum is not None and value > maximum:
+            errors.append(f"{section_name}.{key}: {maximum} 이하여야 함 (현재 {value})")
+
+    for stage, sla in sections.get('FRESHNESS_CONFIG', {}).get('SLA_SECONDS', {}).items():
+        if isinstance(sla, bool) or not isinstance(sla, (int, float)) or sla <= 0:
+            errors.append(f"FRESHNESS_CONFIG.SLA_SECONDS.{stage}: 양수 필요 (현재 {sla!r})")
+
+    llm_mode = sections.get('WORKFLOW_CONFIG', {}).get('LLM_MODE')
+    if llm_mode not in (None, 'combined', 'two_call'):
+        errors.append(f"WORKFLOW_CONFIG.LLM_MODE: combined 또는 two_call (현재 {llm_mode!r})")
+
+    if errors:
+        raise ConfigError("설정 검증 실패:\n  " + "\n  ".join(errors))
+
+
+def compile_config(environment: str = 'development', overrides: Optional[Mapping] = None) -> AppConfig:
+    """
+    환경 설정 컴파일 (병합 → 검증 → 불변 객체)
+
+    우선순위: 기본값 < ENVIRONMENT_CONFIGS < 설정 파일 < .env 운영 파라미터 < overrides(CLI 등)
+
+    Raises:
+        ConfigError: 알 수 없는 환경이거나 검증 실패
+    """
     if environment not in ENVIRONMENT_CONFIGS:
-        raise ValueError(f"지원되지 않는 환경: {environment}")
-    
-    config = {
-        'GMAIL_CONFIG': GMAIL_CONFIG.copy(),
-        'GEMINI_CONFIG': GEMINI_CONFIG.copy(),
-        'SALESFORCE_CONFIG': SALESFORCE_CONFIG.copy(),
-        'WORKFLOW_CONFIG': WORKFLOW_CONFIG.copy(),
-        'LOGGING_CONFIG': LOGGING_CONFIG.copy()
+        raise ConfigError(f"지원되지 않는 환경: {environment}")
+
+    ensure_environment()
+
+    sections = {
+        'GMAIL_CONFIG': GMAIL_CONFIG,
+        'GEMINI_CONFIG': GEMINI_CONFIG,
+        'OPENAI_CONFIG': OPENAI_CONFIG,
+        'HTTP_POOL_CONFIG': HTTP_POOL_CONFIG,
+        'LLM_ROUTER_CONFIG': LLM_ROUTER_CONFIG,
+        'MAIL_FILTER_CONFIG': MAIL_FILTER_CONFIG,
+        'TRIAGE_CONFIG': TRIAGE_CONFIG,
+        'PRE_EXTRACT_CONFIG': PRE_EXTRACT_CONFIG,
+        'BATCH_EXTRACT_CONFIG': BATCH_EXTRACT_CONFIG,
+        'BATCH_JOB_CONFIG': BATCH_JOB_CONFIG,
+        'REPLY_TEMPLATE_CONFIG': REPLY_TEMPLATE_CONFIG,
+        'PROMPT_BUDGET_CONFIG': PROMPT_BUDGET_CONFIG,
+        'LLM_CACHE_CONFIG': LLM_CACHE_CONFIG,
+        'RATE_LIMIT_CONFIG': RATE_LIMIT_CONFIG,
+        'SALESFORCE_CONFIG': SALESFORCE_CONFIG,
+        'WORKFLOW_CONFIG': WORKFLOW_CONFIG,
+        'CIRCUIT_BREAKER_CONFIG': CIRCUIT_BREAKER_CONFIG,
+        'HEALTH_CONFIG': HEALTH_CONFIG,
+        'STARTUP_CONFIG': STARTUP_CONFIG,
+        'FRESHNESS_CONFIG': FRESHNESS_CONFIG,
+        'PROFILING_CONFIG': PROFILING_CONFIG,
+        'MEMORY_CONFIG': MEMORY_CONFIG,
+        'LOGGING_CONFIG': LOGGING_CONFIG,
+        'TRACING_CONFIG': TRACING_CONFIG,
+        'RELOAD_CONFIG': RELOAD_CONFIG
     }
-    
-    env_overrides = ENVIRONMENT_CONFIGS[environment]
-    for section_name, overrides in env_overrides.items():
-        if section_name in config:
-            config[section_name].update(overrides)
-    
-    return config
+    merged = copy.deepcopy(sections)
+    sources = []
+
+    def _apply(layer: Mapping) -> None:
+        for section_name, section_overrides in layer.items():
+            if section_name not in merged:
+                raise ConfigError(f"알 수 없는 설정 섹션: {section_name}")
+            _deep_merge(merged[section_name], section_overrides)
+
+    _apply(ENVIRONMENT_CONFIGS[environment])
+
+    file_path = config_file_path()
+    if file_path:
+        _apply(_read_config_file(file_path, environment))
+        sources.append(str(file_path))
+
+    _apply(_env_tunable_overrides())
+    if SHARED_ENV_FILE.exists():
+        sources.append(str(SHARED_ENV_FILE))
+
+    if overrides:
+        _apply(overrides)
+
+    _validate(merged)
+    return AppConfig(
+        environment=environment,
+        workflow=WorkflowSettings.from_section(merged['WORKFLOW_CONFIG']),
+        sections=_freeze(merged),
+        sources=tuple(sources)
+    )
+
+
+# 환경별 컴파일 결과 캐시 (엔진/health/stats 모드가 같은 객체를 공유)
+_compiled_configs: Dict[str, AppConfig] = {}
+
+def load_environment_config(environment: str = 'development', overrides: Optional[Mapping] = None) -> AppConfig:
+    """환경별 설정 로드 (최초 1회 컴파일, overrides가 있으면 캐시하지 않음)"""
+    if overrides:
+        return compile_config(environment, overrides)
+    if environment not in _compiled_configs:
+        _compiled_configs[environment] = compile_config(environment)
+    return _compiled_configs[environment]
+
+def reload_environment_config(environment: str = 'development', overrides: Optional[Mapping] = None) -> AppConfig:
+    """설정 파일을 다시 읽어 컴파일 (검증 실패 시 ConfigError, 기존 캐시 유지)"""
+    compiled = compile_config(environment, overrides)
+    if not overrides:
+        _compiled_configs[environment] = compiled
+    return compiled
 
 def validate_config(environment: str = 'development') -> bool:
     """설정 유효성 검사"""
     try:
+        ensure_environment()
         print(f"🔍 {environment} 환경 설정 검증 중...")
         
         # 공유 파일 확인
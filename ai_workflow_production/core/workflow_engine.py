@@ -1,50 +1,74 @@
-# core/workflow_engine.py - 워크플로우 엔진 (OpenAI 버전)
+# core/workflow_engine.py - 워크플로우 엔진
 
 import logging
+import os
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Mapping, Optional
 from datetime import datetime
 
 from ai_workflow_production import config
+from ai_workflow_production.services.mail_filter import format_stats as format_filter_stats
 from ai_workflow_production.services.service_manager import ServiceManager
-from ai_workflow_production.services.gmail_service_v2 import GmailServiceV2
-
-# ========================================
-# 🔄 변경 1: Gemini 대신 OpenAI import
-# ========================================
-# from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
-from ai_workflow_production.services.openai_service_v2 import OpenAIServiceV2
-
-from ai_workflow_production.services.salesforce_service_v2 import SalesforceServiceV2
+from ai_workflow_production.services.triage import NON_INQUIRY, TriageClassifier
+from ai_workflow_production.utils.tracing import configure_tracing
+from ai_workflow_production.utils.llm_cache import configure_llm_cache, format_stats
+from ai_workflow_production.utils.rate_limiter import configure_rate_limiter, format_stats as format_limit_stats
+from ai_workflow_production.utils.freshness import FreshnessTracker
+from ai_workflow_production.utils.profiler import CycleProfiler
+from ai_workflow_production.utils.memory_watchdog import BoundedIdSet, MemoryWatchdog
+from ai_workflow_production.utils.config_watcher import ConfigWatcher, split_changes
 
 class WorkflowEngine:
     """워크플로우 엔진 - Level 1, 2 처리"""
     
-    def __init__(self, environment='development'):
+    def __init__(self, environment='development', config_overrides: Optional[Mapping] = None):
         self.logger = logging.getLogger(__name__)
         self.environment = environment
-        self.config = config.load_environment_config(environment)
+        self.config_overrides = config_overrides
+        self.config = config.load_environment_config(environment, config_overrides)
         
-        self.service_manager = ServiceManager()
-        self.processed_emails = set()
+        self.tracer = configure_tracing(self.config['TRACING_CONFIG'])
+        self.llm_cache = configure_llm_cache(self.config['LLM_CACHE_CONFIG'])
+        self.rate_limiter = configure_rate_limiter(self.config['RATE_LIMIT_CONFIG'])
+        self.freshness = FreshnessTracker.from_config(self.config['FRESHNESS_CONFIG'])
+        self.triage = TriageClassifier.from_config(self.config['TRIAGE_CONFIG'])
+        self.service_manager = ServiceManager(
+            self.config['CIRCUIT_BREAKER_CONFIG'], self.config['STARTUP_CONFIG']
+        )
+        self.service_manager.update_retry_policy(self.config.workflow.retry_attempts, self.config.workflow.retry_delay)
+        self.processed_emails = BoundedIdSet(self.config['MEMORY_CONFIG']['MAX_PROCESSED_IDS'])
+        self.memory_watchdog = MemoryWatchdog.from_config(self.config['MEMORY_CONFIG'])
         
         self._setup_services()
         
         self.logger.info(f"워크플로우 엔진 초기화 - 환경: {environment}")
     
+    @staticmethod
+    def register_default_services(service_manager: ServiceManager, config: Dict) -> None:
+        """기본 서비스 팩토리 등록 (서비스 모듈은 처음 사용할 때 import/생성)"""
+        def gmail_factory():
+            from ai_workflow_production.services.gmail_service_v2 import GmailServiceV2
+            return GmailServiceV2(config)
+
+        # "ai" = 제공자 라우터 (LLM_ROUTER_CONFIG ROUTES로 OpenAI/Gemini 선택, failover/hedge)
+        def ai_factory():
+            from ai_workflow_production.services.llm_router import LLMRouterService
+            return LLMRouterService(config)
+
+        def salesforce_factory():
+            from ai_workflow_production.services.salesforce_service_v2 import SalesforceServiceV2
+            return SalesforceServiceV2(config)
+
+        service_manager.register_factory("gmail", gmail_factory)
+        service_manager.register_factory("ai", ai_factory)
+        service_manager.register_factory("salesforce", salesforce_factory)
+
     def _setup_services(self):
         """서비스 등록"""
         self.logger.info("서비스 등록 중...")
         
         try:
-            # ========================================
-            # 🔄 변경 2: Gemini 대신 OpenAI 서비스 등록
-            # ========================================
-            self.service_manager.register_service("gmail", GmailServiceV2(self.config))
-            # self.service_manager.register_service("gemini", GeminiServiceV2(self.config))
-            self.service_manager.register_service("ai", OpenAIServiceV2(self.config))
-            self.service_manager.register_service("salesforce", SalesforceServiceV2(self.config))
-            
+            self.register_default_services(self.service_manager, self.config)
         except Exception as e:
             self.logger.error(f"서비스 등록 실패: {e}", exc_info=True)
             raise
@@ -58,6 +82,10 @@ class WorkflowEngine:
         result = self.service_manager.initialize_all()
         
         if result:
+            pending = [name for name, state in self.service_manager.startup_report().items()
+                       if state['status'] != 'ready']
+            if pending:
+                self.logger.warning(f"⚠️ 일부 서비스 미준비 상태로 시작 (제한 모드): {pending}")
             self.logger.info("✅ 워크플로우 엔진 초기화 완료")
         else:
             self.logger.error("❌ 워크플로우 엔진 초기화 실패")
@@ -74,12 +102,17 @@ class WorkflowEngine:
             max_emails = self.config['WORKFLOW_CONFIG']['MAX_EMAILS_PER_CHECK']
         
         try:
+            # 서킷이 닫힌 서비스의 지연 작업 먼저 처리
+            self.service_manager.drain_retry_queue()
+            
             gmail_service = self.service_manager.get_service("gmail")
             if not gmail_service:
                 self.logger.error("Gmail 서비스를 사용할 수 없습니다")
                 return []
             
-            new_emails = gmail_service.get_recent_emails(lookback_minutes, max_emails)
+            with self.tracer.start_trace("cycle.fetch_emails", lookback_minutes=lookback_minutes):
+                new_emails = gmail_service.get_recent_emails(lookback_minutes, max_emails,
+                                                             exclude_ids=self.processed_emails)
             
             if not new_emails:
                 self.logger.info("처리할 새 이메일 없음")
@@ -91,18 +124,30 @@ class WorkflowEngine:
                 self.logger.info("모든 이메일이 이미 처리됨")
                 return []
             
+            # 문의가 아닌 메일(뉴스레터/영수증/부재중 회신/스팸)은 LLM 호출 전에 제외
+            unique_emails = self._triage(unique_emails)
+            if not unique_emails:
+                self.logger.info("처리할 문의 메일 없음")
+                return []
+            
             self.logger.info(f"🎉 {len(unique_emails)}개 새 이메일 발견")
             
+            # 고객 정보는 사이클 단위로 일괄 추출 (LLM 요청 1회에 여러 건)
+            prefetched = self._prefetch_customer_info(unique_emails)
+            
             results = []
             for i, email in enumerate(unique_emails, 1):
                 self.logger.info(f"\n{'─' * 60}")
                 self.logger.info(f"[{i}/{len(unique_emails)}] 이메일 처리 중")
                 
-                result = self._process_single_email(email)
+                result = self._process_single_email(email, prefetched.pop(email.get('id'), None))
+                # 처리가 끝난 본문은 바로 해제 (대용량 메일이 사이클 끝까지 남지 않도록)
+                email.pop('content', None)
                 if result:
                     results.append(result)
                     self.processed_emails.add(email.get('id'))
             
+            self.freshness.save()
             self.logger.info(f"\n✅ 이메일 처리 완료: {len(results)}개")
             return results
             
@@ -110,35 +155,115 @@ class WorkflowEngine:
             self.logger.error(f"이메일 처리 중 오류: {e}", exc_info=True)
             return []
 
-    def _process_single_email(self, email: Dict) -> Optional[Dict]:
-        """개별 이메일 처리"""
+    def _triage(self, emails: List[Dict]) -> List[Dict]:
+        """
+        LLM 호출 전 메일 분류: 문의가 아닌 메일은 처리 완료로 기록하고 제외 (SKIP_NON_INQUIRY=False면 기록만)
+
+        분류 모델이 없으면 그대로 반환 (불확실 = 문의와 같이 처리)
+        """
+        if not self.triage.ready:
+            return emails
+        kept = []
+        with self.tracer.start_trace("cycle.triage", emails=len(emails)) as trace:
+            for email in emails:
+                result = self.triage.classify(email)
+                if result.label == NON_INQUIRY:
+                    action = "건너뜀" if self.triage.skip_non_inquiry else "처리 (관찰 모드)"
+                    self.logger.info(f"🗂️ 문의 아님 → {action}: {email.get('sender', '')} / {email.get('subject', '')} "
+                                     f"(문의 확률 {result.inquiry_prob:.1%})")
+                    if self.triage.skip_non_inquiry:
+                        email.pop('content', None)
+                        self.processed_emails.add(email.get('id'))
+                        continue
+                kept.append(email)
+            trace.set_attribute('skipped', len(emails) - len(kept))
+        return kept
+
+    def _prefetch_customer_info(self, emails: List[Dict]) -> Dict[str, Dict]:
+        """
+        여러 이메일의 고객 정보 일괄 추출: {이메일 id: 고객 정보}
+
+        BATCH_EXTRACT_CONFIG 비활성화, 이메일 수가 MIN_EMAILS 미만, AI 서비스 사용 불가 시 빈 dict
+        (각 이메일은 _process_single_email에서 1건씩 추출)
+        """
+        batch_config = self.config['BATCH_EXTRACT_CONFIG']
+        if not batch_config.get('ENABLED', False) or len(emails) < batch_config.get('MIN_EMAILS', 2):
+            return {}
+        ai_service = self.service_manager.get_service("ai")
+        if not hasattr(ai_service, 'extract_customer_info_batch') or not self.service_manager.is_available("ai"):
+            return {}
+        if hasattr(ai_service, 'reconfigure_batch'):
+            ai_service.reconfigure_batch(batch_config)  # MAX_EMAILS/MAX_INPUT_TOKENS hot reload
+        
+        with self.tracer.start_trace("cycle.extract_batch", emails=len(emails)) as trace:
+            try:
+                return ai_service.extract_customer_info_batch([
+                    {'id': email.get('id'), 'content': email.get('content', ''), 'sender': email.get('sender', '')}
+                    for email in emails
+                ])
+            except Exception as e:
+                trace.set_error(str(e))
+                self.logger.error(f"고객 정보 일괄 추출 실패 → 1건씩 추출: {e}", exc_info=True)
+                return {}
+
+    def _process_single_email(self, email: Dict, customer_info: Optional[Dict] = None,
+                              reply: Optional[Dict] = None) -> Optional[Dict]:
+        """개별 이메일 처리 (이메일 1건 = 트레이스 1개, customer_info/reply = 일괄 추출·배치 작업 결과)"""
         sender = email.get('sender', '')
         subject = email.get('subject', '')
         content = email.get('content', '')
         
-        self.logger.info(f"📧 발신자: {sender}")
-        self.logger.info(f"📋 제목: {subject}")
-        
-        try:
-            # Level 1: AI를 이용한 정보 추출 및 답장 생성/발송
-            level1_result = self._execute_level1_workflow(sender, subject, content, email.get('id'))
-            customer_info = level1_result.get('customer_info')
+        with self.tracer.start_trace("email.process", email_id=email.get('id'), sender=sender) as trace:
+            self.logger.info(f"📧 발신자: {sender} (trace_id: {trace.trace_id})")
+            self.logger.info(f"📋 제목: {subject}")
+            
+            # AI 서비스가 초기화 중이거나 서킷이 열려 있으면 대체 답장("추가 정보 요청")을 보내지 않고 이메일 전체를 지연 처리
+            if reply is None and not self.service_manager.is_available("ai"):
+                trace.set_attribute('deferred', True)
+                self.service_manager.defer("ai", f"이메일 처리 ({email.get('id')})",
+                                           self._process_single_email, dict(email))
+                return {'customer_info': None, 'reply_sent': False, 'deferred': True}
             
-            # Level 2: 정보가 완전할 경우 Salesforce Lead 생성
-            if customer_info and customer_info.get('has_all_info'):
-                self._execute_level2_workflow(customer_info)
-            else:
-                self.logger.info("🔷 Level 2: 정보 부족으로 Lead 생성 건너뜀")
+            try:
+                # Level 1: AI를 이용한 정보 추출 및 답장 생성/발송
+                level1_result = self._execute_level1_workflow(
+                    sender, subject, content, email.get('id'),
+                    on_sent=lambda: self._record_freshness(email, 'reply'),
+                    customer_info=customer_info, reply=reply
+                )
+                customer_info = level1_result.get('customer_info')
+                trace.set_attribute('reply_sent', bool(level1_result.get('reply_sent')))
+                if level1_result.get('reply_sent'):
+                    self._record_freshness(email, 'reply')
+                
+                # Level 2: 정보가 완전할 경우 Salesforce Lead 생성
+                if customer_info and customer_info.get('has_all_info'):
+                    lead_created = self._execute_level2_workflow(
+                        customer_info, on_created=lambda: self._record_freshness(email, 'lead')
+                    )
+                    trace.set_attribute('lead_created', bool(lead_created))
+                    if lead_created:
+                        self._record_freshness(email, 'lead')
+                else:
+                    self.logger.info("🔷 Level 2: 정보 부족으로 Lead 생성 건너뜀")
 
-            self.logger.info("✅ 이메일 처리 완료")
-            return level1_result
+                self.logger.info(f"✅ 이메일 처리 완료 ({trace.duration_ms:.0f}ms)")
+                return level1_result
 
-        except Exception as e:
-            self.logger.error(f"개별 이메일 처리 실패: {e}", exc_info=True)
-            return None
+            except Exception as e:
+                trace.set_error(str(e))
+                self.logger.error(f"개별 이메일 처리 실패: {e}", exc_info=True)
+                return None
+
+    def _record_freshness(self, email: Dict, stage: str) -> None:
+        """수신 시각 대비 완료 시각 기록 (메일박스별)"""
+        mailbox = email.get('mailbox') or self.config['GMAIL_CONFIG']['TARGET_EMAIL']
+        self.freshness.record(mailbox, stage, email.get('received_at'))
 
-    def _execute_level1_workflow(self, sender: str, subject: str, content: str, email_id: str) -> Dict:
-        """Level 1: 자동 답장 (고객 정보 추출 포함)"""
+    def _execute_level1_workflow(self, sender: str, subject: str, content: str, email_id: str,
+                                 on_sent: Optional[Callable] = None, customer_info: Optional[Dict] = None,
+                                 reply: Optional[Dict] = None) -> Dict:
+        """Level 1: 자동 답장 (고객 정보 추출 포함, customer_info/reply가 있으면 해당 단계 생략)"""
         self.logger.info("\n🔷 Level 1: 답장 처리 시작")
         
         # ========================================
@@ -147,19 +272,48 @@ class WorkflowEngine:
         ai_service = self.service_manager.get_service("ai")
         gmail_service = self.service_manager.get_service("gmail")
         
-        # 1. 고객 정보 추출
-        customer_info = ai_service.extract_customer_info(content, sender)
+        if reply is not None:
+            # 배치 작업에서 추출/답변 작성 완료 → 발송만
+            self.logger.info(f"배치 작업 결과 사용 (답변 {reply.get('template', 'LLM')})")
+        elif customer_info is not None:
+            # 고객 정보는 일괄 추출됨 → 답변만 생성
+            with self.tracer.span("level1.generate_reply", prefetched=True):
+                reply = ai_service.generate_reply(customer_info, subject, content)
+        elif self.config.workflow.llm_mode == 'combined' and hasattr(ai_service, 'process_inquiry'):
+            # 1+2. 고객 정보 추출과 답변 생성을 1회 호출로 (실패 시 서비스 내부에서 2회 호출로 대체)
+            with self.tracer.span("level1.process_inquiry") as span:
+                processed = ai_service.process_inquiry(content, sender, subject)
+                span.set_attribute('llm.mode', processed['mode'])
+                span.set_attribute('llm.reply_source', processed.get('reply_source', 'llm'))
+            customer_info, reply = processed['customer_info'], processed['reply']
+        else:
+            # 1. 고객 정보 추출
+            with self.tracer.span("level1.extract_customer_info"):
+                customer_info = ai_service.extract_customer_info(content, sender)
+            
+            # 2. 답변 생성 (라우터는 원문을 보고 템플릿 / LLM 맞춤 답변 선택)
+            with self.tracer.span("level1.generate_reply"):
+                reply = ai_service.generate_reply(customer_info, subject, content)
         
-        # 2. 답변 생성
-        reply = ai_service.generate_reply(customer_info, subject)
+        # 3. 답장 발송 (Gmail 사용 불가 시 재시도 큐로)
+        if not self.service_manager.is_available("gmail"):
+            self.service_manager.defer(
+                "gmail", f"답장 발송 ({customer_info['email']})", gmail_service.send_reply,
+                to_email=customer_info['email'],
+                subject=reply['subject'],
+                content=reply['body'],
+                original_email_id=email_id,
+                on_success=on_sent
+            )
+            return {'customer_info': customer_info, 'reply_sent': False, 'reply_deferred': True}
         
-        # 3. 답장 발송
-        reply_sent = gmail_service.send_reply(
-            to_email=customer_info['email'],
-            subject=reply['subject'],
-            content=reply['body'],
-            original_email_id=email_id
-        )
+        with self.tracer.span("level1.send_reply"):
+            reply_sent = gmail_service.send_reply(
+                to_email=customer_info['email'],
+                subject=reply['subject'],
+                content=reply['body'],
+                original_email_id=email_id
+            )
         
         if reply_sent:
             self.logger.info("✅ Level 1 완료: 답장 발송 성공")
@@ -168,12 +322,21 @@ class WorkflowEngine:
             
         return {'customer_info': customer_info, 'reply_sent': reply_sent}
 
-    def _execute_level2_workflow(self, customer_info: Dict) -> bool:
+    def _execute_level2_workflow(self, customer_info: Dict, on_created: Optional[Callable] = None) -> bool:
         """Level 2: Lead 생성 (정보가 완전한 경우만)"""
         self.logger.info("\n🔷 Level 2: Lead 생성 시작")
         salesforce_service = self.service_manager.get_service("salesforce")
         
-        lead_created = salesforce_service.create_lead(customer_info)
+        # Salesforce 사용 불가(초기화 중 또는 서킷 open) 시 재시도 큐로
+        if not self.service_manager.is_available("salesforce"):
+            self.service_manager.defer(
+                "salesforce", f"Lead 생성 ({customer_info.get('email')})",
+                salesforce_service.create_lead, customer_info, on_success=on_created
+            )
+            return False
+        
+        with self.tracer.span("level2.create_lead"):
+            lead_created = salesforce_service.create_lead(customer_info)
         
         if lead_created:
             self.logger.info("✅ Level 2 완료: Lead 생성 성공")
@@ -182,7 +345,125 @@ class WorkflowEngine:
             
         return lead_created
 
-    def run_single(self):
+    def apply_config(self, new_config: config.AppConfig) -> None:
+        """
+        재컴파일된 설정 반영 (monitor 실행 중, 상태 유지)
+
+        HOT_RELOAD_KEYS 항목은 다음 사이클부터 적용되고, 그 외 변경은 재시작이 필요하다고 경고
+        """
+        hot, restart = split_changes(self.config.diff(new_config))
+        self.config = new_config
+
+        self.service_manager.update_breaker_config(new_config['CIRCUIT_BREAKER_CONFIG'])
+        self.service_manager.update_retry_policy(new_config.workflow.retry_attempts, new_config.workflow.retry_delay)
+        self.freshness.reconfigure(new_config['FRESHNESS_CONFIG'])
+        self.triage.reconfigure(new_config['TRIAGE_CONFIG'])
+        self.memory_watchdog.reconfigure(new_config['MEMORY_CONFIG'])
+        self.processed_emails.resize(new_config['MEMORY_CONFIG']['MAX_PROCESSED_IDS'])
+        self.llm_cache.reconfigure(new_config['LLM_CACHE_CONFIG'])
+        self.rate_limiter.reconfigure(new_config['RATE_LIMIT_CONFIG'])
+
+        for (section_name, key), (old, new) in sorted(hot.items()):
+            self.logger.info(f"🔄 설정 반영: {section_name}.{key} {old} → {new}")
+        if restart:
+            changed = ', '.join(f"{section}.{key}" for section, key in sorted(restart))
+            self.logger.warning(f"⚠️ 재시작 후 반영되는 설정 변경: {changed}")
+
+    def _wait_for_next_cycle(self, watcher: Optional[ConfigWatcher]) -> None:
+        """다음 사이클까지 대기 (대기 중 설정 변경을 확인하고, 간격이 바뀌면 남은 시간 재계산)"""
+        started = time.monotonic()
+        while True:
+            remaining = self.config.workflow.email_check_interval - (time.monotonic() - started)
+            if remaining <= 0:
+                return
+            if watcher is None:
+                time.sleep(remaining)
+                return
+            time.sleep(min(remaining, watcher.poll_seconds))
+            new_config = watcher.poll()
+            if new_config is not None:
+                self.apply_config(new_config)
+
+    def _run_cycle(self, check_count: int, profiler: Optional[CycleProfiler] = None):
+        """process_new_emails 1회 실행 (프로파일러 지정 시 프로파일링)"""
+        try:
+            if profiler is None:
+                return self.process_new_emails()
+            with profiler.profile_cycle(check_count):
+                return self.process_new_emails()
+        finally:
+            self._report_llm_stats()
+            self._report_pool_stats()
+
+    def _report_llm_stats(self) -> None:
+        """메일 사전 필터 / 사전 분류 / LLM 응답 캐시(누적 통계 저장 포함) / 속도 제한 / 답변 경로 / 본문 토큰 예산 /
+        프롬프트 캐시 / 일괄 추출 통계 로그 (해당 처리가 있었던 경우만)"""
+        gmail_service = self.service_manager.get_service("gmail")
+        if hasattr(gmail_service, 'mail_filter'):
+            filter_stats = gmail_service.mail_filter.stats()
+            if any(filter_stats.values()):
+                self.logger.info(f"⛔ 메일 사전 필터: {format_filter_stats(filter_stats)}")
+
+        triage = self.triage.stats()
+        if triage['classified']:
+            self.logger.info(
+                f"🗂️ 메일 사전 분류: 문의 {triage['inquiry']} / 문의 아님 {triage['non_inquiry']} "
+                f"(건너뜀 {triage['skipped']}) / 불확실 {triage['uncertain']}, 건당 {triage['mean_us']:.0f}μs"
+            )
+
+        stats = self.llm_cache.stats()
+        if stats['lookups']:
+            self.llm_cache.flush_stats()
+            self.logger.info(f"💾 LLM 응답 캐시: {format_stats(stats)}")
+
+        limit_stats = self.rate_limiter.stats()
+        if limit_stats:
+            self.logger.info(f"🚦 LLM 속도 제한: {format_limit_stats(limit_stats)}")
+
+        ai_service = self.service_manager.get_service("ai")
+        if hasattr(ai_service, 'reply_stats'):
+            replies = ai_service.reply_stats()
+            if replies['template'] + replies['llm'] + replies['fallback']:
+                self.logger.info(
+                    f"✉️ 답변 경로: 템플릿 {replies['template']} / LLM {replies['llm']} / "
+                    f"기본 {replies['fallback']} (템플릿 {replies['template_ratio']:.0%}, "
+                    f"LLM 사유 {replies['custom_reasons']})"
+                )
+        if hasattr(ai_service, 'budget_stats'):
+            budget = ai_service.budget_stats()
+            if budget['calls']:
+                self.logger.info(
+                    f"✂️ 본문 토큰 예산: {budget['calls']}회, 추정 {budget['tokens_before']} → "
+                    f"{budget['tokens_after']} 토큰 ({budget['saved_ratio']:.0%} 절감), 잘림 {budget['truncated']}"
+                )
+
+        if hasattr(ai_service, 'prompt_cache_stats'):
+            for name, cached in sorted(ai_service.prompt_cache_stats().items()):
+                if not cached['calls']:
+                    continue
+                self.logger.info(
+                    f"🧊 프롬프트 캐시 [{name}]: 입력 {cached['prompt_tokens']} 토큰 중 캐시 적중 "
+                    f"{cached['cached_tokens']} ({cached['cached_tokens'] / max(1, cached['prompt_tokens']):.0%})"
+                )
+
+        if hasattr(ai_service, 'batch_stats'):
+            batch = ai_service.batch_stats()
+            if batch['batches'] or batch['batch_failures']:
+                self.logger.info(
+                    f"📦 고객 정보 일괄 추출: 요청 {batch['batches']}회 / {batch['batched_emails']}건 "
+                    f"(요청당 {batch['emails_per_batch']:.1f}건), 1건씩 재추출 {batch['item_fallbacks']}, "
+                    f"요청 실패 {batch['batch_failures']}"
+                )
+
+    def _report_pool_stats(self) -> None:
+        """외부 API HTTP 커넥션 재사용 통계 로그 (프로세스 시작 이후 누적)"""
+        # http_pool은 requests를 import하므로 통계를 낼 때 로드 (main import 시간에 포함되지 않도록)
+        from ai_workflow_production.utils.http_pool import format_pool_stats, pool_stats
+        summary = format_pool_stats(pool_stats())
+        if summary:
+            self.logger.info(f"🔌 HTTP 커넥션 재사용: {summary}")
+
+    def run_single(self, profiler: Optional[CycleProfiler] = None):
         """단일 실행 모드"""
         self.logger.info("\n" + "=" * 60)
         self.logger.info("단일 실행 모드")
@@ -192,10 +473,89 @@ class WorkflowEngine:
             self.logger.error("초기화 실패")
             return
         
-        self.process_new_emails()
+        self._run_cycle(1, profiler)
         self.logger.info("\n✅ 단일 실행 완료")
 
-    def run_monitor(self):
+    def process_backfill(self, lookback_days: int = None, max_emails: int = None) -> List[Dict]:
+        """
+        지난 메일 대량 처리: LLM 배치 작업(Batch API)으로 추출/답변 작성 → 결과를 이메일에 연결해 발송/Lead 생성
+
+        배치 작업을 쓸 수 없거나(제공자 미지원/제출 실패) 결과가 빠진 이메일은 실시간 경로로 처리
+        """
+        job_config = self.config['BATCH_JOB_CONFIG']
+        lookback_days = lookback_days or job_config['LOOKBACK_DAYS']
+        max_emails = max_emails or job_config['MAX_EMAILS']
+
+        gmail_service = self.service_manager.get_service("gmail")
+        if not gmail_service:
+            self.logger.error("Gmail 서비스를 사용할 수 없습니다")
+            return []
+        with self.tracer.start_trace("backfill.fetch_emails", lookback_days=lookback_days):
+            emails = gmail_service.get_recent_emails(lookback_days * 24 * 60, max_emails,
+                                                     exclude_ids=self.processed_emails)
+        emails = self._triage([email for email in emails if email.get('id') not in self.processed_emails])
+        # 새 프로세스의 processed_emails는 비어 있으므로 모니터 모드가 이미 답장한 메일은 보낸편지함으로 확인
+        if emails and hasattr(gmail_service, 'answered_ids'):
+            with self.tracer.start_trace("backfill.check_answered", emails=len(emails)):
+                answered = gmail_service.answered_ids(emails)
+            if answered:
+                self.logger.info(f"↩️ 이미 답장한 이메일 {len(answered)}건 제외")
+                for email_id in answered:
+                    self.processed_emails.add(email_id)
+                emails = [email for email in emails if email.get('id') not in answered]
+        if not emails:
+            self.logger.info("대량 처리할 이메일 없음")
+            return []
+        self.logger.info(f"📚 지난 {lookback_days}일 이메일 {len(emails)}건 대량 처리")
+
+        prepared: Dict[str, Dict] = {}
+        ai_service = self.service_manager.get_service("ai")
+        provider = ai_service.provider('openai') if hasattr(ai_service, 'provider') else ai_service
+        if not hasattr(provider, 'create_batch'):
+            self.logger.warning("Batch API를 지원하는 AI 제공자가 없음 → 실시간 경로로 처리")
+        else:
+            from ai_workflow_production.services.batch_jobs import LLMBatchJob
+
+            with self.tracer.start_trace("backfill.batch_job", emails=len(emails)) as trace:
+                try:
+                    prepared = LLMBatchJob(provider, self.config).run(emails)
+                except Exception as e:
+                    trace.set_error(str(e))
+                    self.logger.error(f"LLM 배치 작업 실패 → 실시간 경로로 처리: {e}", exc_info=True)
+
+        results = []
+        for i, email in enumerate(emails, 1):
+            self.logger.info(f"\n{'─' * 60}")
+            self.logger.info(f"[{i}/{len(emails)}] 이메일 처리 중 ({'배치 결과' if email.get('id') in prepared else '실시간'})")
+            entry = prepared.pop(email.get('id'), None) or {}
+            result = self._process_single_email(email, entry.get('customer_info'), entry.get('reply'))
+            email.pop('content', None)
+            if result:
+                results.append(result)
+                self.processed_emails.add(email.get('id'))
+
+        self.freshness.save()
+        self.logger.info(f"\n✅ 대량 처리 완료: {len(results)}개")
+        return results
+
+    def run_backfill(self, lookback_days: int = None, max_emails: int = None):
+        """대량 처리 모드 (지난 메일 1회 처리)"""
+        self.logger.info("\n" + "=" * 60)
+        self.logger.info("대량 처리(backfill) 모드")
+        self.logger.info("=" * 60)
+
+        if not self.initialize():
+            self.logger.error("초기화 실패")
+            return
+
+        try:
+            self.process_backfill(lookback_days, max_emails)
+        finally:
+            self._report_llm_stats()
+            self._report_pool_stats()
+        self.logger.info("\n✅ 대량 처리 모드 완료")
+
+    def run_monitor(self, profiler: Optional[CycleProfiler] = None):
         """모니터링 모드 (지속 실행)"""
         self.logger.info("\n" + "=" * 60)
         self.logger.info("모니터링 모드 시작")
@@ -205,29 +565,55 @@ class WorkflowEngine:
             self.logger.error("초기화 실패로 모니터링을 시작할 수 없습니다.")
             return
         
-        interval = self.config['WORKFLOW_CONFIG']['EMAIL_CHECK_INTERVAL']
+        watcher = None
+        if self.config['RELOAD_CONFIG']['ENABLED']:
+            watcher = ConfigWatcher.from_config(self.config, self.config_overrides)
+            self.logger.info(f"🔄 설정 변경 감시: {', '.join(str(p) for p in watcher.watched_paths())}")
+        
+        health_config = self.config['HEALTH_CONFIG']
+        health_port = health_config.get('HTTP_PORT') or os.getenv(health_config['HTTP_PORT_ENV'])
+        health_server = None
+        if health_port:
+            from ai_workflow_production.utils.health_server import start_health_server
+            health_server = start_health_server(self.service_manager, health_config, health_port)
         
         check_count = 0
         try:
             while True:
                 check_count += 1
                 self.logger.info(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔍 체크 #{check_count}")
-                self.process_new_emails()
-                self.logger.info(f"⏰ 다음 체크: {interval}초 후...\n")
-                time.sleep(interval)
+                self._run_cycle(check_count, profiler)
+                self.memory_watchdog.maybe_sample(check_count, {
+                    'processed_emails': len(self.processed_emails),
+                    'evicted_ids': self.processed_emails.evicted
+                })
+                self.logger.info(f"⏰ 다음 체크: {self.config.workflow.email_check_interval}초 후...\n")
+                self._wait_for_next_cycle(watcher)
         except KeyboardInterrupt:
             self.logger.info("\n\n⏹️  모니터링 중단")
+        finally:
+            if health_server:
+                health_server.shutdown()
 
     def health_check(self):
         """헬스 체크"""
-        self.logger.info("\n" + "=" * 60)
-        self.logger.info("헬스 체크")
-        self.logger.info("=" * 60)
-        
-        health_status = self.service_manager.health_check()
-        
-        for service_name, status in health_status.items():
-            status_symbol = "✅" if status else "❌"
-            self.logger.info(f"{status_symbol} {service_name}: {'정상' if status else '비정상'}")
-        
-        self.logger.info("=" * 60)
\ No newline at end of file
+        report_health(self.service_manager, self.config['HEALTH_CONFIG'], self.logger)
+
+
+def report_health(service_manager: ServiceManager, health_config: Dict, logger: logging.Logger) -> bool:
+    """서비스별 프로브 실행 후 결과 로그 출력 (모두 정상이면 True)"""
+    logger.info("\n" + "=" * 60)
+    logger.info("헬스 체크")
+    logger.info("=" * 60)
+    
+    results = service_manager.probe_all(timeout=health_config['PROBE_TIMEOUT'], force=True)
+    
+    for service_name, result in results.items():
+        status_symbol = "✅" if result['healthy'] else "❌"
+        logger.info(
+            f"{status_symbol} {service_name}: {'정상' if result['healthy'] else '비정상'} "
+            f"({result['latency_ms']:.0f}ms, 서킷: {result['circuit']}) {result['detail']}"
+        )
+    
+    logger.info("=" * 60)
+    return all(result['healthy'] for result in results.values())
@@ -9,16 +9,47 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 # ✅ logger_config 임포트 추가
 from ai_workflow_production.utils.logger_config import setup_logging
-from ai_workflow_production.core.workflow_engine import WorkflowEngine
+from ai_workflow_production.core.workflow_engine import WorkflowEngine, report_health
+from ai_workflow_production.services.service_manager import ServiceManager
+from ai_workflow_production import config
+from ai_workflow_production.utils.freshness import FreshnessTracker, format_report
+from ai_workflow_production.utils.llm_cache import format_stats as format_cache_stats, read_persisted_stats
+from ai_workflow_production.utils.profiler import CycleProfiler, PROFILE_MODES
+
+def show_stats(environment: str, logger):
+    """문의 수신 → 답장/Lead 생성 대기 시간(freshness) + LLM 응답 캐시 누적 통계 리포트"""
+    env_config = config.load_environment_config(environment)
+    tracker = FreshnessTracker.from_config(env_config['FRESHNESS_CONFIG'])
+
+    logger.info("=" * 60)
+    logger.info("응답 대기 시간 (freshness) 통계")
+    logger.info("=" * 60)
+    for line in format_report(tracker.summary()):
+        logger.info(line)
+
+    cache_stats = read_persisted_stats(env_config['LLM_CACHE_CONFIG'].get('DB_FILE'))
+    if cache_stats:
+        logger.info(f"LLM 응답 캐시 (누적): {format_cache_stats(cache_stats)}")
+    logger.info("=" * 60)
+
+
+def show_health(environment: str, logger) -> bool:
+    """엔진 없이 서비스만 등록하여 liveness 프로브 실행"""
+    env_config = config.load_environment_config(environment)
+    service_manager = ServiceManager(env_config['CIRCUIT_BREAKER_CONFIG'])
+    WorkflowEngine.register_default_services(service_manager, env_config)
+    return report_health(service_manager, env_config['HEALTH_CONFIG'], logger)
+
 
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description='AI Workflow Production')
     parser.add_argument(
         '--mode',
-        choices=['single', 'monitor', 'health'],
+        choices=['single', 'monitor', 'backfill', 'health', 'stats'],
         default='monitor',
-        help='실행 모드: single(단일 실행), monitor(모니터링), health(헬스 체크)'
+        help='실행 모드: single(단일 실행), monitor(모니터링), backfill(지난 메일 LLM 배치 작업 대량 처리), '
+             'health(헬스 체크), stats(응답 대기 시간 통계)'
     )
     parser.add_argument(
         '--env',
@@ -33,6 +64,38 @@ def main():
         help='로그 로테이션 타입: time(날짜 기반) 또는 size(크기 기반)'
     )
 
+    parser.add_argument(
+        '--health-port',
+        type=int,
+        default=None,
+        help='monitor 모드에서 HTTP /healthz 제공 포트 (기본값: HEALTH_HTTP_PORT 환경변수)'
+    )
+    parser.add_argument(
+        '--profile',
+        choices=PROFILE_MODES,
+        default=None,
+        help='사이클 프로파일링: cpu(CPU 시간), wall(경과 시간), memory(할당 증가) → logs/profiles/'
+    )
+    parser.add_argument(
+        '--profile-every',
+        type=int,
+        default=None,
+        help='N번째 사이클마다 프로파일링 (기본값: PROFILING_CONFIG EVERY)'
+    )
+
+    parser.add_argument(
+        '--backfill-days',
+        type=int,
+        default=None,
+        help='backfill 모드 조회 기간 (일, 기본값: BATCH_JOB_CONFIG LOOKBACK_DAYS)'
+    )
+    parser.add_argument(
+        '--backfill-max',
+        type=int,
+        default=None,
+        help='backfill 모드 최대 이메일 수 (기본값: BATCH_JOB_CONFIG MAX_EMAILS)'
+    )
+
     args = parser.parse_args()
 
     # ✅ 로깅 설정 (logger_config.py 사용)
@@ -45,16 +108,31 @@ def main():
     logger.info(f"환경: {args.env}")
     logger.info(f"로그 로테이션: {args.log_rotation}")
 
+    # stats 모드는 서비스 인증 없이 저장된 통계만 출력
+    if args.mode == 'stats':
+        show_stats(args.env, logger)
+        return
+
+    # health 모드는 엔진 생성 없이 프로브만 실행
+    if args.mode == 'health':
+        sys.exit(0 if show_health(args.env, logger) else 1)
+
     # 워크플로우 엔진 시작
-    engine = WorkflowEngine(environment=args.env)
+    config_overrides = {'HEALTH_CONFIG': {'HTTP_PORT': args.health_port}} if args.health_port else None
+    engine = WorkflowEngine(environment=args.env, config_overrides=config_overrides)
+
+    profiler = None
+    if args.profile:
+        profiler = CycleProfiler.from_config(args.profile, engine.config['PROFILING_CONFIG'], args.profile_every)
+        logger.info(f"프로파일링: {args.profile} (매 {profiler.every}번째 사이클)")
 
     # 모드에 따라 실행
     if args.mode == 'single':
-        engine.run_single()
+        engine.run_single(profiler)
     elif args.mode == 'monitor':
-        engine.run_monitor()
-    elif args.mode == 'health':
-        engine.health_check()
+        engine.run_monitor(profiler)
+    elif args.mode == 'backfill':
+        engine.run_backfill(args.backfill_days, args.backfill_max)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+# scripts/bench_batch_extract.py - 고객 정보 1건씩 추출 vs 일괄 추출(요청 1회에 여러 건) 처리량/비용 비교
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import CUSTOMER_FIELDS
+from bench_llm_providers import DEFAULT_CORPUS, _same, load_corpus
+from bench_llm_router import build_router
+from openai_standin import start_standin
+
+
+def cycle_emails(corpus: List[Dict], count: int) -> List[Dict]:
+    """코퍼스를 반복해 한 사이클 분량의 이메일 (메시지 id는 모두 다름)"""
+    return [{**corpus[i % len(corpus)], 'id': f"msg-{i:04d}"} for i in range(count)]
+
+
+def run(router, emails: List[Dict], batch: bool) -> Dict:
+    """전체 추출 시간, 필드 정확도, 대체 서버 usage 기준 토큰"""
+    started = time.perf_counter()
+    if batch:
+        results = router.extract_customer_info_batch(
+            [{'id': email['id'], 'content': email['content'], 'sender': email['sender']} for email in emails]
+        )
+    else:
+        results = {email['id']: router.extract_customer_info(email['content'], email['sender']) for email in emails}
+    elapsed = time.perf_counter() - started
+
+    hits = sum(_same(results[email['id']].get(name), email['expected'].get(name))
+               for email in emails for name in CUSTOMER_FIELDS)
+    usage = [task for provider in router.usage_summary().values() for task in provider.values()]
+    return {
+        'elapsed': elapsed,
+        'accuracy': hits / (len(emails) * len(CUSTOMER_FIELDS)),
+        'requests': sum(task['calls'] for task in usage),
+        'prompt_tokens': sum(task['prompt_tokens'] for task in usage),
+        'completion_tokens': sum(task['completion_tokens'] for task in usage),
+        'batch': router.batch_stats()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='1건씩 추출 vs 일괄 추출 (로컬 OpenAI 호환 대체 서버)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--emails', type=int, default=40, help='사이클당 이메일 수')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[5, 10], help='비교할 MAX_EMAILS')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='대체 서버 요청당 고정 지연')
+    parser.add_argument('--token-ms', type=float, default=8.0, help='대체 서버 응답 토큰당 지연 (생성 속도)')
+    parser.add_argument('--drop-rate', type=float, default=0.1, help='누락 주입 시나리오의 일괄 결과 누락 비율')
+    parser.add_argument('--input-price', type=float, default=0.15, help='입력 100만 토큰당 USD (gpt-4o-mini)')
+    parser.add_argument('--output-price', type=float, default=0.60, help='출력 100만 토큰당 USD (gpt-4o-mini)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('OPENAI_API_KEY', 'standin')
+    emails = cycle_emails(load_corpus(args.corpus), args.emails)
+    env_config = config.load_environment_config('development')
+    batch_config = env_config['BATCH_EXTRACT_CONFIG']
+
+    scenarios = [('1건씩', None, 0.0)]
+    scenarios += [(f"일괄 {size}건", size, 0.0) for size in args.batch_sizes]
+    scenarios.append((f"일괄 {max(args.batch_sizes)}건 누락 {args.drop_rate:.0%}", max(args.batch_sizes), args.drop_rate))
+
+    print(f"이메일 {len(emails)}건, 대체 서버 {args.latency_ms:.0f}ms + 응답 토큰당 {args.token_ms:g}ms "
+          f"(규칙 사전 추출 끔 - 모든 메일이 LLM으로)")
+    print(f"{'방식':<20} {'요청':>4} {'전체':>8} {'건당':>8} {'건/초':>6} {'입력 토큰/건':>11} {'출력 토큰/건':>11} "
+          f"{'USD/1천건':>9} {'정확도':>6} {'재추출':>6}")
+    for label, size, drop_rate in scenarios:
+        standin = start_standin(latency_ms=args.latency_ms, token_ms=args.token_ms, batch_drop_rate=drop_rate)
+        router = build_router(env_config, {'openai': standin}, hedge=False)
+        router.batch_config = {**batch_config, 'MAX_EMAILS': size or 1}
+        result = run(router, emails, batch=size is not None)
+        standin.shutdown()
+
+        count = len(emails)
+        cost = (result['prompt_tokens'] * args.input_price + result['completion_tokens'] * args.output_price) / 1e6
+        print(f"{label:<20} {result['requests']:>4} {result['elapsed']:>6.1f}s "
+              f"{result['elapsed'] / count * 1000:>6.0f}ms {count / result['elapsed']:>6.2f} "
+              f"{result['prompt_tokens'] / count:>11.0f} {result['completion_tokens'] / count:>11.0f} "
+              f"{cost / count * 1000:>9.4f} {result['accuracy']:>6.0%} {result['batch']['item_fallbacks']:>6}")
+    print("(일괄 추출은 지시문을 요청당 1번만 보내고 요청 고정 지연을 나눠 가짐, 누락된 이메일은 1건씩 재추출)")
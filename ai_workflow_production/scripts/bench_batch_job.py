@@ -0,0 +1,132 @@
+# scripts/bench_batch_job.py - 지난 메일 대량 처리: 실시간 경로 vs LLM 배치 작업(Batch API) 처리량/비용 비교
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production.core.workflow_engine import WorkflowEngine
+from ai_workflow_production.services.llm_router import LLMRouterService
+from ai_workflow_production.utils.tracing import configure_tracing
+from bench_llm_providers import DEFAULT_CORPUS, load_corpus
+from openai_standin import start_standin
+
+
+class CorpusGmailService:
+    """코퍼스를 반복한 지난 메일을 돌려주고 발송 수만 세는 Gmail 대역"""
+
+    def __init__(self, corpus: List[Dict], count: int):
+        now = time.time()
+        self.emails = [{**corpus[i % len(corpus)], 'id': f"hist-{i:05d}", 'received_at': now - 86400,
+                        'mailbox': 'bench@example.com'} for i in range(count)]
+        self.sent = 0
+
+    def get_recent_emails(self, minutes_ago: int = 10, max_results: int = 10, exclude_ids=None):
+        return [dict(email) for email in self.emails[:max_results]]
+
+    def send_reply(self, to_email, subject, content, original_email_id=None):
+        self.sent += 1
+        return True
+
+
+class CountingSalesforceService:
+    def __init__(self):
+        self.leads = 0
+
+    def create_lead(self, customer_info):
+        self.leads += 1
+        return True
+
+
+class BenchEngine(WorkflowEngine):
+    """OpenAI 대체 서버를 쓰는 라우터 + 가짜 Gmail/Salesforce"""
+
+    def __init__(self, gmail: CorpusGmailService, base_url: str, overrides: Dict):
+        self._bench_gmail = gmail
+        self._bench_base_url = base_url
+        self.bench_salesforce = CountingSalesforceService()
+        super().__init__(environment='development', config_overrides=overrides)
+
+    def _setup_services(self):
+        from ai_workflow_production.services.openai_service_v2 import OpenAIServiceV2
+
+        os.environ['BENCH_BATCH_BASE_URL'] = self._bench_base_url
+        settings = self.config.to_dict()
+        settings['OPENAI_CONFIG']['BASE_URL_ENV'] = 'BENCH_BATCH_BASE_URL'
+        router = LLMRouterService(settings, {'openai': lambda: OpenAIServiceV2(settings)})
+        self.service_manager.register_service("gmail", self._bench_gmail)
+        self.service_manager.register_service("ai", router)
+        self.service_manager.register_service("salesforce", self.bench_salesforce)
+
+
+def run(mode: str, corpus: List[Dict], args, job_dir: str) -> Dict:
+    standin = start_standin(latency_ms=args.latency_ms, token_ms=args.token_ms,
+                            batch_turnaround_ms=args.turnaround_ms)
+    overrides = {
+        'LLM_CACHE_CONFIG': {'ENABLED': False},
+        'RATE_LIMIT_CONFIG': {'ENABLED': False},   # 대체 서버는 한도가 없음
+        'BATCH_EXTRACT_CONFIG': {'ENABLED': mode == 'realtime_batched'},
+        'BATCH_JOB_CONFIG': {'POLL_INTERVAL': args.poll_interval, 'JOB_DIR': job_dir}
+    }
+    gmail = CorpusGmailService(corpus, args.emails)
+    engine = BenchEngine(gmail, standin.base_url, overrides)
+    engine.tracer = configure_tracing({'ENABLED': False})
+    engine.freshness.state_file = None
+
+    started = time.perf_counter()
+    if mode == 'backfill':
+        results = engine.process_backfill(lookback_days=30, max_emails=args.emails)
+    else:
+        results = engine.process_new_emails(lookback_minutes=30 * 24 * 60, max_emails=args.emails)
+    elapsed = time.perf_counter() - started
+    standin.shutdown()
+
+    state = standin.state
+    return {
+        'elapsed': elapsed, 'processed': len(results), 'sent': gmail.sent,
+        'leads': engine.bench_salesforce.leads, 'http_requests': state.requests,
+        'llm_requests': sum(batch['request_counts']['total'] for batch in state.batches.values()),
+        'prompt_tokens': state.prompt_tokens, 'completion_tokens': state.completion_tokens
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='지난 메일 대량 처리: 실시간 vs LLM 배치 작업 (로컬 대체 서버)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--emails', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='실시간 요청당 고정 지연')
+    parser.add_argument('--token-ms', type=float, default=8.0, help='실시간 응답 토큰당 지연')
+    parser.add_argument('--turnaround-ms', type=float, default=3000.0, help='배치 작업 처리 시작 대기')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='배치 상태 확인 간격 (초)')
+    parser.add_argument('--input-price', type=float, default=0.15, help='입력 100만 토큰당 USD (gpt-4o-mini)')
+    parser.add_argument('--output-price', type=float, default=0.60, help='출력 100만 토큰당 USD (gpt-4o-mini)')
+    parser.add_argument('--batch-discount', type=float, default=0.5, help='Batch API 할인율')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('OPENAI_API_KEY', 'standin')
+    corpus = load_corpus(args.corpus)
+
+    print(f"지난 메일 {args.emails}건, 실시간 {args.latency_ms:.0f}ms + 응답 토큰당 {args.token_ms:g}ms, "
+          f"배치 처리 대기 {args.turnaround_ms / 1000:g}초 (규칙 사전 추출/템플릿 답변 켬)")
+    print(f"{'방식':<18} {'전체':>8} {'건/초':>7} {'POST':>5} {'배치 요청':>8} {'입력 토큰':>9} {'출력 토큰':>9} "
+          f"{'USD/1천건':>9} {'발송':>5} {'Lead':>5}")
+    labels = {'realtime': '실시간 1건씩', 'realtime_batched': '실시간 + 일괄 추출', 'backfill': '배치 작업'}
+    with tempfile.TemporaryDirectory() as job_dir:
+        for mode, label in labels.items():
+            result = run(mode, corpus, args, job_dir)
+            discount = args.batch_discount if mode == 'backfill' else 0.0
+            cost = (result['prompt_tokens'] * args.input_price
+                    + result['completion_tokens'] * args.output_price) / 1e6 * (1 - discount)
+            print(f"{label:<18} {result['elapsed']:>6.1f}s {result['processed'] / result['elapsed']:>7.1f} "
+                  f"{result['http_requests']:>5} {result['llm_requests']:>8} {result['prompt_tokens']:>9} "
+                  f"{result['completion_tokens']:>9} {cost / max(1, result['processed']) * 1000:>9.4f} "
+                  f"{result['sent']:>5} {result['leads']:>5}")
+    print("(배치 작업 시간은 대부분 처리 대기 - 실제 Batch API는 최대 24시간, 비용은 할인 반영)")
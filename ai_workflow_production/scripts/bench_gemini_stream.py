@@ -0,0 +1,96 @@
+# scripts/bench_gemini_stream.py - Gemini generateContent(전체 응답 대기) vs streamGenerateContent(SSE) 지연 비교
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.utils.freshness import percentile
+from ai_workflow_production.utils.tracing import configure_tracing
+from bench_llm_providers import DEFAULT_CORPUS, load_corpus
+from gemini_standin import start_gemini_standin
+
+
+class TtftCollector:
+    """스팬 export에서 스트리밍 첫 조각 지연(llm.ttft_ms) 수집"""
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def export(self, payload: Dict) -> None:
+        for resource in payload['resourceSpans']:
+            for scope in resource['scopeSpans']:
+                for span in scope['spans']:
+                    for attribute in span.get('attributes', []):
+                        if attribute['key'] == 'llm.ttft_ms':
+                            self.samples.append(float(next(iter(attribute['value'].values()))))
+
+
+def run(service, corpus: List[Dict], repeat: int) -> Dict[str, Dict]:
+    """작업별 호출 지연(ms)과 실패 수 (추출 → 원문 포함 맞춤 답변)"""
+    results = {task: {'latencies': [], 'failures': 0} for task in ('extract', 'reply')}
+
+    def timed(task, call):
+        started = time.perf_counter()
+        try:
+            value = call()
+        except Exception:
+            value = None
+            results[task]['failures'] += 1
+        results[task]['latencies'].append((time.perf_counter() - started) * 1000)
+        return value
+
+    for _ in range(repeat):
+        for item in corpus:
+            info = timed('extract', lambda: service.extract_customer_info_or_raise(item['content'], item['sender']))
+            if info is not None:
+                timed('reply', lambda: service.generate_reply_or_raise(info, item['subject'], item['content']))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Gemini 스트리밍 vs 전체 응답 대기 (로컬 대체 서버)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--ttft-ms', type=float, default=300.0, help='대체 서버 첫 조각 지연')
+    parser.add_argument('--chunk-ms', type=float, default=15.0, help='대체 서버 조각(8글자) 사이 지연')
+    parser.add_argument('--stall-rate', type=float, default=0.1, help='중간에 멈추는 응답 비율')
+    parser.add_argument('--stall-ms', type=float, default=8000.0, help='멈춤 시간')
+    parser.add_argument('--stall-timeout', type=float, default=2.0, help='스트림 정지 판단 (초)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('GEMINI_API_KEY', 'standin')
+    corpus = load_corpus(args.corpus)
+    env_config = config.load_environment_config('development')
+    tracer = configure_tracing({'ENABLED': True})
+
+    from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+
+    print(f"대체 서버: 첫 조각 {args.ttft_ms:.0f}ms, 조각당 {args.chunk_ms:.0f}ms, "
+          f"정지 {args.stall_rate:.0%} × {args.stall_ms:.0f}ms, 정지 판단 {args.stall_timeout:g}초")
+    print(f"{'방식':<10} {'작업':<8} {'p50':>8} {'p95':>8} {'최대':>8} {'첫 조각 p50':>11} {'실패':>5}")
+    for stream in (False, True):
+        server = start_gemini_standin(ttft_ms=args.ttft_ms, chunk_ms=args.chunk_ms,
+                                      stall_rate=args.stall_rate, stall_ms=args.stall_ms)
+        service = GeminiServiceV2(env_config)
+        service.base_url = server.base_url
+        service.stream = stream
+        service.stall_timeout = args.stall_timeout
+        collector = TtftCollector()
+        tracer.exporters[:] = [collector]
+
+        for task, result in run(service, corpus, args.repeat).items():
+            latencies = result['latencies']
+            ttft = percentile(collector.samples, 50) if stream else percentile(latencies, 50)
+            print(f"{'스트리밍' if stream else '전체 대기':<10} {task:<8} {percentile(latencies, 50):>6.0f}ms "
+                  f"{percentile(latencies, 95):>6.0f}ms {max(latencies):>6.0f}ms {ttft:>9.0f}ms {result['failures']:>5}")
+        server.shutdown()
+    print("(스트리밍 실패 = 정지 감지로 즉시 실패 → 라우터가 다음 제공자로 failover, 전체 대기는 정지가 끝날 때까지 대기)")
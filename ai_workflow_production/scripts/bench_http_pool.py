@@ -0,0 +1,168 @@
+# scripts/bench_http_pool.py - 요청마다 새 연결(requests.post) vs 공용 keep-alive 세션 지연 비교 (로컬 TLS 서버)
+
+import argparse
+import gzip
+import json
+import logging
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.utils.freshness import percentile
+from ai_workflow_production.utils.http_pool import create_session
+
+# generateContent 응답과 비슷한 크기의 본문 (압축 효과 확인용)
+_RESPONSE = {
+    'candidates': [{
+        'content': {'parts': [{'text': "안녕하세요. 문의 주셔서 감사합니다. 담당 영업팀이 신속히 연락드리겠습니다. " * 20}]},
+        'finishReason': 'STOP'
+    }],
+    'usageMetadata': {'promptTokenCount': 420, 'candidatesTokenCount': 380, 'totalTokenCount': 800}
+}
+
+
+def make_certificate(directory: Path) -> Path:
+    """127.0.0.1용 자체 서명 인증서 (openssl CLI)"""
+    cert, key = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+         '-addext', 'subjectAltName=IP:127.0.0.1', '-keyout', str(key), '-out', str(cert)],
+        check=True, capture_output=True
+    )
+    return cert
+
+
+def start_tls_server(cert: Path, rtt_ms: float) -> ThreadingHTTPServer:
+    """
+    HTTPS JSON 서버 (연결/요청 수 집계)
+
+    rtt_ms: 네트워크 왕복 지연 모사 - 새 연결마다 2 RTT(TCP + TLS 1.3 핸드셰이크), 요청마다 1 RTT
+    """
+    state = {'connections': 0, 'requests': 0, 'bytes': 0, 'lock': threading.Lock()}
+    plain = json.dumps(_RESPONSE, ensure_ascii=False).encode('utf-8')
+    compressed = gzip.compress(plain)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            self.request.do_handshake()
+            time.sleep(2 * rtt_ms / 1000)
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with state['lock']:
+                state['connections'] += 1
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(rtt_ms / 1000)
+            use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+            data = compressed if use_gzip else plain
+            with state['lock']:
+                state['requests'] += 1
+                state['bytes'] += len(data)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, cert.parent / 'key.pem')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    # 핸드셰이크는 요청 처리 스레드에서 (accept 스레드가 직렬화하지 않도록)
+    server.socket = context.wrap_socket(server.socket, server_side=True, do_handshake_on_connect=False)
+    server.daemon_threads = True
+    server.state = state
+    server.url = f"https://127.0.0.1:{server.server_port}/v1/models/bench:generateContent"
+    threading.Thread(target=server.serve_forever, name="tls-bench", daemon=True).start()
+    return server
+
+
+def run(post: Callable[[], requests.Response], count: int, workers: int) -> List[float]:
+    """count번 호출 (workers개 스레드), 요청별 지연(ms)"""
+    def one(_):
+        started = time.perf_counter()
+        response = post()
+        response.json()
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(one, range(count)))
+
+
+def scenario(label: str, cert: Path, rtt_ms: float, count: int, workers: int, pooled: bool, pool_config: Dict):
+    server = start_tls_server(cert, rtt_ms)
+    payload = {'contents': [{'parts': [{'text': '벤치마크 요청'}]}]}
+    session = None
+    if pooled:
+        session = create_session(f"bench-{label}", pool_config)
+        # REQUESTS_CA_BUNDLE 환경변수가 session.verify보다 우선하므로 요청마다 지정
+        post = lambda: session.post(server.url, json=payload, verify=str(cert))  # noqa: E731
+    else:
+        post = lambda: requests.post(server.url, json=payload, verify=str(cert), timeout=60)  # noqa: E731
+
+    run(post, min(workers, count), workers)  # 워밍업 (풀 채우기)
+    with server.state['lock']:
+        server.state.update(connections=0, requests=0, bytes=0)
+    latencies = run(post, count, workers)
+    server.shutdown()
+    state = server.state
+    reuse = None
+    if session is not None:
+        counts = list(session.pool_stats().values())
+        made, opened = sum(c['requests'] for c in counts), sum(c['connections'] for c in counts)
+        reuse = 1 - opened / made if made else 0.0
+    return {
+        'reuse': reuse,
+        'p50': percentile(latencies, 50), 'p95': percentile(latencies, 95),
+        'mean': sum(latencies) / len(latencies),
+        'connections': state['connections'], 'requests': state['requests'],
+        'kb_per_response': state['bytes'] / max(1, state['requests']) / 1024
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='공용 keep-alive 세션 vs 요청마다 새 연결 (로컬 TLS 서버)')
+    parser.add_argument('--count', type=int, default=200, help='시나리오별 요청 수')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8], help='동시 요청 스레드 수')
+    parser.add_argument('--rtt-ms', type=float, nargs='+', default=[0.0, 20.0],
+                        help='모사할 네트워크 왕복 지연 (새 연결 2 RTT, 요청 1 RTT)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    pool_config = config.load_environment_config('development')['HTTP_POOL_CONFIG']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert = make_certificate(Path(tmp))
+        print(f"{'RTT':>6} {'스레드':>4} {'방식':<14} {'p50':>8} {'p95':>8} {'평균':>8} {'새 연결':>8} "
+              f"{'응답 KB':>7} {'재사용률':>6}")
+        for rtt in args.rtt_ms:
+            for workers in args.workers:
+                for pooled in (False, True):
+                    label = f"{rtt:g}ms-{workers}"
+                    result = scenario(label, cert, rtt, args.count, workers, pooled, pool_config)
+                    method = '공용 세션' if pooled else 'requests.post'
+                    print(f"{rtt:>4.0f}ms {workers:>4} {method:<14} {result['p50']:>6.1f}ms {result['p95']:>6.1f}ms "
+                          f"{result['mean']:>6.1f}ms {result['connections']:>4}/{result['requests']:<3} "
+                          f"{result['kb_per_response']:>7.1f} "
+                          f"{'-' if result['reuse'] is None else format(result['reuse'], '.0%'):>6}")
+    print("(재사용률은 워밍업 포함, 응답은 gzip - requests 기본 Accept-Encoding)")
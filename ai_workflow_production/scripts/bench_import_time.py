@@ -0,0 +1,62 @@
+# scripts/bench_import_time.py - CLI cold start(import 시간) 벤치마크 및 회귀 방지
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+MAIN_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# (import 대상, 허용 시간 ms) - 짧은 실행(cron --mode single, --mode health)의 시작 비용
+TARGETS = [
+    ('ai_workflow_production.config', 30),
+    ('ai_workflow_production.services', 30),
+    ('ai_workflow_production.main', 80),
+]
+
+# 패키지 import만으로 로드되면 안 되는 무거운 모듈 (서비스 생성 시점에 로드)
+HEAVY_MODULES = ['googleapiclient', 'google.auth', 'google_auth_oauthlib', 'jwt', 'requests', 'dotenv']
+
+_MEASURE = """
+import json, sys, time
+started = time.perf_counter()
+import {target}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{'ms': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(target: str, runs: int) -> dict:
+    """새 인터프리터에서 runs번 import하여 중앙값 측정"""
+    timings = []
+    heavy = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _MEASURE.format(target=target, heavy=HEAVY_MODULES)],
+            cwd=MAIN_PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        timings.append(result['ms'])
+        heavy.update(result['heavy'])
+    return {'median_ms': statistics.median(timings), 'max_ms': max(timings), 'heavy': sorted(heavy)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='import 시간 벤치마크')
+    parser.add_argument('--runs', type=int, default=7, help='대상별 측정 횟수')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='허용 시간 배율 (느린 CI용)')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'target':<36} {'median':>9} {'max':>9} {'budget':>9}  heavy modules")
+    for target, budget_ms in TARGETS:
+        result = measure(target, args.runs)
+        budget = budget_ms * args.budget_scale
+        over = result['median_ms'] > budget or result['heavy']
+        failed = failed or bool(over)
+        print(f"{'❌' if over else '✅'} {target:<34} {result['median_ms']:>7.1f}ms {result['max_ms']:>7.1f}ms "
+              f"{budget:>7.0f}ms  {', '.join(result['heavy']) or '-'}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,178 @@
+# scripts/bench_llm_providers.py - AI 서비스(OpenAI/Gemini) 추출 정확도·지연·토큰 벤치마크 (2회 호출 vs 1회 호출)
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import CUSTOMER_FIELDS
+from ai_workflow_production.utils.freshness import percentile
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / 'data' / 'inquiry_corpus.jsonl'
+
+
+def load_corpus(path: Path) -> List[Dict]:
+    """라벨링된 문의 메일: {id, sender, subject, content, expected: {name, company, ...}}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _same(actual, expected) -> bool:
+    """공백/대소문자 차이는 무시하고 비교 (None끼리는 일치)"""
+    def _norm(value):
+        return None if value in (None, '') else ''.join(str(value).split()).lower()
+    return _norm(actual) == _norm(expected)
+
+
+def build_service(provider: str, env_config):
+    if provider == 'openai':
+        from ai_workflow_production.services.openai_service_v2 import OpenAIServiceV2
+        return OpenAIServiceV2(env_config)
+    from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+    return GeminiServiceV2(env_config)
+
+
+def _process(service, item: Dict, mode: str) -> Dict:
+    """mode별 1건 처리: (고객 정보, 답변, 실제 사용 경로)"""
+    if mode == 'combined' and hasattr(service, 'process_inquiry_or_raise'):
+        try:
+            result = service.process_inquiry_or_raise(item['content'], item['sender'], item['subject'])
+            return {**result, 'mode': 'combined'}
+        except Exception:
+            pass  # 엔진과 동일하게 2회 호출로 대체
+    info = service.extract_customer_info(item['content'], item['sender'])
+    return {'customer_info': info, 'reply': service.generate_reply(info, item['subject']), 'mode': 'two_call'}
+
+
+def _usage_totals(service) -> Dict[str, int]:
+    usage = service.usage_summary() if hasattr(service, 'usage_summary') else {}
+    return {
+        'calls': sum(task['calls'] for task in usage.values()),
+        'tokens': sum(task['total_tokens'] for task in usage.values())
+    }
+
+
+def run_provider(service, corpus: List[Dict], repeat: int, mode: str = 'two_call') -> Dict:
+    email_ms = []
+    field_hits = {field: 0 for field in CUSTOMER_FIELDS}
+    complete_hits = 0
+    reply_consistent = 0
+    fallbacks = 0
+    outputs = []
+    before = _usage_totals(service)
+
+    for _ in range(repeat):
+        for item in corpus:
+            started = time.perf_counter()
+            processed = _process(service, item, mode)
+            email_ms.append((time.perf_counter() - started) * 1000)
+
+            info = processed['customer_info']
+            outputs.append(info)
+            fallbacks += processed['mode'] != mode
+            expected = item['expected']
+            for field in CUSTOMER_FIELDS:
+                field_hits[field] += _same(info.get(field), expected.get(field))
+            expected_complete = all(expected.get(field) for field in CUSTOMER_FIELDS)
+            complete_hits += info['has_all_info'] == expected_complete
+            # 답변 제목(담당자 배정/추가 정보 요청)이 추출 결과와 일치하는지
+            reply_consistent += processed['reply']['subject'].endswith(
+                '담당자 배정 완료' if info['has_all_info'] else '추가 정보 요청')
+
+    runs = len(outputs)
+    after = _usage_totals(service)
+    calls = after['calls'] - before['calls']
+    tokens = after['tokens'] - before['tokens']
+    return {
+        'mode': mode,
+        'runs': runs,
+        'email_p50': percentile(email_ms, 50),
+        'email_p95': percentile(email_ms, 95),
+        'field_accuracy': {field: hits / runs for field, hits in field_hits.items()},
+        'complete_accuracy': complete_hits / runs,
+        'reply_consistency': reply_consistent / runs,
+        'fallbacks': fallbacks,
+        'calls_per_email': calls / runs if calls else None,
+        'tokens': tokens or None,
+        'outputs': outputs
+    }
+
+
+def parity(a: Dict, b: Dict) -> float:
+    """두 실행의 필드별 추출 결과 일치율"""
+    pairs = list(zip(a['outputs'], b['outputs']))
+    same = sum(_same(x.get(field), y.get(field)) for x, y in pairs for field in CUSTOMER_FIELDS)
+    return same / (len(pairs) * len(CUSTOMER_FIELDS)) if pairs else 0.0
+
+
+def print_report(provider: str, result: Dict) -> None:
+    tokens = f"{result['tokens']} ({result['tokens'] / result['runs']:.0f}/건)" if result['tokens'] else '-'
+    calls = f"{result['calls_per_email']:.2f}" if result['calls_per_email'] else '-'
+    fields = ' '.join(f"{field}={acc:.0%}" for field, acc in result['field_accuracy'].items())
+    print(f"\n[{provider} / {result['mode']}] {result['runs']}건 (2회 호출 대체 {result['fallbacks']}건)")
+    print(f"  이메일당 지연 p50 {result['email_p50']:.1f}ms  p95 {result['email_p95']:.1f}ms  (LLM 호출 {calls}회/건)")
+    print(f"  필드 정확도 {fields}")
+    print(f"  Lead 판정(has_all_info) 정확도 {result['complete_accuracy']:.0%}, "
+          f"답변 유형 일치 {result['reply_consistency']:.0%}")
+    print(f"  토큰 {tokens}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='AI 서비스 벤치마크 (라벨링된 문의 메일 코퍼스)')
+    parser.add_argument('--providers', nargs='+', choices=['openai', 'gemini'], default=['openai'])
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--env', choices=['development', 'production'], default='development')
+    parser.add_argument('--repeat', type=int, default=1, help='코퍼스 반복 횟수')
+    parser.add_argument('--standin', action='store_true',
+                        help='로컬 OpenAI 호환 대체 서버를 띄워 openai를 그쪽으로 연결')
+    parser.add_argument('--standin-latency-ms', type=float, default=50.0)
+    parser.add_argument('--cache', action='store_true',
+                        help='LLM 응답 캐시 사용 (메모리 단계만, --repeat 2 이상이면 반복분이 적중)')
+    parser.add_argument('--mode', choices=['two_call', 'combined', 'both'], default='both',
+                        help='two_call(추출 → 답변), combined(1회 호출), both(둘 다 + 품질 일치율)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    corpus = load_corpus(args.corpus)
+    env_config = config.load_environment_config(args.env)
+
+    cache = None
+    if args.cache:
+        from ai_workflow_production.utils.llm_cache import configure_llm_cache
+        cache = configure_llm_cache({**env_config['LLM_CACHE_CONFIG'], 'ENABLED': True, 'DB_FILE': None})
+
+    standin = None
+    if args.standin:
+        from openai_standin import start_standin
+        standin = start_standin(latency_ms=args.standin_latency_ms, jitter_ms=args.standin_latency_ms / 2)
+        os.environ[env_config['OPENAI_CONFIG']['BASE_URL_ENV']] = standin.base_url
+        print(f"로컬 대체 서버: {standin.base_url}")
+
+    for provider in args.providers:
+        try:
+            service = build_service(provider, env_config)
+        except ValueError as e:
+            print(f"\n[{provider}] 건너뜀: {e}")
+            continue
+        modes = ['two_call', 'combined'] if args.mode == 'both' else [args.mode]
+        results = [run_provider(service, corpus, args.repeat, mode) for mode in modes]
+        for result in results:
+            print_report(provider, result)
+        if len(results) == 2:
+            print(f"  two_call ↔ combined 필드 일치율 {parity(*results):.0%}")
+
+    if cache:
+        from ai_workflow_production.utils.llm_cache import format_stats
+        print(f"\nLLM 응답 캐시: {format_stats(cache.stats())}")
+
+    if standin:
+        print(f"\n대체 서버 연결 {standin.state.connections}개 / 요청 {standin.state.requests}건 (keep-alive 재사용)")
+        standin.shutdown()
@@ -0,0 +1,88 @@
+# scripts/bench_llm_router.py - AI 라우터 hedge/failover 벤치마크 (로컬 대체 서버 2대)
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_router import LLMRouterService
+from ai_workflow_production.utils.freshness import percentile
+from bench_llm_providers import DEFAULT_CORPUS, load_corpus
+from openai_standin import start_standin
+
+
+def build_router(env_config, standins, hedge: bool) -> LLMRouterService:
+    """대체 서버마다 OpenAI 제공자 1개씩 (primary → secondary 순서)"""
+    from ai_workflow_production.services.openai_service_v2 import OpenAIServiceV2
+
+    settings = env_config.to_dict()
+    names = list(standins)
+    settings['LLM_ROUTER_CONFIG']['ROUTES'] = {'extract': names, 'reply': names}
+    settings['LLM_ROUTER_CONFIG']['HEDGE']['ENABLED'] = hedge
+    # hedge/failover 측정은 모든 메일이 제공자까지 가도록 규칙 기반 사전 추출 끔
+    settings['PRE_EXTRACT_CONFIG']['ENABLED'] = False
+
+    def factory(name, server):
+        def _create():
+            url_env = f"BENCH_{name.upper()}_BASE_URL"
+            os.environ[url_env] = server.base_url
+            provider_settings = dict(settings)
+            provider_settings['OPENAI_CONFIG'] = {**settings['OPENAI_CONFIG'], 'BASE_URL_ENV': url_env}
+            return OpenAIServiceV2(provider_settings)
+        return _create
+
+    return LLMRouterService(settings, {name: factory(name, server) for name, server in standins.items()})
+
+
+def run(router: LLMRouterService, corpus, emails: int) -> dict:
+    latencies = []
+    for i in range(emails):
+        item = corpus[i % len(corpus)]
+        started = time.perf_counter()
+        router.extract_customer_info(item['content'], item['sender'])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'mean': sum(latencies) / len(latencies)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='AI 라우터 hedge/failover 벤치마크')
+    parser.add_argument('--emails', type=int, default=300)
+    parser.add_argument('--latency-ms', type=float, default=80.0, help='대체 서버 기본 지연')
+    parser.add_argument('--tail-rate', type=float, default=0.03, help='꼬리 지연 요청 비율 (p95 hedge는 5%% 미만 꼬리에 효과)')
+    parser.add_argument('--tail-ms', type=float, default=1500.0, help='꼬리 지연 추가 시간')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='primary 503 비율 (failover 확인용)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    corpus = load_corpus(DEFAULT_CORPUS)
+    env_config = config.load_environment_config('development')
+
+    print(f"이메일 {args.emails}건, 지연 {args.latency_ms:.0f}ms, 꼬리 {args.tail_rate:.0%} × +{args.tail_ms:.0f}ms")
+    print(f"{'시나리오':<14} {'p50':>9} {'p95':>9} {'p99':>9} {'평균':>9} {'요청/건':>8}")
+    for label, hedge in (('hedge 끔', False), ('hedge 켬', True)):
+        standins = {
+            name: start_standin(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2,
+                                tail_rate=args.tail_rate, tail_ms=args.tail_ms,
+                                fail_rate=args.fail_rate if name == 'primary' else 0.0)
+            for name in ('primary', 'secondary')
+        }
+        router = build_router(env_config, standins, hedge)
+        result = run(router, corpus, args.emails)
+        requests_per_email = sum(s.state.requests for s in standins.values()) / args.emails
+        print(f"{label:<14} {result['p50']:>7.0f}ms {result['p95']:>7.0f}ms {result['p99']:>7.0f}ms "
+              f"{result['mean']:>7.0f}ms {requests_per_email:>8.2f}")
+        for name, stats in router.routing_stats().items():
+            print(f"    {name:<10} {stats}")
+        for server in standins.values():
+            server.shutdown()
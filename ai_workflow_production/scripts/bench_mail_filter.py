@@ -0,0 +1,156 @@
+# scripts/bench_mail_filter.py - 메일 사전 필터: 본문 조회/처리 메일 수 (헤더 필터 전후), 자동 응답기와의 답장 루프
+
+import argparse
+import base64
+import email
+import logging
+import sys
+import time
+from pathlib import Path
+from email import policy
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.gmail_service_v2 import GmailServiceV2
+from ai_workflow_production.services.llm_common import reply_subject
+from train_triage import load_samples
+
+MAILBOX = 'sales@ourco.kr'
+
+
+class _Call:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class FakeGmailAPI:
+    """googleapiclient Gmail 리소스 대역: 받은편지함 메시지 목록/조회(metadata·full)/발송, 호출 수와 받은 본문 바이트 집계"""
+
+    def __init__(self):
+        self.inbox: List[Dict] = []
+        self.sent: List[email.message.Message] = []
+        self.calls = {'list': 0, 'metadata': 0, 'full': 0}
+        self.body_bytes = 0
+        self.on_send = None
+
+    def deliver(self, sender: str, subject: str, content: str, headers: Optional[Dict] = None) -> None:
+        self.inbox.insert(0, {
+            'id': f"m{len(self.inbox) + 1:05d}", 'internalDate': str(int(time.time() * 1000)),
+            'headers': {'From': sender, 'To': MAILBOX, 'Subject': subject, **(headers or {})},
+            'data': base64.urlsafe_b64encode(content.encode('utf-8')).decode('ascii')
+        })
+
+    # users().messages() 체인
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, userId, q, maxResults):
+        self.calls['list'] += 1
+        return _Call({'messages': [{'id': item['id']} for item in self.inbox[:maxResults]]})
+
+    def get(self, userId, id, format='full', metadataHeaders=None):
+        item = next(item for item in self.inbox if item['id'] == id)
+        self.calls[format] += 1
+        if format == 'metadata':
+            wanted = {name.lower() for name in metadataHeaders or ()}
+            headers = [{'name': name, 'value': value} for name, value in item['headers'].items()
+                       if not wanted or name.lower() in wanted]
+            return _Call({'id': id, 'internalDate': item['internalDate'], 'payload': {'headers': headers}})
+        self.body_bytes += len(item['data'])
+        return _Call({'id': id, 'internalDate': item['internalDate'], 'payload': {
+            'mimeType': 'text/plain', 'body': {'data': item['data']},
+            'headers': [{'name': name, 'value': value} for name, value in item['headers'].items()]
+        }})
+
+    def send(self, userId, body):
+        message = email.message_from_bytes(base64.urlsafe_b64decode(body['raw']), policy=policy.default)
+        self.sent.append(message)
+        if self.on_send:
+            self.on_send(message)
+        return _Call({'id': f"s{len(self.sent)}"})
+
+
+def make_gmail(env_config, api: FakeGmailAPI, enabled: bool) -> GmailServiceV2:
+    filter_config = {**env_config['MAIL_FILTER_CONFIG'], 'ENABLED': enabled, 'STATE_FILE': None}
+    gmail = GmailServiceV2({**env_config.to_dict(), 'MAIL_FILTER_CONFIG': filter_config})
+    gmail.service, gmail.user_email = api, MAILBOX
+    return gmail
+
+
+def run_cycles(gmail: GmailServiceV2, api: FakeGmailAPI, cycles: int) -> int:
+    """엔진처럼 사이클마다 조회 → 처리한 메일마다 답장 (처리한 id는 다시 조회하지 않음), 처리 메일 수"""
+    processed = set()
+    for _ in range(cycles):
+        for item in gmail.get_recent_emails(60, 100, exclude_ids=processed):
+            processed.add(item['id'])
+            info = {'has_all_info': False}
+            gmail.send_reply(item['sender'], reply_subject(info, item['subject']), "추가 정보를 알려주세요.", item['id'])
+    return len(processed)
+
+
+def mixed_inbox(env_config, samples: List[Dict]) -> None:
+    """라벨링된 메일 (헤더 포함)을 받은편지함에 넣고 1회 조회: 본문 조회 수/바이트, 처리로 넘긴 메일, 제외된 문의"""
+    print(f"받은편지함: 문의 {sum(s['label'] == 'inquiry' for s in samples)}건 / "
+          f"문의 아님 {sum(s['label'] != 'inquiry' for s in samples)}건 (뉴스레터·영수증·부재중 회신·반송·스팸)")
+    print(f"{'방식':<22} {'메타데이터 조회':>12} {'본문 조회':>8} {'본문 KB':>8} {'처리(답장)':>10} "
+          f"{'문의 아님 처리':>12} {'제외된 문의':>10}")
+    for label, enabled in (('필터 없음 (이전)', False), ('헤더 사전 필터', True)):
+        api = FakeGmailAPI()
+        for sample in samples:
+            # 헤더 이름은 실제 메일처럼 표기 (List-Id, Auto-Submitted ...)
+            headers = {'-'.join(part.capitalize() for part in name.split('-')): value
+                       for name, value in (sample.get('headers') or {}).items()}
+            api.deliver(sample['sender'], sample['subject'], sample['content'], headers)
+        labels = {api.inbox[len(samples) - 1 - i]['id']: sample['label'] for i, sample in enumerate(samples)}
+        gmail = make_gmail(env_config, api, enabled)
+        emails = gmail.get_recent_emails(60, 500)
+        passed = [labels[item['id']] for item in emails]
+        dropped_inquiries = sum(label == 'inquiry' for label in labels.values()) - passed.count('inquiry')
+        print(f"{label:<22} {api.calls['metadata']:>12} {api.calls['full']:>8} {api.body_bytes / 1024:>8.1f} "
+              f"{len(passed):>10} {passed.count('non_inquiry'):>12} {dropped_inquiries:>10}")
+
+
+def ping_pong(env_config, cycles: int) -> None:
+    """우리 답장마다 즉시 회신하는 자동 응답기 2종과 주고받기: 사이클 수만큼 조회/답장했을 때 보낸 답장 수"""
+    print(f"\n자동 응답기와 답장 주고받기 ({cycles} 사이클)")
+    print(f"{'응답기':<34} {'필터 없음':>8} {'헤더 사전 필터':>12}")
+    responders = {
+        # RFC 3834를 지키지 않는 응답기: 헤더 없이 "Re: ..."로 매번 회신
+        '헤더 없는 자동 응답기': lambda message: ('bot@helpdesk.example.com', f"Re: {message['Subject']}",
+                                          "접수되었습니다. 티켓 #1234", {}),
+        # Auto-Submitted를 붙이는 부재중 회신 (우리 답장의 Auto-Submitted는 무시하는 구현)
+        '부재중 회신 (Auto-Submitted)': lambda message: ('kim@partner.co.kr', f"자동 회신: {message['Subject']}",
+                                                 "휴가 중입니다.", {'Auto-Submitted': 'auto-replied'}),
+    }
+    for name, responder in responders.items():
+        row = []
+        for enabled in (False, True):
+            api = FakeGmailAPI()
+            sender = responder({'Subject': '견적 문의'})[0]
+            api.deliver(sender, '견적 문의', '견적 부탁드립니다.')
+            api.on_send = lambda message: api.deliver(*responder(message))
+            run_cycles(make_gmail(env_config, api, enabled), api, cycles)
+            row.append(len(api.sent))
+        print(f"{name:<34} {row[0]:>8} {row[1]:>12}")
+    print("(우리 답장에는 Auto-Submitted: auto-replied / X-Auto-Response-Suppress: All을 붙여 RFC 3834를 지키는 응답기는 회신하지 않음)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='메일 사전 필터 (헤더/답장 한도/루프 감지) 벤치마크')
+    parser.add_argument('--data', action='append', help="라벨링된 메일 JSONL (train_triage.py와 같은 형식)")
+    parser.add_argument('--cycles', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    env_config = config.load_environment_config('development')
+    mixed_inbox(env_config, load_samples(args.data))
+    ping_pong(env_config, args.cycles)
@@ -0,0 +1,117 @@
+# scripts/bench_pre_extract.py - 규칙 기반 사전 추출 정확도/속도 및 LLM 호출 절감 벤치마크
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import CUSTOMER_FIELDS
+from ai_workflow_production.services.rule_extractor import pre_extract
+from ai_workflow_production.utils.freshness import percentile
+from bench_llm_providers import DEFAULT_CORPUS, _same, load_corpus
+
+
+def run_rules(corpus: List[Dict], min_confidence: float, repeat: int) -> Dict:
+    """규칙만 실행: 확정 필드 정밀도(확정한 값 중 정답 비율), 재현율, LLM 생략 비율, 건당 시간"""
+    confident = {name: 0 for name in CUSTOMER_FIELDS}
+    correct = {name: 0 for name in CUSTOMER_FIELDS}
+    present = {name: 0 for name in CUSTOMER_FIELDS}
+    skipped = 0
+    errors = []
+
+    for item in corpus:
+        extraction = pre_extract(item['content'], item['sender'])
+        values = extraction.confident(min_confidence)
+        skipped += not extraction.unresolved(min_confidence, item['sender'])
+        for name in CUSTOMER_FIELDS:
+            expected = item['expected'].get(name)
+            # email은 본문에 없으면 발신자 주소로 확정 (normalize_customer_info와 동일)
+            value = values.get(name) or (item['sender'] if name == 'email' else None)
+            present[name] += expected is not None
+            if value is not None:
+                confident[name] += 1
+                if _same(value, expected):
+                    correct[name] += 1
+                else:
+                    errors.append(f"{item['id']} {name}: {value!r} (정답 {expected!r})")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in corpus:
+            pre_extract(item['content'], item['sender'])
+    per_email_us = (time.perf_counter() - started) / (repeat * len(corpus)) * 1e6
+
+    return {
+        'precision': {name: correct[name] / confident[name] if confident[name] else None for name in CUSTOMER_FIELDS},
+        'recall': {name: correct[name] / present[name] if present[name] else None for name in CUSTOMER_FIELDS},
+        'skip_ratio': skipped / len(corpus),
+        'per_email_us': per_email_us,
+        'errors': errors
+    }
+
+
+def run_pipeline(router, corpus: List[Dict]) -> Dict:
+    """라우터 extract_customer_info 전체 경로: 필드 정확도, LLM 호출 수, 이메일당 지연"""
+    hits = {name: 0 for name in CUSTOMER_FIELDS}
+    latencies = []
+    for item in corpus:
+        started = time.perf_counter()
+        info = router.extract_customer_info(item['content'], item['sender'])
+        latencies.append((time.perf_counter() - started) * 1000)
+        for name in CUSTOMER_FIELDS:
+            hits[name] += _same(info.get(name), item['expected'].get(name))
+    return {
+        'accuracy': {name: count / len(corpus) for name, count in hits.items()},
+        'p50': percentile(latencies, 50),
+        'mean': sum(latencies) / len(latencies)
+    }
+
+
+def _percent(value) -> str:
+    return '  -' if value is None else f"{value:.0%}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='규칙 기반 사전 추출 벤치마크 (라벨링된 문의 메일 코퍼스)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--min-confidence', type=float, default=None, help='기본값: PRE_EXTRACT_CONFIG')
+    parser.add_argument('--repeat', type=int, default=2000, help='속도 측정 반복 횟수')
+    parser.add_argument('--standin', action='store_true',
+                        help='로컬 OpenAI 호환 대체 서버로 LLM 단독 vs 규칙+LLM 전체 경로 비교')
+    parser.add_argument('--standin-latency-ms', type=float, default=300.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    corpus = load_corpus(args.corpus)
+    env_config = config.load_environment_config('development')
+    min_confidence = args.min_confidence or env_config['PRE_EXTRACT_CONFIG']['MIN_CONFIDENCE']
+
+    rules = run_rules(corpus, min_confidence, args.repeat)
+    print(f"코퍼스 {len(corpus)}건, 확정 기준 {min_confidence}")
+    print(f"{'필드':<8} {'정밀도':>6} {'재현율':>6}")
+    for name in CUSTOMER_FIELDS:
+        print(f"{name:<8} {_percent(rules['precision'][name]):>6} {_percent(rules['recall'][name]):>6}")
+    print(f"LLM 호출 생략(모든 필드 확정) {rules['skip_ratio']:.0%}, 규칙 추출 {rules['per_email_us']:.0f}µs/건")
+    for error in rules['errors']:
+        print(f"  ✗ {error}")
+
+    if args.standin:
+        from bench_llm_router import build_router
+        from openai_standin import start_standin
+
+        print(f"\n전체 경로 (대체 서버 지연 {args.standin_latency_ms:.0f}ms - 실제 모델 아님, 호출 수/지연 비교용)")
+        print(f"{'시나리오':<12} {'LLM 호출':>8} {'p50':>8} {'평균':>8}  필드 정확도")
+        for label, enabled in (('LLM 단독', False), ('규칙 + LLM', True)):
+            standin = start_standin(latency_ms=args.standin_latency_ms)
+            router = build_router(env_config, {'openai': standin}, hedge=False)
+            router.pre_extract_config = {'ENABLED': enabled, 'MIN_CONFIDENCE': min_confidence}
+            result = run_pipeline(router, corpus)
+            accuracy = ' '.join(f"{name}={acc:.0%}" for name, acc in result['accuracy'].items())
+            print(f"{label:<12} {standin.state.requests:>8} {result['p50']:>6.0f}ms {result['mean']:>6.0f}ms  {accuracy}")
+            standin.shutdown()
@@ -0,0 +1,138 @@
+# scripts/bench_prompt_budget.py - 본문 토큰 예산(정리/압축/절단) 효과 벤치마크
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import CUSTOMER_FIELDS
+from ai_workflow_production.services.prompt_budget import budget_email, estimate_tokens
+from ai_workflow_production.utils.freshness import percentile
+from bench_llm_providers import DEFAULT_CORPUS, _same, load_corpus
+
+LEGAL_FOOTER = (
+    "본 메일은 발신 전용이 아니며, 수신인 외의 자에게 무단 배포하는 것을 금지합니다.\n"
+    "This email and any attachments are confidential and intended solely for the addressee. "
+    "If you have received this email in error, please notify the sender and delete it."
+)
+_FILLER_WORDS = ('공정', '설비', '생산성', '품질', '자동화', '라인', '검사', '납기', 'capacity', 'throughput',
+                 'maintenance', '데이터', '분석', '효율', '개선', '도입', '사례', '고객사', '운영', 'ROI')
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_FILLER_WORDS) for _ in range(words)) + '.'
+
+
+def bloat(item: Dict, rng: random.Random) -> Dict:
+    """
+    실제 메일에서 흔한 군더더기를 붙인 변형:
+    첫 문단 뒤 붙여넣은 긴 사양 설명(약 6천 토큰) + 법적 고지 + 인용된 이전 메일 10통
+    """
+    paragraphs = item['content'].split('\n\n')
+    pasted = '\n'.join(_paragraph(rng, 40) for _ in range(150))
+    quoted = '\n'.join(f"> {_paragraph(rng, 30)}" for _ in range(200))
+    content = '\n\n'.join([paragraphs[0], pasted, *paragraphs[1:], LEGAL_FOOTER,
+                           f"-----Original Message-----\nFrom: sales@example.com\n{quoted}"])
+    return {**item, 'id': f"{item['id']}+bloat", 'content': content}
+
+
+def newsletter(rng: random.Random, size_bytes: int = 200_000) -> str:
+    """반복 배너/기사/수신거부 문구로 이루어진 대용량 뉴스레터 (문의 메일 아님)"""
+    blocks = []
+    while sum(len(block.encode('utf-8')) for block in blocks) < size_bytes:
+        blocks.append("▶ 이번 주 인기 기사 보러 가기 https://news.example.com/top?utm_source=newsletter")
+        blocks.append('\n'.join(_paragraph(rng, 50) for _ in range(5)))
+        blocks.append("수신을 원하지 않으시면 수신거부를 눌러주세요. Unsubscribe: https://news.example.com/u")
+    return '\n\n'.join(blocks)
+
+
+def run_offline(items: List[Dict], budget_config: Dict, repeat: int) -> Dict:
+    """작업별 정리/절단 후 추정 토큰과 처리 시간 (LLM 호출 없음)"""
+    report = {}
+    for task in budget_config['MAX_INPUT_TOKENS']:
+        before = after = truncated = 0
+        timings = []
+        for item in items:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                budgeted = budget_email(item['content'], task, budget_config)
+            timings.append((time.perf_counter() - started) / repeat * 1000)
+            before += budgeted.tokens_before
+            after += budgeted.tokens_after
+            truncated += budgeted.truncated
+        report[task] = {'before': before / len(items), 'after': after / len(items),
+                        'truncated': truncated, 'p50_ms': percentile(timings, 50), 'max_ms': max(timings)}
+    return report
+
+
+def run_pipeline(router, items: List[Dict]) -> Dict:
+    """라우터 extract_customer_info 전체 경로: 필드 정확도, 실제 프롬프트 토큰(대체 서버 usage), 지연"""
+    hits = {name: 0 for name in CUSTOMER_FIELDS}
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        info = router.extract_customer_info(item['content'], item['sender'])
+        latencies.append((time.perf_counter() - started) * 1000)
+        for name in CUSTOMER_FIELDS:
+            hits[name] += _same(info.get(name), item['expected'].get(name))
+    usage = router.usage_summary()
+    prompt_tokens = sum(task['prompt_tokens'] for provider in usage.values() for task in provider.values())
+    return {
+        'accuracy': {name: count / len(items) for name, count in hits.items()},
+        'prompt_tokens': prompt_tokens / len(items),
+        'p50': percentile(latencies, 50),
+        'max': max(latencies)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='본문 토큰 예산 벤치마크 (코퍼스 / 군더더기 변형 / 200KB 뉴스레터)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=20, help='처리 시간 측정 반복 횟수')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--standin', action='store_true',
+                        help='로컬 OpenAI 호환 대체 서버로 예산 적용 전/후 실제 프롬프트 토큰/정확도 비교')
+    parser.add_argument('--standin-latency-ms', type=float, default=100.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.corpus)
+    bloated = [bloat(item, rng) for item in corpus]
+    letter = newsletter(rng)
+    env_config = config.load_environment_config('development')
+    budget_config = env_config['PROMPT_BUDGET_CONFIG']
+
+    print(f"예산 {dict(budget_config['MAX_INPUT_TOKENS'])}, 끝부분 비율 {budget_config['TAIL_RATIO']}")
+    print(f"{'입력':<20} {'작업':<9} {'추정 토큰(전→후)':>18} {'잘림':>5} {'p50':>8} {'최대':>8}")
+    inputs = (('코퍼스', corpus), ('군더더기 변형', bloated),
+              (f"뉴스레터 {len(letter.encode('utf-8')) // 1000}KB", [{'content': letter}]))
+    for label, items in inputs:
+        for task, row in run_offline(items, budget_config, args.repeat).items():
+            print(f"{label:<20} {task:<9} {row['before']:>8.0f} → {row['after']:>6.0f} {row['truncated']:>5} "
+                  f"{row['p50_ms']:>6.2f}ms {row['max_ms']:>6.2f}ms")
+    print(f"(참고: 뉴스레터 원문 전체 추정 {estimate_tokens(letter)} 토큰)")
+
+    if args.standin:
+        from bench_llm_router import build_router
+        from openai_standin import start_standin
+
+        print(f"\n전체 추출 경로 (대체 서버 지연 {args.standin_latency_ms:.0f}ms, 규칙 사전 추출 끔 - 모든 메일이 LLM으로)")
+        print(f"{'입력':<14} {'예산':<5} {'프롬프트 토큰/건':>14} {'p50':>8} {'최대':>8}  필드 정확도")
+        for label, items in (('코퍼스', corpus), ('군더더기 변형', bloated)):
+            for enabled in (False, True):
+                standin = start_standin(latency_ms=args.standin_latency_ms)
+                router = build_router(env_config, {'openai': standin}, hedge=False)
+                router.budget_config = {**budget_config, 'ENABLED': enabled}
+                result = run_pipeline(router, items)
+                accuracy = ' '.join(f"{name}={acc:.0%}" for name, acc in result['accuracy'].items())
+                print(f"{label:<14} {'on' if enabled else 'off':<5} {result['prompt_tokens']:>14.0f} "
+                      f"{result['p50']:>6.0f}ms {result['max']:>6.0f}ms  {accuracy}")
+                standin.shutdown()
@@ -0,0 +1,119 @@
+# scripts/bench_prompt_cache.py - 프롬프트 고정 지시문: 단일 프롬프트 vs systemInstruction (입력 토큰/지연) + 자동 프롬프트 캐시 적중률
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import (
+    PROMPT_INSTRUCTIONS, build_combined_prompt, build_extraction_prompt, build_reply_prompt, normalize_customer_info
+)
+from ai_workflow_production.services.prompt_budget import estimate_tokens
+from bench_llm_providers import DEFAULT_CORPUS, load_corpus
+from gemini_standin import _json_payload, start_gemini_standin
+from openai_standin import start_standin
+
+
+def requests_for(corpus: List[Dict]) -> List[Dict]:
+    """이메일 1건 = 추출 + 답변 (2회 호출 경로) + combined 1회 - 작업별 지시문이 모두 쓰이도록"""
+    calls = []
+    for item in corpus:
+        extract = build_extraction_prompt(item['content'], item['sender'])
+        info = normalize_customer_info(_json_payload(extract.text), item['sender'])
+        calls.append({'task': 'extract', 'prompt': extract})
+        calls.append({'task': 'reply', 'prompt': build_reply_prompt(info, item['subject'])})
+        calls.append({'task': 'combined', 'prompt': build_combined_prompt(item['content'], item['sender'],
+                                                                          item['subject'])})
+    return calls
+
+
+def run_gemini(env_config, calls: List[Dict], repeat: int, inline: bool, args) -> Dict:
+    """calls를 repeat회 순서대로 호출: 입력 토큰, 호출 지연, 응답 (내용 비교용)"""
+    from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+
+    server = start_gemini_standin(ttft_ms=args.ttft_ms, chunk_ms=0, chunk_chars=4096, prefill_us=args.prefill_us)
+    service = GeminiServiceV2(env_config)
+    service.base_url = server.base_url
+    service.stream = False
+    latencies, texts = [], []
+    for _ in range(repeat):
+        for call in calls:
+            # 단일 프롬프트 = 이전 방식 (지시문 + 이메일을 한 문자열로 contents에)
+            prompt = call['prompt'].text if inline else call['prompt']
+            started = time.perf_counter()
+            texts.append(service.generate_text(prompt, temperature=0.3, task=call['task']))
+            latencies.append((time.perf_counter() - started) * 1000)
+    server.shutdown()
+    return {
+        'calls': len(latencies),
+        'prompt_tokens': server.state.prompt_tokens,
+        'p50': statistics.median(latencies),
+        'mean': statistics.mean(latencies),
+        'texts': texts
+    }
+
+
+def openai_cache_stats(env_config, calls: List[Dict], repeat: int, min_tokens: int) -> Dict[str, int]:
+    """OpenAI 자동 프롬프트 캐시 (system 메시지 접두사가 min_tokens 이상일 때만 적중) - 입력/적중 토큰"""
+    from ai_workflow_production.services.openai_service_v2 import RESPONSE_FORMATS, OpenAIServiceV2, prompt_messages
+
+    server = start_standin(cache_min_tokens=min_tokens)
+    os.environ['BENCH_PROMPT_CACHE_BASE_URL'] = server.base_url
+    settings = {**env_config, 'OPENAI_CONFIG': {**env_config['OPENAI_CONFIG'],
+                                                'BASE_URL_ENV': 'BENCH_PROMPT_CACHE_BASE_URL'}}
+    service = OpenAIServiceV2(settings)
+    for _ in range(repeat):
+        for call in calls:
+            service.chat_completion(prompt_messages(call['prompt']), task=call['task'],
+                                    response_format=RESPONSE_FORMATS.get(call['task']))
+    server.shutdown()
+    return service.prompt_cache_stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='프롬프트 고정 지시문 분리 / 자동 프롬프트 캐시 비교 (로컬 대체 서버)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--ttft-ms', type=float, default=150.0, help='대체 서버 기본 응답 지연')
+    parser.add_argument('--prefill-us', type=float, default=200.0, help='입력 토큰당 지연 (μs)')
+    parser.add_argument('--cache-min-tokens', type=int, default=1024, help='제공자 최소 캐시 접두사 토큰')
+    parser.add_argument('--low-min-tokens', type=int, default=256,
+                        help='지시문이 최소 캐시 토큰을 넘는 경우를 보기 위한 낮춘 최소값')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('GEMINI_API_KEY', 'standin')
+    os.environ.setdefault('OPENAI_API_KEY', 'standin')
+    env_config = config.load_environment_config('development')
+    corpus = load_corpus(args.corpus)
+    calls = requests_for(corpus)
+
+    print("작업별 고정 지시문 추정 토큰: " + ', '.join(f"{task} {estimate_tokens(text)}"
+                                            for task, text in PROMPT_INSTRUCTIONS.items() if task != 'extract_batch')
+          + f" (제공자 최소 캐시 접두사 {args.cache_min_tokens})")
+    print(f"코퍼스 {len(corpus)}건 × 3회 호출(추출/답변/combined) × {args.repeat}회, 응답 지연 {args.ttft_ms:.0f}ms + "
+          f"입력 토큰당 {args.prefill_us:.0f}μs")
+
+    print(f"\n[Gemini] {'방식':<28} {'입력/건':>8} {'p50 ms':>8} {'평균 ms':>8} {'응답 일치':>8}")
+    baseline = None
+    for label, inline in (('단일 프롬프트 (이전)', True), ('systemInstruction', False)):
+        result = run_gemini(env_config, calls, args.repeat, inline, args)
+        baseline = baseline or result
+        same = sum(a == b for a, b in zip(result['texts'], baseline['texts'])) / result['calls']
+        print(f"         {label:<28} {result['prompt_tokens'] / result['calls']:>8.0f} {result['p50']:>8.0f} "
+              f"{result['mean']:>8.0f} {same:>8.0%}")
+
+    print(f"\n[OpenAI] {'최소 캐시 접두사':<28} {'입력/건':>8} {'캐시 적중':>8}")
+    for min_tokens in (args.cache_min_tokens, min(args.low_min_tokens, args.cache_min_tokens)):
+        stats = openai_cache_stats(env_config, calls, args.repeat, min_tokens)
+        print(f"         {f'{min_tokens}토큰':<28} {stats['prompt_tokens'] / max(1, stats['calls']):>8.0f} "
+              f"{stats['cached_tokens'] / max(1, stats['prompt_tokens']):>8.0%}")
+    print("(지시문이 최소 캐시 접두사보다 짧으면 자동 캐시가 적용되지 않음 - 낮춘 최소값은 비교용)")
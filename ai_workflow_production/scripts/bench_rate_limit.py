@@ -0,0 +1,137 @@
+# scripts/bench_rate_limit.py - 여러 프로세스/스레드가 같은 Gemini 한도를 쓸 때: 429 후 재시도 vs 공유 속도 제한(허용 제어)
+
+import argparse
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import PromptParts, build_extraction_prompt
+from bench_llm_providers import DEFAULT_CORPUS, load_corpus
+from gemini_standin import start_gemini_standin
+from openai_standin import _approx_tokens
+
+
+def worker(base_url: str, limit_config: Dict, threads: int, start_at: float, duration: float,
+           prompt: PromptParts, backoff: float, results) -> None:
+    """프로세스 1개: threads개 스레드가 duration초 동안 generate_text 반복 (실패하면 backoff초 뒤 재시도)"""
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('GEMINI_API_KEY', 'standin')
+    from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+    from ai_workflow_production.utils.rate_limiter import configure_rate_limiter
+
+    limiter = configure_rate_limiter(limit_config)
+    service = GeminiServiceV2(config.load_environment_config('development'))
+    service.base_url = base_url
+    service.stream = False
+    counts = {'attempts': 0, 'ok': 0}
+    lock = threading.Lock()
+
+    def loop():
+        while time.time() < start_at + duration:
+            text = service.generate_text(prompt, temperature=0.0)
+            with lock:
+                counts['attempts'] += 1
+                counts['ok'] += text is not None
+            if text is None:
+                time.sleep(backoff)
+
+    time.sleep(max(0.0, start_at - time.time()))
+    pool = [threading.Thread(target=loop) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put({**counts, 'limiter': limiter.stats().get('gemini', {})})
+
+
+def run(mode: str, args, prompt: PromptParts, db_dir: str) -> Dict:
+    """대체 서버 1개(window초 창 한도)에 processes × threads 워커를 붙여 초당 허용 요청 추이 측정"""
+    server = start_gemini_standin(ttft_ms=args.latency_ms, chunk_ms=0, rpm=args.rpm, tpm=args.tpm,
+                                  window_s=args.window)
+    # 대체 서버의 창(window초)을 1분으로 보고 한도/버스트를 같은 비율로 환산
+    scale = 60 / args.window
+    limit_config = {
+        'ENABLED': mode == 'limiter',
+        'DB_FILE': str(Path(db_dir) / f"{mode}.sqlite3"),
+        'LIMITS': {'gemini': {'RPM': args.rpm * scale, 'TPM': args.tpm * scale}},
+        'HEADROOM': args.headroom,
+        'BURST_SECONDS': 6 / scale,
+        'MAX_WAIT': 30 / scale,
+        'THROTTLE_SECONDS': 10 / scale
+    }
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start_at = time.time() + 3.0  # 모든 프로세스가 준비된 뒤 동시에 시작
+    processes = [context.Process(target=worker, args=(server.base_url, limit_config, args.threads, start_at,
+                                                      args.duration, prompt, args.backoff, results))
+                 for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    server.shutdown()
+
+    state = server.state
+    first = state.accepted[0] if state.accepted else 0.0
+    per_second = [0] * int(args.duration)
+    for accepted in state.accepted:
+        second = int(accepted - first)
+        if second < len(per_second):
+            per_second[second] += 1
+    steady = per_second[int(args.window):] or per_second  # 첫 창(초기 버스트) 제외
+    return {
+        'attempts': sum(outcome['attempts'] for outcome in outcomes),
+        'ok': sum(outcome['ok'] for outcome in outcomes),
+        'rejected': state.rejected,
+        'per_second': per_second,
+        'mean': statistics.mean(steady),
+        'cv': statistics.pstdev(steady) / statistics.mean(steady) if statistics.mean(steady) else 0.0,
+        'waited': sum(outcome['limiter'].get('waited', 0) for outcome in outcomes)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='공유 속도 제한 vs 429 후 재시도 (로컬 Gemini 대체 서버, 시간 축소)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=6, help='프로세스당 워커 스레드')
+    parser.add_argument('--duration', type=float, default=30.0, help='측정 시간 (초)')
+    parser.add_argument('--window', type=float, default=10.0, help='대체 서버 한도 창 (초, 1분을 축소)')
+    parser.add_argument('--rpm', type=int, default=60, help='창당 요청 한도')
+    parser.add_argument('--tpm', type=int, default=30000, help='창당 입력 토큰 한도')
+    parser.add_argument('--headroom', type=float, default=0.9)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='대체 서버 응답 지연')
+    parser.add_argument('--backoff', type=float, default=0.2, help='실패 후 재시도 대기 (초)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    email = load_corpus(args.corpus)[0]
+    prompt = build_extraction_prompt(email['content'], email['sender'])
+    limit_per_second = min(args.rpm, args.tpm / _approx_tokens(prompt.text)) / args.window
+
+    print(f"워커 {args.processes}프로세스 × {args.threads}스레드, {args.duration:g}초, 한도 {args.window:g}초 창당 "
+          f"요청 {args.rpm} / 입력 토큰 {args.tpm} (초당 약 {limit_per_second:.1f}건), 응답 {args.latency_ms:.0f}ms")
+    print(f"{'방식':<14} {'시도':>6} {'성공':>6} {'429':>6} {'낭비':>6} {'성공/초':>8} {'한도 대비':>9} {'초당 변동':>9} "
+          f"{'대기':>6}  초당 허용 요청")
+    labels = {'retry': '429 후 재시도', 'limiter': '공유 속도 제한'}
+    with tempfile.TemporaryDirectory() as db_dir:
+        for mode, label in labels.items():
+            result = run(mode, args, prompt, db_dir)
+            print(f"{label:<14} {result['attempts']:>6} {result['ok']:>6} {result['rejected']:>6} "
+                  f"{result['rejected'] / max(1, result['attempts']):>6.0%} {result['mean']:>8.2f} "
+                  f"{result['mean'] / limit_per_second:>9.0%} {result['cv']:>9.2f} {result['waited']:>6}  "
+                  f"{' '.join(str(count) for count in result['per_second'])}")
+    print("(초당 변동 = 첫 창 이후 초당 허용 수의 표준편차/평균, 낮을수록 한도 아래에서 일정하게 흐름)")
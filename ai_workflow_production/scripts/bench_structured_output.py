@@ -0,0 +1,140 @@
+# scripts/bench_structured_output.py - Gemini 추출 응답 해석 실패율: 자유 텍스트 + 정규식 vs 스키마 검증기 vs responseSchema
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.llm_common import (
+    CUSTOMER_FIELDS, LLMError, build_combined_prompt, build_extraction_prompt, normalize_customer_info,
+    parse_combined_response
+)
+from bench_llm_providers import DEFAULT_CORPUS, _same, load_corpus
+from gemini_standin import _json_payload, start_gemini_standin
+
+
+def legacy_extract(text: str, sender: str) -> Dict:
+    """이전 추출 응답 해석 (코드 펜스 분리 + 정규식 \\{[^}]+\\})"""
+    content = text
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0].strip()
+    elif '```' in content:
+        content = content.split('```')[1].split('```')[0].strip()
+    json_match = re.search(r'\{[^}]+\}', content, re.DOTALL)
+    info = json.loads(json_match.group() if json_match else content)
+    return normalize_customer_info(info, sender)
+
+
+def legacy_combined(text: str, sender: str, subject: str) -> Dict:
+    """이전 combined 응답 해석 (첫 '{'부터 마지막 '}'까지)"""
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end <= start:
+        raise LLMError("응답에서 JSON을 찾을 수 없습니다")
+    return parse_combined_response(json.loads(text[start:end + 1]), sender, subject)
+
+
+def run(service, corpus: List[Dict], repeat: int, task: str, parse: Callable) -> Dict:
+    """
+    작업별 해석 결과 집계 (기준 = 대체 서버가 의도한 응답 객체 → 해석 손실만 측정)
+
+    - failures: 해석 실패 → 추출은 라우터 failover(LLM 재호출), combined는 2회 호출 경로(재호출 2회)
+    - wasted: 본문에 모든 정보가 있는데 누락으로 판단 → 불필요한 추가 정보 요청 메일
+      (추출 해석 실패도 포함 - 다른 제공자가 없으면 '모든 필드 누락' 기본값으로 처리됨)
+    """
+    counts = {'calls': 0, 'failures': 0, 'partial': 0, 'wasted': 0, 'hits': 0, 'fields': 0, 'parse_us': 0.0}
+    for _ in range(repeat):
+        for item in corpus:
+            if task == 'extract':
+                prompt = build_extraction_prompt(item['content'], item['sender'])
+            else:
+                prompt = build_combined_prompt(item['content'], item['sender'], item['subject'])
+            text = service.generate_text(prompt, temperature=0.3, task=task)
+            counts['calls'] += 1
+            truth = normalize_customer_info(_json_payload(prompt.text), item['sender'])
+            has_all_info = truth['has_all_info']
+            started = time.perf_counter()
+            try:
+                if text is None:
+                    raise LLMError("응답 없음")
+                info = parse(text, item)
+            except (LLMError, ValueError, KeyError, TypeError, AttributeError):
+                counts['failures'] += 1
+                counts['wasted'] += task == 'extract' and has_all_info
+                continue
+            finally:
+                counts['parse_us'] += (time.perf_counter() - started) * 1e6
+
+            counts['partial'] += info.pop('_partial', False)
+            counts['hits'] += sum(_same(info.get(name), truth[name]) for name in CUSTOMER_FIELDS)
+            counts['fields'] += len(CUSTOMER_FIELDS)
+            counts['wasted'] += has_all_info and not info['has_all_info']
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='추출 응답 해석 실패율 비교 (로컬 Gemini 대체 서버)')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--quirk-rate', type=float, default=0.15, help='자유 텍스트 JSON 형식 변형 비율')
+    parser.add_argument('--truncate-rate', type=float, default=0.03, help='JSON 응답이 끊기는 비율 (max tokens)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    os.environ.setdefault('GEMINI_API_KEY', 'standin')
+    corpus = load_corpus(args.corpus)
+    env_config = config.load_environment_config('development')
+
+    from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+
+    def parsed(service, task):
+        """현재 해석기 (부분 복구 여부 표시)"""
+        def parse(text, item):
+            result = service._parse_json(text, task)
+            if task == 'extract':
+                info = normalize_customer_info(result.value, item['sender'])
+            else:
+                info = parse_combined_response(result.value, item['sender'], item['subject'])['customer_info']
+            return {**info, '_partial': not result.complete}
+        return parse
+
+    scenarios = [
+        ('자유 텍스트 + 정규식', False, {
+            'extract': lambda text, item: legacy_extract(text, item['sender']),
+            'combined': lambda text, item: legacy_combined(text, item['sender'], item['subject'])['customer_info']
+        }),
+        ('자유 텍스트 + 검증기', False, None),
+        ('responseSchema + 검증기', True, None)
+    ]
+
+    print(f"코퍼스 {len(corpus)}건 × {args.repeat}회, 자유 텍스트 형식 변형 {args.quirk_rate:.0%}, "
+          f"응답 끊김 {args.truncate_rate:.0%} (스키마와 무관)")
+    print(f"{'방식':<24} {'작업':<9} {'호출':>5} {'해석 실패':>8} {'부분 복구':>8} {'LLM 재호출':>9} {'불필요 요청':>10} "
+          f"{'필드 일치':>10} {'해석 μs':>8}")
+    for label, structured, legacy in scenarios:
+        for task in ('extract', 'combined'):
+            random.seed(args.seed)
+            server = start_gemini_standin(ttft_ms=0, chunk_ms=0, chunk_chars=64,
+                                          quirk_rate=args.quirk_rate, truncate_rate=args.truncate_rate)
+            service = GeminiServiceV2(env_config)
+            service.base_url = server.base_url
+            service.response_schema = structured
+            result = run(service, corpus, args.repeat, task, legacy[task] if legacy else parsed(service, task))
+            server.shutdown()
+
+            retries = result['failures'] * (1 if task == 'extract' else 2)
+            print(f"{label:<24} {task:<9} {result['calls']:>5} {result['failures'] / result['calls']:>8.1%} "
+                  f"{result['partial']:>8} {retries:>9} {result['wasted']:>10} "
+                  f"{result['hits'] / max(1, result['fields']):>10.1%} {result['parse_us'] / result['calls']:>8.0f}")
+    print("(해석 실패 시 추출은 다른 제공자로 재호출, combined는 추출 + 답변 2회 호출로 대체 / 불필요 요청 = 모델은 "
+          "정보를 모두 찾았는데 해석에서 잃어 추가 정보 요청 메일을 보냄 / 필드 일치 = 모델이 의도한 값과 같은 비율)")
@@ -0,0 +1,98 @@
+# scripts/bench_triage.py - 메일 사전 분류: 교차 검증 정확도 (문의를 잘못 건너뛴 수), 기준 확률별 LLM 호출 절감, 분류 시간
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_workflow_production.services.triage import INQUIRY, NON_INQUIRY, UNCERTAIN, TriageClassifier, train_model
+from ai_workflow_production.utils.freshness import percentile
+from train_triage import load_samples
+
+
+def cross_validate(samples: List[Dict], folds: int, seed: int) -> List[Dict]:
+    """라벨별로 나눠 섞은 k-겹 교차 검증: 각 메일을 자신이 빠진 모델로 채점 → [{label, prob}]"""
+    rng = random.Random(seed)
+    by_label: Dict[str, List[Dict]] = {}
+    for sample in samples:
+        by_label.setdefault(sample['label'], []).append(sample)
+    assignments = []
+    for group in by_label.values():
+        group = group[:]
+        rng.shuffle(group)
+        assignments.extend((i % folds, sample) for i, sample in enumerate(group))
+
+    scored = []
+    for fold in range(folds):
+        train = [sample for index, sample in assignments if index != fold]
+        classifier = TriageClassifier(train_model(train))
+        scored.extend({'label': sample['label'], 'prob': classifier.inquiry_probability(sample)}
+                      for index, sample in assignments if index == fold)
+    return scored
+
+
+def decide(prob: float, inquiry_min_prob: float, non_inquiry_min_prob: float) -> str:
+    if prob >= inquiry_min_prob:
+        return INQUIRY
+    return NON_INQUIRY if 1.0 - prob >= non_inquiry_min_prob else UNCERTAIN
+
+
+def timing(samples: List[Dict], repeat: int) -> Dict:
+    """전체 데이터로 학습한 모델의 건당 분류 시간 (μs) + 200KB 뉴스레터 1건"""
+    classifier = TriageClassifier(train_model(samples))
+    latencies = []
+    for _ in range(repeat):
+        for sample in samples:
+            latencies.append(classifier.classify(sample).elapsed_us)
+    newsletter = dict(samples[0], content="이번 주 소식과 할인 쿠폰을 확인하세요. https://example.com/l/1\n" * 3000)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        classifier.classify(newsletter)
+    return {
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'large_us': (time.perf_counter() - started) / repeat * 1e6,
+        'large_kb': len(newsletter['content'].encode('utf-8')) / 1024
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='메일 사전 분류 교차 검증/분류 시간')
+    parser.add_argument('--data', action='append', help="라벨링된 메일 JSONL (train_triage.py와 같은 형식)")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--seeds', type=int, default=5, help='교차 검증 분할 반복 횟수')
+    parser.add_argument('--inquiry-min-prob', type=float, default=0.9)
+    parser.add_argument('--calls-per-email', type=float, default=2.0,
+                        help='문의 1건당 LLM 호출 수 (two_call = 추출 + 답변)')
+    parser.add_argument('--repeat', type=int, default=200, help='분류 시간 측정 반복')
+    args = parser.parse_args()
+
+    samples = load_samples(args.data)
+    scored = [row for seed in range(args.seeds) for row in cross_validate(samples, args.folds, seed)]
+    inquiries = sum(row['label'] == INQUIRY for row in scored)
+    others = len(scored) - inquiries
+
+    print(f"라벨링된 메일: 문의 {inquiries // args.seeds}건 / 문의 아님 {others // args.seeds}건, "
+          f"{args.folds}겹 교차 검증 × {args.seeds}회 (문의 기준 확률 {args.inquiry_min_prob})")
+    print(f"{'건너뛰기 기준':<16} {'문의 오분류':>10} {'문의 아님 건너뜀':>14} {'불확실':>8} "
+          f"{'LLM 호출 절감':>12} {'잘못된 자동 답장':>14}")
+    print(f"{'분류 없음 (이전)':<16} {0:>10} {'0%':>14} {'-':>8} {'0%':>12} {others // args.seeds:>14}")
+    for threshold in (0.9, 0.99, 0.999):
+        decisions = [(row['label'], decide(row['prob'], args.inquiry_min_prob, threshold)) for row in scored]
+        wrong = sum(label == INQUIRY and decision == NON_INQUIRY for label, decision in decisions)
+        skipped = sum(label == NON_INQUIRY and decision == NON_INQUIRY for label, decision in decisions)
+        uncertain = sum(decision == UNCERTAIN for _, decision in decisions)
+        # 불확실 / 문의로 분류된 메일만 LLM 처리 (건너뛴 문의 아님 = 절감, 남은 문의 아님 = 잘못된 자동 답장)
+        saved = (skipped + wrong) * args.calls_per_email / (len(scored) * args.calls_per_email)
+        print(f"{f'문의 아님 ≥ {threshold}':<16} {wrong / args.seeds:>10.1f} {skipped / others:>14.0%} "
+              f"{uncertain / len(scored):>8.0%} {saved:>12.0%} {(others - skipped) / args.seeds:>14.1f}")
+    print("(문의 오분류 = 문의인데 건너뛴 건수/회 - 0이어야 함, 잘못된 자동 답장 = 처리된 문의 아님 건수/회)")
+
+    timing_result = timing(samples, args.repeat)
+    print(f"\n분류 시간: 건당 p50 {timing_result['p50']:.0f}μs / p99 {timing_result['p99']:.0f}μs, "
+          f"{timing_result['large_kb']:.0f}KB 뉴스레터 {timing_result['large_us']:.0f}μs (본문 앞부분만 사용)")
@@ -0,0 +1,266 @@
+# scripts/gemini_standin.py - 로컬 Gemini generateContent/streamGenerateContent 대체 서버 (벤치마크/개발용, 실제 모델 아님)
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from openai_standin import (
+    MISSING_MARKER, _STANDIN_REPLY, _STANDIN_REQUEST, _approx_tokens, rule_extract, rule_extract_batch
+)
+
+# 긴 답변 (스트리밍 첫 토큰 지연 비교용)
+_LONG_REPLY = _STANDIN_REPLY.replace(
+    "\n\n감사합니다.",
+    "\n\n보내주신 문의 내용을 검토한 뒤, 도입 일정과 예산 범위에 맞는 구성안을 함께 준비해 드리겠습니다. "
+    "필요하시면 현장 방문 상담이나 온라인 데모도 가능하오니 편하신 일정을 알려주시기 바랍니다. "
+    "또한 유사 업종 고객사의 적용 사례와 기대 효과 자료를 함께 보내드리겠습니다.\n\n감사합니다."
+)
+# 모델이 JSON 뒤에 덧붙이는 설명 (조기 종료 효과 확인용)
+_TRAILING_NOTE = ("\n```\n\n위 JSON은 이메일 본문에서 확인된 정보만 포함합니다. 이메일 주소는 본문에 없으면 "
+                  "발신자 주소를 사용했으며, 확인되지 않은 항목은 null로 표시했습니다.")
+# responseSchema 없이 자유 텍스트로 JSON을 받을 때 모델이 종종 만드는 형식 변형
+# nested: 중첩 객체 필드 추가, brace_in_value: 값 안의 중괄호, preamble: 중괄호가 든 설명 뒤에 펜스 없는 JSON
+QUIRKS = ('nested', 'brace_in_value', 'preamble')
+
+
+class GeminiStandinState:
+    """요청/연결 수 및 지연·정지·속도 제한·응답 형식 오류 주입 설정"""
+
+    def __init__(self, ttft_ms: float = 300.0, chunk_ms: float = 20.0, chunk_chars: int = 8,
+                 stall_rate: float = 0.0, stall_ms: float = 0.0, rpm: int = 0, tpm: int = 0,
+                 window_s: float = 60.0, quirk_rate: float = 0.0, truncate_rate: float = 0.0,
+                 prefill_us: float = 0.0):
+        self.ttft_ms = ttft_ms          # 첫 조각까지 지연
+        self.chunk_ms = chunk_ms        # 조각 사이 지연 (생성 속도)
+        self.chunk_chars = chunk_chars  # 조각당 글자 수
+        self.stall_rate = stall_rate    # 이 비율의 응답은 중간에 stall_ms만큼 멈춤
+        self.stall_ms = stall_ms
+        self.quirk_rate = quirk_rate        # 자유 텍스트 JSON 응답 중 QUIRKS 변형 비율 (responseSchema가 있으면 0)
+        self.truncate_rate = truncate_rate  # JSON 응답이 max tokens에서 끊기는 비율 (스키마와 무관)
+        self.prefill_us = prefill_us        # 입력 토큰당 첫 조각 추가 지연 (μs, 프롬프트 처리 시간)
+        self.prompt_tokens = 0              # 생성 요청 입력 토큰 합계
+        # window_s초 슬라이딩 창 안에서 요청 rpm건 / 입력 토큰 tpm개 초과 시 429 (0이면 제한 없음)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_s = window_s
+        self.window = deque()   # (허용 시각, 입력 토큰)
+        self.accepted = []      # 허용된 요청 시각 (처리량 추이)
+        self.rejected = 0
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def admit(self, tokens: int) -> float:
+        """창 한도 안이면 기록하고 0, 초과면 창에서 여유가 생길 때까지 남은 시간 (초)"""
+        now = time.monotonic()
+        with self.lock:
+            while self.window and self.window[0][0] <= now - self.window_s:
+                self.window.popleft()
+            over_requests = self.rpm and len(self.window) >= self.rpm
+            over_tokens = self.tpm and sum(used for _, used in self.window) + tokens > self.tpm
+            if self.window and (over_requests or over_tokens):
+                self.rejected += 1
+                return self.window[0][0] + self.window_s - now
+            self.window.append((now, tokens))
+            self.accepted.append(now)
+            return 0.0
+
+
+def _json_payload(prompt: str) -> Optional[Dict]:
+    """JSON 작업(일괄 추출 / combined / 추출)의 응답 객체 (답변 작업이면 None)"""
+    if '<email id="' in prompt:
+        return rule_extract_batch(prompt)
+    if 'in the same JSON object' in prompt:
+        info = rule_extract(prompt)
+        has_all_info = all(info.values())
+        info['reply_type'] = 'assigned' if has_all_info else 'request_info'
+        info['reply_body'] = _LONG_REPLY if has_all_info else _STANDIN_REQUEST
+        return info
+    if 'respond ONLY in a valid JSON' in prompt:
+        return rule_extract(prompt)
+    return None
+
+
+def respond_text(prompt: str, structured: bool = False, quirk: Optional[str] = None) -> str:
+    """
+    프롬프트 종류별 응답
+
+    structured(responseSchema 지정)면 JSON만, 아니면 코드 펜스 + 뒤쪽 설명 (quirk 지정 시 QUIRKS 변형)
+    """
+    data = _json_payload(prompt)
+    if data is None:
+        return _STANDIN_REQUEST if MISSING_MARKER in prompt else _LONG_REPLY
+    if structured:
+        return json.dumps(data, ensure_ascii=False)
+    if quirk == 'nested':
+        data = {**data, 'meta': {'confidence': 0.9, 'source': 'latest_message'}}
+    elif quirk == 'brace_in_value':
+        data = {**data, 'note': '서명 블록의 {회사 로고} 이미지는 제외했습니다'}
+    body = json.dumps(data, ensure_ascii=False, indent=2)
+    if quirk == 'preamble':
+        return f"요청하신 필드 {{{', '.join(data)}}}를 추출했습니다.\n{body}"
+    return f"```json\n{body}{_TRAILING_NOTE}"
+
+
+def _chunks(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or ['']
+
+
+def make_handler(state: GeminiStandinState):
+    class GeminiStandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with state.lock:
+                state.connections += 1
+
+        def handle(self):
+            try:
+                super().handle()
+            except ConnectionResetError:
+                self.close_connection = True  # 클라이언트가 스트림을 조기 종료하고 연결을 닫음
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path.startswith(('/v1/models/', '/v1beta/models/')):
+                name = path.rsplit('/', 1)[-1]
+                self._respond(200, {'name': f"models/{name}", 'displayName': f"{name} (standin)"})
+            else:
+                self._respond(404, {'error': {'message': 'not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            with state.lock:
+                state.requests += 1
+
+            path = self.path.split('?', 1)[0]
+            # 고정 지시문: systemInstruction (없으면 contents에 포함된 단일 프롬프트)
+            instructions = '\n'.join(part.get('text', '') for part in
+                                     (body.get('systemInstruction') or {}).get('parts', []))
+            prompt = '\n'.join(part.get('text', '') for content in body.get('contents', [])
+                               for part in content.get('parts', []))
+            if instructions:
+                prompt = f"{instructions}\n\n{prompt}"
+            prompt_tokens = _approx_tokens(prompt)
+            retry_after = state.admit(prompt_tokens)
+            if retry_after:
+                # 실제 Gemini처럼 Retry-After 헤더 없이 본문 RetryInfo로 대기 시간 안내
+                self._respond(429, {'error': {
+                    'code': 429, 'status': 'RESOURCE_EXHAUSTED', 'message': 'Resource has been exhausted',
+                    'details': [{'@type': 'type.googleapis.com/google.rpc.RetryInfo',
+                                 'retryDelay': f"{max(1, round(retry_after))}s"}]
+                }})
+                return
+            structured = 'responseSchema' in (body.get('generationConfig') or {})
+            quirk = random.choice(QUIRKS) if not structured and random.random() < state.quirk_rate else None
+            text, finish_reason = respond_text(prompt, structured, quirk), 'STOP'
+            if _json_payload(prompt) is not None and random.random() < state.truncate_rate:
+                # JSON 본문 뒤쪽 절반 어딘가에서 끊김 (형식과 무관하게 같은 위치 분포)
+                end = text.rfind('}')
+                text, finish_reason = text[:random.randint((text.find('{') + end) // 2, end)], 'MAX_TOKENS'
+            chunks = _chunks(text, state.chunk_chars)
+            stall_at = random.randrange(len(chunks)) if random.random() < state.stall_rate else -1
+            usage = {'promptTokenCount': prompt_tokens, 'candidatesTokenCount': _approx_tokens(text),
+                     'totalTokenCount': prompt_tokens + _approx_tokens(text)}
+            with state.lock:
+                state.prompt_tokens += prompt_tokens
+            ttft_ms = state.ttft_ms + prompt_tokens * state.prefill_us / 1000
+
+            if path.endswith(':generateContent'):
+                # 전체 생성이 끝난 뒤 한 번에 응답
+                delay = ttft_ms + state.chunk_ms * (len(chunks) - 1) + (state.stall_ms if stall_at >= 0 else 0)
+                time.sleep(delay / 1000)
+                self._respond(200, {
+                    'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'},
+                                    'finishReason': finish_reason}],
+                    'usageMetadata': usage
+                })
+            elif path.endswith(':streamGenerateContent'):
+                self._stream(chunks, stall_at, usage, finish_reason, ttft_ms)
+            else:
+                self._respond(404, {'error': {'message': 'not found'}})
+
+        def _stream(self, chunks: List[str], stall_at: int, usage: Dict, finish_reason: str, ttft_ms: float):
+            """SSE (chunked 전송): 조각마다 data 이벤트 1개, 마지막 이벤트에 finishReason/usageMetadata"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                time.sleep(ttft_ms / 1000)
+                for index, piece in enumerate(chunks):
+                    if index == stall_at:
+                        time.sleep(state.stall_ms / 1000)
+                    elif index:
+                        time.sleep(state.chunk_ms / 1000)
+                    event = {'candidates': [{'content': {'parts': [{'text': piece}], 'role': 'model'}}]}
+                    if index == len(chunks) - 1:
+                        event['candidates'][0]['finishReason'] = finish_reason
+                        event['usageMetadata'] = usage
+                    self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode('utf-8'))
+                self._write_chunk(b'')
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # 클라이언트가 조기 종료/정지 감지로 연결을 끊음
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+        def _respond(self, status: int, payload: Dict):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return GeminiStandinHandler
+
+
+def start_gemini_standin(host: str = '127.0.0.1', port: int = 0, **state_kwargs) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 대체 서버 시작 (server.state로 통계 확인, base URL은 /v1beta)"""
+    state = GeminiStandinState(**state_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    server.base_url = f"http://{host}:{server.server_port}/v1beta"
+    threading.Thread(target=server.serve_forever, name="gemini-standin", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='로컬 Gemini 대체 서버 (generateContent / streamGenerateContent)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8788)
+    parser.add_argument('--ttft-ms', type=float, default=300.0, help='첫 조각까지 지연 (ms)')
+    parser.add_argument('--chunk-ms', type=float, default=20.0, help='조각 사이 지연 (ms)')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='중간에 멈추는 응답 비율 (0~1)')
+    parser.add_argument('--stall-ms', type=float, default=0.0, help='멈춤 시간 (ms)')
+    parser.add_argument('--rpm', type=int, default=0, help='분당 요청 한도 (초과 시 429, 0이면 제한 없음)')
+    parser.add_argument('--tpm', type=int, default=0, help='분당 입력 토큰 한도 (초과 시 429, 0이면 제한 없음)')
+    parser.add_argument('--quirk-rate', type=float, default=0.0, help='자유 텍스트 JSON 형식 변형 비율 (0~1)')
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help='JSON 응답이 중간에 끊기는 비율 (0~1)')
+    parser.add_argument('--prefill-us', type=float, default=0.0, help='입력 토큰당 첫 조각 추가 지연 (μs)')
+    args = parser.parse_args()
+
+    server = start_gemini_standin(args.host, args.port, ttft_ms=args.ttft_ms, chunk_ms=args.chunk_ms,
+                                  stall_rate=args.stall_rate, stall_ms=args.stall_ms, rpm=args.rpm, tpm=args.tpm,
+                                  quirk_rate=args.quirk_rate, truncate_rate=args.truncate_rate,
+                                  prefill_us=args.prefill_us)
+    print(f"Gemini 대체 서버: {server.base_url} (GeminiServiceV2.base_url에 지정)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
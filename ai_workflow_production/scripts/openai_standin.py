@@ -0,0 +1,364 @@
+# scripts/openai_standin.py - 로컬 OpenAI 호환 대체 서버 (Chat Completions / Files / Batches, 벤치마크/개발용, 실제 모델 아님)
+
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# 프롬프트에서 이메일 본문/발신자 위치 (services/llm_common.build_extraction_prompt 형식)
+_EMAIL_BLOCK = re.compile(r"Email Content:\n---\n(.*?)\n---", re.DOTALL)
+_SENDER = re.compile(r"Sender's Email: (\S+)")
+# 일괄 추출 프롬프트의 이메일 블록 (services/llm_common.build_batch_extraction_prompt 형식)
+_BATCH_EMAIL = re.compile(r'<email id="([^"]*)" sender="([^"]*)">\n(.*?)\n</email>', re.DOTALL)
+
+_PHONE = re.compile(r"(?:\+82[-\s]?)?0\d{1,2}[-\s.]?\d{3,4}[-\s.]?\d{4}")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_LABELS = {
+    'name': ('이름', '성함', '담당자'),
+    'company': ('회사', '소속', '회사명'),
+    'title': ('직급', '직책'),
+}
+
+
+def _labeled(text: str, labels) -> Optional[str]:
+    for label in labels:
+        match = re.search(rf"{label}\s*[:：]\s*([^\n,]+)", text)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def rule_extract(prompt: str) -> Dict:
+    """라벨('이름: ...')과 전화번호/이메일 패턴만 보는 결정적 추출 (응답 형식/지연 시험용)"""
+    block = _EMAIL_BLOCK.search(prompt)
+    text = block.group(1) if block else prompt
+    # 인용된 이전 메일(> ...)은 제외
+    text = '\n'.join(line for line in text.splitlines() if not line.lstrip().startswith('>'))
+    sender = _SENDER.search(prompt)
+
+    info = {field: _labeled(text, labels) for field, labels in _LABELS.items()}
+    phone = _labeled(text, ('연락처', '전화')) or (_PHONE.search(text).group(0) if _PHONE.search(text) else None)
+    email = _labeled(text, ('이메일',)) or (_EMAIL.search(text).group(0) if _EMAIL.search(text) else None)
+    info['phone'] = phone
+    info['email'] = email or (sender.group(1) if sender else None)
+    return info
+
+
+def rule_extract_batch(prompt: str, drop_rate: float = 0.0) -> Dict:
+    """일괄 추출 응답 {'results': [...]} - drop_rate 비율의 이메일은 결과에서 빠뜨림 (1건씩 재추출 시험용)"""
+    results = []
+    for email_id, sender, content in _BATCH_EMAIL.findall(prompt):
+        if random.random() < drop_rate:
+            continue
+        info = rule_extract(f"Email Content:\n---\n{content}\n---\nSender's Email: {sender}")
+        results.append({'id': email_id, **info})
+    return {'results': results}
+
+
+# 답변 프롬프트의 누락 정보 안내 (services/llm_common.build_reply_prompt 형식 - 고정 지시문이 아닌 이메일별 입력)
+MISSING_MARKER = '다음 정보가 누락되었습니다'
+
+_STANDIN_REPLY = "안녕하세요.\n\n문의 주셔서 감사합니다. 보내주신 정보를 확인했으며 담당 영업팀이 신속히 연락드리겠습니다.\n\n감사합니다."
+_STANDIN_REQUEST = "안녕하세요.\n\n문의 주셔서 감사합니다. 정확한 상담을 위해 성함, 소속, 직급, 연락처를 알려주시면 신속히 답변 드리겠습니다.\n\n감사합니다."
+
+
+def _approx_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글은 글자당 1, 그 외 4글자당 1)"""
+    hangul = sum(1 for ch in text if '가' <= ch <= '힣')
+    return hangul + max(1, (len(text) - hangul) // 4)
+
+
+class StandinState:
+    """요청/연결 수 및 지연·장애 주입 설정"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, fail_rate: float = 0.0,
+                 tail_rate: float = 0.0, tail_ms: float = 0.0, token_ms: float = 0.0, batch_drop_rate: float = 0.0,
+                 batch_turnaround_ms: float = 0.0, cache_min_tokens: int = 1024):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.tail_rate = tail_rate   # 이 비율의 요청은 tail_ms만큼 추가 지연 (꼬리 지연 재현)
+        self.tail_ms = tail_ms
+        self.token_ms = token_ms     # 응답 토큰당 추가 지연 (생성 속도 - 긴 응답일수록 느림)
+        self.batch_drop_rate = batch_drop_rate  # 일괄 추출 결과에서 빠뜨릴 이메일 비율
+        self.batch_turnaround_ms = batch_turnaround_ms  # Batch API 작업이 처리를 시작하기까지 대기
+        self.cache_min_tokens = cache_min_tokens  # 자동 프롬프트 캐시 최소 접두사 (system 메시지 기준으로 단순화)
+        self.prefixes = set()                   # 한 번 이상 본 system 메시지 (캐시된 접두사)
+        self.cached_tokens = 0
+        self.prompt_tokens = 0                  # 생성한 응답의 usage 합계 (실시간 + Batch)
+        self.completion_tokens = 0
+        self.files: Dict[str, bytes] = {}       # Files API (업로드한 입력 / 결과 JSONL)
+        self.batches: Dict[str, Dict] = {}      # Batches API 작업 객체
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def delay(self, completion_tokens: int = 0) -> None:
+        seconds = (self.latency_ms + random.uniform(0, self.jitter_ms) + self.token_ms * completion_tokens) / 1000
+        if random.random() < self.tail_rate:
+            seconds += self.tail_ms / 1000
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def complete(body: Dict, state: 'StandinState') -> Dict:
+    """Chat Completions 응답 (response_format 종류별 결정적 내용, usage 포함)"""
+    prompt = '\n'.join(str(m.get('content', '')) for m in body.get('messages', []))
+    response_format = body.get('response_format') or {}
+    schema_name = (response_format.get('json_schema') or {}).get('name')
+    if schema_name == 'inquiry_response':
+        # 추출 + 답변 1회 호출 (combined 모드)
+        info = rule_extract(prompt)
+        has_all_info = all(info.values())
+        info['reply_type'] = 'assigned' if has_all_info else 'request_info'
+        info['reply_body'] = _STANDIN_REPLY if has_all_info else _STANDIN_REQUEST
+        content = json.dumps(info, ensure_ascii=False)
+    elif schema_name == 'batch_customer_info':
+        content = json.dumps(rule_extract_batch(prompt, state.batch_drop_rate), ensure_ascii=False)
+    elif response_format.get('type') in ('json_schema', 'json_object'):
+        content = json.dumps(rule_extract(prompt), ensure_ascii=False)
+    else:
+        content = _STANDIN_REQUEST if MISSING_MARKER in prompt else _STANDIN_REPLY
+
+    prompt_tokens = _approx_tokens(prompt)
+    completion_tokens = _approx_tokens(content)
+    # 자동 프롬프트 캐시: 이전 요청과 같은 system 메시지가 최소 길이 이상이면 128토큰 단위로 캐시 적중
+    messages = body.get('messages') or [{}]
+    system = str(messages[0].get('content', '')) if messages[0].get('role') == 'system' else ''
+    system_tokens = _approx_tokens(system) if system else 0
+    with state.lock:
+        cached_tokens = 0
+        if system_tokens >= state.cache_min_tokens:
+            if system in state.prefixes:
+                cached_tokens = system_tokens // 128 * 128
+            state.prefixes.add(system)
+        state.prompt_tokens += prompt_tokens
+        state.completion_tokens += completion_tokens
+        state.cached_tokens += cached_tokens
+    return {
+        'id': f"chatcmpl-standin-{state.requests}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'standin'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content, 'refusal': None},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'prompt_tokens_details': {'cached_tokens': cached_tokens}
+        }
+    }
+
+
+def _multipart_fields(content_type: str, data: bytes) -> Dict[str, bytes]:
+    """multipart/form-data 본문 → {필드 이름: 값}"""
+    message = BytesParser(policy=default_policy).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + data
+    )
+    return {part.get_param('name', header='content-disposition'): part.get_payload(decode=True)
+            for part in message.iter_parts()}
+
+
+def _store_file(state: StandinState, data: bytes, purpose: str) -> Dict:
+    with state.lock:
+        file_id = f"file-standin-{len(state.files) + 1}"
+        state.files[file_id] = data
+    return {'id': file_id, 'object': 'file', 'bytes': len(data), 'created_at': int(time.time()),
+            'filename': f"{file_id}.jsonl", 'purpose': purpose}
+
+
+def run_batch(state: StandinState, batch_id: str) -> None:
+    """
+    Batch 작업 처리 (백그라운드 스레드): 대기 → 줄마다 Chat Completions 응답 → 결과/오류 파일
+
+    fail_rate 비율의 요청은 오류 파일로 (status_code 500), 처리 중 취소되면 처리한 줄까지만 결과에 남김
+    """
+    batch = state.batches[batch_id]
+    time.sleep(state.batch_turnaround_ms / 1000)
+    lines = [json.loads(raw) for raw in state.files[batch['input_file_id']].decode('utf-8').splitlines()
+             if raw.strip()]
+    with state.lock:
+        if batch['status'] == 'validating':
+            batch.update(status='in_progress', in_progress_at=int(time.time()))
+        batch['request_counts']['total'] = len(lines)
+
+    outputs, errors = [], []
+    for index, line in enumerate(lines, 1):
+        if batch['status'] == 'cancelling':
+            break
+        result = {'id': f"batch_req_{batch_id}_{index}", 'custom_id': line['custom_id'], 'error': None}
+        failed = random.random() < state.fail_rate
+        if failed:
+            result['response'] = {'status_code': 500, 'request_id': f"req_{index}",
+                                  'body': {'error': {'message': 'standin injected failure'}}}
+            errors.append(result)
+        else:
+            result['response'] = {'status_code': 200, 'request_id': f"req_{index}", 'body': complete(line['body'], state)}
+            outputs.append(result)
+        with state.lock:
+            batch['request_counts']['failed' if failed else 'completed'] += 1
+
+    def _jsonl(results):
+        return ''.join(json.dumps(result, ensure_ascii=False) + '\n' for result in results).encode('utf-8')
+
+    output_file = _store_file(state, _jsonl(outputs), 'batch_output') if outputs else None
+    error_file = _store_file(state, _jsonl(errors), 'batch_output') if errors else None
+    with state.lock:
+        cancelled = batch['status'] == 'cancelling'
+        batch.update(status='cancelled' if cancelled else 'completed',
+                     output_file_id=output_file and output_file['id'],
+                     error_file_id=error_file and error_file['id'],
+                     **{('cancelled_at' if cancelled else 'completed_at'): int(time.time())})
+
+
+def make_handler(state: StandinState):
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive 지원
+
+        def setup(self):
+            super().setup()
+            # 헤더/본문 분할 전송 시 Nagle + delayed ACK로 생기는 ~40ms 지연 방지
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with state.lock:
+                state.connections += 1
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/stats':
+                self._respond(200, {'requests': state.requests, 'connections': state.connections})
+            elif path.startswith('/v1/models/'):
+                self._respond(200, {'id': path.rsplit('/', 1)[-1], 'object': 'model', 'owned_by': 'standin'})
+            elif path.startswith('/v1/batches/') and path.count('/') == 3:
+                self._respond_batch(path.rsplit('/', 1)[-1])
+            elif path.startswith('/v1/files/') and path.endswith('/content'):
+                data = state.files.get(path.split('/')[3])
+                if data is None:
+                    self._respond(404, {'error': {'message': 'file not found'}})
+                else:
+                    self._respond_bytes(200, data, 'application/jsonl')
+            else:
+                self._respond(404, {'error': {'message': 'not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length)
+            with state.lock:
+                state.requests += 1
+
+            path = self.path.split('?', 1)[0]
+            if path == '/v1/files':
+                fields = _multipart_fields(self.headers.get('Content-Type', ''), raw)
+                self._respond(200, _store_file(state, fields.get('file') or b'',
+                                               (fields.get('purpose') or b'').decode('utf-8')))
+                return
+            if path == '/v1/batches':
+                self._create_batch(json.loads(raw or b'{}'))
+                return
+            if path.startswith('/v1/batches/') and path.endswith('/cancel'):
+                batch_id = path.split('/')[3]
+                with state.lock:
+                    batch = state.batches.get(batch_id)
+                    if batch is not None and batch['status'] in ('validating', 'in_progress'):
+                        batch['status'] = 'cancelling'
+                self._respond_batch(batch_id)
+                return
+            if path != '/v1/chat/completions':
+                self._respond(404, {'error': {'message': 'not found'}})
+                return
+
+            body = json.loads(raw or b'{}')
+            payload = complete(body, state)
+            state.delay(payload['usage']['completion_tokens'])
+            if random.random() < state.fail_rate:
+                self._respond(503, {'error': {'message': 'standin injected failure'}})
+                return
+            self._respond(200, payload)
+
+        def _create_batch(self, body: Dict):
+            if body.get('input_file_id') not in state.files:
+                self._respond(400, {'error': {'message': 'input_file_id not found'}})
+                return
+            with state.lock:
+                batch_id = f"batch_standin_{len(state.batches) + 1}"
+                batch = {
+                    'id': batch_id, 'object': 'batch', 'endpoint': body.get('endpoint'),
+                    'input_file_id': body['input_file_id'], 'completion_window': body.get('completion_window'),
+                    'status': 'validating', 'output_file_id': None, 'error_file_id': None, 'errors': None,
+                    'created_at': int(time.time()), 'metadata': body.get('metadata'),
+                    'request_counts': {'total': 0, 'completed': 0, 'failed': 0}
+                }
+                state.batches[batch_id] = batch
+            threading.Thread(target=run_batch, args=(state, batch_id), name=f"standin-{batch_id}", daemon=True).start()
+            self._respond_batch(batch_id)
+
+        def _respond_batch(self, batch_id: str):
+            with state.lock:
+                batch = state.batches.get(batch_id)
+                snapshot = json.loads(json.dumps(batch)) if batch is not None else None
+            if snapshot is None:
+                self._respond(404, {'error': {'message': 'batch not found'}})
+            else:
+                self._respond(200, snapshot)
+
+        def _respond(self, status: int, payload: Dict):
+            self._respond_bytes(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                                'application/json; charset=utf-8')
+
+        def _respond_bytes(self, status: int, data: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandinHandler
+
+
+def start_standin(host: str = '127.0.0.1', port: int = 0, **state_kwargs) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 대체 서버 시작 (server.state로 통계 확인, base URL은 /v1)"""
+    state = StandinState(**state_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    server.base_url = f"http://{host}:{server.server_port}/v1"
+    threading.Thread(target=server.serve_forever, name="openai-standin", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='로컬 OpenAI 호환 대체 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='응답 지연 (ms)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='추가 무작위 지연 최대값 (ms)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='503 응답 비율 (0~1)')
+    parser.add_argument('--tail-rate', type=float, default=0.0, help='꼬리 지연 요청 비율 (0~1)')
+    parser.add_argument('--tail-ms', type=float, default=0.0, help='꼬리 지연 추가 시간 (ms)')
+    parser.add_argument('--token-ms', type=float, default=0.0, help='응답 토큰당 추가 지연 (ms)')
+    parser.add_argument('--batch-drop-rate', type=float, default=0.0, help='일괄 추출 결과 누락 비율 (0~1)')
+    parser.add_argument('--batch-turnaround-ms', type=float, default=0.0, help='Batch API 작업 처리 시작 대기 (ms)')
+    args = parser.parse_args()
+
+    server = start_standin(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           fail_rate=args.fail_rate, tail_rate=args.tail_rate, tail_ms=args.tail_ms,
+                           token_ms=args.token_ms, batch_drop_rate=args.batch_drop_rate,
+                           batch_turnaround_ms=args.batch_turnaround_ms)
+    print(f"OpenAI 대체 서버: OPENAI_BASE_URL={server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,141 @@
+# scripts/soak_memory.py - 모니터 모드 메모리 soak 테스트 (가짜 서비스로 대량 이메일 처리)
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from ai_workflow_production.core.workflow_engine import WorkflowEngine
+from ai_workflow_production.utils.memory_watchdog import current_rss_bytes
+from ai_workflow_production.utils.tracing import configure_tracing
+
+
+class FakeGmailService:
+    """호출될 때마다 새로운 이메일 배치를 돌려주는 Gmail 대역"""
+
+    def __init__(self, total_emails: int, body_size: int):
+        self.total_emails = total_emails
+        self.body = ("문의드립니다. 성춘향 / 춘향서비스 / 과장 / 010-2333-3333\n" * (body_size // 60 + 1))[:body_size]
+        self.issued = 0
+        self.sent = 0
+
+    def get_recent_emails(self, minutes_ago: int = 10, max_results: int = 10, exclude_ids=None):
+        batch = []
+        while self.issued < self.total_emails and len(batch) < max_results:
+            self.issued += 1
+            batch.append({
+                'id': f"soak-{self.issued:08d}",
+                'sender': f"customer{self.issued}@example.com",
+                'subject': f"문의 #{self.issued}",
+                'content': self.body,
+                'received_at': time.time(),
+                'mailbox': 'soak@example.com'
+            })
+        return batch
+
+    def send_reply(self, to_email, subject, content, original_email_id=None):
+        self.sent += 1
+        return True
+
+
+class FakeAIService:
+    def extract_customer_info(self, email_content, sender_email):
+        return {
+            'has_all_info': True, 'name': '성춘향', 'company': '춘향서비스', 'title': '과장',
+            'phone': '010-2333-3333', 'email': sender_email, 'missing_fields': []
+        }
+
+    def generate_reply(self, customer_info, original_subject, email_content=None):
+        return {'subject': f"Re: {original_subject} - 담당자 배정 완료", 'body': "감사합니다.\n" * 50}
+
+
+class FakeSalesforceService:
+    def create_lead(self, customer_info):
+        return True
+
+
+class SoakEngine(WorkflowEngine):
+    """실제 서비스 대신 가짜 서비스를 등록하는 엔진"""
+
+    def __init__(self, total_emails: int, body_size: int, environment: str = 'development'):
+        self._fake_gmail = FakeGmailService(total_emails, body_size)
+        super().__init__(environment=environment)
+
+    def _setup_services(self):
+        self.service_manager.register_service("gmail", self._fake_gmail)
+        self.service_manager.register_service("ai", FakeAIService())
+        self.service_manager.register_service("salesforce", FakeSalesforceService())
+
+
+def run_soak(total_emails: int, batch_size: int, body_size: int, warmup_cycles: int,
+             max_growth_mb: float) -> bool:
+    engine = SoakEngine(total_emails, body_size)
+
+    # 로그/트레이스/통계 파일을 실제 운영 경로에 쓰지 않도록 비활성화
+    engine.tracer = configure_tracing({'ENABLED': False})
+    engine.freshness.state_file = None
+
+    tracemalloc.start()
+    baseline_traced = None
+    baseline_rss = None
+    cycle = 0
+    samples = []
+
+    while engine._fake_gmail.issued < total_emails:
+        cycle += 1
+        engine.process_new_emails(lookback_minutes=1, max_emails=batch_size)
+
+        if cycle == warmup_cycles:
+            baseline_traced = tracemalloc.get_traced_memory()[0]
+            baseline_rss = current_rss_bytes()
+
+        if baseline_traced is not None and cycle % max(1, warmup_cycles) == 0:
+            traced = tracemalloc.get_traced_memory()[0]
+            samples.append((engine._fake_gmail.issued, traced, current_rss_bytes()))
+
+    final_traced = tracemalloc.get_traced_memory()[0]
+    final_rss = current_rss_bytes()
+    tracemalloc.stop()
+
+    if baseline_traced is None:
+        print("❌ warmup 사이클 수가 전체 사이클 수보다 많습니다")
+        return False
+
+    print(f"{'emails':>10} {'traced MB':>10} {'RSS MB':>10}")
+    for issued, traced, rss in samples[::max(1, len(samples) // 20)]:
+        print(f"{issued:>10} {traced / 1048576:>10.2f} {rss / 1048576:>10.1f}")
+
+    traced_growth = (final_traced - baseline_traced) / 1048576
+    rss_growth = (final_rss - baseline_rss) / 1048576
+
+    print(f"\n처리 이메일: {engine._fake_gmail.issued}개 (답장 {engine._fake_gmail.sent}개)")
+    print(f"processed_emails: {len(engine.processed_emails)}개 (cap {engine.processed_emails.maxlen}, "
+          f"evicted {engine.processed_emails.evicted}개)")
+    print(f"warmup 이후 증가: traced {traced_growth:+.2f}MB, RSS {rss_growth:+.1f}MB "
+          f"(허용 {max_growth_mb}MB)")
+
+    # 아무것도 처리하지 못한 실행 (예외로 모든 이메일 실패)은 메모리가 늘지 않아도 실패
+    processed_all = engine._fake_gmail.sent == total_emails and len(engine.processed_emails) > 0
+    if not processed_all:
+        print(f"❌ 이메일 처리 실패: 답장 {engine._fake_gmail.sent}/{total_emails}개")
+    memory_stable = traced_growth <= max_growth_mb
+    print("✅ 메모리 사용량 안정" if memory_stable else "❌ 메모리 증가 감지")
+    return processed_all and memory_stable
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='모니터 모드 메모리 soak 테스트')
+    parser.add_argument('--emails', type=int, default=100_000, help='처리할 가짜 이메일 수')
+    parser.add_argument('--batch', type=int, default=50, help='사이클당 이메일 수')
+    parser.add_argument('--body-size', type=int, default=4096, help='이메일 본문 크기 (bytes)')
+    parser.add_argument('--warmup', type=int, default=250, help='기준점 측정 전 warmup 사이클 수')
+    parser.add_argument('--max-growth-mb', type=float, default=2.0, help='허용 traced 메모리 증가량')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    ok = run_soak(args.emails, args.batch, args.body_size, args.warmup, args.max_growth_mb)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,74 @@
+# scripts/train_triage.py - 메일 사전 분류 모델 학습 (라벨링된 지난 메일 JSONL → TRIAGE_CONFIG MODEL_FILE)
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from ai_workflow_production import config
+from ai_workflow_production.services.triage import (
+    INQUIRY, LABELS, NON_INQUIRY, TriageClassifier, save_model, train_model
+)
+
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+# 기본 학습 데이터: 라벨링된 지난 메일 + 문의 코퍼스(라벨 없음 = 문의)
+DEFAULT_DATA = [f"{DATA_DIR / 'triage_history.jsonl'}", f"{DATA_DIR / 'inquiry_corpus.jsonl'}:{INQUIRY}"]
+
+
+def load_labeled(spec: str) -> List[Dict]:
+    """'경로' 또는 '경로:라벨' (라벨 지정 시 label 필드가 없는 줄에 적용) → {sender, subject, content, headers, label}"""
+    path, default_label = spec, None
+    head, _, tail = spec.rpartition(':')
+    if head and tail in LABELS:
+        path, default_label = head, tail
+    samples = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            sample = json.loads(line)
+            sample.setdefault('label', default_label)
+            if sample['label'] not in LABELS:
+                raise ValueError(f"{path}:{line_no} 라벨 없음/알 수 없음: {sample['label']!r}")
+            samples.append(sample)
+    return samples
+
+
+def load_samples(specs: Optional[List[str]] = None) -> List[Dict]:
+    samples = []
+    for spec in specs or DEFAULT_DATA:
+        samples.extend(load_labeled(spec))
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='메일 사전 분류 모델 학습')
+    parser.add_argument('--data', action='append',
+                        help="라벨링된 메일 JSONL ('경로' 또는 '경로:inquiry|non_inquiry', 여러 번 지정 가능)")
+    parser.add_argument('--env', choices=['development', 'production'], default='development')
+    parser.add_argument('--output', type=Path, help='모델 파일 (기본: TRIAGE_CONFIG MODEL_FILE)')
+    parser.add_argument('--bits', type=int, default=18, help='특징 해시 버킷 수 = 2^bits')
+    parser.add_argument('--alpha', type=float, default=1.0, help='라플라스 평활')
+    parser.add_argument('--max-body-chars', type=int, default=2000, help='특징으로 쓰는 본문 앞부분 글자 수')
+    args = parser.parse_args()
+
+    triage_config = config.load_environment_config(args.env)['TRIAGE_CONFIG']
+    output = args.output or Path(triage_config['MODEL_FILE'])
+
+    samples = load_samples(args.data)
+    model = train_model(samples, bits=args.bits, alpha=args.alpha, max_body_chars=args.max_body_chars)
+    save_model(model, output)
+
+    classifier = TriageClassifier(model, triage_config['INQUIRY_MIN_PROB'], triage_config['NON_INQUIRY_MIN_PROB'])
+    results = [(sample['label'], classifier.classify(sample).label) for sample in samples]
+    print(f"학습: 문의 {model['docs'][INQUIRY]}건 / 문의 아님 {model['docs'][NON_INQUIRY]}건, "
+          f"버킷 {len(set(model['counts'][INQUIRY]) | set(model['counts'][NON_INQUIRY]))}개 → {output} "
+          f"({output.stat().st_size / 1024:.0f}KB)")
+    for label in LABELS:
+        predicted = [result for expected, result in results if expected == label]
+        summary = ', '.join(f"{name} {predicted.count(name)}" for name in (INQUIRY, NON_INQUIRY, 'uncertain'))
+        print(f"  학습 데이터 {label:<12} → {summary}")
+    print("(학습 데이터 자체 분류 결과 - 처음 보는 메일 기준 정확도는 scripts/bench_triage.py 교차 검증)")
@@ -2,13 +2,34 @@
 
 """
 AI Workflow Production - Services Package
+
+각 서비스 모듈은 처음 접근할 때 import됩니다 (googleapiclient, google-auth,
+jwt, requests 등 무거운 의존성을 짧은 CLI 실행에서 피하기 위함).
 """
 
-from .gmail_service_v2 import GmailServiceV2
-from .gemini_service_v2 import GeminiServiceV2
-from .salesforce_service_v2 import SalesforceServiceV2
-from .openai_service_v2 import OpenAIServiceV2
-from .service_manager import ServiceManager
+import importlib
+
+_LAZY_EXPORTS = {
+    'GmailServiceV2': '.gmail_service_v2',
+    'GeminiServiceV2': '.gemini_service_v2',
+    'SalesforceServiceV2': '.salesforce_service_v2',
+    'OpenAIServiceV2': '.openai_service_v2',
+    'LLMRouterService': '.llm_router',
+    'ServiceManager': '.service_manager',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
 
 
 __all__ = [
@@ -16,5 +37,6 @@ __all__ = [
     'GeminiServiceV2',
     'SalesforceServiceV2',
     'OpenAIServiceV2',
+    'LLMRouterService',
     'ServiceManager',
-]
\ No newline at end of file
+]
@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 import time
 
+from ai_workflow_production.utils.tracing import get_tracer
+
 class BaseService(ABC):
     """모든 서비스의 기본 클래스"""
     
@@ -14,6 +16,10 @@ class BaseService(ABC):
         self._authenticated = False
         self._last_auth_time = 0
         self.auth_timeout = 3600  # 1시간
+        self.circuit_breaker = None  # ServiceManager 등록 시 연결됨
+        # execute_with_retry 기본 재시도 (ServiceManager 등록 시 WORKFLOW_CONFIG.RETRY_ATTEMPTS/RETRY_DELAY로 설정)
+        self.retry_attempts = 3
+        self.retry_delay = 1.0
     
     @abstractmethod
     def authenticate(self) -> bool:
@@ -48,25 +54,62 @@ class BaseService(ABC):
         
         return success
     
+    def _circuit_allows(self, operation_name: str) -> bool:
+        """서킷이 열려 있으면 네트워크 호출 없이 즉시 실패"""
+        if self.circuit_breaker is None or self.circuit_breaker.allow_request():
+            return True
+        self.logger.warning(f"⚡ {self.service_name} 서킷 open - {operation_name} 즉시 실패")
+        return False
+    
+    def _record_outcome(self, success: bool) -> None:
+        """서킷 브레이커에 호출 결과 기록"""
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+    
+    def _release_circuit(self) -> None:
+        """서킷 허용 후 요청을 보내지 않았을 때 (속도 제한 초과 등) half-open 시험 슬롯 반환"""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
     def execute_with_retry(self, operation_name: str, operation_func, 
-                          max_retries: int = 3, retry_delay: int = 1) -> Optional[Any]:
-        """재시도 로직이 포함된 작업 실행"""
-        for attempt in range(max_retries):
-            try:
-                self.logger.debug(f"{operation_name} 실행 (시도 {attempt + 1}/{max_retries})")
-                result = operation_func()
-                self.logger.info(f"{operation_name} 성공")
-                return result
-                
-            except Exception as e:
-                self.logger.warning(f"{operation_name} 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                          max_retries: Optional[int] = None, retry_delay: Optional[float] = None) -> Optional[Any]:
+        """재시도 로직이 포함된 작업 실행 (횟수/간격을 생략하면 retry_attempts/retry_delay)"""
+        max_retries = self.retry_attempts if max_retries is None else max_retries
+        retry_delay = self.retry_delay if retry_delay is None else retry_delay
+        tracer = get_tracer()
+        with tracer.span(f"{self.service_name}.{operation_name}", max_retries=max_retries) as op_span:
+            for attempt in range(max_retries):
+                if not self._circuit_allows(operation_name):
+                    op_span.set_error("circuit open")
+                    return None
                 
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
+                try:
+                    self.logger.debug(f"{operation_name} 실행 (시도 {attempt + 1}/{max_retries})")
+                    with tracer.span("attempt", attempt=attempt + 1):
+                        result = operation_func()
+                    self._record_outcome(True)
+                    self.logger.info(f"{operation_name} 성공")
+                    op_span.set_attribute("attempts", attempt + 1)
+                    return result
                     
-                    if "auth" in str(e).lower() or "token" in str(e).lower():
-                        self.logger.info("인증 오류로 인한 재인증 시도")
-                        self.ensure_authenticated()
-        
-        self.logger.error(f"{operation_name} 최종 실패 (모든 재시도 소진)")
-        return None
\ No newline at end of file
+                except Exception as e:
+                    self._record_outcome(False)
+                    self.logger.warning(f"{operation_name} 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                    
+                    if attempt < max_retries - 1:
+                        delay = retry_delay * (attempt + 1)
+                        with tracer.span("backoff.sleep", delay_seconds=delay):
+                            time.sleep(delay)
+                        
+                        if "auth" in str(e).lower() or "token" in str(e).lower():
+                            self.logger.info("인증 오류로 인한 재인증 시도")
+                            self.ensure_authenticated()
+            
+            op_span.set_attribute("attempts", max_retries)
+            op_span.set_error("모든 재시도 소진")
+            self.logger.error(f"{operation_name} 최종 실패 (모든 재시도 소진)")
+            return None
\ No newline at end of file
@@ -0,0 +1,259 @@
+# services/batch_jobs.py - 비동기 LLM 배치 작업 (지난 메일 대량 처리: JSONL 작성 → 제출 → 완료 대기 → 결과 연결)
+
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .llm_common import (
+    COMBINED_SCHEMA, CUSTOMER_FIELDS, CUSTOMER_INFO_SCHEMA, LLMError, build_combined_prompt, build_extraction_prompt,
+    build_reply_prompt, normalize_customer_info, parse_combined_response, reply_subject
+)
+from .prompt_budget import budget_email, clip_chars
+from .reply_templates import custom_reply_reason, render_reply
+from .rule_extractor import merge_customer_info, pre_extract, split_fields
+from .structured_output import parse_structured
+from ai_workflow_production.utils.tracing import get_tracer
+
+# 더 이상 바뀌지 않는 배치 상태 (OpenAI Batch API)
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+# 처리 방식별 배치 요청 작업 (rules는 요청 없음)
+_KIND_TASKS = {'extract': 'extract', 'reply': 'reply', 'combined': 'combined'}
+
+
+class LLMBatchJob:
+    """
+    이메일 묶음의 고객 정보 추출 / 답변 작성을 LLM 배치 작업 1개로 처리
+
+    이메일마다 LLMRouterService.process_inquiry와 같은 경로를 고름:
+    - rules: 규칙으로 모든 필드 확정 + 템플릿 답변 → 요청 없음
+    - extract: 남은 필드 추출 요청 + 템플릿 답변
+    - reply: 규칙으로 모든 필드 확정 + 맞춤 답변 요청
+    - combined: 추출 + 맞춤 답변 1회 요청
+
+    요청/결과 JSONL과 배치 상태는 JOB_DIR/<시각>/에 남김.
+    결과가 없거나 해석할 수 없는 이메일은 결과에서 빠짐 (호출자가 실시간 경로로 처리)
+    """
+
+    def __init__(self, provider, config_obj):
+        """
+        Args:
+            provider: Batch API를 지원하는 제공자 (batch_request / upload_batch_file / create_batch /
+                      retrieve_batch / cancel_batch / batch_file_content - OpenAIServiceV2)
+        """
+        self.provider = provider
+        self.logger = logging.getLogger(__name__)
+
+        job_config = config_obj['BATCH_JOB_CONFIG']
+        self.completion_window = job_config.get('COMPLETION_WINDOW', '24h')
+        self.poll_interval = job_config.get('POLL_INTERVAL', 30)
+        self.max_wait = job_config.get('MAX_WAIT', 86400)
+        self.job_dir = Path(job_config['JOB_DIR'])
+        self.pre_extract_config = dict(config_obj.get('PRE_EXTRACT_CONFIG') or {})
+        self.template_config = dict(config_obj.get('REPLY_TEMPLATE_CONFIG') or {})
+        self.budget_config = dict(config_obj.get('PROMPT_BUDGET_CONFIG') or {})
+
+        self.stats = {'emails': 0, 'requests': 0, 'succeeded': 0, 'failed': 0, 'unparsed': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0}
+
+    # ------------------------------------------------------------------
+    # 요청 작성
+    # ------------------------------------------------------------------
+
+    def _budget(self, task: str, content: str) -> str:
+        if not content or not self.budget_config.get('ENABLED', False):
+            return content
+        return budget_email(content, task, self.budget_config).text
+
+    def _pre_extract(self, content: str, sender: str) -> Tuple[Dict[str, str], List[str]]:
+        if not self.pre_extract_config.get('ENABLED', False):
+            return {}, list(CUSTOMER_FIELDS)
+        return split_fields(pre_extract(content, sender), self.pre_extract_config.get('MIN_CONFIDENCE', 0.85), sender)
+
+    def plan(self, emails: List[Dict]) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        배치 입력 JSONL 줄과 이메일별 처리 계획
+
+        Returns:
+            (요청 줄 목록 - custom_id = 이메일 id, {이메일 id: {'kind', 'resolved', 'reason'}})
+        """
+        lines, plan = [], {}
+        for email in emails:
+            sender, subject = email.get('sender', ''), email.get('subject', '')
+            content = email.get('content', '')
+            if self.budget_config.get('ENABLED', False):
+                content = clip_chars(content, self.budget_config.get('MAX_SCAN_CHARS', 50000))
+            resolved, unresolved = self._pre_extract(content, sender)
+            reason = custom_reply_reason(content, self.template_config)
+
+            if unresolved and reason is None:
+                kind, prompt = 'extract', build_extraction_prompt(self._budget('extract', content), sender)
+            elif unresolved:
+                kind, prompt = 'combined', build_combined_prompt(self._budget('combined', content), sender, subject)
+            elif reason is not None:
+                custom_content = None if reason == 'templates_disabled' else self._budget('reply', content)
+                kind, prompt = 'reply', build_reply_prompt(normalize_customer_info(resolved, sender), subject,
+                                                           custom_content)
+            else:
+                kind, prompt = 'rules', None
+
+            if prompt is not None:
+                lines.append(self.provider.batch_request(email['id'], _KIND_TASKS[kind], prompt))
+            plan[email['id']] = {'kind': kind, 'resolved': resolved, 'reason': reason}
+        return lines, plan
+
+    # ------------------------------------------------------------------
+    # 제출 / 대기 / 결과
+    # ------------------------------------------------------------------
+
+    def submit(self, lines: List[Dict], directory: Path) -> Dict:
+        """요청 JSONL 저장 → 업로드 → 배치 생성"""
+        directory.mkdir(parents=True, exist_ok=True)
+        request_file = directory / 'requests.jsonl'
+        with open(request_file, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+
+        with get_tracer().span("batch_job.submit", **{'batch.requests': len(lines)}):
+            file_id = self.provider.upload_batch_file(request_file)
+            batch = self.provider.create_batch(file_id, self.completion_window, {'source': 'backfill'})
+        self._save(directory, batch)
+        self.logger.info(f"📤 LLM 배치 작업 제출: {batch['id']} (요청 {len(lines)}건, 완료 기한 {self.completion_window})")
+        return batch
+
+    def wait(self, batch: Dict, directory: Path) -> Dict:
+        """완료/실패/만료까지 POLL_INTERVAL마다 상태 확인, MAX_WAIT를 넘으면 취소 (완료된 요청 결과는 유지)"""
+        deadline = time.monotonic() + self.max_wait
+        status = batch.get('status')
+        cancelled = False
+        while batch.get('status') not in TERMINAL_STATUSES:
+            if not cancelled and time.monotonic() > deadline:
+                # 취소 후에도 cancelled가 될 때까지 확인 (그 전에 완료된 요청 결과는 output 파일에 남음)
+                self.logger.warning(f"LLM 배치 작업 대기 시간 초과 ({self.max_wait}초) → 취소: {batch['id']}")
+                self.provider.cancel_batch(batch['id'])
+                cancelled = True
+            time.sleep(self.poll_interval)
+            batch = self.provider.retrieve_batch(batch['id'])
+            if batch.get('status') != status:
+                status = batch.get('status')
+                counts = batch.get('request_counts') or {}
+                self.logger.info(f"LLM 배치 작업 상태: {status} "
+                                 f"({counts.get('completed', 0)}/{counts.get('total', 0)}, 실패 {counts.get('failed', 0)})")
+                self._save(directory, batch)
+        return batch
+
+    def _save(self, directory: Path, batch: Dict) -> None:
+        with open(directory / 'batch.json', 'w', encoding='utf-8') as f:
+            json.dump(batch, f, ensure_ascii=False, indent=2)
+
+    def outputs(self, batch: Dict, directory: Path) -> Dict[str, str]:
+        """성공한 요청의 응답 내용: {custom_id: 메시지 content} (결과 JSONL은 results.jsonl로 저장)"""
+        results: Dict[str, str] = {}
+        for key, filename in (('output_file_id', 'results.jsonl'), ('error_file_id', 'errors.jsonl')):
+            if not batch.get(key):
+                continue
+            text = self.provider.batch_file_content(batch[key])
+            (directory / filename).write_text(text, encoding='utf-8')
+            for raw in text.splitlines():
+                if not raw.strip():
+                    continue
+                line = json.loads(raw)
+                response = line.get('response') or {}
+                body = response.get('body') or {}
+                if line.get('error') or response.get('status_code') != 200:
+                    self.stats['failed'] += 1
+                    continue
+                usage = body.get('usage') or {}
+                self.stats['prompt_tokens'] += int(usage.get('prompt_tokens') or 0)
+                self.stats['completion_tokens'] += int(usage.get('completion_tokens') or 0)
+                choice = (body.get('choices') or [{}])[0]
+                content = (choice.get('message') or {}).get('content')
+                if content and choice.get('finish_reason') != 'length':
+                    results[line['custom_id']] = content
+                    self.stats['succeeded'] += 1
+                else:
+                    self.stats['failed'] += 1
+        return results
+
+    # ------------------------------------------------------------------
+    # 결과 연결
+    # ------------------------------------------------------------------
+
+    def _join_one(self, email: Dict, entry: Dict, content: Optional[str]) -> Optional[Dict]:
+        """이메일 1건의 {'customer_info', 'reply'} (결과가 없거나 해석할 수 없으면 None)"""
+        sender, subject = email.get('sender', ''), email.get('subject', '')
+        resolved, kind = entry['resolved'], entry['kind']
+
+        if kind == 'rules':
+            customer_info = normalize_customer_info(resolved, sender)
+            return {'customer_info': customer_info, 'reply': render_reply(customer_info, subject)}
+        if content is None:
+            return None
+        if kind == 'reply':
+            customer_info = normalize_customer_info(resolved, sender)
+            return {'customer_info': customer_info,
+                    'reply': {'subject': reply_subject(customer_info, subject), 'body': content}}
+
+        data = parse_structured(content, CUSTOMER_INFO_SCHEMA if kind == 'extract' else COMBINED_SCHEMA,
+                                strict=True).value
+        if kind == 'extract':
+            customer_info = normalize_customer_info(merge_customer_info(resolved, data), sender)
+            return {'customer_info': customer_info, 'reply': render_reply(customer_info, subject)}
+
+        result = parse_combined_response(data, sender, subject)
+        customer_info = normalize_customer_info(merge_customer_info(resolved, result['customer_info']), sender)
+        if customer_info['has_all_info'] != result['customer_info']['has_all_info']:
+            # 규칙 값으로 정보 완전 여부가 바뀌면 답변 유형도 달라짐 → 실시간 경로에서 다시 작성
+            return None
+        return {'customer_info': customer_info, 'reply': result['reply']}
+
+    def join(self, emails: List[Dict], plan: Dict[str, Dict], outputs: Dict[str, str]) -> Dict[str, Dict]:
+        """배치 결과를 이메일에 연결: {이메일 id: {'customer_info', 'reply'}}"""
+        joined = {}
+        for email in emails:
+            try:
+                result = self._join_one(email, plan[email['id']], outputs.get(email['id']))
+            except (LLMError, ValueError, KeyError, TypeError, AttributeError) as e:
+                self.stats['unparsed'] += 1
+                self.logger.warning(f"배치 결과 해석 실패 ({email['id']}): {e}")
+                continue
+            if result is not None:
+                joined[email['id']] = result
+        return joined
+
+    def run(self, emails: List[Dict]) -> Dict[str, Dict]:
+        """
+        계획 → 제출 → 완료 대기 → 결과 연결
+
+        Returns:
+            {이메일 id: {'customer_info', 'reply'}} - 빠진 이메일은 실시간 경로로 처리
+        """
+        lines, plan = self.plan(emails)
+        self.stats['emails'] = len(emails)
+        self.stats['requests'] = len(lines)
+        kinds = {}
+        for entry in plan.values():
+            kinds[entry['kind']] = kinds.get(entry['kind'], 0) + 1
+        self.logger.info(f"LLM 배치 작업 계획: 이메일 {len(emails)}건 → 요청 {len(lines)}건 {kinds}")
+
+        outputs: Dict[str, str] = {}
+        if lines:
+            directory = self.job_dir / datetime.now().strftime('%Y%m%d-%H%M%S')
+            batch = self.wait(self.submit(lines, directory), directory)
+            if batch.get('status') != 'completed':
+                self.logger.warning(f"LLM 배치 작업 종료 상태: {batch.get('status')} {batch.get('errors') or ''}")
+            try:
+                outputs = self.outputs(batch, directory)
+            except (LLMError, ValueError) as e:
+                self.logger.error(f"LLM 배치 결과 다운로드 실패: {e}")
+
+        joined = self.join(emails, plan, outputs)
+        self.logger.info(
+            f"LLM 배치 작업 결과: {len(joined)}/{len(emails)}건 연결 (요청 성공 {self.stats['succeeded']}, "
+            f"실패 {self.stats['failed']}, 해석 실패 {self.stats['unparsed']}, "
+            f"토큰 {self.stats['prompt_tokens']}+{self.stats['completion_tokens']})"
+        )
+        return joined
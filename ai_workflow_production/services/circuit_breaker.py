@@ -0,0 +1,147 @@
+# services/circuit_breaker.py - 외부 서비스별 서킷 브레이커
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreakerOpenError(Exception):
+    """서킷이 열려 있어 호출을 즉시 거부할 때 발생"""
+
+
+class CircuitBreaker:
+    """
+    실패율 기반 서킷 브레이커
+
+    - closed: 정상 호출. 최근 window_seconds 동안 호출이 min_calls 이상이고
+      실패율이 failure_rate_threshold 이상이면 open으로 전환
+    - open: cooldown_seconds 동안 모든 호출 즉시 거부
+    - half_open: cooldown 이후 half_open_max_calls개의 시험 호출만 허용.
+      성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, window_seconds: float = 60,
+                 min_calls: int = 5, cooldown_seconds: float = 60, half_open_max_calls: int = 1):
+        self.logger = logging.getLogger(f"{__name__}.{name}")
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._calls: Deque[Tuple[float, bool]] = deque()  # (시각, 성공 여부)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _settings(name: str, breaker_config: Dict) -> Dict:
+        """공통 설정에 서비스별 override를 적용한 생성자 인자"""
+        overrides = breaker_config.get('SERVICES', {}).get(name, {})
+        settings = {**breaker_config, **overrides}
+        return {
+            'failure_rate_threshold': settings.get('FAILURE_RATE_THRESHOLD', 0.5),
+            'window_seconds': settings.get('WINDOW_SECONDS', 60),
+            'min_calls': settings.get('MIN_CALLS', 5),
+            'cooldown_seconds': settings.get('COOLDOWN_SECONDS', 60),
+            'half_open_max_calls': settings.get('HALF_OPEN_MAX_CALLS', 1)
+        }
+
+    @classmethod
+    def from_config(cls, name: str, breaker_config: Dict) -> 'CircuitBreaker':
+        return cls(name=name, **cls._settings(name, breaker_config))
+
+    def reconfigure(self, breaker_config: Dict) -> None:
+        """임계값만 변경 (현재 상태와 윈도우 기록은 유지)"""
+        with self._lock:
+            for attribute, value in self._settings(self.name, breaker_config).items():
+                setattr(self, attribute, value)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+            self._half_open_in_flight = 0
+            self.logger.info(f"🟡 {self.name} 서킷 half-open: 시험 호출 허용")
+
+    def allow_request(self) -> bool:
+        """호출 가능 여부 (half-open에서는 시험 호출 슬롯을 차지함)"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """요청을 보내지 않고 끝난 호출의 half-open 시험 슬롯 반환 (성공/실패로 기록하지 않음)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def is_open(self) -> bool:
+        """슬롯을 차지하지 않고 open 여부만 확인"""
+        return self.state == OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._calls.clear()
+                self.logger.info(f"🟢 {self.name} 서킷 closed: 서비스 회복")
+                return
+            self._append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip("half-open 시험 호출 실패")
+                return
+            if self._state == OPEN:
+                return
+
+            self._append(False)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate_threshold:
+                self._trip(f"실패율 {failures}/{len(self._calls)}")
+
+    def _append(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._calls.append((now, ok))
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _trip(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self.logger.warning(f"🔴 {self.name} 서킷 open ({reason}): {self.cooldown_seconds}초 동안 호출 차단")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._maybe_half_open()
+            failures = sum(1 for _, ok in self._calls if not ok)
+            remaining = 0.0
+            if self._state == OPEN:
+                remaining = max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+            return {
+                'state': self._state,
+                'window_calls': len(self._calls),
+                'window_failures': failures,
+                'cooldown_remaining': round(remaining, 1)
+            }
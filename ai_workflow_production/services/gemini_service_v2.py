@@ -1,11 +1,49 @@
 # services/gemini_service_v2.py
 
-from services.base_service import BaseService
+from .base_service import BaseService
+from .llm_common import (
+    BATCH_EXTRACTION_SCHEMA, COMBINED_SCHEMA, CUSTOMER_INFO_SCHEMA, PROMPT_VERSIONS, JsonCloseScanner, LLMError,
+    PromptParts, ProviderUnavailable, build_batch_extraction_prompt, build_combined_prompt, build_extraction_prompt,
+    build_reply_prompt, empty_customer_info, fallback_reply, normalize_customer_info, parse_batch_response,
+    parse_combined_response, reply_subject
+)
+from .prompt_budget import estimate_tokens
+from .structured_output import StructuredResult, describe, parse_structured, to_gemini_schema
+from ai_workflow_production.utils.http_pool import create_session
+from ai_workflow_production.utils.llm_cache import get_llm_cache
+from ai_workflow_production.utils.rate_limiter import RateLimitExceeded, get_rate_limiter
+from ai_workflow_production.utils.tracing import get_tracer
 import os
 import json
-import re
+import threading
+import time
 import requests
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# 스트리밍 추출에서 JSON 객체가 닫혀 응답을 조기 종료한 경우의 종료 사유 (완전한 응답으로 취급)
+JSON_CLOSED = 'JSON_CLOSED'
+
+# 작업별 JSON 응답 스키마 (생성 단계에서 스키마를 강제 - 응답은 항상 JSON 객체, 해석 시 같은 스키마로 검증)
+RESPONSE_SCHEMAS = {
+    'extract': CUSTOMER_INFO_SCHEMA,
+    'combined': COMBINED_SCHEMA,
+    'extract_batch': BATCH_EXTRACTION_SCHEMA
+}
+GEMINI_RESPONSE_SCHEMAS = {task: to_gemini_schema(schema) for task, schema in RESPONSE_SCHEMAS.items()}
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """SSE 줄 스트림에서 이벤트별 data 필드 (여러 data 줄은 개행으로 연결)"""
+    data = []
+    for line in lines:
+        if not line:
+            if data:
+                yield '\n'.join(data)
+                data = []
+        elif line.startswith('data:'):
+            data.append(line[5:].lstrip(' '))
+    if data:
+        yield '\n'.join(data)
 
 class GeminiServiceV2(BaseService):
     """Gemini AI 서비스"""
@@ -15,76 +53,336 @@ class GeminiServiceV2(BaseService):
         
         # Config에서 설정 가져오기
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.base_url = 'https://generativelanguage.googleapis.com/v1'
+        gemini_config = config_obj['GEMINI_CONFIG']
+        # responseSchema(구조화 출력)는 v1beta에서 제공
+        self.base_url = gemini_config.get('BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
         self.model = 'gemini-2.0-flash-lite'
+        self.max_tokens = gemini_config.get('MAX_TOKENS', 2048)
+        self.response_schema = gemini_config.get('RESPONSE_SCHEMA', True)
+        # 스트리밍: 청크 사이 STALL_TIMEOUT초 동안 응답이 없으면 정지로 판단 (전체 타임아웃까지 기다리지 않음)
+        self.stream = gemini_config.get('STREAM', False)
+        self.stall_timeout = gemini_config.get('STALL_TIMEOUT', 10)
+        self.stream_timeout = gemini_config.get('STREAM_TIMEOUT', 60)
+        # 모든 요청이 공유하는 keep-alive 커넥션 풀 (기본 타임아웃: HTTP_POOL_CONFIG의 연결/읽기)
+        self.session = create_session('gemini', config_obj.get('HTTP_POOL_CONFIG'))
+        self._prompt_usage = {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0}
+        self._usage_lock = threading.Lock()
         
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다")
         
         self.logger.info(f"Gemini 서비스 초기화 - 모델: {self.model}")
         
-      # 2. 바로 이 위치에 authenticate 메서드를 추가합니다.
     def authenticate(self) -> bool:
-        """Gemini API 연결을 테스트하여 인증을 수행합니다."""
+        """models.get 호출로 API 키/모델을 확인합니다 (생성 호출 없음)."""
         self.logger.info("Gemini 서비스 인증 시도...")
-        return self.test_connection()
+        result = self.probe()
+        if not result['healthy']:
+            self.logger.error(f"Gemini 인증 실패: {result['detail']}")
+        return result['healthy']
+    
+    def probe(self, timeout: float = 5.0) -> Dict:
+        """models.get 호출로 연결 확인 (토큰 소모 없음)"""
+        url = f"{self.base_url}/models/{self.model}"
+        with get_tracer().span("HTTP GET models.get", **{'http.method': 'GET', 'http.url': url}) as span:
+            response = self.session.get(f"{url}?key={self.api_key}", timeout=timeout)
+            span.set_http_status(response.status_code)
+        
+        if response.status_code == 200:
+            return {'healthy': True, 'detail': response.json().get('displayName', self.model)}
+        return {'healthy': False, 'detail': f"HTTP {response.status_code}"}
     
     
-    def generate_text(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024) -> Optional[str]:
+    def generate_text(self, prompt: Union[str, PromptParts], temperature: float = 0.7,
+                      max_tokens: Optional[int] = None, task: Optional[str] = None) -> Optional[str]:
         """
         텍스트 생성 (검증된 코드 사용)
         
         Args:
-            prompt: 입력 프롬프트
+            prompt: 입력 프롬프트 (PromptParts면 고정 지시문은 컨텍스트 캐시 참조 또는 systemInstruction)
             temperature: 생성 온도 (0.0-1.0)
-            max_tokens: 최대 토큰 수
+            max_tokens: 최대 출력 토큰 수 (기본값: GEMINI_CONFIG MAX_TOKENS)
+            task: 작업 종류 (extract/reply/combined/extract_batch) - 지정 시 응답 캐시 사용,
+                  JSON 작업은 responseSchema로 출력 형식 강제 (RESPONSE_SCHEMA)
             
         Returns:
-            Optional[str]: 생성된 텍스트
+            Optional[str]: 생성된 텍스트 (캐시 적중 시 네트워크 호출 없음, 서킷 open/속도 제한 초과 시 즉시 None)
         """
+        generation_config = {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens or self.max_tokens,
+            "topP": 0.8,
+            "topK": 10
+        }
+        if self.response_schema and task in GEMINI_RESPONSE_SCHEMAS:
+            generation_config["responseMimeType"] = "application/json"
+            generation_config["responseSchema"] = GEMINI_RESPONSE_SCHEMAS[task]
+        
+        cache = get_llm_cache()
+        cache_key = None
+        if task:
+            cache_key = cache.make_key('gemini', self.model, PROMPT_VERSIONS.get(task), generation_config,
+                                       prompt.text if isinstance(prompt, PromptParts) else prompt)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"{task} 응답 캐시 적중 ({cached.tier}, 절약 토큰 {cached.tokens})")
+                return cached.text
+        
+        if not self._circuit_allows("텍스트 생성"):
+            return None
+        
+        # 보내기 전에 RPM/TPM 허용량을 받음 (429 후 재시도 대신 한도 직전에서 대기)
+        limiter = get_rate_limiter()
         try:
-            url = f"{self.base_url}/models/{self.model}:generateContent"
-            
-            headers = {'Content-Type': 'application/json'}
-            data = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": temperature,
-                    "maxOutputTokens": max_tokens,
-                    "topP": 0.8,
-                    "topK": 10
-                }
-            }
-            
-            response = requests.post(
+            admission = limiter.acquire('gemini', estimate_tokens(
+                prompt.text if isinstance(prompt, PromptParts) else prompt))
+        except RateLimitExceeded as e:
+            # 요청을 보내지 않았으므로 서킷 결과로 기록하지 않고 시험 슬롯만 반환
+            self._release_circuit()
+            self.logger.warning(f"텍스트 생성 보류: {e}")
+            return None
+        
+        try:
+            result = self._send(self._request_body(prompt, generation_config), task)
+        except requests.exceptions.RequestException as e:
+            self._record_outcome(False)
+            self.logger.error(f"텍스트 생성 중 네트워크 오류: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"텍스트 생성 중 오류: {e}")
+            return None
+        
+        if result is None:
+            return None
+        text, finish_reason, usage = result
+        # Gemini TPM은 입력 토큰 기준 (조기 종료로 usage가 없으면 추정치 유지)
+        limiter.settle(admission, usage.get('promptTokenCount', 0))
+        with self._usage_lock:
+            self._prompt_usage['calls'] += 1
+            self._prompt_usage['prompt_tokens'] += usage.get('promptTokenCount', 0)
+            self._prompt_usage['cached_tokens'] += usage.get('cachedContentTokenCount', 0)
+        self.logger.info("텍스트 생성 성공")
+        if cache_key and finish_reason in (None, 'STOP', JSON_CLOSED):
+            cache.put(cache_key, text, usage.get('totalTokenCount', 0))
+        return text
+    
+    def _request_body(self, prompt: Union[str, PromptParts], generation_config: Dict) -> Dict:
+        """generateContent 본문 (고정 지시문은 systemInstruction, 이메일별 입력은 contents)"""
+        if not isinstance(prompt, PromptParts):
+            return {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": generation_config}
+        
+        data = {
+            "contents": [{
+                "role": "user",
+                "parts": [{"text": prompt.content}]
+            }],
+            "generationConfig": generation_config,
+            "systemInstruction": {"parts": [{"text": prompt.instructions}]}
+        }
+        return data
+    
+    def _send(self, data: Dict, task: Optional[str]) -> Optional[Tuple[str, Optional[str], Dict]]:
+        if self.stream:
+            # 추출/combined 응답은 JSON 객체가 닫히면 나머지(코드 펜스, 설명 등)를 기다리지 않음
+            return self._stream_generate(data, stop_at_json=task in ('extract', 'combined', 'extract_batch'))
+        return self._generate(data)
+    
+    def _generation_failed(self, response: requests.Response) -> None:
+        """생성 실패 응답 기록 (429면 모든 워커가 Retry-After 동안 새 요청을 보내지 않도록)"""
+        self.logger.error(f"텍스트 생성 실패 ({response.status_code}): {response.text}")
+        if response.status_code == 429:
+            get_rate_limiter().throttle('gemini', response)
+    
+    def _generate(self, data: Dict) -> Optional[Tuple[str, Optional[str], Dict]]:
+        """generateContent 1회 호출: (텍스트, 종료 사유, usageMetadata) - 실패 시 None"""
+        url = f"{self.base_url}/models/{self.model}:generateContent"
+        headers = {'Content-Type': 'application/json'}
+        
+        with get_tracer().span("HTTP POST generateContent", **{
+            'http.method': 'POST', 'http.url': url, 'llm.model': self.model
+        }) as span:
+            response = self.session.post(
                 f"{url}?key={self.api_key}",
                 headers=headers,
+                json=data
+            )
+            span.set_http_status(response.status_code)
+        
+        # 5xx/429만 서비스 장애로 간주 (그 외 4xx는 요청 문제)
+        self._record_outcome(response.status_code < 500 and response.status_code != 429)
+        
+        if response.status_code != 200:
+            self._generation_failed(response)
+            return None
+        
+        result = response.json()
+        if 'candidates' in result and len(result['candidates']) > 0:
+            candidate = result['candidates'][0]
+            text = candidate['content']['parts'][0]['text']
+            return text, candidate.get('finishReason'), result.get('usageMetadata') or {}
+        
+        self.logger.error("응답에서 텍스트를 찾을 수 없습니다.")
+        return None
+    
+    def _stream_generate(self, data: Dict, stop_at_json: bool) -> Optional[Tuple[str, Optional[str], Dict]]:
+        """
+        streamGenerateContent(SSE) 호출: 조각을 이어 붙여 (텍스트, 종료 사유, usageMetadata) - 실패/정지 시 None
+        
+        - 읽기 타임아웃 = STALL_TIMEOUT (청크 사이 최대 대기), 전체는 STREAM_TIMEOUT으로 제한
+        - stop_at_json이면 최상위 JSON 객체가 닫히는 즉시 연결을 끊고 반환 (종료 사유 JSON_CLOSED)
+        """
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent"
+        headers = {'Content-Type': 'application/json'}
+        started = time.monotonic()
+        
+        with get_tracer().span("HTTP POST streamGenerateContent", **{
+            'http.method': 'POST', 'http.url': url, 'llm.model': self.model
+        }) as span:
+            response = self.session.post(
+                f"{url}?alt=sse&key={self.api_key}",
+                headers=headers,
                 json=data,
-                timeout=60
+                stream=True,
+                timeout=(self.session.timeout[0], self.stall_timeout)
             )
+            span.set_http_status(response.status_code)
             
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    text = result['candidates'][0]['content']['parts'][0]['text']
-                    self.logger.info("텍스트 생성 성공")
-                    return text
-                else:
-                    self.logger.error("응답에서 텍스트를 찾을 수 없습니다.")
+            with response:
+                if response.status_code != 200:
+                    self._record_outcome(response.status_code < 500 and response.status_code != 429)
+                    self._generation_failed(response)
                     return None
-            else:
-                self.logger.error(f"텍스트 생성 실패 ({response.status_code}): {response.text}")
-                return None
                 
-        except Exception as e:
-            self.logger.error(f"텍스트 생성 중 오류: {e}")
+                parts = []
+                scanner = JsonCloseScanner() if stop_at_json else None
+                finish_reason, usage, first_chunk = None, {}, True
+                try:
+                    # SSE는 항상 UTF-8 (charset 없는 text/event-stream을 ISO-8859-1로 해석하지 않도록 줄 단위로 디코딩)
+                    lines = (line.decode('utf-8') for line in response.iter_lines())
+                    for event in iter_sse_data(lines):
+                        if first_chunk:
+                            first_chunk = False
+                            span.set_attribute('llm.ttft_ms', round((time.monotonic() - started) * 1000, 1))
+                        chunk = json.loads(event)
+                        candidate = (chunk.get('candidates') or [{}])[0]
+                        finish_reason = candidate.get('finishReason') or finish_reason
+                        usage = chunk.get('usageMetadata') or usage
+                        for part in (candidate.get('content') or {}).get('parts') or []:
+                            text = part.get('text', '')
+                            closed = scanner.feed(text) if scanner else -1
+                            if closed >= 0:
+                                parts.append(text[:closed])
+                                finish_reason = JSON_CLOSED
+                                break
+                            parts.append(text)
+                        if finish_reason == JSON_CLOSED:
+                            span.set_attribute('llm.early_stop', True)
+                            break
+                        if time.monotonic() - started > self.stream_timeout:
+                            raise requests.exceptions.Timeout(f"스트림 전체 {self.stream_timeout}초 초과")
+                except requests.exceptions.ConnectionError as e:
+                    # 스트림 도중 읽기 타임아웃 = 청크가 STALL_TIMEOUT초 동안 오지 않음
+                    raise requests.exceptions.Timeout(f"스트림 {self.stall_timeout}초 동안 응답 없음: {e}") from e
+                except requests.exceptions.RequestException:
+                    raise  # generate_text에서 실패로 기록
+                except Exception:
+                    # 잘못된 SSE 청크 (JSON 해석 실패 등)도 실패로 기록 - half-open 시험 슬롯이 남지 않도록
+                    self._record_outcome(False)
+                    raise
+        
+        self._record_outcome(True)
+        if not parts:
+            self.logger.error("응답에서 텍스트를 찾을 수 없습니다.")
             return None
+        return ''.join(parts), finish_reason, usage
+    
+    def prompt_cache_stats(self) -> Dict[str, int]:
+        """입력 토큰 중 암시적 프롬프트 캐시 적중분 (cachedContentTokenCount)"""
+        with self._usage_lock:
+            return dict(self._prompt_usage)
+    
+    def _parse_json(self, response_text: str, task: str) -> StructuredResult:
+        """
+        작업 스키마로 응답 해석 (설명/코드 펜스 무시), 실패 시 LLMError
+
+        끊긴 응답의 부분 복구는 extract_batch만 (빠진 항목은 라우터가 1건씩 재추출) -
+        extract/combined는 필수 필드가 하나라도 없으면 LLMError → 다른 제공자 / 2회 호출 경로
+        """
+        result = parse_structured(response_text, RESPONSE_SCHEMAS[task], strict=task != 'extract_batch')
+        note = describe(result)
+        if note:
+            self.logger.warning(f"{task} 응답 부분 복구: {note}")
+        return result
+    
+    def extract_customer_info_or_raise(self, email_content: str, sender_email: str) -> Dict:
+        """고객 정보 추출, 실패 시 LLMError"""
+        prompt = build_extraction_prompt(email_content, sender_email)
+        
+        response_text = self.generate_text(prompt, temperature=0.3, task='extract')
+        
+        if not response_text:
+            raise ProviderUnavailable("Gemini 응답 없음")
+        
+        info = self._parse_json(response_text, 'extract').value
+        
+        result = normalize_customer_info(info, sender_email)
+        
+        self.logger.info(f"고객 정보 추출 완료: {result}")
+        return result
+    
+    def extract_batch_or_raise(self, emails: List[Dict]) -> Dict[str, Dict]:
+        """
+        여러 이메일의 고객 정보를 1회 호출로 추출, 응답 전체를 해석할 수 없으면 LLMError
+
+        Returns:
+            {id: 고객 정보} - 응답에 없거나 형식이 틀린 id는 빠짐
+        """
+        prompt = build_batch_extraction_prompt(emails)
+        
+        response_text = self.generate_text(prompt, temperature=0.3, task='extract_batch')
+        
+        if not response_text:
+            raise ProviderUnavailable("Gemini 응답 없음")
+        
+        # 응답이 끊겨도 완성된 결과 항목은 사용 (빠진 id는 라우터가 1건씩 재추출)
+        data = self._parse_json(response_text, 'extract_batch').value
+        results = parse_batch_response(data, emails)
+        self.logger.info(f"고객 정보 일괄 추출 완료: {len(results)}/{len(emails)}건")
+        return results
+    
+    def generate_reply_or_raise(self, customer_info: Dict, original_subject: str,
+                                email_content: Optional[str] = None) -> Dict:
+        """답변 생성 (email_content가 있으면 원문에 맞춘 답변), 실패 시 LLMError"""
+        prompt = build_reply_prompt(customer_info, original_subject, email_content)
+        
+        body = self.generate_text(prompt, temperature=0.7, task='reply')
+        
+        if not body:
+            raise ProviderUnavailable("답변 생성 실패")
+        
+        return {
+            'subject': reply_subject(customer_info, original_subject),
+            'body': body
+        }
+    
+    def process_inquiry_or_raise(self, email_content: str, sender_email: str, original_subject: str) -> Dict:
+        """고객 정보 추출 + 답변 작성을 1회 호출로 처리, 실패 시 LLMError"""
+        prompt = build_combined_prompt(email_content, sender_email, original_subject)
+        
+        response_text = self.generate_text(prompt, temperature=0.3, task='combined')
+        
+        if not response_text:
+            raise ProviderUnavailable("Gemini 응답 없음")
+        
+        # 응답이 끊기거나 필수 필드가 빠지면 LLMError → 2회 호출 경로
+        data = self._parse_json(response_text, 'combined').value
+        result = parse_combined_response(data, sender_email, original_subject)
+        self.logger.info(f"고객 정보 추출 + 답변 작성 완료 (1회 호출): {result['customer_info']}")
+        return result
     
     def extract_customer_info(self, email_content: str, sender_email: str) -> Dict:
         """
-        이메일에서 고객 정보 추출
+        이메일에서 고객 정보 추출 (실패 시 발신자 이메일만 채운 기본값)
         
         Returns:
             {
@@ -98,102 +396,15 @@ class GeminiServiceV2(BaseService):
             }
         """
         try:
-            # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼ 이 프롬프트를 교체하세요 ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
-            prompt = f"""
-Analyze the following email content to extract customer information.
-The content may include replies or forwarded messages. Ignore quoted text, previous email threads, and signatures. Focus only on the information provided in the most recent message part.
-
-Email Content:
----
-{email_content}
----
-
-From the text above, extract the following fields and respond ONLY in a valid JSON format.
-If a piece of information is not found, the value should be null.
-The "email" field should default to the sender's email if not present in the body.
-
-Sender's Email: {sender_email}
-
-Required fields:
-1. name: Full name of the person (e.g., "성춘향")
-2. company: Company name (e.g., "춘향서비스")
-3. title: Job title (e.g., "과장")
-4. phone: Contact phone number (e.g., "010-2333-3333")
-5. email: Contact email address
-
-JSON response format:
-{{
-    "name": "value or null",
-    "company": "value or null",
-    "title": "value or null",
-    "phone": "value or null",
-    "email": "value or null"
-}}
-"""
-            # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
-
-            # ... (이하 메서드의 나머지 코드는 그대로) ...
-            
-            response_text = self.generate_text(prompt, temperature=0.3)
-            
-            if not response_text:
-                raise Exception("Gemini 응답 없음")
-            
-            # JSON 파싱
-            content = response_text
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            # JSON에서 중괄호 부분만 추출
-            json_match = re.search(r'\{[^}]+\}', content, re.DOTALL)
-            if json_match:
-                info = json.loads(json_match.group())
-            else:
-                info = json.loads(content)
-            
-            # 발신자 이메일 기본값 설정
-            if not info.get('email') or info.get('email') == 'null':
-                info['email'] = sender_email
-            
-            # 누락된 필드 확인
-            required_fields = ['name', 'company', 'title', 'phone', 'email']
-            missing_fields = []
-            
-            for field in required_fields:
-                value = info.get(field)
-                if not value or value == 'null' or value == '':
-                    missing_fields.append(field)
-            
-            result = {
-                'has_all_info': len(missing_fields) == 0,
-                'name': info.get('name') if info.get('name') != 'null' else None,
-                'company': info.get('company') if info.get('company') != 'null' else None,
-                'title': info.get('title') if info.get('title') != 'null' else None,
-                'phone': info.get('phone') if info.get('phone') != 'null' else None,
-                'email': info.get('email', sender_email),
-                'missing_fields': missing_fields
-            }
-            
-            self.logger.info(f"고객 정보 추출 완료: {result}")
-            return result
-            
+            return self.extract_customer_info_or_raise(email_content, sender_email)
         except Exception as e:
             self.logger.error(f"고객 정보 추출 실패: {e}")
-            return {
-                'has_all_info': False,
-                'name': None,
-                'company': None,
-                'title': None,
-                'phone': None,
-                'email': sender_email,
-                'missing_fields': ['name', 'company', 'title', 'phone']
-            }
+            return empty_customer_info(sender_email)
     
-    def generate_reply(self, customer_info: Dict, original_subject: str) -> Dict:
+    def generate_reply(self, customer_info: Dict, original_subject: str,
+                       email_content: Optional[str] = None) -> Dict:
         """
-        고객 정보를 바탕으로 답변 생성
+        고객 정보를 바탕으로 답변 생성 (실패 시 기본 답변)
         
         Returns:
             {
@@ -202,77 +413,10 @@ JSON response format:
             }
         """
         try:
-            if customer_info['has_all_info']:
-                # 모든 정보가 있는 경우
-                prompt = f"""
-고객이 다음 정보와 함께 문의했습니다:
-- 이름: {customer_info['name']}
-- 회사: {customer_info['company']}
-- 직급: {customer_info['title']}
-- 전화번호: {customer_info['phone']}
-- 이메일: {customer_info['email']}
-
-원본 제목: {original_subject}
-
-다음 내용으로 정중한 답변 이메일을 작성해주세요:
-1. 문의에 감사 인사
-2. 고객님의 정보를 확인했다고 말하기
-3. 담당 영업팀에 연결하여 신속히 연락드리겠다고 안내
-4. 빠른 시일 내 연락드릴 것을 약속
-5. "감사합니다" 마무리
-
-전문적이고 친절한 톤으로 한국어로 작성하세요.
-"""
-            else:
-                # 정보가 부족한 경우
-                missing_kr = {
-                    'name': '성함',
-                    'company': '소속/회사명',
-                    'title': '직급',
-                    'phone': '연락처',
-                    'email': '이메일'
-                }
-                missing_list = [missing_kr.get(f, f) for f in customer_info['missing_fields']]
-                
-                prompt = f"""
-고객이 문의 이메일을 보냈지만 다음 정보가 누락되었습니다:
-{', '.join(missing_list)}
-
-원본 제목: {original_subject}
-
-다음 내용으로 정중한 답변 이메일을 작성해주세요:
-1. 문의에 감사 인사
-2. 정확한 상담을 위해 추가 정보가 필요하다고 설명
-3. 누락된 정보 목록을 정중히 요청:
-   - {chr(10).join(['   - ' + m for m in missing_list])}
-4. 정보 제공 시 신속히 답변 드리겠다고 안내
-5. "감사합니다" 마무리
-
-전문적이고 친절한 톤으로 한국어로 작성하세요.
-"""
-            
-            body = self.generate_text(prompt, temperature=0.7)
-            
-            if not body:
-                raise Exception("답변 생성 실패")
-            
-            # 제목 생성
-            if customer_info['has_all_info']:
-                subject = f"Re: {original_subject} - 담당자 배정 완료"
-            else:
-                subject = f"Re: {original_subject} - 추가 정보 요청"
-            
-            return {
-                'subject': subject,
-                'body': body
-            }
-            
+            return self.generate_reply_or_raise(customer_info, original_subject, email_content)
         except Exception as e:
             self.logger.error(f"답변 생성 실패: {e}")
-            return {
-                'subject': f"Re: {original_subject}",
-                'body': "문의 주셔서 감사합니다. 빠른 시일 내에 답변 드리겠습니다."
-            }
+            return fallback_reply(original_subject)
     
     def test_connection(self) -> bool:
         """연결 테스트"""
@@ -288,12 +432,16 @@ JSON response format:
                 }]
             }
             
-            response = requests.post(
-                f"{url}?key={self.api_key}",
-                headers=headers,
-                json=data,
-                timeout=10  # ← 30에서 10으로 단축
-            )
+            with get_tracer().span("HTTP POST generateContent (test)", **{
+                'http.method': 'POST', 'http.url': url
+            }) as span:
+                response = self.session.post(
+                    f"{url}?key={self.api_key}",
+                    headers=headers,
+                    json=data,
+                    timeout=(self.session.timeout[0], 10)  # ← 읽기 30에서 10으로 단축
+                )
+                span.set_http_status(response.status_code)
             
             if response.status_code == 200:
                 result = response.json()
@@ -11,9 +11,12 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from typing import List, Dict
+from typing import Container, Iterable, List, Dict, Optional, Set
 
 from .base_service import BaseService
+from .mail_filter import METADATA_HEADERS, REASONS, MailPrefilter, sender_address
+from ai_workflow_production.utils.http_pool import create_session
+from ai_workflow_production.utils.tracing import get_tracer
 
 class GmailServiceV2(BaseService):
     """Gmail API 서비스 (독립 실행 버전)"""
@@ -28,10 +31,12 @@ class GmailServiceV2(BaseService):
         
         self.service = None
         self.user_email = None
+        self.mail_filter = MailPrefilter.from_config(config['MAIL_FILTER_CONFIG'])
+        # 상태 확인(getProfile)용 keep-alive 세션 (메일 조회/발송은 googleapiclient가 처리)
+        self.session = create_session('gmail', config.get('HTTP_POOL_CONFIG'))
 
-    def authenticate(self) -> bool:
-        """Gmail API 인증 및 서비스 객체 생성"""
-        self.logger.info("Gmail 서비스 인증 시작...")
+    def _load_credentials(self, interactive: bool = True) -> Optional[Credentials]:
+        """저장된 토큰 로드/갱신 (interactive=False면 브라우저 인증 흐름 없이 실패)"""
         creds = None
         
         if os.path.exists(self.token_path):
@@ -46,16 +51,27 @@ class GmailServiceV2(BaseService):
                     creds = None # 새로 인증하도록 creds를 초기화
             
             if not creds:
+                if not interactive:
+                    return None
                 try:
                     flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, self.scopes)
                     creds = flow.run_local_server(port=0)
                 except Exception as e:
                     self.logger.error(f"새 인증 흐름 실패: {e}", exc_info=True)
-                    return False
+                    return None
 
             with open(self.token_path, 'w') as token:
                 token.write(creds.to_json())
         
+        return creds
+
+    def authenticate(self) -> bool:
+        """Gmail API 인증 및 서비스 객체 생성"""
+        self.logger.info("Gmail 서비스 인증 시작...")
+        creds = self._load_credentials(interactive=True)
+        if not creds:
+            return False
+        
         try:
             self.service = build('gmail', 'v1', credentials=creds)
             profile = self.service.users().getProfile(userId='me').execute()
@@ -66,8 +82,30 @@ class GmailServiceV2(BaseService):
             self.logger.error(f"Gmail 서비스 빌드 실패: {e}", exc_info=True)
             return False
 
-    def get_recent_emails(self, minutes_ago: int = 10, max_results: int = 10) -> List[Dict]:
-        """최근 이메일 조회 (자신이 보낸 이메일 제외)"""
+    def probe(self, timeout: float = 5.0) -> Dict:
+        """getProfile 호출로 연결 확인 (대화형 인증 없음, LLM/메일 호출 없음)"""
+        creds = self._load_credentials(interactive=False)
+        if not creds:
+            return {'healthy': False, 'detail': '유효한 토큰 없음 (인증 필요)'}
+        
+        with get_tracer().span("HTTP GET gmail.users.getProfile"):
+            response = self.session.get(
+                'https://gmail.googleapis.com/gmail/v1/users/me/profile',
+                headers={'Authorization': f'Bearer {creds.token}'},
+                timeout=timeout
+            )
+        if response.status_code == 200:
+            return {'healthy': True, 'detail': response.json().get('emailAddress', '')}
+        return {'healthy': False, 'detail': f"HTTP {response.status_code}"}
+
+    def get_recent_emails(self, minutes_ago: int = 10, max_results: int = 10,
+                          exclude_ids: Optional[Container[str]] = None) -> List[Dict]:
+        """
+        최근 이메일 조회 (자신이 보낸 이메일 / 자동 발송·대량 메일 / 답장 한도 초과 / 답장 루프 제외)
+
+        메타데이터(헤더)만 먼저 받아 MailPrefilter로 판단하고, 통과한 메일만 본문 조회.
+        exclude_ids(이미 처리한 id)와 이전에 제외한 id는 메타데이터도 받지 않음
+        """
         if not self.service:
             self.logger.error("❌ Gmail 서비스가 초기화되지 않았습니다.")
             return []
@@ -80,23 +118,54 @@ class GmailServiceV2(BaseService):
             
             self.logger.info(f"이메일 검색 쿼리: {query}")
             
-            results = self.service.users().messages().list(userId='me', q=query, maxResults=max_results).execute()
+            with get_tracer().span("HTTP GET gmail.messages.list", max_results=max_results):
+                results = self.service.users().messages().list(userId='me', q=query, maxResults=max_results).execute()
             messages = results.get('messages', [])
             emails = []
+            filtered = 0
+            self.mail_filter.begin_fetch()
             
             for msg in messages:
+                if (exclude_ids is not None and msg['id'] in exclude_ids) or self.mail_filter.known_drop(msg['id']):
+                    continue
                 try:
-                    email_data = self.service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
+                    email_data = None
+                    if self.mail_filter.enabled:
+                        # 1) 헤더만 조회 → 자동 발송/대량 메일/답장 한도 초과는 본문을 받지 않고 제외
+                        with get_tracer().span("HTTP GET gmail.messages.get", message_id=msg['id'], format='metadata'):
+                            metadata = self.service.users().messages().get(
+                                userId='me', id=msg['id'], format='metadata', metadataHeaders=list(METADATA_HEADERS)
+                            ).execute()
+                    else:
+                        with get_tracer().span("HTTP GET gmail.messages.get", message_id=msg['id'], format='full'):
+                            metadata = email_data = self.service.users().messages().get(
+                                userId='me', id=msg['id'], format='full'
+                            ).execute()
                     
-                    headers = email_data['payload']['headers']
-                    sender = next((h['value'] for h in headers if h['name'].lower() == 'from'), '')
-                    subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), '')
+                    headers = {h['name'].lower(): h['value'] for h in metadata['payload'].get('headers', [])}
+                    sender = headers.get('from', '')
+                    subject = headers.get('subject', '')
                     
                     # ✅ 추가 안전장치: 발신자가 자신인지 다시 한 번 체크
                     if self.user_email and self.user_email.lower() in sender.lower():
                         self.logger.info(f"자신이 보낸 이메일 건너뜀: {sender}")
                         continue
                     
+                    # Gmail 수신 시각 (internalDate: epoch ms) → freshness 측정 기준점
+                    internal_date = metadata.get('internalDate')
+                    received_at = int(internal_date) / 1000 if internal_date else None
+                    
+                    reason = self.mail_filter.check(msg['id'], headers, received_at)
+                    if reason:
+                        filtered += 1
+                        self.logger.info(f"⛔ 자동 발송/대량 메일 제외 ({REASONS[reason]}): {sender} / {subject}")
+                        continue
+                    
+                    if email_data is None:
+                        # 2) 본문 조회
+                        with get_tracer().span("HTTP GET gmail.messages.get", message_id=msg['id'], format='full'):
+                            email_data = self.service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
+                    
                     content = ""
                     if 'parts' in email_data['payload']:
                         for part in email_data['payload']['parts']:
@@ -107,19 +176,50 @@ class GmailServiceV2(BaseService):
                         content = base64.urlsafe_b64decode(email_data['payload']['body']['data']).decode('utf-8', errors='ignore')
 
                     emails.append({
-                        'id': msg['id'], 'sender': sender, 'subject': subject, 'content': content.strip()
+                        'id': msg['id'], 'sender': sender, 'subject': subject, 'content': content.strip(),
+                        'received_at': received_at, 'mailbox': self.user_email,
+                        # 사전 분류 특징용 (List-Unsubscribe, Auto-Submitted, Precedence 등)
+                        'headers': {h['name'].lower(): h['value'] for h in email_data['payload']['headers']}
                     })
                 except Exception as e:
                     self.logger.warning(f"개별 이메일 파싱 실패: {e}")
                     continue
             
-            if emails:
-                self.logger.info(f"✅ {len(emails)}개의 새 이메일 발견 (자신이 보낸 이메일 제외)")
+            self.mail_filter.save()
+            if emails or filtered:
+                self.logger.info(f"✅ {len(emails)}개의 새 이메일 발견 (자신이 보낸 이메일 제외, 자동 발송/대량 메일 {filtered}개 제외)")
             
             return emails
 
         return self.execute_with_retry("최근 이메일 조회", _get_emails) or []
 
+    def answered_ids(self, emails: Iterable[Dict]) -> Set[str]:
+        """
+        이미 답장한 메일 id (대량 처리에서 다시 답장/Lead 생성하지 않도록)
+
+        수신 이후 그 발신자에게 보낸 메일이 있으면 답장한 것으로 봄 (in:sent to:발신자 after:수신 시각).
+        처리 기록(processed_emails)은 프로세스마다 비어 있으므로 보낸편지함 기준으로 확인.
+        확인에 실패한 메일도 답장한 것으로 취급 (중복 답장보다 누락이 안전 - 다음 모니터 사이클/수동 처리)
+        """
+        if not self.service:
+            return set()
+        answered = set()
+        for email in emails:
+            address = sender_address(email.get('sender', ''))
+            if not address or not email.get('received_at'):
+                continue
+            query = f"in:sent to:{address} after:{int(email['received_at'])}"
+            try:
+                with get_tracer().span("HTTP GET gmail.messages.list", q='in:sent'):
+                    sent = self.service.users().messages().list(userId='me', q=query, maxResults=1).execute()
+            except Exception as e:
+                self.logger.warning(f"답장 여부 확인 실패 → 건너뜀 ({email.get('id')}): {e}")
+                answered.add(email['id'])
+                continue
+            if sent.get('messages'):
+                answered.add(email['id'])
+        return answered
+
     def send_reply(self, to_email: str, subject: str, content: str, original_email_id: str = None) -> bool:
         """답장 발송"""
         if not self.service:
@@ -131,11 +231,19 @@ class GmailServiceV2(BaseService):
             message['to'] = to_email
             message['from'] = self.user_email
             message['subject'] = subject
+            # RFC 3834: 자동 답장임을 표시 → 부재중 회신/자동 응답기가 다시 답하지 않음 (답장 루프 방지)
+            message['Auto-Submitted'] = 'auto-replied'
+            message['X-Auto-Response-Suppress'] = 'All'
             message.attach(MIMEText(content, 'plain', 'utf-8'))
             
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
             
-            self.service.users().messages().send(userId='me', body={'raw': raw_message}).execute()
+            with get_tracer().span("HTTP POST gmail.messages.send"):
+                self.service.users().messages().send(userId='me', body={'raw': raw_message}).execute()
+            if original_email_id:
+                # 발신자별 답장 한도는 실제로 보낸 답장 기준
+                self.mail_filter.record_reply(original_email_id, to_email)
+                self.mail_filter.save()
             return True
 
         return self.execute_with_retry(f"답장 발송 ({to_email})", _send) or False
\ No newline at end of file
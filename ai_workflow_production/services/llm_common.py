@@ -0,0 +1,394 @@
+# services/llm_common.py - AI 서비스(Gemini/OpenAI) 공통 프롬프트 및 고객 정보 형식
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Lead 생성에 필요한 고객 정보 필드 (순서 = 프롬프트/스키마 순서)
+CUSTOMER_FIELDS = ['name', 'company', 'title', 'phone', 'email']
+
+MISSING_FIELD_LABELS = {
+    'name': '성함',
+    'company': '소속/회사명',
+    'title': '직급',
+    'phone': '연락처',
+    'email': '이메일'
+}
+
+# 구조화 출력용 JSON Schema (모든 필드 필수, 값이 없으면 null)
+CUSTOMER_INFO_SCHEMA = {
+    'type': 'object',
+    'properties': {field: {'type': ['string', 'null']} for field in CUSTOMER_FIELDS},
+    'required': list(CUSTOMER_FIELDS),
+    'additionalProperties': False
+}
+
+# 추출 + 답변을 한 번에 받는 구조화 출력 스키마 (combined 모드)
+REPLY_TYPES = ('assigned', 'request_info')
+COMBINED_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        **CUSTOMER_INFO_SCHEMA['properties'],
+        'reply_type': {'type': 'string', 'enum': list(REPLY_TYPES)},
+        'reply_body': {'type': 'string'}
+    },
+    'required': [*CUSTOMER_FIELDS, 'reply_type', 'reply_body'],
+    'additionalProperties': False
+}
+
+# 여러 이메일 일괄 추출 응답 스키마 (id = 프롬프트에 붙인 이메일 번호)
+BATCH_EXTRACTION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'results': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'id': {'type': 'string'}, **CUSTOMER_INFO_SCHEMA['properties']},
+                'required': ['id', *CUSTOMER_FIELDS],
+                'additionalProperties': False
+            }
+        }
+    },
+    'required': ['results'],
+    'additionalProperties': False
+}
+
+# 작업별 프롬프트 템플릿 버전 (LLM 응답 캐시 키에 포함)
+# 프롬프트 문구/스키마/응답 해석 방식을 바꾸면 올려서 이전 응답 캐시를 무효화
+PROMPT_VERSIONS = {
+    'extract': 3,
+    'reply': 2,
+    'combined': 3,
+    'extract_batch': 3
+}
+
+
+class LLMError(Exception):
+    """AI 제공자 호출 실패 (응답 없음, 형식 오류, 서킷 open 등) - 라우터가 다른 제공자로 failover"""
+
+
+class ProviderUnavailable(LLMError):
+    """제공자 응답 없음 (네트워크 오류, 5xx/429, 서킷 open, 속도 제한, 타임아웃) - "ai" 서킷에는 이것만 실패로 기록"""
+
+
+class JsonCloseScanner:
+    """
+    스트리밍 응답에서 최상위 JSON 객체가 닫히는 위치 탐지 (문자열 안의 중괄호/이스케이프는 무시)
+
+    feed()에 조각을 순서대로 넣으면, 첫 JSON 객체에 대응하는 '}'가 나온 조각에서 그 다음 위치를 반환 (없으면 -1)
+    JSON 객체 시작은 '{' 다음 공백이 아닌 글자가 '"' 또는 '}'인 경우만 (설명 문장의 "{name, ...}"은 무시)
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.opening = False   # 시작 후보 '{'를 보고 다음 글자를 기다리는 중 (조각 경계에 걸칠 수 있음)
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, chunk: str) -> int:
+        for index, char in enumerate(chunk):
+            if self.opening:
+                if char in ' \t\r\n':
+                    continue
+                self.opening = False
+                if char in '"}':
+                    self.started, self.depth = True, 1
+            if not self.started:
+                self.opening = char == '{'
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return index + 1
+        return -1
+
+
+FALLBACK_REPLY_BODY = "문의 주셔서 감사합니다. 빠른 시일 내에 답변 드리겠습니다."
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """
+    프롬프트 = 작업별 고정 지시문(instructions) + 이메일별 입력(content)
+
+    instructions는 이메일이 바뀌어도 같은 텍스트 → 항상 앞에 둠 (Gemini systemInstruction, OpenAI system 메시지)
+    제공자 자동 프롬프트 캐시는 접두사가 최소 1024토큰 이상일 때만 적용 - 현재 지시문(약 140~610토큰)은 미달
+    template은 지시문 종류 이름 (PROMPT_INSTRUCTIONS 키)
+    """
+    instructions: str
+    content: str
+    template: str
+
+    @property
+    def text(self) -> str:
+        """단일 문자열 프롬프트 (응답 캐시 키, 토큰 추정, 지시문을 분리하지 않는 경로)"""
+        return f"{self.instructions}\n\n{self.content}"
+
+
+_FIELD_LIST = """Required fields:
+1. name: Full name of the person (e.g., "성춘향")
+2. company: Company name (e.g., "춘향서비스")
+3. title: Job title (e.g., "과장")
+4. phone: Contact phone number (e.g., "010-2333-3333")
+5. email: Contact email address"""
+
+EXTRACTION_INSTRUCTIONS = f"""Analyze the email content given below to extract customer information.
+The content may include replies or forwarded messages. Ignore quoted text, previous email threads, and signatures. Focus only on the information provided in the most recent message part.
+
+Extract the following fields and respond ONLY in a valid JSON format.
+If a piece of information is not found, the value should be null.
+The "email" field should default to the sender's email if not present in the body.
+
+{_FIELD_LIST}
+
+JSON response format:
+{{
+    "name": "value or null",
+    "company": "value or null",
+    "title": "value or null",
+    "phone": "value or null",
+    "email": "value or null"
+}}"""
+
+BATCH_EXTRACTION_INSTRUCTIONS = f"""Analyze each of the emails given below SEPARATELY to extract customer information.
+The content may include replies or forwarded messages. Ignore quoted text, previous email threads, and signatures. Focus only on the information provided in the most recent message part of each email.
+Never copy information from one email into another email's result.
+
+For every email, extract the following fields. If a piece of information is not found, the value should be null.
+
+{_FIELD_LIST}
+
+Respond ONLY in a valid JSON format with exactly one result per email id, in the same order:
+{{
+    "results": [
+        {{"id": "email id", "name": "value or null", "company": "value or null", "title": "value or null", "phone": "value or null", "email": "value or null"}}
+    ]
+}}"""
+
+
+def _email_block(email_content: str, sender_email: str) -> str:
+    return f"""Email Content:
+---
+{email_content}
+---
+
+Sender's Email: {sender_email}"""
+
+
+def build_extraction_prompt(email_content: str, sender_email: str) -> PromptParts:
+    """고객 정보 추출 프롬프트"""
+    return PromptParts(EXTRACTION_INSTRUCTIONS, _email_block(email_content, sender_email), 'extract')
+
+
+def build_batch_extraction_prompt(emails: List[Dict]) -> PromptParts:
+    """
+    여러 이메일의 고객 정보를 한 번에 추출하는 프롬프트 (지시문은 1번만 포함)
+
+    Args:
+        emails: [{'id': str, 'content': str, 'sender': str}] - id는 짧은 번호 권장
+    """
+    blocks = '\n\n'.join(
+        '<email id="{id}" sender="{sender}">\n{content}\n</email>'.format(**email)
+        for email in emails
+    )
+    return PromptParts(BATCH_EXTRACTION_INSTRUCTIONS, f"{len(emails)} emails:\n\n{blocks}", 'extract_batch')
+
+
+def parse_batch_response(data, emails: List[Dict]) -> Dict[str, Dict]:
+    """
+    일괄 추출 응답을 {id: 고객 정보}로 변환
+
+    요청에 없는 id, 중복 id, 필드 형식이 틀린 항목은 제외 (호출자가 해당 이메일만 1건씩 다시 추출)
+    """
+    senders = {email['id']: email['sender'] for email in emails}
+    entries = data.get('results') if isinstance(data, dict) else None
+    results: Dict[str, Dict] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        email_id = str(entry.get('id'))
+        if email_id not in senders or email_id in results:
+            continue
+        if any(not isinstance(entry.get(field), (str, type(None))) for field in CUSTOMER_FIELDS):
+            continue
+        results[email_id] = normalize_customer_info(entry, senders[email_id])
+    return results
+
+
+def _clean(value) -> Optional[str]:
+    """null/빈 문자열 정규화"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value in ('', 'null', 'None') else value
+
+
+def normalize_customer_info(info: Dict, sender_email: str) -> Dict:
+    """
+    모델 응답(dict)을 워크플로우 고객 정보 형식으로 변환
+
+    Returns:
+        {'has_all_info', 'name', 'company', 'title', 'phone', 'email', 'missing_fields'}
+    """
+    result = {field: _clean(info.get(field)) for field in CUSTOMER_FIELDS}
+    if not result['email']:
+        result['email'] = sender_email
+
+    missing_fields = [field for field in CUSTOMER_FIELDS if not result[field]]
+    return {'has_all_info': not missing_fields, **result, 'missing_fields': missing_fields}
+
+
+def empty_customer_info(sender_email: str) -> Dict:
+    """추출 실패 시 기본값 (발신자 이메일만 확보)"""
+    return {
+        'has_all_info': False,
+        'name': None,
+        'company': None,
+        'title': None,
+        'phone': None,
+        'email': sender_email,
+        'missing_fields': ['name', 'company', 'title', 'phone']
+    }
+
+
+def missing_field_labels(missing_fields: List[str]) -> List[str]:
+    return [MISSING_FIELD_LABELS.get(f, f) for f in missing_fields]
+
+
+# 답변 유형별 고정 지시문 (담당자 배정 / 추가 정보 요청)
+REPLY_INSTRUCTIONS = {
+    'assigned': """고객이 필요한 정보를 모두 보내 문의했습니다.
+다음 내용으로 정중한 답변 이메일을 작성해주세요:
+1. 문의에 감사 인사
+2. 고객님의 정보를 확인했다고 말하기
+3. 담당 영업팀에 연결하여 신속히 연락드리겠다고 안내
+4. 빠른 시일 내 연락드릴 것을 약속
+5. "감사합니다" 마무리
+
+전문적이고 친절한 톤으로 한국어로 작성하세요.""",
+    'request_info': """고객이 문의 이메일을 보냈지만 일부 정보가 빠져 있습니다.
+다음 내용으로 정중한 답변 이메일을 작성해주세요:
+1. 문의에 감사 인사
+2. 정확한 상담을 위해 추가 정보가 필요하다고 설명
+3. 아래 누락된 정보 목록을 정중히 요청
+4. 정보 제공 시 신속히 답변 드리겠다고 안내
+5. "감사합니다" 마무리
+
+전문적이고 친절한 톤으로 한국어로 작성하세요."""
+}
+
+
+def _custom_reply_section(email_content: Optional[str]) -> str:
+    """맞춤 답변용 고객 문의 원문 (템플릿으로 답할 수 없는 메일만 포함)"""
+    if not email_content:
+        return ""
+    return f"""
+고객 문의 원문:
+---
+{email_content}
+---
+문의 내용에 맞춰 답변하되, 가격/일정/정책처럼 확인이 필요한 내용은 약속하지 말고 담당자가 안내드리겠다고 작성하세요.
+"""
+
+
+def build_reply_prompt(customer_info: Dict, original_subject: str,
+                       email_content: Optional[str] = None) -> PromptParts:
+    """답변 생성 프롬프트 (정보 완전 여부에 따라 담당자 배정 / 추가 정보 요청, 원문이 있으면 맞춤 답변)"""
+    custom = _custom_reply_section(email_content)
+    if customer_info['has_all_info']:
+        return PromptParts(REPLY_INSTRUCTIONS['assigned'], f"""고객 정보:
+- 이름: {customer_info['name']}
+- 회사: {customer_info['company']}
+- 직급: {customer_info['title']}
+- 전화번호: {customer_info['phone']}
+- 이메일: {customer_info['email']}
+
+원본 제목: {original_subject}
+{custom}""".rstrip(), 'reply_assigned')
+
+    missing_list = missing_field_labels(customer_info['missing_fields'])
+    return PromptParts(REPLY_INSTRUCTIONS['request_info'], f"""다음 정보가 누락되었습니다:
+{chr(10).join('- ' + m for m in missing_list)}
+
+원본 제목: {original_subject}
+{custom}""".rstrip(), 'reply_request_info')
+
+
+# 답장 제목 끝에 붙는 표식 (수신 메일 제목에 여러 번 쌓이면 자동 응답기와 답장을 주고받는 루프)
+REPLY_SUBJECT_MARKERS = {'assigned': '담당자 배정 완료', 'request_info': '추가 정보 요청'}
+
+
+def reply_subject(customer_info: Dict, original_subject: str) -> str:
+    marker = REPLY_SUBJECT_MARKERS['assigned' if customer_info['has_all_info'] else 'request_info']
+    return f"Re: {original_subject} - {marker}"
+
+
+def fallback_reply(original_subject: str) -> Dict:
+    return {'subject': f"Re: {original_subject}", 'body': FALLBACK_REPLY_BODY}
+
+
+_COMBINED_LABELS = ', '.join(f"{field}({MISSING_FIELD_LABELS[field]})" for field in CUSTOMER_FIELDS)
+
+COMBINED_INSTRUCTIONS = f"""{EXTRACTION_INSTRUCTIONS}
+
+Then, in the same JSON object, write the reply email body to the customer.
+
+- If ALL of {_COMBINED_LABELS} were found, set "reply_type" to "assigned" and write (한국어):
+  1. 문의에 감사 인사 2. 고객님의 정보를 확인했다고 말하기
+  3. 담당 영업팀에 연결하여 신속히 연락드리겠다고 안내 4. 빠른 시일 내 연락드릴 것을 약속 5. "감사합니다" 마무리
+- Otherwise set "reply_type" to "request_info" and write (한국어):
+  1. 문의에 감사 인사 2. 정확한 상담을 위해 추가 정보가 필요하다고 설명
+  3. 누락된 정보 목록을 정중히 요청 4. 정보 제공 시 신속히 답변 드리겠다고 안내 5. "감사합니다" 마무리
+
+전문적이고 친절한 톤으로 작성하세요. Put the reply text in "reply_body"."""
+
+# 고정 지시문 종류별 텍스트 (PromptParts.template → 지시문)
+PROMPT_INSTRUCTIONS = {
+    'extract': EXTRACTION_INSTRUCTIONS,
+    'reply_assigned': REPLY_INSTRUCTIONS['assigned'],
+    'reply_request_info': REPLY_INSTRUCTIONS['request_info'],
+    'combined': COMBINED_INSTRUCTIONS,
+    'extract_batch': BATCH_EXTRACTION_INSTRUCTIONS
+}
+
+
+def build_combined_prompt(email_content: str, sender_email: str, original_subject: str) -> PromptParts:
+    """고객 정보 추출과 답변 작성을 한 번에 요청하는 프롬프트 (combined 모드)"""
+    return PromptParts(COMBINED_INSTRUCTIONS,
+                       f"{_email_block(email_content, sender_email)}\n\nOriginal subject: {original_subject}",
+                       'combined')
+
+
+def parse_combined_response(data: Dict, sender_email: str, original_subject: str) -> Dict:
+    """
+    combined 응답을 (고객 정보, 답변)으로 변환
+
+    모델이 판단한 reply_type이 실제 누락 필드와 다르면(예: 전화번호 없는데 담당자 배정 답변)
+    잘못된 답장을 보내지 않도록 LLMError → 2회 호출 경로로 대체
+
+    Returns:
+        {'customer_info': {...}, 'reply': {'subject', 'body'}}
+    """
+    customer_info = normalize_customer_info(data, sender_email)
+    expected_type = 'assigned' if customer_info['has_all_info'] else 'request_info'
+    if data.get('reply_type') != expected_type:
+        raise LLMError(f"reply_type 불일치 ({data.get('reply_type')} != {expected_type})")
+
+    body = (data.get('reply_body') or '').strip()
+    if not body:
+        raise LLMError("reply_body 없음")
+    return {
+        'customer_info': customer_info,
+        'reply': {'subject': reply_subject(customer_info, original_subject), 'body': body}
+    }
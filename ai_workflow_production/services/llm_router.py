@@ -0,0 +1,640 @@
+# services/llm_router.py - 여러 AI 제공자를 묶는 "ai" 서비스 (작업별 라우팅, failover, hedged 요청)
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .base_service import BaseService
+from .circuit_breaker import CircuitBreaker
+from .llm_common import (
+    CUSTOMER_FIELDS, LLMError, ProviderUnavailable, empty_customer_info, fallback_reply, normalize_customer_info
+)
+from .prompt_budget import budget_email, clip_chars, estimate_tokens
+from .reply_templates import custom_reply_reason, render_reply
+from .rule_extractor import merge_customer_info, pre_extract, split_fields
+from ai_workflow_production.utils.freshness import percentile
+from ai_workflow_production.utils.tracing import get_tracer
+
+
+def default_provider_factories(config_obj) -> Dict[str, Callable[[], BaseService]]:
+    """기본 제공자 생성 함수 (모듈은 제공자를 처음 사용할 때 import)"""
+    def openai_factory():
+        from .openai_service_v2 import OpenAIServiceV2
+        return OpenAIServiceV2(config_obj)
+
+    def gemini_factory():
+        from .gemini_service_v2 import GeminiServiceV2
+        return GeminiServiceV2(config_obj)
+
+    return {'openai': openai_factory, 'gemini': gemini_factory}
+
+
+class LLMRouterService(BaseService):
+    """
+    AI 제공자 라우터 (GeminiServiceV2/OpenAIServiceV2와 같은 계약)
+
+    - ROUTES 순서대로 제공자 선택 (생성 실패/서킷 open 제공자는 건너뜀)
+    - 오류나 TIMEOUTS 초과 시 다음 제공자로 failover
+    - hedge 대상 작업은 1순위 제공자가 최근 p95 지연을 넘기면 2순위에도 요청하고 먼저 성공한 응답 사용
+      (hedge 비율은 MAX_RATIO로 제한하여 평균 비용 증가를 억제)
+    """
+
+    def __init__(self, config_obj, factories: Optional[Dict[str, Callable[[], BaseService]]] = None):
+        super().__init__("LLMRouter")
+
+        router_config = config_obj['LLM_ROUTER_CONFIG']
+        self.routes = {task: list(names) for task, names in router_config['ROUTES'].items()}
+        self.timeouts = dict(router_config.get('TIMEOUTS', {}))
+        self.hedge_config = dict(router_config.get('HEDGE', {}))
+        self.latency_window = router_config.get('LATENCY_WINDOW', 200)
+        self._breaker_config = config_obj['CIRCUIT_BREAKER_CONFIG']
+        self.pre_extract_config = dict(config_obj.get('PRE_EXTRACT_CONFIG') or {})
+        self.template_config = dict(config_obj.get('REPLY_TEMPLATE_CONFIG') or {})
+        self.budget_config = dict(config_obj.get('PROMPT_BUDGET_CONFIG') or {})
+        self.batch_config = dict(config_obj.get('BATCH_EXTRACT_CONFIG') or {})
+
+        self._factories = factories or default_provider_factories(config_obj)
+        self._providers: Dict[str, BaseService] = {}
+        self._provider_errors: Dict[str, str] = {}
+        self._provider_lock = threading.Lock()
+
+        # 제공자/작업별 최근 성공 지연 (초) 및 통계
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+        # 규칙 기반 사전 추출 결과: 모두 확정(LLM 생략) / 일부 확정 / 확정 없음
+        self._pre_extract_stats = {'rules_only': 0, 'partial': 0, 'llm_only': 0}
+        # 답변 경로 (템플릿 / LLM / 기본 답변) 및 LLM 맞춤 답변 사유별 수
+        self._reply_stats = {'template': 0, 'llm': 0, 'fallback': 0}
+        self._custom_reasons: Dict[str, int] = {}
+        # LLM에 보낸 본문의 정리 전/후 추정 토큰 합계와 예산 초과로 잘린 수
+        self._budget_stats = {'calls': 0, 'tokens_before': 0, 'tokens_after': 0, 'truncated': 0}
+        # 일괄 추출: 요청 수 / 요청에 담은 이메일 수 / 1건씩 다시 추출한 이메일 수 / 요청 전체 실패 수
+        self._batch_stats = {'batches': 0, 'batched_emails': 0, 'item_fallbacks': 0, 'batch_failures': 0}
+
+        # 제공자 호출 스레드 (hedge/타임아웃 처리용). 타임아웃된 호출은 끝날 때까지 슬롯을 차지함
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-router")
+
+        self.logger.info(f"AI 라우터 초기화 - 경로: {self.routes}")
+
+    # ------------------------------------------------------------------
+    # 제공자 관리
+    # ------------------------------------------------------------------
+
+    def provider(self, name: str) -> Optional[BaseService]:
+        """제공자 인스턴스 (처음 사용할 때 생성, 생성 실패 시 None)"""
+        provider = self._providers.get(name)
+        if provider is not None or name in self._provider_errors:
+            return provider
+
+        with self._provider_lock:
+            if name in self._providers or name in self._provider_errors:
+                return self._providers.get(name)
+            try:
+                provider = self._factories[name]()
+            except Exception as e:
+                self._provider_errors[name] = f"{type(e).__name__}: {e}"
+                self.logger.warning(f"AI 제공자 {name} 사용 불가: {e}")
+                return None
+            # 제공자별 서킷 (한 제공자 장애가 "ai" 전체 서킷을 열지 않도록)
+            provider.circuit_breaker = CircuitBreaker.from_config(f"ai.{name}", self._breaker_config)
+            self._providers[name] = provider
+            return provider
+
+    def provider_names(self) -> List[str]:
+        return list(dict.fromkeys(name for names in self.routes.values() for name in names))
+
+    def _candidates(self, task: str) -> List[str]:
+        """작업 경로 중 현재 호출 가능한 제공자 (서킷 open 제외)"""
+        candidates = []
+        for name in self.routes.get(task, self.provider_names()):
+            provider = self.provider(name)
+            if provider is None:
+                continue
+            if provider.circuit_breaker is not None and provider.circuit_breaker.is_open():
+                continue
+            candidates.append(name)
+        return candidates
+
+    def authenticate(self) -> bool:
+        """제공자를 모두 인증하고 하나라도 성공하면 True"""
+        self.logger.info("AI 라우터 인증 시도...")
+        self._provider_errors.clear()  # 생성 실패 제공자도 재시도 (예: 키 추가 후 초기화 재시도)
+        ready = []
+        for name in self.provider_names():
+            provider = self.provider(name)
+            try:
+                if provider is not None and provider.authenticate():
+                    ready.append(name)
+            except Exception as e:
+                self.logger.warning(f"AI 제공자 {name} 인증 실패: {e}")
+        if not ready:
+            self.logger.error(f"사용 가능한 AI 제공자 없음: {self._provider_errors or '모두 인증 실패'}")
+            return False
+        self.logger.info(f"사용 가능한 AI 제공자: {ready}")
+        return True
+
+    def probe(self, timeout: float = 5.0) -> Dict:
+        """제공자별 프로브 (하나라도 정상이면 healthy)"""
+        details = []
+        healthy = False
+        for name in self.provider_names():
+            provider = self.provider(name)
+            if provider is None:
+                details.append(f"{name}: {self._provider_errors.get(name)}")
+                continue
+            try:
+                result = provider.probe(timeout=timeout)
+            except Exception as e:
+                result = {'healthy': False, 'detail': f"{type(e).__name__}: {e}"}
+            healthy = healthy or result['healthy']
+            details.append(f"{name}: {'ok' if result['healthy'] else result['detail']}")
+        return {'healthy': healthy, 'detail': ', '.join(details)}
+
+    # ------------------------------------------------------------------
+    # 라우팅
+    # ------------------------------------------------------------------
+
+    def _count(self, name: str, key: str) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, {'calls': 0, 'failures': 0, 'timeouts': 0,
+                                                  'hedges': 0, 'hedge_wins': 0})
+            stats[key] += 1
+
+    def _record_latency(self, name: str, task: str, seconds: float) -> None:
+        with self._stats_lock:
+            self._latencies.setdefault((name, task), deque(maxlen=self.latency_window)).append(seconds)
+
+    def _hedge_delay(self, name: str, task: str) -> Optional[float]:
+        """hedge 요청까지 대기 시간 (hedge 대상이 아니거나 비율 상한 초과 시 None)"""
+        hedge = self.hedge_config
+        if not hedge.get('ENABLED') or task not in hedge.get('TASKS', ()):
+            return None
+
+        with self._stats_lock:
+            calls = sum(s['calls'] for s in self._stats.values())
+            hedges = sum(s['hedges'] for s in self._stats.values())
+            samples = list(self._latencies.get((name, task), ()))
+        if calls and hedges / calls >= hedge.get('MAX_RATIO', 0.1):
+            return None
+
+        if len(samples) < hedge.get('MIN_SAMPLES', 20):
+            return hedge.get('INITIAL_DELAY', 5.0)
+        return max(hedge.get('MIN_DELAY', 0.2), percentile(samples, hedge.get('PERCENTILE', 95)))
+
+    def _invoke(self, name: str, task: str, method: str, args: tuple):
+        """
+        제공자 1회 호출 (실행 스레드에서 수행)
+
+        hedge에 져서 버려지는 응답도 지연을 기록해야 p95가 낮게 치우치지 않음
+        """
+        provider = self._providers[name]
+        with get_tracer().span(f"llm.{task}", **{'llm.provider': name}):
+            started = time.perf_counter()
+            result = getattr(provider, method)(*args)
+            self._record_latency(name, task, time.perf_counter() - started)
+            return result
+
+    def route(self, task: str, method: str, *args):
+        """
+        작업을 제공자에 라우팅 (failover + hedge)
+
+        Raises:
+            ProviderUnavailable: 호출 가능한 제공자가 없거나 모두 응답 없음/타임아웃
+            LLMError: 모든 제공자 실패 (하나라도 응답은 왔지만 해석/검증 실패)
+        """
+        candidates = self._candidates(task)
+        if not candidates:
+            raise ProviderUnavailable(f"사용 가능한 AI 제공자 없음 ({task})")
+
+        timeout = self.timeouts.get(task, 60)
+        queue = list(candidates)
+        pending = {}   # future -> (제공자, 시작 시각)
+        errors = []
+        unavailable = True   # 모든 실패가 응답 없음/타임아웃인지
+        hedged_with = None
+
+        def launch(name: str):
+            self._count(name, 'calls')
+            # 스레드는 ContextVar를 상속하지 않으므로 현재 트레이스 컨텍스트를 복사해서 실행
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, self._invoke, name, task, method, args)
+            pending[future] = (name, time.monotonic())
+            return future
+
+        primary = queue.pop(0)
+        primary_future = launch(primary)
+        hedge_delay = self._hedge_delay(primary, task) if queue else None
+        hedge_at = pending[primary_future][1] + hedge_delay if hedge_delay is not None else None
+
+        while pending:
+            wake_at = min(started + timeout for _, started in pending.values())
+            if hedge_at is not None:
+                wake_at = min(wake_at, hedge_at)
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self._count(name, 'failures')
+                    unavailable = unavailable and isinstance(e, ProviderUnavailable)
+                    errors.append(f"{name}: {e}")
+                    self.logger.warning(f"AI 제공자 {name} {task} 실패: {e}")
+                    if future is primary_future:
+                        hedge_at = None
+                    if not pending and queue:
+                        launch(queue.pop(0))
+                    continue
+
+                if name == hedged_with:
+                    self._count(name, 'hedge_wins')
+                return result
+
+            if done:
+                continue
+
+            now = time.monotonic()
+            # hedge: 1순위가 아직 진행 중이고 최근 p95 지연을 넘김 → 2순위에 동시 요청
+            if hedge_at is not None and now >= hedge_at:
+                hedge_at = None
+                if primary_future in pending and queue:
+                    hedged_with = queue.pop(0)
+                    self._count(hedged_with, 'hedges')
+                    self.logger.info(f"⏱️ {primary} {task} {hedge_delay:.2f}초 초과 → {hedged_with} hedge 요청")
+                    launch(hedged_with)
+                continue
+
+            # 타임아웃된 호출은 결과를 기다리지 않고 다음 제공자로 failover
+            # (제공자 서킷에는 버려진 호출이 끝날 때 제공자가 직접 기록 - 읽기 타임아웃이 상한)
+            for future, (name, started) in list(pending.items()):
+                if now >= started + timeout:
+                    pending.pop(future)
+                    self._count(name, 'timeouts')
+                    errors.append(f"{name}: {timeout}초 타임아웃")
+                    self.logger.warning(f"AI 제공자 {name} {task} {timeout}초 타임아웃")
+            if not pending and queue:
+                launch(queue.pop(0))
+
+        error_type = ProviderUnavailable if unavailable else LLMError
+        raise error_type(f"모든 AI 제공자 실패 ({task}): {'; '.join(errors)}")
+
+    # ------------------------------------------------------------------
+    # AI 서비스 계약
+    # ------------------------------------------------------------------
+
+    def _record_failure(self, error: Exception) -> None:
+        """
+        "ai" 서킷에는 제공자 가용성 실패(ProviderUnavailable)만 기록
+
+        응답은 왔지만 해석/검증에 실패했거나 라우터 내부 오류면 시험 슬롯만 반환
+        (제공자는 살아 있으므로 서킷을 열면 규칙/기본 답변으로 불필요하게 대체됨)
+        """
+        if isinstance(error, ProviderUnavailable):
+            self._record_outcome(False)
+        else:
+            self._release_circuit()
+
+    def _clip(self, email_content: str) -> str:
+        """매우 긴 본문(뉴스레터 등)은 규칙 추출/정리 전에 MAX_SCAN_CHARS로 먼저 자름"""
+        if not self.budget_config.get('ENABLED', False):
+            return email_content
+        return clip_chars(email_content, self.budget_config.get('MAX_SCAN_CHARS', 50000))
+
+    def _budget(self, task: str, email_content: Optional[str]) -> Optional[str]:
+        """LLM에 보낼 본문: 정리(인용/고지문/반복 줄 제거) 후 작업별 토큰 예산에 맞춤"""
+        if not email_content or not self.budget_config.get('ENABLED', False):
+            return email_content
+
+        with get_tracer().span("llm.prompt_budget", **{'llm.task': task}) as span:
+            budgeted = budget_email(email_content, task, self.budget_config)
+            span.set_attribute('prompt_budget.tokens_before', budgeted.tokens_before)
+            span.set_attribute('prompt_budget.tokens_after', budgeted.tokens_after)
+            span.set_attribute('prompt_budget.truncated', budgeted.truncated)
+
+        with self._stats_lock:
+            self._budget_stats['calls'] += 1
+            self._budget_stats['tokens_before'] += budgeted.tokens_before
+            self._budget_stats['tokens_after'] += budgeted.tokens_after
+            self._budget_stats['truncated'] += budgeted.truncated
+        if budgeted.truncated:
+            self.logger.info(f"{task} 본문이 토큰 예산 초과로 잘림 "
+                             f"(추정 {budgeted.tokens_before} → {budgeted.tokens_after} 토큰)")
+        return budgeted.text
+
+    def _pre_extract(self, email_content: str, sender_email: str) -> Tuple[Dict[str, str], List[str]]:
+        """규칙 기반 사전 추출: (확정된 필드 값, LLM이 채워야 할 필드) - 비활성화 시 ({}, 전체 필드)"""
+        if not self.pre_extract_config.get('ENABLED', False):
+            return {}, list(CUSTOMER_FIELDS)
+
+        with get_tracer().span("llm.pre_extract") as span:
+            resolved, unresolved = split_fields(pre_extract(email_content, sender_email),
+                                                self.pre_extract_config.get('MIN_CONFIDENCE', 0.85), sender_email)
+            span.set_attribute('pre_extract.resolved', ','.join(resolved))
+            span.set_attribute('pre_extract.unresolved', ','.join(unresolved))
+
+        outcome = 'rules_only' if not unresolved else 'partial' if resolved else 'llm_only'
+        with self._stats_lock:
+            self._pre_extract_stats[outcome] += 1
+        return resolved, unresolved
+
+    def _complete_extraction_or_raise(self, email_content: str, sender_email: str,
+                                      resolved: Dict[str, str], unresolved: List[str]) -> Dict:
+        """규칙으로 확정되지 않은 필드가 있을 때만 LLM 호출 (확정된 규칙 값이 LLM 값보다 우선)"""
+        if not unresolved:
+            self.logger.info("규칙 기반 추출로 모든 필드 확정 → LLM 호출 생략")
+            return normalize_customer_info(resolved, sender_email)
+
+        llm_info = self.route('extract', 'extract_customer_info_or_raise',
+                              self._budget('extract', email_content), sender_email)
+        if not resolved:
+            return llm_info
+        return normalize_customer_info(merge_customer_info(resolved, llm_info), sender_email)
+
+    def _extract_or_default(self, email_content: str, sender_email: str,
+                            resolved: Dict[str, str], unresolved: List[str]) -> Dict:
+        """고객 정보 추출 (LLM 실패/서킷 open 시 규칙으로 확정된 필드 + 발신자 이메일)"""
+        if unresolved and not self._circuit_allows("고객 정보 추출"):
+            return normalize_customer_info(resolved, sender_email) if resolved else empty_customer_info(sender_email)
+        try:
+            result = self._complete_extraction_or_raise(email_content, sender_email, resolved, unresolved)
+            if unresolved:
+                self._record_outcome(True)
+            return result
+        except Exception as e:
+            if unresolved:
+                self._record_failure(e)
+            self.logger.error(f"고객 정보 추출 실패: {e}")
+            return normalize_customer_info(resolved, sender_email) if resolved else empty_customer_info(sender_email)
+
+    def extract_customer_info_or_raise(self, email_content: str, sender_email: str) -> Dict:
+        email_content = self._clip(email_content)
+        resolved, unresolved = self._pre_extract(email_content, sender_email)
+        return self._complete_extraction_or_raise(email_content, sender_email, resolved, unresolved)
+
+    def generate_reply_or_raise(self, customer_info: Dict, original_subject: str,
+                                email_content: Optional[str] = None) -> Dict:
+        """LLM 답변 생성 (email_content가 있으면 원문에 맞춘 답변), 실패 시 LLMError"""
+        return self.route('reply', 'generate_reply_or_raise', customer_info, original_subject,
+                          self._budget('reply', email_content))
+
+    def process_inquiry_or_raise(self, email_content: str, sender_email: str, original_subject: str) -> Dict:
+        return self.route('combined', 'process_inquiry_or_raise',
+                          self._budget('combined', email_content), sender_email, original_subject)
+
+    def _count_reply(self, source: str, reason: Optional[str] = None) -> None:
+        with self._stats_lock:
+            self._reply_stats[source] += 1
+            if reason:
+                kind = reason.split(':', 1)[0]
+                self._custom_reasons[kind] = self._custom_reasons.get(kind, 0) + 1
+
+    def _llm_reply(self, customer_info: Dict, original_subject: str,
+                   email_content: Optional[str]) -> Tuple[Dict, str]:
+        """LLM 답변: (답변, 'llm' | 'fallback')"""
+        if not self._circuit_allows("답변 생성"):
+            return fallback_reply(original_subject), 'fallback'
+        try:
+            result = self.generate_reply_or_raise(customer_info, original_subject, email_content)
+            self._record_outcome(True)
+            return result, 'llm'
+        except Exception as e:
+            self._record_failure(e)
+            self.logger.error(f"답변 생성 실패: {e}")
+            return fallback_reply(original_subject), 'fallback'
+
+    def _reply(self, customer_info: Dict, original_subject: str, email_content: Optional[str],
+               reason: Optional[str]) -> Tuple[Dict, str]:
+        """
+        답변 작성: (답변, 'template' | 'llm' | 'fallback')
+
+        맞춤 답변이 필요 없으면(reason None) 템플릿, 필요하면 원문을 포함한 프롬프트로 LLM
+        """
+        if reason is None:
+            reply, source = render_reply(customer_info, original_subject), 'template'
+        else:
+            custom_content = email_content if reason != 'templates_disabled' else None
+            reply, source = self._llm_reply(customer_info, original_subject, custom_content)
+        self._count_reply(source, reason if reason != 'templates_disabled' else None)
+        return reply, source
+
+    def process_inquiry(self, email_content: str, sender_email: str, original_subject: str) -> Dict:
+        """
+        고객 정보 추출 + 답변 생성
+
+        - 정형 답변으로 충분한 메일: 추출(규칙 → 남은 필드만 LLM) + 템플릿 답변
+        - 맞춤 답변이 필요한 메일: 규칙으로 모두 확정되면 답변만 LLM,
+          아니면 1회 호출(추출 + 답변), 실패 시 2회 호출 경로로 대체
+
+        Returns:
+            {'customer_info': {...}, 'reply': {'subject', 'body'},
+             'mode': 'rules' | 'extract' | 'combined' | 'two_call',
+             'reply_source': 'template' | 'llm' | 'fallback'}
+        """
+        email_content = self._clip(email_content)
+        resolved, unresolved = self._pre_extract(email_content, sender_email)
+        reason = custom_reply_reason(email_content, self.template_config)
+
+        if reason is None or not unresolved:
+            customer_info = self._extract_or_default(email_content, sender_email, resolved, unresolved)
+            reply, source = self._reply(customer_info, original_subject, email_content, reason)
+            return {
+                'customer_info': customer_info,
+                'reply': reply,
+                'mode': 'extract' if unresolved else 'rules',
+                'reply_source': source
+            }
+
+        if self._circuit_allows("추출 + 답변 (1회 호출)"):
+            try:
+                result = self.process_inquiry_or_raise(email_content, sender_email, original_subject)
+                self._record_outcome(True)
+                customer_info, reply = result['customer_info'], result['reply']
+                if resolved:
+                    customer_info = normalize_customer_info(merge_customer_info(resolved, customer_info),
+                                                            sender_email)
+                if customer_info['has_all_info'] != result['customer_info']['has_all_info']:
+                    # 규칙 값으로 정보 완전 여부가 바뀌면 답변 유형도 달라지므로 다시 작성
+                    reply, source = self._reply(customer_info, original_subject, email_content, reason)
+                else:
+                    source = 'llm'
+                    self._count_reply(source, reason if reason != 'templates_disabled' else None)
+                return {'customer_info': customer_info, 'reply': reply, 'mode': 'combined', 'reply_source': source}
+            except Exception as e:
+                self._record_failure(e)
+                self.logger.warning(f"1회 호출 처리 실패 → 2회 호출로 대체: {e}")
+
+        customer_info = self._extract_or_default(email_content, sender_email, resolved, unresolved)
+        reply, source = self._reply(customer_info, original_subject, email_content, reason)
+        return {'customer_info': customer_info, 'reply': reply, 'mode': 'two_call', 'reply_source': source}
+
+    def extract_customer_info(self, email_content: str, sender_email: str) -> Dict:
+        """이메일에서 고객 정보 추출 (모든 제공자 실패 시 규칙으로 확정된 필드 + 발신자 이메일)"""
+        email_content = self._clip(email_content)
+        resolved, unresolved = self._pre_extract(email_content, sender_email)
+        return self._extract_or_default(email_content, sender_email, resolved, unresolved)
+
+    def reconfigure_batch(self, batch_config: Dict) -> None:
+        """BATCH_EXTRACT_CONFIG 변경 반영 (설정 hot reload - 다음 일괄 추출부터)"""
+        self.batch_config = dict(batch_config)
+
+    def _split_batches(self, items: List[Dict]) -> List[List[Dict]]:
+        """순서를 유지하며 MAX_EMAILS / MAX_INPUT_TOKENS(본문 추정 토큰 합계) 안에서 요청 단위로 나눔"""
+        max_emails = self.batch_config.get('MAX_EMAILS', 10)
+        max_tokens = self.batch_config.get('MAX_INPUT_TOKENS', 6000)
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        current_tokens = 0
+        for item in items:
+            if current and (len(current) >= max_emails or current_tokens + item['tokens'] > max_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += item['tokens']
+        if current:
+            batches.append(current)
+        return batches
+
+    def _extract_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        """
+        요청 1회로 batch의 고객 정보 추출: {message id: LLM 추출 결과}
+
+        프롬프트에는 메시지 id 대신 짧은 번호를 붙이고 결과를 다시 메시지 id로 매핑.
+        요청 전체가 실패하면 빈 dict (호출자가 1건씩 추출로 대체)
+        """
+        if not self._circuit_allows("고객 정보 일괄 추출"):
+            return {}
+        prompt_emails = [{'id': str(index), 'content': item['content'], 'sender': item['sender']}
+                         for index, item in enumerate(batch, 1)]
+        try:
+            with get_tracer().span("llm.extract_batch", **{'batch.size': len(batch)}) as span:
+                extracted = self.route('extract_batch', 'extract_batch_or_raise', prompt_emails)
+                span.set_attribute('batch.parsed', len(extracted))
+            self._record_outcome(True)
+        except Exception as e:
+            self._record_failure(e)
+            with self._stats_lock:
+                self._batch_stats['batch_failures'] += 1
+            self.logger.error(f"고객 정보 일괄 추출 실패 ({len(batch)}건) → 1건씩 추출로 대체: {e}")
+            return {}
+        with self._stats_lock:
+            self._batch_stats['batches'] += 1
+            self._batch_stats['batched_emails'] += len(batch)
+        return {item['id']: extracted[str(index)] for index, item in enumerate(batch, 1)
+                if str(index) in extracted}
+
+    def extract_customer_info_batch(self, emails: List[Dict]) -> Dict[str, Dict]:
+        """
+        여러 이메일의 고객 정보 추출 (요청 1회에 여러 건 - 지시문/요청 오버헤드 분산)
+
+        - 규칙으로 모든 필드가 확정된 이메일은 LLM 호출 없음
+        - 나머지는 MAX_EMAILS / MAX_INPUT_TOKENS 단위로 나눠 일괄 추출
+          (LLM이 필요한 이메일이 MIN_EMAILS보다 적으면 1건씩)
+        - 요청 전체 실패, 또는 결과가 빠지거나 형식이 틀린 이메일은 그 이메일만 1건씩 추출로 대체
+
+        Args:
+            emails: [{'id': 메시지 id, 'content': 본문, 'sender': 발신자 이메일}]
+
+        Returns:
+            {메시지 id: 고객 정보} (extract_customer_info와 같은 형식)
+        """
+        results: Dict[str, Dict] = {}
+        pending: List[Dict] = []
+        for email in emails:
+            content = self._clip(email['content'])
+            resolved, unresolved = self._pre_extract(content, email['sender'])
+            if not unresolved:
+                results[email['id']] = normalize_customer_info(resolved, email['sender'])
+                continue
+            pending.append({'id': email['id'], 'sender': email['sender'], 'raw': content,
+                            'resolved': resolved, 'unresolved': unresolved})
+
+        if pending and len(pending) >= self.batch_config.get('MIN_EMAILS', 2):
+            for item in pending:
+                item['content'] = self._budget('extract', item['raw'])
+                item['tokens'] = estimate_tokens(item['content'])
+            batches: List[List[Dict]] = self._split_batches(pending)
+        else:
+            batches = [[item] for item in pending]
+
+        for batch in batches:
+            extracted = self._extract_batch(batch) if len(batch) > 1 else {}
+            for item in batch:
+                info = extracted.get(item['id'])
+                if info is None:
+                    if len(batch) > 1:
+                        with self._stats_lock:
+                            self._batch_stats['item_fallbacks'] += 1
+                    info = self._extract_or_default(item['raw'], item['sender'], item['resolved'], item['unresolved'])
+                elif item['resolved']:
+                    info = normalize_customer_info(merge_customer_info(item['resolved'], info), item['sender'])
+                results[item['id']] = info
+        return results
+
+    def generate_reply(self, customer_info: Dict, original_subject: str,
+                       email_content: Optional[str] = None) -> Dict:
+        """
+        답변 생성 (템플릿으로 충분하면 LLM 호출 없음, 모든 제공자 실패 시 기본 답변)
+
+        email_content가 있으면 맞춤 답변 필요 여부(불만/다수 질문/영문 등)를 판단
+        """
+        email_content = self._clip(email_content) if email_content else email_content
+        reason = custom_reply_reason(email_content, self.template_config)
+        reply, _ = self._reply(customer_info, original_subject, email_content, reason)
+        return reply
+
+    def usage_summary(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """제공자별 토큰 사용량 (usage_summary를 지원하는 제공자만)"""
+        return {name: provider.usage_summary() for name, provider in self._providers.items()
+                if hasattr(provider, 'usage_summary')}
+
+    def prompt_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """제공자별 입력 토큰 중 프롬프트 캐시 적중분 (prompt_cache_stats를 지원하는 제공자만)"""
+        return {name: provider.prompt_cache_stats() for name, provider in self._providers.items()
+                if hasattr(provider, 'prompt_cache_stats')}
+
+    def pre_extract_stats(self) -> Dict[str, int]:
+        """규칙 기반 사전 추출 결과 수: {rules_only, partial, llm_only}"""
+        with self._stats_lock:
+            return dict(self._pre_extract_stats)
+
+    def budget_stats(self) -> Dict:
+        """본문 토큰 예산 통계: {calls, tokens_before, tokens_after, truncated, saved_ratio}"""
+        with self._stats_lock:
+            stats = dict(self._budget_stats)
+        before = stats['tokens_before']
+        stats['saved_ratio'] = 1 - stats['tokens_after'] / before if before else 0.0
+        return stats
+
+    def batch_stats(self) -> Dict:
+        """일괄 추출 통계: {batches, batched_emails, item_fallbacks, batch_failures, emails_per_batch}"""
+        with self._stats_lock:
+            stats = dict(self._batch_stats)
+        stats['emails_per_batch'] = stats['batched_emails'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def reply_stats(self) -> Dict:
+        """답변 경로 수와 템플릿 비율: {template, llm, fallback, template_ratio, custom_reasons}"""
+        with self._stats_lock:
+            stats = dict(self._reply_stats)
+            stats['custom_reasons'] = dict(self._custom_reasons)
+        total = stats['template'] + stats['llm'] + stats['fallback']
+        stats['template_ratio'] = stats['template'] / total if total else 0.0
+        return stats
+
+    def routing_stats(self) -> Dict[str, Dict]:
+        """제공자별 호출/실패/타임아웃/hedge 수와 작업별 p50/p95 지연 (ms)"""
+        with self._stats_lock:
+            report = {name: dict(stats) for name, stats in self._stats.items()}
+            latencies = {key: list(samples) for key, samples in self._latencies.items()}
+        for (name, task), samples in latencies.items():
+            report.setdefault(name, {})[f'{task}_p50_ms'] = round(percentile(samples, 50) * 1000, 1)
+            report[name][f'{task}_p95_ms'] = round(percentile(samples, 95) * 1000, 1)
+        return report
+
@@ -0,0 +1,247 @@
+# services/mail_filter.py - 본문 조회 전 헤더(메타데이터)만으로 자동 발송/대량 메일 제외 + 발신자별 답장 한도/답장 루프 감지
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parseaddr
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Set
+
+from .llm_common import REPLY_SUBJECT_MARKERS
+
+# Gmail messages.get(format='metadata')로 받을 헤더 (본문 없이 판단)
+METADATA_HEADERS = ('From', 'Subject', 'Auto-Submitted', 'Precedence', 'List-Id', 'X-Autoreply', 'X-Autorespond',
+                    'Return-Path')
+
+# 제외 사유 → 로그 표시
+REASONS = {
+    'auto_submitted': 'Auto-Submitted',
+    'precedence': 'Precedence',
+    'list': '메일링 리스트',
+    'autoreply_header': '자동 응답 헤더',
+    'bounce_sender': '반송 발신자',
+    'null_return_path': '빈 Return-Path (반송)',
+    'reply_limit': '발신자별 답장 한도',
+    'loop': '답장 루프 감지',
+}
+# 다음 조회에서 다시 판단하는 사유 (답장 한도는 답장 발송/window 만료로 풀림)
+RECHECK_REASONS = frozenset(('reply_limit',))
+
+
+class _SenderWindow:
+    """
+    발신자별 sliding window: 받은 메일 / 답장을 보낸 메일 {메시지 id: 시각}, 루프 감지 후 차단 만료 시각
+    + 이번 조회에서 처리로 넘겼지만 아직 답장하지 않은 메시지 id (저장하지 않음)
+    """
+
+    __slots__ = ('inbound', 'replied', 'pending', 'suppressed_until')
+
+    def __init__(self, inbound: Optional[Dict[str, float]] = None, replied: Optional[Dict[str, float]] = None,
+                 suppressed_until: float = 0.0):
+        self.inbound = inbound or {}
+        self.replied = replied or {}
+        self.pending: Set[str] = set()
+        self.suppressed_until = suppressed_until
+
+    def prune(self, inbound_since: float, replied_since: float) -> None:
+        self.inbound = {key: at for key, at in self.inbound.items() if at >= inbound_since}
+        self.replied = {key: at for key, at in self.replied.items() if at >= replied_since}
+
+
+def sender_address(value: str) -> str:
+    """'이름 <addr@example.com>' → 'addr@example.com' (소문자)"""
+    return parseaddr(value or '')[1].lower()
+
+
+class MailPrefilter:
+    """
+    LLM 처리/답장 전에 헤더만 보고 제외할 메일 판단 (Gmail 본문 조회 전)
+
+    - 헤더: Auto-Submitted(no 외), Precedence(bulk/list/junk/auto_reply), List-Id, X-Autoreply/X-Autorespond,
+      mailer-daemon/postmaster 발신자, 빈 Return-Path(<>)
+    - 발신자별 답장 한도: REPLY_WINDOW_SECONDS 동안 실제로 답장을 보낸 메일(record_reply) + 이번 조회에서 처리로
+      넘긴 메일이 MAX_REPLIES_PER_SENDER건이면 제외 (사전 분류로 건너뛰거나 처리 중 실패한 메일은 세지 않음)
+    - 루프 감지: LOOP_WINDOW_SECONDS 동안 같은 발신자 메일이 LOOP_MAX_MESSAGES건 이상이거나, 제목에 우리 답장 표식이
+      LOOP_MAX_SUBJECT_MARKERS번 이상 쌓이면 (자동 응답기끼리 주고받는 중) LOOP_COOLDOWN_SECONDS 동안 그 발신자 제외
+
+    발신자 window는 STATE_FILE에 저장 (재시작 후에도 한도/차단 유지, 같은 메시지는 다시 세지 않음)
+    """
+
+    def __init__(self, filter_config: Optional[Mapping] = None):
+        self.logger = logging.getLogger(__name__)
+        self._windows: Dict[str, _SenderWindow] = {}
+        self._decisions: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._passed_senders: "OrderedDict[str, str]" = OrderedDict()  # 처리로 넘긴 메시지 id → 발신자 (답장 기록용)
+        self._counters: Dict[str, int] = dict.fromkeys(('passed', *REASONS), 0)
+        self._lock = threading.Lock()
+        self.configure(filter_config or {})
+        self.load()
+
+    @classmethod
+    def from_config(cls, filter_config: Mapping) -> 'MailPrefilter':
+        return cls(filter_config)
+
+    def configure(self, filter_config: Mapping) -> None:
+        self.enabled = filter_config.get('ENABLED', True)
+        self.bulk_precedence = tuple(filter_config.get('BULK_PRECEDENCE', ('bulk', 'list', 'junk', 'auto_reply')))
+        self.bounce_senders = tuple(filter_config.get('BOUNCE_SENDERS', ('mailer-daemon', 'postmaster')))
+        self.max_replies = filter_config.get('MAX_REPLIES_PER_SENDER', 3)
+        self.reply_window = filter_config.get('REPLY_WINDOW_SECONDS', 86400)
+        self.loop_max_messages = filter_config.get('LOOP_MAX_MESSAGES', 5)
+        self.loop_window = filter_config.get('LOOP_WINDOW_SECONDS', 600)
+        self.loop_max_markers = filter_config.get('LOOP_MAX_SUBJECT_MARKERS', 3)
+        self.loop_cooldown = filter_config.get('LOOP_COOLDOWN_SECONDS', 86400)
+        self.max_tracked = filter_config.get('MAX_TRACKED_IDS', 10000)
+        state_file = filter_config.get('STATE_FILE')
+        self.state_file = Path(state_file) if state_file else None
+
+    def header_reason(self, headers: Mapping[str, str]) -> Optional[str]:
+        """헤더 규칙만 적용 (헤더 이름은 소문자): 제외 사유 또는 None"""
+        auto_submitted = headers.get('auto-submitted', '').strip().lower()
+        if auto_submitted and not auto_submitted.startswith('no'):
+            return 'auto_submitted'
+        if headers.get('precedence', '').strip().lower() in self.bulk_precedence:
+            return 'precedence'
+        if headers.get('list-id'):
+            return 'list'
+        if headers.get('x-autoreply') or headers.get('x-autorespond'):
+            return 'autoreply_header'
+        local = sender_address(headers.get('from', '')).partition('@')[0]
+        if local.startswith(self.bounce_senders):
+            return 'bounce_sender'
+        if 'return-path' in headers and headers['return-path'].strip() in ('<>', ''):
+            return 'null_return_path'
+        return None
+
+    def begin_fetch(self) -> None:
+        """조회 시작: 지난 조회에서 처리로 넘겼지만 답장하지 않은 메일 (사전 분류 건너뜀, 처리 실패)은 한도에서 제외"""
+        with self._lock:
+            for window in self._windows.values():
+                window.pending.clear()
+
+    def known_drop(self, message_id: str) -> bool:
+        """이미 제외한 메시지 (다음 조회에서 메타데이터도 다시 받지 않음, 답장 한도 초과는 다시 판단)"""
+        with self._lock:
+            reason = self._decisions.get(message_id)
+            return reason is not None and reason not in RECHECK_REASONS
+
+    def check(self, message_id: str, headers: Mapping[str, str], received_at: Optional[float] = None) -> Optional[str]:
+        """
+        메시지 1건 판단 (같은 id는 처음 판단 결과 유지, 답장 한도 초과였던 메시지만 다시 판단)
+
+        Args:
+            headers: 소문자 헤더 이름 → 값 (METADATA_HEADERS)
+            received_at: Gmail internalDate (epoch 초) - 지난 메일은 루프 감지 window 밖이므로 세지 않음
+
+        Returns:
+            제외 사유 (REASONS 키) 또는 None (처리)
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            previous = self._decisions.get(message_id, '')
+            if message_id in self._decisions and previous not in RECHECK_REASONS:
+                return previous
+            reason = self.header_reason(headers) or self._sender_reason(message_id, headers, received_at)
+            self._decisions[message_id] = reason
+            while len(self._decisions) > self.max_tracked:
+                self._decisions.popitem(last=False)
+            if reason != previous:
+                self._counters[reason or 'passed'] += 1
+            return reason
+
+    def _sender_reason(self, message_id: str, headers: Mapping[str, str],
+                       received_at: Optional[float]) -> Optional[str]:
+        sender = sender_address(headers.get('from', ''))
+        if not sender:
+            return None
+        now = time.time()
+        window = self._windows.setdefault(sender, _SenderWindow())
+        window.inbound[message_id] = received_at or now
+        window.prune(now - self.loop_window, now - self.reply_window)
+
+        if window.suppressed_until > now:
+            return 'loop'
+        subject = headers.get('subject', '')
+        markers = sum(subject.count(marker) for marker in REPLY_SUBJECT_MARKERS.values())
+        if markers >= self.loop_max_markers or len(window.inbound) >= self.loop_max_messages:
+            window.suppressed_until = now + self.loop_cooldown
+            self.logger.warning(
+                f"🔁 답장 루프 의심 → {self.loop_cooldown:g}초 동안 {sender} 메일 제외 "
+                f"(최근 {self.loop_window:g}초 {len(window.inbound)}건, 제목 표식 {markers}회)"
+            )
+            return 'loop'
+        if message_id not in window.replied and len(window.replied) + len(window.pending) >= self.max_replies:
+            return 'reply_limit'
+        window.pending.add(message_id)
+        self._passed_senders[message_id] = sender
+        while len(self._passed_senders) > self.max_tracked:
+            self._passed_senders.popitem(last=False)
+        return None
+
+    def record_reply(self, message_id: str, to_email: str = '') -> None:
+        """답장 발송 성공: 원본 메시지 발신자의 답장 한도에 반영 (처리로 넘긴 적 없는 메시지면 수신자 기준)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            sender = self._passed_senders.pop(message_id, None) or sender_address(to_email)
+            if not sender:
+                return
+            window = self._windows.setdefault(sender, _SenderWindow())
+            window.pending.discard(message_id)
+            window.replied[message_id] = time.time()
+
+    def stats(self) -> Dict[str, int]:
+        """{passed, 사유별 제외 수, suppressed(현재 차단 중인 발신자 수)} (프로세스 시작 이후 누적)"""
+        now = time.time()
+        with self._lock:
+            stats = dict(self._counters)
+            stats['suppressed'] = sum(window.suppressed_until > now for window in self._windows.values())
+        return stats
+
+    def save(self) -> None:
+        """발신자 window 저장 (만료된 항목 제외)"""
+        if not self.state_file:
+            return
+        now = time.time()
+        with self._lock:
+            senders = {}
+            for sender, window in list(self._windows.items()):
+                window.prune(now - self.loop_window, now - self.reply_window)
+                if not (window.inbound or window.replied or window.pending or window.suppressed_until > now):
+                    del self._windows[sender]
+                    continue
+                senders[sender] = {'inbound': window.inbound, 'replied': window.replied,
+                                   'suppressed_until': window.suppressed_until}
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'updated_at': now, 'senders': senders}), encoding='utf-8')
+            tmp_path.replace(self.state_file)
+        except Exception as e:
+            self.logger.warning(f"메일 사전 필터 상태 저장 실패: {e}")
+
+    def load(self) -> None:
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            state = json.loads(self.state_file.read_text(encoding='utf-8'))
+        except Exception as e:
+            self.logger.warning(f"메일 사전 필터 상태 로드 실패: {e}")
+            return
+        with self._lock:
+            for sender, saved in state.get('senders', {}).items():
+                self._windows[sender] = _SenderWindow(saved.get('inbound'), saved.get('replied'),
+                                                      saved.get('suppressed_until', 0.0))
+
+
+def format_stats(stats: Mapping[str, int]) -> str:
+    """'처리 12 / 제외 5 (Auto-Submitted 2, 메일링 리스트 3), 차단 중 발신자 1'"""
+    dropped = {reason: stats.get(reason, 0) for reason in REASONS if stats.get(reason)}
+    detail = ', '.join(f"{REASONS[reason]} {count}" for reason, count in dropped.items())
+    summary = f"처리 {stats.get('passed', 0)} / 제외 {sum(dropped.values())}" + (f" ({detail})" if detail else "")
+    if stats.get('suppressed'):
+        summary += f", 차단 중 발신자 {stats['suppressed']}"
+    return summary
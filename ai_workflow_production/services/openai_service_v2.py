@@ -0,0 +1,389 @@
+# services/openai_service_v2.py - OpenAI(및 OpenAI 호환) Chat Completions 서비스
+
+from .base_service import BaseService
+from .prompt_budget import estimate_tokens
+from .structured_output import describe, parse_structured
+from .llm_common import (
+    BATCH_EXTRACTION_SCHEMA, COMBINED_SCHEMA, CUSTOMER_INFO_SCHEMA, PROMPT_VERSIONS, LLMError, PromptParts,
+    ProviderUnavailable, build_batch_extraction_prompt, build_combined_prompt, build_extraction_prompt, build_reply_prompt,
+    empty_customer_info, fallback_reply, normalize_customer_info, parse_batch_response, parse_combined_response,
+    reply_subject
+)
+from ai_workflow_production.utils.http_pool import create_session
+from ai_workflow_production.utils.llm_cache import get_llm_cache
+from ai_workflow_production.utils.rate_limiter import RateLimitExceeded, get_rate_limiter
+from ai_workflow_production.utils.tracing import get_tracer
+import os
+import threading
+import requests
+from typing import Dict, List, Optional
+
+# 작업 종류: extract(고객 정보 추출), reply(답변 생성), combined(추출 + 답변 1회 호출),
+# extract_batch(여러 이메일 추출 1회 호출)
+TASKS = ('extract', 'reply', 'combined', 'extract_batch')
+
+# 작업별 구조화 출력 형식 (JSON Schema, 없으면 자유 텍스트)
+RESPONSE_FORMATS = {
+    task: {'type': 'json_schema', 'json_schema': {'name': name, 'strict': True, 'schema': schema}}
+    for task, name, schema in (
+        ('extract', 'customer_info', CUSTOMER_INFO_SCHEMA),
+        ('combined', 'inquiry_response', COMBINED_SCHEMA),
+        ('extract_batch', 'batch_customer_info', BATCH_EXTRACTION_SCHEMA)
+    )
+}
+
+
+def prompt_messages(prompt: PromptParts) -> List[Dict]:
+    """고정 지시문은 system 메시지로 맨 앞에 (요청마다 같은 접두사 → 자동 프롬프트 캐시), 이메일별 입력은 user"""
+    return [{'role': 'system', 'content': prompt.instructions}, {'role': 'user', 'content': prompt.content}]
+
+
+class OpenAIServiceV2(BaseService):
+    """OpenAI AI 서비스 (GeminiServiceV2와 같은 extract_customer_info / generate_reply 계약)"""
+
+    def __init__(self, config_obj):
+        super().__init__("OpenAI")
+
+        openai_config = config_obj['OPENAI_CONFIG']
+        self.api_key = os.getenv(openai_config['API_KEY_ENV'])
+        custom_base_url = os.getenv(openai_config.get('BASE_URL_ENV', ''))
+        self.base_url = (custom_base_url or openai_config['BASE_URL']).rstrip('/')
+        self.models = dict(openai_config['MODELS'])
+        self.temperatures = dict(openai_config.get('TEMPERATURES', {}))
+        self.max_tokens = openai_config.get('MAX_TOKENS', 2048)
+        self.timeout = (openai_config.get('CONNECT_TIMEOUT', 5), openai_config.get('READ_TIMEOUT', 60))
+
+        # 로컬 대체 서버는 키 없이 사용 가능
+        if not self.api_key and not custom_base_url:
+            raise ValueError(f"{openai_config['API_KEY_ENV']} 환경변수가 설정되지 않았습니다")
+
+        # 모든 요청이 공유하는 keep-alive 커넥션 풀 (요청마다 TCP/TLS 연결을 새로 맺지 않음)
+        self.session = create_session('openai', config_obj.get('HTTP_POOL_CONFIG'),
+                                      connect_timeout=self.timeout[0], read_timeout=self.timeout[1],
+                                      pool_maxsize=openai_config.get('POOL_MAXSIZE'))
+        self.session.headers.update({'Content-Type': 'application/json'})
+        if self.api_key:
+            self.session.headers['Authorization'] = f"Bearer {self.api_key}"
+
+        # 작업별 토큰 사용량 누적
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._usage_lock = threading.Lock()
+
+        self.logger.info(f"OpenAI 서비스 초기화 - 모델: {self.models} ({self.base_url})")
+
+    def authenticate(self) -> bool:
+        """models 조회로 API 키/모델을 확인합니다 (생성 호출 없음)."""
+        self.logger.info("OpenAI 서비스 인증 시도...")
+        result = self.probe()
+        if not result['healthy']:
+            self.logger.error(f"OpenAI 인증 실패: {result['detail']}")
+        return result['healthy']
+
+    def probe(self, timeout: float = 5.0) -> Dict:
+        """추출 모델 조회로 연결 확인 (토큰 소모 없음)"""
+        url = f"{self.base_url}/models/{self.models['extract']}"
+        with get_tracer().span("HTTP GET models.retrieve", **{'http.method': 'GET', 'http.url': url}) as span:
+            response = self.session.get(url, timeout=timeout)
+            span.set_http_status(response.status_code)
+
+        if response.status_code == 200:
+            return {'healthy': True, 'detail': response.json().get('id', self.models['extract'])}
+        return {'healthy': False, 'detail': f"HTTP {response.status_code}"}
+
+    def chat_completion(self, messages: List[Dict], task: str, response_format: Optional[Dict] = None,
+                        temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Chat Completions 호출
+
+        Args:
+            messages: [{'role': ..., 'content': ...}]
+            task: TASKS 중 하나 (모델/온도 선택, 사용량 집계 기준)
+            response_format: 구조화 출력 형식 (json_schema 등)
+
+        Returns:
+            Optional[str]: 응답 메시지 내용 (캐시 적중 시 네트워크 호출 없음, 서킷 open/속도 제한 초과/실패 시 None)
+        """
+        payload = self._payload(messages, task, response_format, temperature, max_tokens)
+        model = payload['model']
+        url = f"{self.base_url}/chat/completions"
+
+        # 같은 요청(모델/템플릿 버전/파라미터/내용)의 응답이 캐시에 있으면 네트워크 호출 생략
+        cache = get_llm_cache()
+        cache_key = cache.make_key(
+            'openai', model, PROMPT_VERSIONS.get(task),
+            {key: value for key, value in payload.items() if key not in ('model', 'messages')},
+            '\n'.join(f"{message['role']}: {message['content']}" for message in messages)
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"{task} 응답 캐시 적중 ({cached.tier}, 절약 토큰 {cached.tokens})")
+            return cached.text
+
+        if not self._circuit_allows(f"{task} 생성"):
+            return None
+
+        # 보내기 전에 RPM/TPM 허용량을 받음 (429 후 재시도 대신 한도 직전에서 대기)
+        limiter = get_rate_limiter()
+        try:
+            admission = limiter.acquire('openai', sum(estimate_tokens(message['content']) for message in messages))
+        except RateLimitExceeded as e:
+            # 요청을 보내지 않았으므로 서킷 결과로 기록하지 않고 시험 슬롯만 반환
+            self._release_circuit()
+            self.logger.warning(f"{task} 생성 보류: {e}")
+            return None
+
+        try:
+            with get_tracer().span("HTTP POST chat.completions", **{
+                'http.method': 'POST', 'http.url': url, 'llm.model': model, 'llm.task': task
+            }) as span:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                span.set_http_status(response.status_code)
+
+                # 5xx/429만 서비스 장애로 간주 (그 외 4xx는 요청 문제)
+                self._record_outcome(response.status_code < 500 and response.status_code != 429)
+
+                if response.status_code != 200:
+                    self.logger.error(f"{task} 생성 실패 ({response.status_code}): {response.text[:500]}")
+                    if response.status_code == 429:
+                        limiter.throttle('openai', response)
+                    return None
+
+                result = response.json()
+                usage = self._record_usage(task, model, result.get('usage') or {})
+                limiter.settle(admission, usage['total_tokens'])
+                for key, value in usage.items():
+                    span.set_attribute(f'llm.usage.{key}', value)
+
+            choice = (result.get('choices') or [{}])[0]
+            message = choice.get('message') or {}
+            if message.get('refusal'):
+                self.logger.warning(f"{task} 생성 거부: {message['refusal']}")
+                return None
+            truncated = choice.get('finish_reason') == 'length'
+            if truncated:
+                self.logger.warning(f"{task} 응답이 max_tokens에서 잘렸습니다")
+
+            content = message.get('content')
+            if not content:
+                self.logger.error("응답에서 텍스트를 찾을 수 없습니다.")
+                return None
+            if not truncated:
+                cache.put(cache_key, content, usage['total_tokens'])
+            return content
+
+        except requests.exceptions.RequestException as e:
+            self._record_outcome(False)
+            self.logger.error(f"{task} 생성 중 네트워크 오류: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"{task} 생성 중 오류: {e}")
+            return None
+
+    def _payload(self, messages: List[Dict], task: str, response_format: Optional[Dict] = None,
+                 temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> Dict:
+        """Chat Completions 요청 본문 (작업별 모델/온도)"""
+        payload = {
+            'model': self.models.get(task) or self.models['extract'],
+            'messages': messages,
+            'temperature': self.temperatures.get(task, 0.7) if temperature is None else temperature,
+            'max_completion_tokens': max_tokens or self.max_tokens
+        }
+        if response_format:
+            payload['response_format'] = response_format
+        return payload
+
+    def _record_usage(self, task: str, model: str, usage: Dict) -> Dict[str, int]:
+        """응답의 usage를 작업별로 누적"""
+        tokens = {
+            'prompt_tokens': int(usage.get('prompt_tokens') or 0),
+            'completion_tokens': int(usage.get('completion_tokens') or 0),
+            'total_tokens': int(usage.get('total_tokens') or 0),
+            # 자동 프롬프트 캐시(같은 접두사 1024토큰 이상)에 적중해 할인 단가로 과금된 입력 토큰
+            'cached_tokens': int((usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0)
+        }
+        with self._usage_lock:
+            totals = self._usage.setdefault(task, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                                                   'total_tokens': 0, 'cached_tokens': 0})
+            totals['calls'] += 1
+            for key, value in tokens.items():
+                totals[key] += value
+        self.logger.debug(f"토큰 사용량 [{task}/{model}]: {tokens}")
+        return tokens
+
+    def usage_summary(self) -> Dict[str, Dict[str, int]]:
+        """작업별 누적 토큰 사용량: {task: {calls, prompt_tokens, completion_tokens, total_tokens, cached_tokens}}"""
+        with self._usage_lock:
+            return {task: dict(totals) for task, totals in self._usage.items()}
+
+    def prompt_cache_stats(self) -> Dict[str, int]:
+        """입력 토큰 중 자동 프롬프트 캐시 적중분 (전체 작업 합계)"""
+        usage = self.usage_summary().values()
+        return {key: sum(totals[key] for totals in usage) for key in ('calls', 'prompt_tokens', 'cached_tokens')}
+
+    def _parse_json(self, response_text: str, schema: Dict, task: str) -> Dict:
+        """
+        구조화 출력 해석, 실패 시 LLMError
+
+        max_tokens에서 잘린 응답의 부분 복구는 extract_batch만 (빠진 항목은 라우터가 1건씩 재추출) -
+        extract/combined는 끊기거나 필수 필드가 없으면 LLMError
+        """
+        result = parse_structured(response_text, schema, strict=task != 'extract_batch')
+        note = describe(result)
+        if note:
+            self.logger.warning(f"{task} 응답 부분 복구: {note}")
+        return result.value
+
+    def extract_customer_info_or_raise(self, email_content: str, sender_email: str) -> Dict:
+        """고객 정보 추출 (JSON Schema 구조화 출력 - 정규식 파싱 불필요), 실패 시 LLMError"""
+        response_text = self.chat_completion(
+            prompt_messages(build_extraction_prompt(email_content, sender_email)),
+            task='extract',
+            response_format=RESPONSE_FORMATS['extract']
+        )
+        if not response_text:
+            raise ProviderUnavailable("OpenAI 응답 없음")
+        info = self._parse_json(response_text, CUSTOMER_INFO_SCHEMA, 'extract')
+
+        result = normalize_customer_info(info, sender_email)
+        self.logger.info(f"고객 정보 추출 완료: {result}")
+        return result
+
+    def extract_batch_or_raise(self, emails: List[Dict]) -> Dict[str, Dict]:
+        """
+        여러 이메일의 고객 정보를 구조화 출력 1회 호출로 추출, 응답 전체를 해석할 수 없으면 LLMError
+
+        Returns:
+            {id: 고객 정보} - 응답에 없거나 형식이 틀린 id는 빠짐
+        """
+        response_text = self.chat_completion(
+            prompt_messages(build_batch_extraction_prompt(emails)),
+            task='extract_batch',
+            response_format=RESPONSE_FORMATS['extract_batch']
+        )
+        if not response_text:
+            raise ProviderUnavailable("OpenAI 응답 없음")
+        data = self._parse_json(response_text, BATCH_EXTRACTION_SCHEMA, 'extract_batch')
+
+        results = parse_batch_response(data, emails)
+        self.logger.info(f"고객 정보 일괄 추출 완료: {len(results)}/{len(emails)}건")
+        return results
+
+    def generate_reply_or_raise(self, customer_info: Dict, original_subject: str,
+                                email_content: Optional[str] = None) -> Dict:
+        """답변 생성 (email_content가 있으면 원문에 맞춘 답변), 실패 시 LLMError"""
+        body = self.chat_completion(
+            prompt_messages(build_reply_prompt(customer_info, original_subject, email_content)),
+            task='reply'
+        )
+        if not body:
+            raise ProviderUnavailable("답변 생성 실패")
+        return {'subject': reply_subject(customer_info, original_subject), 'body': body}
+
+    def process_inquiry_or_raise(self, email_content: str, sender_email: str, original_subject: str) -> Dict:
+        """고객 정보 추출 + 답변 작성을 구조화 출력 1회 호출로 처리, 실패 시 LLMError"""
+        response_text = self.chat_completion(
+            prompt_messages(build_combined_prompt(email_content, sender_email, original_subject)),
+            task='combined',
+            response_format=RESPONSE_FORMATS['combined']
+        )
+        if not response_text:
+            raise ProviderUnavailable("OpenAI 응답 없음")
+        data = self._parse_json(response_text, COMBINED_SCHEMA, 'combined')
+
+        result = parse_combined_response(data, sender_email, original_subject)
+        self.logger.info(f"고객 정보 추출 + 답변 작성 완료 (1회 호출): {result['customer_info']}")
+        return result
+
+    # ------------------------------------------------------------------
+    # Batch API (비동기 대량 처리 - 완료까지 최대 completion_window, 요청 단가 할인)
+    # ------------------------------------------------------------------
+
+    def batch_request(self, custom_id: str, task: str, prompt: PromptParts) -> Dict:
+        """Batch 입력 JSONL 1줄 (실시간 호출과 같은 모델/온도/구조화 출력 형식)"""
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': self._payload(prompt_messages(prompt), task, RESPONSE_FORMATS.get(task))
+        }
+
+    def _batch_api(self, method: str, path: str, span_name: str, **kwargs) -> requests.Response:
+        """Files/Batches API 호출, 200이 아니면 LLMError"""
+        url = f"{self.base_url}{path}"
+        with get_tracer().span(span_name, **{'http.method': method, 'http.url': url}) as span:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                raise LLMError(f"{span_name} 네트워크 오류: {e}")
+            span.set_http_status(response.status_code)
+        if response.status_code != 200:
+            raise LLMError(f"{span_name} 실패 ({response.status_code}): {response.text[:500]}")
+        return response
+
+    def upload_batch_file(self, path) -> str:
+        """Batch 입력 JSONL 업로드 → file id"""
+        with open(path, 'rb') as f:
+            # 세션 기본 Content-Type(application/json) 대신 multipart 경계가 붙도록 제거
+            response = self._batch_api('POST', '/files', "HTTP POST files.create",
+                                       headers={'Content-Type': None}, data={'purpose': 'batch'},
+                                       files={'file': (os.path.basename(str(path)), f, 'application/jsonl')})
+        return response.json()['id']
+
+    def create_batch(self, input_file_id: str, completion_window: str = '24h',
+                     metadata: Optional[Dict[str, str]] = None) -> Dict:
+        """Batch 생성 → batch 객체 (id, status, ...)"""
+        payload = {'input_file_id': input_file_id, 'endpoint': '/v1/chat/completions',
+                   'completion_window': completion_window}
+        if metadata:
+            payload['metadata'] = metadata
+        return self._batch_api('POST', '/batches', "HTTP POST batches.create", json=payload).json()
+
+    def retrieve_batch(self, batch_id: str) -> Dict:
+        """Batch 상태 조회 (status, request_counts, output_file_id, error_file_id)"""
+        return self._batch_api('GET', f"/batches/{batch_id}", "HTTP GET batches.retrieve").json()
+
+    def cancel_batch(self, batch_id: str) -> Dict:
+        return self._batch_api('POST', f"/batches/{batch_id}/cancel", "HTTP POST batches.cancel").json()
+
+    def batch_file_content(self, file_id: str) -> str:
+        """Batch 결과/오류 JSONL 내용"""
+        response = self._batch_api('GET', f"/files/{file_id}/content", "HTTP GET files.content")
+        return response.content.decode('utf-8')
+
+    def extract_customer_info(self, email_content: str, sender_email: str) -> Dict:
+        """
+        이메일에서 고객 정보 추출 (실패 시 발신자 이메일만 채운 기본값)
+
+        Returns:
+            {
+                'has_all_info': bool,
+                'name': str,
+                'company': str,
+                'title': str,
+                'phone': str,
+                'email': str,
+                'missing_fields': list
+            }
+        """
+        try:
+            return self.extract_customer_info_or_raise(email_content, sender_email)
+        except Exception as e:
+            self.logger.error(f"고객 정보 추출 실패: {e}")
+            return empty_customer_info(sender_email)
+
+    def generate_reply(self, customer_info: Dict, original_subject: str,
+                       email_content: Optional[str] = None) -> Dict:
+        """
+        고객 정보를 바탕으로 답변 생성 (실패 시 기본 답변)
+
+        Returns:
+            {
+                'subject': str,
+                'body': str
+            }
+        """
+        try:
+            return self.generate_reply_or_raise(customer_info, original_subject, email_content)
+        except Exception as e:
+            self.logger.error(f"답변 생성 실패: {e}")
+            return fallback_reply(original_subject)
@@ -0,0 +1,154 @@
+# services/prompt_budget.py - LLM 호출 전 본문 토큰 예산 (토큰 추정, 정리/압축, 앞부분 + 서명 보존 절단)
+
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Mapping
+
+from .rule_extractor import latest_message
+
+# 토큰 추정용 문자 분류 (한글/한자/가나는 글자당 약 1토큰, 영문 단어 4글자당, 숫자 3자리당, 기호는 1개당 1토큰)
+_WIDE = re.compile(r"[ᄀ-ᇿ㄰-㆏가-힣぀-ヿ一-鿿]")
+_ASCII_WORD = re.compile(r"[A-Za-z]+")
+_DIGITS = re.compile(r"\d+")
+_SYMBOL = re.compile(r"[^\sA-Za-z\dᄀ-ᇿ㄰-㆏가-힣぀-ヿ一-鿿]")
+
+# 법적 고지/수신거부 문단 표시 (문단 단위로 제거)
+_FOOTER_MARKERS = re.compile(
+    r"(?:본 메일은|이 메일은|이 이메일은).{0,40}(?:수신|발신 전용|비밀|기밀|법적)|수신\s*거부|수신을 원하지 않|"
+    r"무단\s*(?:배포|복제|전재)|CONFIDENTIAL|"
+    r"This (?:e-?mail|message)(?: and any attachments?)? (?:is|are|may (?:be|contain)) (?:strictly )?(?:confidential|privileged|intended)|"
+    r"intended (?:solely |only )?for the (?:use of the )?(?:addressee|recipient)|unsubscribe|"
+    r"Sent from my (?:iPhone|Android|Galaxy)",
+    re.IGNORECASE
+)
+_INVISIBLE = re.compile(r"[​-‍⁠﻿]")
+_SPACES = re.compile(r"[ \t 　]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+TRUNCATION_MARK = "\n[...중략...]\n"
+_DEDUPE_MIN_CHARS = 20   # 이보다 짧은 줄("감사합니다." 등)은 반복돼도 유지
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    한국어/영어 혼합 텍스트의 토큰 수 추정 (토크나이저 없이, 실제보다 약간 크게)
+
+    - 한글 음절/한자/가나: 글자당 1
+    - 영문 단어: 4글자당 1 (최소 1)
+    - 숫자: 3자리당 1
+    - 기호/구두점: 개당 1, 공백은 0
+    """
+    if not text:
+        return 0
+    return (
+        len(_WIDE.findall(text))
+        + sum(math.ceil(len(word) / 4) for word in _ASCII_WORD.findall(text))
+        + sum(math.ceil(len(digits) / 3) for digits in _DIGITS.findall(text))
+        + len(_SYMBOL.findall(text))
+    )
+
+
+@dataclass(frozen=True)
+class BudgetedContent:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    truncated: bool
+
+
+def normalize_whitespace(text: str) -> str:
+    """보이지 않는 문자 제거, 줄 안의 연속 공백 축소, 줄 끝 공백/연속 빈 줄 제거"""
+    text = _INVISIBLE.sub('', text.replace('\r\n', '\n').replace('\r', '\n'))
+    lines = [_SPACES.sub(' ', line).strip() for line in text.split('\n')]
+    return _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def strip_footers(text: str) -> str:
+    """법적 고지/수신거부/모바일 서명 문단 제거 (빈 줄로 나뉜 문단 단위)"""
+    paragraphs = text.split('\n\n')
+    kept = [paragraph for paragraph in paragraphs if not _FOOTER_MARKERS.search(paragraph)]
+    return '\n\n'.join(kept)
+
+
+def dedupe_lines(text: str) -> str:
+    """반복되는 상용구 줄(뉴스레터 반복 배너/링크 등)은 처음 1번만 유지"""
+    seen = set()
+    lines: List[str] = []
+    for line in text.split('\n'):
+        key = line.lower()
+        if len(line) >= _DEDUPE_MIN_CHARS:
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+    return _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def clip_chars(content: str, max_chars: int) -> str:
+    """매우 긴 본문은 앞 4/5 + 끝 1/5만 남김 (정규식/추정 비용 상한, 끝부분의 서명 보존)"""
+    if not content or len(content) <= max_chars:
+        return content
+    tail = max_chars // 5
+    return content[:max_chars - tail] + '\n\n' + content[-tail:]
+
+
+def compress_email(content: str, max_scan_chars: int = 50000) -> str:
+    """
+    LLM에 넣기 전 본문 정리 (의미 있는 내용은 유지)
+
+    1. 매우 긴 본문은 앞부분/끝부분만 남김 (이후 단계의 처리 시간 상한)
+    2. 인용된 이전 메일 제거
+    3. 공백 정리 → 법적 고지/수신거부 문단 제거 → 반복 줄 제거
+    """
+    if not content:
+        return ''
+    text = normalize_whitespace(latest_message(clip_chars(content, max_scan_chars)))
+    return dedupe_lines(strip_footers(text))
+
+
+def _take_tokens(lines: List[str], budget: int) -> List[str]:
+    """앞에서부터 예산 안에 들어가는 줄 (예산을 넘는 줄은 글자 수 비율로 잘라서 포함)"""
+    taken = []
+    for line in lines:
+        tokens = estimate_tokens(line) + 1
+        if tokens <= budget:
+            taken.append(line)
+            budget -= tokens
+            continue
+        if budget > 0:
+            cut = max(1, int(len(line) * budget / tokens))
+            taken.append(line[:cut])
+        break
+    return taken
+
+
+def fit_to_budget(text: str, max_tokens: int, tail_ratio: float = 0.25) -> BudgetedContent:
+    """
+    추정 토큰 수가 max_tokens를 넘으면 앞부분(본문)과 끝부분(서명/연락처)을 남기고 가운데를 생략
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return BudgetedContent(text, tokens, tokens, False)
+
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARK)
+    tail_budget = int(budget * tail_ratio)
+    lines = text.split('\n')
+    head = _take_tokens(lines, budget - tail_budget)
+    tail = list(reversed(_take_tokens(list(reversed(lines[len(head):])), tail_budget)))
+    truncated = '\n'.join(head) + TRUNCATION_MARK + '\n'.join(tail)
+    return BudgetedContent(truncated.strip(), tokens, estimate_tokens(truncated), True)
+
+
+def budget_email(content: str, task: str, budget_config: Mapping) -> BudgetedContent:
+    """PROMPT_BUDGET_CONFIG로 본문 정리 + 작업별 토큰 예산 적용"""
+    max_scan_chars = budget_config.get('MAX_SCAN_CHARS', 50000)
+    clipped = clip_chars(content, max_scan_chars)
+    # 원문 토큰 수(통계용)도 잘린 부분으로 추정 후 길이 비율로 환산 - 입력 크기와 무관하게 처리 시간 상한
+    before = round(estimate_tokens(clipped) * len(content) / len(clipped)) if clipped else 0
+    compressed = compress_email(clipped, max_scan_chars)
+    max_tokens = budget_config.get('MAX_INPUT_TOKENS', {}).get(task)
+    if not max_tokens:
+        return BudgetedContent(compressed, before, estimate_tokens(compressed), False)
+    fitted = fit_to_budget(compressed, max_tokens, budget_config.get('TAIL_RATIO', 0.25))
+    return BudgetedContent(fitted.text, before, fitted.tokens_after, fitted.truncated)
@@ -0,0 +1,116 @@
+# services/reply_templates.py - 정형 답변 템플릿 (담당자 배정 / 추가 정보 요청)
+
+import re
+from dataclasses import dataclass
+from string import Template
+from typing import Dict, Mapping, Optional
+
+from .llm_common import missing_field_labels, reply_subject
+from .rule_extractor import latest_message
+
+
+@dataclass(frozen=True)
+class ReplyTemplate:
+    """버전이 붙은 답변 템플릿 (문구를 바꾸면 version을 올려 발송 기록과 대조 가능하게)"""
+    name: str
+    version: int
+    body: Template
+
+    @property
+    def tag(self) -> str:
+        return f"{self.name}/v{self.version}"
+
+
+ASSIGNED = ReplyTemplate('assigned', 1, Template("""안녕하세요, ${greeting}.
+
+문의 주셔서 진심으로 감사드립니다.
+
+보내주신 정보를 아래와 같이 확인했습니다.
+- 성함: ${name}
+- 회사: ${company}
+- 직급: ${title}
+- 연락처: ${phone}
+- 이메일: ${email}
+
+담당 영업팀에 바로 연결해 드렸으며, 빠른 시일 내에 담당자가 직접 연락드리겠습니다.
+추가로 궁금하신 점이 있으시면 언제든지 이 메일로 회신해 주세요.
+
+감사합니다."""))
+
+REQUEST_INFO = ReplyTemplate('request_info', 1, Template("""안녕하세요, ${greeting}.
+
+문의 주셔서 진심으로 감사드립니다.
+
+정확한 상담을 위해 아래 정보를 추가로 알려주시면 감사하겠습니다.
+${missing_list}
+
+정보를 보내주시는 대로 담당자가 신속히 답변 드리겠습니다.
+
+감사합니다."""))
+
+# 질문 문장 (물음표 또는 한국어 의문형 어미로 끝남)
+_QUESTION = re.compile(r"(?:\?|까요|나요|습니까|는지요|인가요|한가요|을지요)[.!]?$")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_HANGUL = re.compile(r"[가-힣]")
+_LETTER = re.compile(r"[가-힣A-Za-z]")
+
+
+def _greeting(customer_info: Dict) -> str:
+    name, title = customer_info.get('name'), customer_info.get('title')
+    if name and title and _HANGUL.search(title):
+        return f"{name} {title}님"
+    if name:
+        return f"{name}님"
+    return "고객님"
+
+
+def render_reply(customer_info: Dict, original_subject: str) -> Dict:
+    """
+    고객 정보로 템플릿 답변 작성 (LLM 호출 없음)
+
+    Returns:
+        {'subject': str, 'body': str, 'template': 'assigned/v1' | 'request_info/v1'}
+    """
+    if customer_info['has_all_info']:
+        template = ASSIGNED
+        body = template.body.substitute(
+            greeting=_greeting(customer_info),
+            **{field: customer_info[field] for field in ('name', 'company', 'title', 'phone', 'email')}
+        )
+    else:
+        template = REQUEST_INFO
+        missing = missing_field_labels(customer_info['missing_fields'])
+        body = template.body.substitute(
+            greeting=_greeting(customer_info),
+            missing_list='\n'.join(f"- {label}" for label in missing)
+        )
+    return {'subject': reply_subject(customer_info, original_subject), 'body': body, 'template': template.tag}
+
+
+def custom_reply_reason(email_content: Optional[str], template_config: Mapping) -> Optional[str]:
+    """
+    템플릿 대신 LLM 맞춤 답변이 필요한 이유 (None이면 템플릿 사용)
+
+    - 불만/환불/장애 등 CUSTOM_KEYWORDS 포함
+    - 질문 문장이 MAX_QUESTIONS개 초과 (정형 답변으로는 답하지 못함)
+    - 한글 비율이 MIN_HANGUL_RATIO 미만 (영문 메일 등 - 템플릿은 한국어)
+    """
+    if not template_config.get('ENABLED', False):
+        return 'templates_disabled'
+    if not email_content:
+        return None
+
+    text = latest_message(email_content)
+    lowered = text.lower()
+    for keyword in template_config.get('CUSTOM_KEYWORDS', ()):
+        if keyword.lower() in lowered:
+            return f"keyword:{keyword}"
+
+    questions = sum(1 for sentence in _SENTENCE_SPLIT.split(text) if _QUESTION.search(sentence.strip()))
+    if questions > template_config.get('MAX_QUESTIONS', 2):
+        return f"questions:{questions}"
+
+    letters = len(_LETTER.findall(text))
+    if letters and len(_HANGUL.findall(text)) / letters < template_config.get('MIN_HANGUL_RATIO', 0.2):
+        return 'language'
+    return None
@@ -0,0 +1,243 @@
+# services/rule_extractor.py - 규칙 기반 고객 정보 사전 추출 (LLM 호출 전, 결정적/마이크로초 단위)
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .llm_common import CUSTOMER_FIELDS
+
+# 신뢰도 (MIN_CONFIDENCE 이상인 필드만 확정, 나머지는 LLM에 맡김)
+LABELED = 0.95      # "이름: 홍길동" 형식
+SIGNATURE = 0.9     # "성춘향 / 춘향서비스 / 과장 / 010-..." 서명 블록
+PATTERN = 0.9       # 전화번호/이메일 정규식
+INTRO = 0.85        # "춘향서비스 과장 성춘향입니다" 자기소개 문장
+CLOSING = 0.8       # "홍길동 드림"
+
+# 한국 성씨 (이름 후보 검증용 - 일반 명사를 이름으로 잡지 않도록)
+_SURNAMES = frozenset(
+    "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감음빈동온호범좌팽승간상갈단견당화창"
+)
+
+KOREAN_TITLES = (
+    '대표이사', '부회장', '부사장', '회장', '사장', '대표', '전무', '상무', '이사', '본부장', '센터장', '실장',
+    '부장', '차장', '과장', '대리', '주임', '사원', '팀장', '파트장', '그룹장', '매니저', '책임연구원',
+    '선임연구원', '수석연구원', '연구원', '책임', '선임', '수석', '프로', '위원', '원장', '소장', '교수'
+)
+_ENGLISH_TITLE_WORDS = (
+    'Manager', 'Director', 'Engineer', 'Officer', 'Lead', 'Head', 'President', 'Specialist',
+    'Consultant', 'Analyst', 'Architect', 'Coordinator', 'Executive', 'Founder', 'Partner',
+    'CEO', 'CTO', 'CFO', 'COO', 'CIO', 'VP'
+)
+
+_KOREAN_NAME = r"[가-힣]{2,4}"
+_ENGLISH_NAME = re.compile(r"[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2}")
+_COMPANY = r"(?:\(주\)|㈜)?[가-힣A-Za-z0-9&][가-힣A-Za-z0-9&.]*(?:\(주\)|㈜)?"
+_DEPARTMENT = r"[가-힣A-Za-z0-9]+(?:팀|부|실|본부|센터|그룹|파트)"
+_TITLE = '|'.join(sorted(map(re.escape, KOREAN_TITLES), key=len, reverse=True))
+_ENGLISH_TITLE = (r"(?:[A-Z][A-Za-z&/-]*\s+){0,3}(?:%s)(?:\s+of\s+[A-Z][A-Za-z&]*(?:\s+[A-Z][A-Za-z&]*){0,2})?"
+                  % '|'.join(_ENGLISH_TITLE_WORDS))
+
+# 국내 전화번호: 휴대폰(010 등), 지역번호(02, 031 ...), 인터넷전화(070), 국가번호 +82
+PHONE_PATTERN = re.compile(
+    r"(?<![\d+])(?:\+82[-.\s]?(?:\(0\))?|0)(?:1[016789]|2|[3-6][1-5]|70)[-.\s)]?\d{3,4}[-.\s]?\d{4}(?!\d)"
+)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+_LABELS = {
+    'name': ('이름', '성함', '성명', '담당자명', '담당자', 'Name'),
+    'company': ('회사명', '회사', '소속', '업체명', '기관명', 'Company'),
+    'title': ('직급', '직책', '직위', 'Title', 'Position'),
+    'phone': ('연락처', '전화번호', '전화', '휴대폰', '핸드폰', '휴대전화', 'Tel', 'Phone', 'Mobile', 'T', 'M'),
+    'email': ('이메일', '메일', 'E-mail', 'Email')
+}
+_LABEL_PATTERNS = {
+    name: re.compile(
+        r"^[\s\-*•·]*(?:%s)\s*\.?\s*[:：.]\s*(.+?)\s*$" % '|'.join(map(re.escape, labels)),
+        re.MULTILINE | re.IGNORECASE
+    )
+    for name, labels in _LABELS.items()
+}
+
+# 자기소개: "{회사} [{부서}] {직급} {이름}입니다" / "{회사} [{부서}] {이름} {직급}입니다"
+_INTRO_TITLE_NAME = re.compile(
+    rf"(?:^|[\s.,!])({_COMPANY})\s+(?:{_DEPARTMENT}\s+)?({_TITLE})\s+({_KOREAN_NAME})(?:입니다|이라고|라고)"
+)
+_INTRO_NAME_TITLE = re.compile(
+    rf"(?:^|[\s.,!])({_COMPANY})\s+(?:{_DEPARTMENT}\s+)?({_KOREAN_NAME})\s+({_TITLE})(?:입니다|이라고|라고)"
+)
+_INTRO_COMPANY = re.compile(rf"(?:^|[\s.,!])({_COMPANY})\s+{_DEPARTMENT}(?:입니다|에서)")
+_CONTACT_PERSON = re.compile(rf"담당자(?:는)?\s+({_KOREAN_NAME})(?=[\s,.]|$|입니다)")
+_CLOSING_NAME = re.compile(rf"^\s*({_KOREAN_NAME})\s*(?:드림|올림|배상)\s*$", re.MULTILINE)
+_ENGLISH_INTRO = re.compile(
+    rf"\b(?:I'm|I am|My name is|This is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){{1,2}})\s*,\s*"
+    rf"({_ENGLISH_TITLE})\s+(?:at|of|from)\s+([A-Z][\w&-]*(?:\s+[A-Z][\w&-]*){{0,3}})"
+)
+
+# 인용된 이전 메일 시작 표시 (이후는 모두 제외)
+_QUOTE_MARKERS = re.compile(
+    r"^(?:-{2,}\s*(?:Original Message|원본 메시지|Forwarded message)|On .+ wrote:|.+\d{4}년 .+ 작성:|보낸 사람:|From: )",
+    re.MULTILINE | re.IGNORECASE
+)
+# 자기소개 패턴의 회사 자리에 올 수 있는 일반 단어 (회사명 아님)
+_NOT_COMPANY = frozenset(('저는', '제가', '저희', '저희는', '안녕하세요', '네', '예', '현재', '우리'))
+_SIGNATURE_SEPARATORS = re.compile(r"\s*[|/·｜]\s*")
+_SIGNATURE_LINES = 6
+
+
+@dataclass
+class RuleExtraction:
+    """필드별 (값, 신뢰도) - values에 없는 필드는 찾지 못한 것"""
+    values: Dict[str, str] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    def offer(self, name: str, value: Optional[str], confidence: float) -> None:
+        """더 높은 신뢰도의 값만 채택"""
+        value = _strip_value(value)
+        if value and confidence > self.confidence.get(name, 0.0):
+            self.values[name] = value
+            self.confidence[name] = confidence
+
+    def confident(self, min_confidence: float) -> Dict[str, str]:
+        return {name: value for name, value in self.values.items()
+                if self.confidence[name] >= min_confidence}
+
+    def unresolved(self, min_confidence: float, sender_email: str = '') -> List[str]:
+        """확정하지 못한 필드 (email은 발신자 주소로 대체되므로 항상 확정)"""
+        confident = self.confident(min_confidence)
+        return [name for name in CUSTOMER_FIELDS
+                if name not in confident and not (name == 'email' and sender_email)]
+
+
+def _strip_value(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = value.strip().strip('.,;:[]<>"\'').strip()
+    # "(주)한솔기계"의 괄호는 유지하고 값 전체를 감싼 괄호만 제거
+    if value.startswith('(') and value.endswith(')'):
+        value = value[1:-1].strip()
+    return value or None
+
+
+def _is_korean_name(token: str) -> bool:
+    return bool(re.fullmatch(_KOREAN_NAME, token)) and token[0] in _SURNAMES and token not in KOREAN_TITLES
+
+
+def _is_english_name(token: str) -> bool:
+    return bool(_ENGLISH_NAME.fullmatch(token))
+
+
+def _is_title(token: str) -> bool:
+    return token in KOREAN_TITLES or bool(re.fullmatch(_ENGLISH_TITLE, token))
+
+
+def latest_message(content: str) -> str:
+    """인용된 이전 메일(> 줄, 'On ... wrote:' 이후 등)을 제외한 최신 메시지 부분"""
+    marker = _QUOTE_MARKERS.search(content)
+    if marker:
+        content = content[:marker.start()]
+    return '\n'.join(line for line in content.splitlines() if not line.lstrip().startswith('>'))
+
+
+def _signature_lines(text: str) -> Iterable[str]:
+    """서명 후보 줄: '--' 이후 또는 마지막 몇 줄"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for index, line in enumerate(lines):
+        if line in ('--', '-- ', '—', '___'):
+            return lines[index + 1:]
+    return lines[-_SIGNATURE_LINES:]
+
+
+def _apply_signature(result: RuleExtraction, text: str) -> None:
+    """구분자(| / ·)로 나뉜 서명 블록의 토큰을 종류별로 분류"""
+    for line in _signature_lines(text):
+        tokens = [_strip_value(token) for token in _SIGNATURE_SEPARATORS.split(line)]
+        tokens = [token for token in tokens if token]
+        if len(tokens) < 3:
+            continue
+        leftovers = []
+        for index, token in enumerate(tokens):
+            token = re.sub(r"^(?:T|M|Tel|Phone|Mobile|E|Email)\s*[.:]\s*", '', token, flags=re.IGNORECASE)
+            if PHONE_PATTERN.fullmatch(token):
+                result.offer('phone', token, SIGNATURE)
+            elif EMAIL_PATTERN.fullmatch(token):
+                result.offer('email', token, SIGNATURE)
+            elif _is_title(token):
+                result.offer('title', token, SIGNATURE)
+            elif (_is_korean_name(token) or (index == 0 and _is_english_name(token))) and 'name' not in leftovers:
+                result.offer('name', token, SIGNATURE)
+                leftovers.append('name')
+            elif re.fullmatch(_COMPANY + r"(?:\s" + _COMPANY + r")?", token):
+                leftovers.append(token)
+        companies = [token for token in leftovers if token != 'name']
+        if len(companies) == 1:
+            result.offer('company', companies[0], SIGNATURE)
+
+
+def pre_extract(email_content: str, sender_email: str = '') -> RuleExtraction:
+    """
+    규칙 기반 고객 정보 추출
+
+    미리 컴파일한 패턴으로 라벨 형식, 서명 블록, 자기소개 문장, 전화번호/이메일을 찾는다.
+    각 필드는 찾은 규칙의 신뢰도와 함께 반환되고, 호출 측이 기준 이상인 필드만 확정한다.
+    """
+    result = RuleExtraction()
+    text = latest_message(email_content)
+
+    for name, pattern in _LABEL_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            value = match.group(1)
+            if name == 'phone':
+                phone = PHONE_PATTERN.search(value)
+                value = phone.group(0) if phone else None
+            elif name == 'email':
+                email = EMAIL_PATTERN.search(value)
+                value = email.group(0) if email else None
+            elif name == 'name' and not (_is_korean_name(value) or _is_english_name(value)):
+                continue
+            result.offer(name, value, LABELED)
+
+    _apply_signature(result, text)
+
+    for pattern, order in ((_INTRO_TITLE_NAME, ('company', 'title', 'name')),
+                           (_INTRO_NAME_TITLE, ('company', 'name', 'title'))):
+        match = pattern.search(text)
+        if match and _is_korean_name(match.group(order.index('name') + 1)) and match.group(1) not in _NOT_COMPANY:
+            for index, name in enumerate(order, start=1):
+                result.offer(name, match.group(index), INTRO)
+
+    match = _ENGLISH_INTRO.search(text)
+    if match:
+        result.offer('name', match.group(1), INTRO)
+        result.offer('title', match.group(2), INTRO)
+        result.offer('company', match.group(3), INTRO)
+
+    match = _INTRO_COMPANY.search(text)
+    if match and match.group(1) not in _NOT_COMPANY:
+        result.offer('company', match.group(1), CLOSING)
+    match = _CONTACT_PERSON.search(text)
+    if match and _is_korean_name(match.group(1)):
+        result.offer('name', match.group(1), INTRO)
+    match = _CLOSING_NAME.search(text)
+    if match and _is_korean_name(match.group(1)):
+        result.offer('name', match.group(1), CLOSING)
+
+    phone = PHONE_PATTERN.search(text)
+    if phone:
+        result.offer('phone', phone.group(0), PATTERN)
+    emails = [email for email in EMAIL_PATTERN.findall(text) if email.lower() != sender_email.lower()]
+    if emails:
+        result.offer('email', emails[0], PATTERN)
+
+    return result
+
+
+def merge_customer_info(rule_values: Dict[str, str], llm_info: Dict) -> Dict[str, Optional[str]]:
+    """확정된 규칙 값이 LLM 값보다 우선 (LLM은 나머지 필드만 채움)"""
+    return {name: rule_values.get(name) or llm_info.get(name) for name in CUSTOMER_FIELDS}
+
+
+def split_fields(extraction: RuleExtraction, min_confidence: float,
+                 sender_email: str = '') -> Tuple[Dict[str, str], List[str]]:
+    """(확정된 필드 값, LLM이 채워야 할 필드)"""
+    return extraction.confident(min_confidence), extraction.unresolved(min_confidence, sender_email)
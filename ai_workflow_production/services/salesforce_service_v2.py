@@ -1,6 +1,8 @@
 # services/salesforce_service_v2.py
 
-from services.base_service import BaseService
+from .base_service import BaseService
+from ai_workflow_production.utils.http_pool import create_session
+from ai_workflow_production.utils.tracing import get_tracer
 import os
 import time
 import jwt
@@ -20,10 +22,14 @@ class SalesforceServiceV2(BaseService):
         self.username = os.getenv(sf_config['USERNAME_ENV'])
         self.login_url = os.getenv("SF_LOGIN_URL")
         self.key_path = os.getenv("SF_JWT_KEY")
+        self.api_version = sf_config.get('API_VERSION', '58.0')
         
         self.access_token = None
         self.instance_url = None
         
+        # 로그인/인스턴스 호스트별 keep-alive 커넥션 풀 (기본 타임아웃: HTTP_POOL_CONFIG의 연결/읽기)
+        self.session = create_session('salesforce', config.get('HTTP_POOL_CONFIG'))
+        
         self.logger.info("Salesforce 서비스 초기화")
     # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
     
@@ -56,15 +62,18 @@ class SalesforceServiceV2(BaseService):
             
             # 토큰 요청
             token_url = f"{self.login_url}/services/oauth2/token"
-            response = requests.post(
-                token_url,
-                data={
-                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                    "assertion": assertion,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=20,
-            )
+            with get_tracer().span("HTTP POST oauth2/token", **{
+                'http.method': 'POST', 'http.url': token_url
+            }) as span:
+                response = self.session.post(
+                    token_url,
+                    data={
+                        "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                        "assertion": assertion,
+                    },
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                )
+                span.set_http_status(response.status_code)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -82,6 +91,38 @@ class SalesforceServiceV2(BaseService):
             self.logger.error(f"Salesforce 인증 실패: {e}")
             return False
     
+    def probe(self, timeout: float = 5.0) -> Dict:
+        """limits 엔드포인트 호출로 연결 확인 (토큰이 없으면 JWT 인증 먼저, 401이면 토큰 재발급 후 1회 재시도)"""
+        if not self.access_token and not self.authenticate():
+            return {'healthy': False, 'detail': 'JWT 인증 실패'}
+        
+        response = self._get_limits(timeout)
+        if response.status_code == 401:
+            # 토큰 만료/폐기 - 재발급에 실패할 때만 비정상으로 보고
+            self.logger.info("Salesforce 토큰 만료 (401), 재발급 후 다시 확인")
+            if not self.authenticate():
+                return {'healthy': False, 'detail': 'HTTP 401 (JWT 재인증 실패)'}
+            response = self._get_limits(timeout)
+        
+        if response.status_code == 200:
+            api_requests = response.json().get('DailyApiRequests', {})
+            return {
+                'healthy': True,
+                'detail': f"API 잔여 {api_requests.get('Remaining')}/{api_requests.get('Max')}"
+            }
+        return {'healthy': False, 'detail': f"HTTP {response.status_code}"}
+    
+    def _get_limits(self, timeout: float):
+        limits_url = f"{self.instance_url}/services/data/v{self.api_version}/limits"
+        with get_tracer().span("HTTP GET limits", **{'http.method': 'GET', 'http.url': limits_url}) as span:
+            response = self.session.get(
+                limits_url,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                timeout=timeout
+            )
+            span.set_http_status(response.status_code)
+        return response
+    
     def create_lead(self, customer_info: Dict) -> bool:
         """
         리드 생성
@@ -99,6 +140,9 @@ class SalesforceServiceV2(BaseService):
             self.logger.error("Salesforce 인증이 필요합니다")
             return False
         
+        if not self._circuit_allows("Lead 생성"):
+            return False
+        
         try:
             import re
             
@@ -140,7 +184,7 @@ class SalesforceServiceV2(BaseService):
             }
             
             # Lead 생성 API 호출
-            lead_url = f"{self.instance_url}/services/data/v60.0/sobjects/Lead/"
+            lead_url = f"{self.instance_url}/services/data/v{self.api_version}/sobjects/Lead/"
             
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
@@ -150,7 +194,13 @@ class SalesforceServiceV2(BaseService):
             self.logger.info(f"Lead 생성 요청: {lead_data['FirstName']} {lead_data['LastName']} ({lead_data['Company']})")
             self.logger.info(f"   이메일: {lead_data['Email']}")
             
-            response = requests.post(lead_url, headers=headers, json=lead_data)
+            with get_tracer().span("HTTP POST sobjects/Lead", **{
+                'http.method': 'POST', 'http.url': lead_url
+            }) as span:
+                response = self.session.post(lead_url, headers=headers, json=lead_data)
+                span.set_http_status(response.status_code)
+            
+            self._record_outcome(response.status_code < 500 and response.status_code != 429)
             
             if response.status_code == 201:
                 result = response.json()
@@ -165,6 +215,10 @@ class SalesforceServiceV2(BaseService):
                 self.logger.error(f"   응답: {response.text}")
                 return False
             
+        except requests.exceptions.RequestException as e:
+            self._record_outcome(False)
+            self.logger.error(f"Lead 생성 중 네트워크 오류: {e}")
+            return False
         except Exception as e:
             self.logger.error(f"Lead 생성 중 오류: {e}")
             return False
@@ -175,14 +229,18 @@ class SalesforceServiceV2(BaseService):
             return None
         
         try:
-            lead_url = f"{self.instance_url}/services/data/v60.0/sobjects/Lead/{lead_id}"
+            lead_url = f"{self.instance_url}/services/data/v{self.api_version}/sobjects/Lead/{lead_id}"
             
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(lead_url, headers=headers)
+            with get_tracer().span("HTTP GET sobjects/Lead", **{
+                'http.method': 'GET', 'http.url': lead_url
+            }) as span:
+                response = self.session.get(lead_url, headers=headers)
+                span.set_http_status(response.status_code)
             
             if response.status_code == 200:
                 return response.json()
@@ -1,74 +1,359 @@
 # services/service_manager.py - 서비스 관리자
 
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker
 
 class ServiceManager:
     """서비스 관리자 - 여러 서비스를 통합 관리"""
     
-    def __init__(self):
+    def __init__(self, breaker_config: Optional[Dict] = None, startup_config: Optional[Dict] = None):
         self.logger = logging.getLogger(__name__)
         self._services: Dict[str, object] = {}
+        self._factories: Dict[str, Callable[[], object]] = {}
+        self._factory_lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breaker_config = breaker_config or {}
+        self._startup_config = startup_config or {}
+        self._retry_policy: Optional[Tuple[int, float]] = None  # (재시도 횟수, 간격) - execute_with_retry 기본값
+        
+        # 서비스별 초기화 상태: name -> {'status': pending|ready|failed, 'seconds': float, ...}
+        self._init_state: Dict[str, Dict] = {}
+        self._init_lock = threading.Lock()
+        self.startup_seconds: Optional[float] = None
+        
+        # 서킷이 열린 서비스에 대한 지연 작업 (Lead 생성, 답장 발송 등)
+        self._retry_queue = deque(maxlen=self._breaker_config.get('RETRY_QUEUE_MAX', 500))
+        self._retry_lock = threading.Lock()
+        
+        # 헬스 프로브 결과 캐시: name -> result
+        self._probe_cache: Dict[str, Dict] = {}
+        self._probe_lock = threading.Lock()
     
     def register_service(self, name: str, service: object) -> None:
-        """서비스 등록"""
+        """서비스 등록 (서비스별 서킷 브레이커 연결)"""
         self._services[name] = service
+        breaker = self._breakers.get(name) or CircuitBreaker.from_config(name, self._breaker_config)
+        self._breakers[name] = breaker
+        if hasattr(service, 'circuit_breaker'):
+            service.circuit_breaker = breaker
+        self._apply_retry_policy(service)
         self.logger.info(f"서비스 등록: {name}")
     
-    def get_service(self, name: str) -> Optional[object]:
-        """서비스 가져오기"""
+    def register_factory(self, name: str, factory: Callable[[], object]) -> None:
+        """서비스 생성 함수 등록 (처음 get_service될 때 생성/모듈 import)"""
+        self._factories[name] = factory
+        self._breakers[name] = CircuitBreaker.from_config(name, self._breaker_config)
+        self.logger.debug(f"서비스 팩토리 등록: {name}")
+    
+    def service_names(self):
+        """등록된 서비스 이름 (생성 여부와 무관)"""
+        return list(dict.fromkeys([*self._services, *self._factories]))
+    
+    def _resolve(self, name: str) -> Optional[object]:
+        """서비스 인스턴스 반환 (팩토리만 등록된 경우 생성)"""
         service = self._services.get(name)
+        if service is not None or name not in self._factories:
+            return service
+        
+        with self._factory_lock:
+            if name not in self._services:
+                self.register_service(name, self._factories[name]())
+        return self._services[name]
+    
+    def update_breaker_config(self, breaker_config: Dict) -> None:
+        """서킷 브레이커 설정 변경 (설정 hot reload, 서킷 상태/지연 작업은 유지)"""
+        self._breaker_config = breaker_config
+        for breaker in self._breakers.values():
+            breaker.reconfigure(breaker_config)
+    
+    def update_retry_policy(self, attempts: int, delay: float) -> None:
+        """서비스 재시도 횟수/간격 변경 (설정 hot reload, 아직 생성되지 않은 서비스는 등록 시 적용)"""
+        self._retry_policy = (attempts, delay)
+        for service in self._services.values():
+            self._apply_retry_policy(service)
+    
+    def _apply_retry_policy(self, service: object) -> None:
+        if self._retry_policy is not None and hasattr(service, 'retry_attempts'):
+            service.retry_attempts, service.retry_delay = self._retry_policy
+    
+    def get_breaker(self, name: str) -> Optional[CircuitBreaker]:
+        """서비스의 서킷 브레이커 가져오기"""
+        return self._breakers.get(name)
+    
+    def is_ready(self, name: str) -> bool:
+        """초기화 완료 여부 (initialize_all 전에는 True로 간주)"""
+        state = self._init_state.get(name)
+        return state is None or state['status'] == 'ready'
+    
+    def is_available(self, name: str) -> bool:
+        """초기화가 끝났고 서킷이 열려 있지 않은지 확인"""
+        if not self.is_ready(name):
+            return False
+        breaker = self._breakers.get(name)
+        return breaker is None or not breaker.is_open()
+    
+    def defer(self, service_name: str, description: str, func: Callable, *args,
+              on_success: Optional[Callable] = None, **kwargs) -> None:
+        """사용 불가 서비스(초기화 중 또는 서킷 open) 호출을 재시도 큐에 보관"""
+        with self._retry_lock:
+            if len(self._retry_queue) == self._retry_queue.maxlen:
+                dropped = self._retry_queue[0]
+                self.logger.error(f"재시도 큐 가득 참, 가장 오래된 작업 폐기: {dropped['description']}")
+            self._retry_queue.append({
+                'service': service_name,
+                'description': description,
+                'func': func,
+                'args': args,
+                'kwargs': kwargs,
+                'on_success': on_success,
+                'attempts': 0
+            })
+        self.logger.warning(f"⏸️ {service_name} 사용 불가 (초기화 중 또는 서킷 open), 재시도 큐에 보관: {description}")
+    
+    def drain_retry_queue(self) -> int:
+        """서킷이 닫힌(또는 half-open) 서비스의 지연 작업 재실행"""
+        self._retry_failed_initializations()
+        
+        with self._retry_lock:
+            pending = list(self._retry_queue)
+            self._retry_queue.clear()
+        
+        if not pending:
+            return 0
+        
+        max_attempts = self._breaker_config.get('RETRY_MAX_ATTEMPTS', 5)
+        completed = 0
+        requeue = []
+        
+        for item in pending:
+            if not self.is_available(item['service']):
+                requeue.append(item)
+                continue
+            
+            item['attempts'] += 1
+            try:
+                result = item['func'](*item['args'], **item['kwargs'])
+            except Exception as e:
+                self.logger.error(f"지연 작업 실행 실패 ({item['description']}): {e}")
+                result = None
+            
+            if isinstance(result, dict) and result.get('deferred'):
+                # 실행 중 서비스가 다시 사용 불가 → 작업이 스스로 재시도 큐에 다시 넣었으므로 완료도 재보관도 아님
+                self.logger.warning(f"⏸️ 지연 작업 다시 지연: {item['description']}")
+            elif result:
+                completed += 1
+                self.logger.info(f"▶️ 지연 작업 완료: {item['description']}")
+                if item['on_success']:
+                    item['on_success']()
+            elif item['attempts'] < max_attempts:
+                requeue.append(item)
+            else:
+                self.logger.error(f"지연 작업 최종 실패 ({item['attempts']}회): {item['description']}")
+        
+        with self._retry_lock:
+            # 처리 중 defer된 작업과 합쳐 한도를 넘으면 defer와 같이 가장 오래된 작업부터 폐기
+            # (maxlen deque의 extendleft는 반대쪽 최신 작업을 기록 없이 버림)
+            overflow = len(self._retry_queue) + len(requeue) - self._retry_queue.maxlen
+            for dropped in requeue[:max(0, overflow)]:
+                self.logger.error(f"재시도 큐 가득 참, 가장 오래된 작업 폐기: {dropped['description']}")
+            requeue = requeue[max(0, overflow):]
+            self._retry_queue.extendleft(reversed(requeue))
+        
+        self.logger.info(f"재시도 큐 처리: 완료 {completed}개, 대기 {len(requeue)}개")
+        return completed
+    
+    def retry_queue_size(self) -> int:
+        return len(self._retry_queue)
+    
+    def get_service(self, name: str) -> Optional[object]:
+        """서비스 가져오기 (지연 생성)"""
+        try:
+            service = self._resolve(name)
+        except Exception as e:
+            self.logger.error(f"서비스 생성 실패 ({name}): {e}", exc_info=True)
+            return None
         if not service:
             self.logger.error(f"서비스를 찾을 수 없음: {name}")
         return service
     
+    def _initialize_one(self, name: str) -> bool:
+        """단일 서비스 생성/초기화 (스레드에서 실행) 및 소요 시간 기록"""
+        started = time.perf_counter()
+        try:
+            service = self._resolve(name)
+            # authenticate 메서드가 있으면 호출, 없으면 성공으로 간주
+            ok = bool(service.authenticate()) if hasattr(service, 'authenticate') else True
+            error = None if ok else "인증 실패"
+        except Exception as e:
+            ok = False
+            error = f"{type(e).__name__}: {e}"
+        
+        elapsed = time.perf_counter() - started
+        with self._init_lock:
+            self._init_state[name] = {
+                'status': 'ready' if ok else 'failed',
+                'seconds': round(elapsed, 2),
+                'error': error,
+                'finished_at': time.time()
+            }
+        
+        if ok:
+            self.logger.info(f"✅ {name} 초기화 성공 ({elapsed:.2f}초)")
+        else:
+            self.logger.warning(f"⚠️ {name} 초기화 실패 ({elapsed:.2f}초): {error}")
+        return ok
+    
     def initialize_all(self) -> bool:
-        """모든 서비스 초기화"""
-        self.logger.info("모든 서비스 초기화 시작...")
+        """
+        모든 서비스 병렬 초기화
+        
+        핵심 서비스(CRITICAL_SERVICES)는 서비스별 타임아웃까지 기다리고,
+        나머지는 백그라운드에서 계속 초기화되며 준비되기 전까지 is_available()이 False.
+        
+        Returns:
+            bool: 핵심 서비스가 모두 준비되면 True
+        """
+        self.logger.info("모든 서비스 병렬 초기화 시작...")
+        started = time.perf_counter()
+        
+        names = self.service_names()
+        critical = set(self._startup_config.get('CRITICAL_SERVICES', names))
+        timeouts = self._startup_config.get('INIT_TIMEOUTS', {})
+        default_timeout = self._startup_config.get('DEFAULT_INIT_TIMEOUT', 30)
         
-        success_count = 0
-        fail_count = 0
+        with self._init_lock:
+            for name in names:
+                self._init_state[name] = {'status': 'pending', 'seconds': None, 'error': None,
+                                          'finished_at': None}
         
-        for name, service in self._services.items():
+        executor = ThreadPoolExecutor(max_workers=max(1, len(names)), thread_name_prefix="init")
+        futures = {name: executor.submit(self._initialize_one, name) for name in names}
+        
+        for name in critical & futures.keys():
+            remaining = started + timeouts.get(name, default_timeout) - time.perf_counter()
             try:
-                self.logger.info(f"초기화 중: {name}")
-                
-                # authenticate 메서드가 있으면 호출
-                if hasattr(service, 'authenticate'):
-                    if service.authenticate():
-                        self.logger.info(f"✅ {name} 초기화 성공")
-                        success_count += 1
-                    else:
-                        self.logger.warning(f"⚠️ {name} 인증 실패")
-                        fail_count += 1
-                else:
-                    # authenticate가 없으면 성공으로 간주
-                    self.logger.info(f"✅ {name} 등록 완료")
-                    success_count += 1
-                    
-            except Exception as e:
-                self.logger.error(f"❌ {name} 초기화 실패: {e}")
-                fail_count += 1
+                futures[name].result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                with self._init_lock:
+                    self._init_state[name].update(status='failed', error="초기화 타임아웃")
+                self.logger.error(f"❌ {name} 초기화 타임아웃 ({timeouts.get(name, default_timeout)}초)")
         
-        self.logger.info(f"초기화 완료: 성공 {success_count}개, 실패 {fail_count}개")
+        # 비핵심 서비스는 기다리지 않음 (완료되면 상태가 자동 갱신됨)
+        executor.shutdown(wait=False)
         
-        # 최소 1개 이상 성공하면 True
-        return success_count > 0
+        self.startup_seconds = time.perf_counter() - started
+        self._log_startup_report(critical)
+        
+        return all(self._init_state[name]['status'] == 'ready' for name in critical & futures.keys())
+    
+    def _log_startup_report(self, critical) -> None:
+        """시작 시간 breakdown 로그 출력"""
+        self.logger.info(f"⏱️ 서비스 초기화: {self.startup_seconds:.2f}초")
+        for name, state in self.startup_report().items():
+            seconds = f"{state['seconds']:.2f}초" if state['seconds'] is not None else "진행 중"
+            role = "핵심" if name in critical else "보조"
+            self.logger.info(f"   {name:<12} [{role}] {state['status']:<8} {seconds}"
+                             + (f" - {state['error']}" if state['error'] else ""))
+    
+    def startup_report(self) -> Dict[str, Dict]:
+        """서비스별 초기화 상태/소요 시간"""
+        with self._init_lock:
+            return {name: dict(state) for name, state in self._init_state.items()}
     
-    def health_check(self) -> Dict[str, bool]:
-        """모든 서비스 상태 확인"""
-        health_status = {}
+    def _retry_failed_initializations(self) -> None:
+        """초기화에 실패한 서비스를 INIT_RETRY_INTERVAL마다 백그라운드에서 재시도"""
+        interval = self._startup_config.get('INIT_RETRY_INTERVAL', 300)
+        now = time.time()
         
-        for name, service in self._services.items():
-            try:
-                # 서비스가 None이 아니면 OK
-                health_status[name] = service is not None
-            except Exception as e:
-                self.logger.error(f"상태 확인 실패 ({name}): {e}")
-                health_status[name] = False
+        with self._init_lock:
+            retry = [
+                name for name, state in self._init_state.items()
+                if state['status'] == 'failed' and now - (state['finished_at'] or 0) >= interval
+            ]
+            for name in retry:
+                self._init_state[name].update(status='pending', finished_at=now)
+        
+        for name in retry:
+            self.logger.info(f"🔄 {name} 초기화 재시도 (백그라운드)")
+            threading.Thread(
+                target=self._initialize_one, args=(name,),
+                name=f"init-{name}", daemon=True
+            ).start()
+    
+    def _run_probe(self, name: str, timeout: float) -> Dict:
+        """단일 서비스 프로브 실행 및 지연 시간 측정"""
+        started = time.perf_counter()
+        try:
+            service = self._resolve(name)
+            if hasattr(service, 'probe'):
+                result = dict(service.probe(timeout=timeout))
+            else:
+                # probe가 없으면 등록 여부만 확인
+                result = {'healthy': service is not None, 'detail': 'probe 미지원'}
+        except Exception as e:
+            result = {'healthy': False, 'detail': f"{type(e).__name__}: {e}"}
+        
+        result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        result['checked_at'] = time.time()
+        return result
+    
+    def probe_all(self, timeout: float = 5.0, cache_ttl: float = 30.0, force: bool = False) -> Dict[str, Dict]:
+        """
+        모든 서비스 liveness 프로브 병렬 실행 (TTL 동안 결과 캐시)
         
-        return health_status
+        Returns:
+            {name: {'healthy': bool, 'detail': str, 'latency_ms': float,
+                    'checked_at': float, 'cached': bool, 'circuit': str}}
+        """
+        now = time.time()
+        results: Dict[str, Dict] = {}
+        to_probe = []
+        
+        with self._probe_lock:
+            for name in self.service_names():
+                cached = self._probe_cache.get(name)
+                if not force and cached and now - cached['checked_at'] < cache_ttl:
+                    results[name] = {**cached, 'cached': True}
+                else:
+                    to_probe.append(name)
+        
+        if to_probe:
+            executor = ThreadPoolExecutor(max_workers=len(to_probe), thread_name_prefix="probe")
+            futures = {name: executor.submit(self._run_probe, name, timeout) for name in to_probe}
+            deadline = time.perf_counter() + timeout + 1.0
+            for name, future in futures.items():
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                except FutureTimeoutError:
+                    result = {'healthy': False, 'detail': f"프로브 타임아웃 ({timeout}초)",
+                              'latency_ms': timeout * 1000, 'checked_at': time.time()}
+                results[name] = {**result, 'cached': False}
+            # 타임아웃된 프로브 스레드를 기다리지 않음
+            executor.shutdown(wait=False)
+            
+            with self._probe_lock:
+                for name in to_probe:
+                    self._probe_cache[name] = {k: v for k, v in results[name].items() if k != 'cached'}
+        
+        for name, result in results.items():
+            breaker = self._breakers.get(name)
+            result['circuit'] = breaker.snapshot()['state'] if breaker else None
+        
+        return results
+    
+    def health_check(self, timeout: float = 5.0, cache_ttl: float = 30.0) -> Dict[str, bool]:
+        """모든 서비스 상태 확인 (probe_all 결과 요약)"""
+        return {
+            name: result['healthy']
+            for name, result in self.probe_all(timeout=timeout, cache_ttl=cache_ttl).items()
+        }
     
     def get_all_services(self) -> Dict[str, object]:
-        """모든 서비스 목록 반환"""
-        return self._services.copy()
\ No newline at end of file
+        """모든 서비스 목록 반환 (미생성 서비스도 생성)"""
+        return {name: self.get_service(name) for name in self.service_names()}
\ No newline at end of file
@@ -0,0 +1,222 @@
+# services/structured_output.py - LLM 구조화 출력(JSON) 해석: 스키마 검증 + 잘리거나 설명이 섞인 응답에서 완성된 필드 복구
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .llm_common import LLMError
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# JSON Schema 타입 → 허용하는 파이썬 타입 (bool은 int의 하위 타입이라 숫자에서 제외)
+_TYPES = {
+    'string': (str,),
+    'object': (dict,),
+    'array': (list,),
+    'boolean': (bool,),
+    'integer': (int,),
+    'number': (int, float)
+}
+
+
+@dataclass
+class StructuredResult:
+    value: Dict
+    complete: bool                                     # False면 응답이 중간에 끊겨 앞부분만 복구
+    dropped: List[str] = field(default_factory=list)   # 스키마에 맞지 않아 버린 경로 (예: $.phone, $.results[2])
+
+
+class _Truncated(Exception):
+    """스칼라 값이 끝나기 전에 텍스트가 끝났거나 문법이 깨짐"""
+
+
+def _skip(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _parse_value(text: str, pos: int) -> Tuple[Any, int, bool]:
+    """pos의 값: (값, 다음 위치, 완전한지) - 객체/배열은 끊겨도 완성된 앞부분을 돌려줌"""
+    pos = _skip(text, pos)
+    if pos >= len(text):
+        raise _Truncated()
+    if text[pos] == '{':
+        return _parse_object(text, pos)
+    if text[pos] == '[':
+        return _parse_array(text, pos)
+    try:
+        value, end = _decoder.raw_decode(text, pos)  # 문자열/숫자/리터럴은 C 스캐너로
+    except ValueError:
+        raise _Truncated()
+    if end >= len(text) and not isinstance(value, str):
+        raise _Truncated()  # 텍스트 끝의 숫자는 잘렸는지 알 수 없음
+    return value, end, True
+
+
+def _parse_object(text: str, pos: int) -> Tuple[Dict, int, bool]:
+    """'{'부터 객체 해석: 끊기면 그 전까지 완성된 멤버만 (끊긴 객체/배열 값은 완성된 부분만 유지)"""
+    result = {}
+    pos = _skip(text, pos + 1)
+    if text.startswith('}', pos):
+        return result, pos + 1, True
+    while True:
+        try:
+            key, pos = _decoder.raw_decode(text, pos)
+            if not isinstance(key, str):
+                raise _Truncated()
+            pos = _skip(text, pos)
+            if not text.startswith(':', pos):
+                raise _Truncated()
+            value, pos, complete = _parse_value(text, pos + 1)
+        except (ValueError, _Truncated):
+            return result, pos, False
+        if complete or isinstance(value, (dict, list)):
+            result[key] = value
+        if not complete:
+            return result, pos, False
+        pos = _skip(text, pos)
+        if text.startswith(',', pos):
+            pos = _skip(text, pos + 1)
+        elif text.startswith('}', pos):
+            return result, pos + 1, True
+        else:
+            return result, pos, False
+
+
+def _parse_array(text: str, pos: int) -> Tuple[List, int, bool]:
+    """'['부터 배열 해석: 끊기면 완성된 항목만 (끊긴 마지막 항목은 버림)"""
+    result = []
+    pos = _skip(text, pos + 1)
+    if text.startswith(']', pos):
+        return result, pos + 1, True
+    while True:
+        try:
+            value, pos, complete = _parse_value(text, pos)
+        except _Truncated:
+            return result, pos, False
+        if not complete:
+            return result, pos, False
+        result.append(value)
+        pos = _skip(text, pos)
+        if text.startswith(',', pos):
+            pos += 1
+        elif text.startswith(']', pos):
+            return result, pos + 1, True
+        else:
+            return result, pos, False
+
+
+def _validate(value: Any, schema: Dict, path: str, dropped: List[str], root: bool = False) -> Tuple[bool, Any]:
+    """
+    스키마에 맞게 정리: (유효한지, 정리된 값)
+
+    - 정의되지 않은 속성 / 타입·enum이 틀린 속성은 버리고 나머지는 유지
+    - 배열 항목·중첩 객체는 필수 속성이 빠지면 통째로 무효 (최상위 객체는 부분 결과 허용)
+    """
+    types = schema.get('type') or []
+    types = [types] if isinstance(types, str) else types
+    if 'enum' in schema and value not in schema['enum']:
+        return False, None
+    if value is None:
+        return 'null' in types, None
+    if not any(isinstance(value, _TYPES.get(name, ())) and not (isinstance(value, bool) and name != 'boolean')
+               for name in types):
+        return False, None
+
+    if isinstance(value, dict):
+        properties = schema.get('properties', {})
+        cleaned = {}
+        for key, item in value.items():
+            if key not in properties:
+                dropped.append(f"{path}.{key}")
+                continue
+            valid, item = _validate(item, properties[key], f"{path}.{key}", dropped)
+            if valid:
+                cleaned[key] = item
+            else:
+                dropped.append(f"{path}.{key}")
+        if not root and any(key not in cleaned for key in schema.get('required', [])):
+            return False, None
+        return True, cleaned
+
+    if isinstance(value, list):
+        cleaned = []
+        for index, item in enumerate(value):
+            valid, item = _validate(item, schema.get('items', {}), f"{path}[{index}]", dropped)
+            if valid:
+                cleaned.append(item)
+            else:
+                dropped.append(f"{path}[{index}]")
+        return True, cleaned
+    return True, value
+
+
+def _require_complete(value: Dict, complete: bool, schema: Dict) -> None:
+    """부분 결과면 LLMError (빠진 필드를 기본값으로 채우면 '정보 누락'으로 잘못 판단하므로)"""
+    if not complete:
+        raise LLMError("응답이 중간에 끊겼습니다")
+    missing = [key for key in schema.get('required', []) if key not in value]
+    if missing:
+        raise LLMError(f"응답에 필수 필드 누락: {', '.join(missing)}")
+
+
+def parse_structured(text: str, schema: Dict, strict: bool = False) -> StructuredResult:
+    """
+    응답 텍스트에서 스키마에 맞는 최상위 JSON 객체 해석 (정규식 없이 1회 스캔)
+
+    - 코드 펜스/앞뒤 설명 무시: '{' 위치마다 시도해 스키마 속성이 하나라도 있는 첫 객체 사용
+      (값 안의 중괄호, 중첩 객체, {"result": {...}}처럼 한 번 감싼 응답도 처리)
+    - 잘린 응답(max tokens 등): 끝까지 완성된 속성/배열 항목만 복구 (complete=False)
+    - strict: 부분 결과를 허용하지 않음 (끊긴 응답 / 최상위 필수 속성 누락은 LLMError)
+
+    Raises:
+        LLMError: 스키마 속성을 하나도 복구하지 못함, strict인데 부분 결과
+    """
+    start = text.find('{')
+    while start >= 0:
+        value, _, complete = _parse_object(text, start)
+        dropped: List[str] = []
+        _, cleaned = _validate(value, schema, '$', dropped, root=True)
+        if cleaned:
+            if strict:
+                _require_complete(cleaned, complete, schema)
+            return StructuredResult(cleaned, complete, dropped)
+        start = text.find('{', start + 1)
+    raise LLMError("응답에서 스키마에 맞는 JSON을 찾을 수 없습니다")
+
+
+def to_gemini_schema(schema: Dict) -> Dict:
+    """
+    JSON Schema(OpenAI 구조화 출력용) → Gemini responseSchema (OpenAPI 부분집합)
+
+    ['string', 'null'] → nullable, additionalProperties 제거, 속성 순서는 propertyOrdering으로 고정
+    """
+    types = schema.get('type')
+    if isinstance(types, list):
+        result: Dict[str, Any] = {'type': next(name for name in types if name != 'null')}
+        if 'null' in types:
+            result['nullable'] = True
+    else:
+        result = {'type': types}
+    if 'enum' in schema:
+        result['enum'] = list(schema['enum'])
+    if 'properties' in schema:
+        result['properties'] = {key: to_gemini_schema(value) for key, value in schema['properties'].items()}
+        result['propertyOrdering'] = list(schema['properties'])
+    if 'required' in schema:
+        result['required'] = list(schema['required'])
+    if 'items' in schema:
+        result['items'] = to_gemini_schema(schema['items'])
+    return result
+
+
+def describe(result: StructuredResult) -> Optional[str]:
+    """부분 복구/정리 내역 로그 문구 (정상 응답이면 None)"""
+    notes = []
+    if not result.complete:
+        notes.append("응답이 중간에 끊겨 완성된 필드만 복구")
+    if result.dropped:
+        notes.append(f"스키마에 맞지 않는 값 제외: {', '.join(result.dropped)}")
+    return '; '.join(notes) or None
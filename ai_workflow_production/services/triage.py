@@ -0,0 +1,284 @@
+# services/triage.py - LLM 호출 전 메일 분류 (문의 / 문의 아님 / 불확실, 해시 특징 나이브 베이즈, CPU 마이크로초 단위)
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+INQUIRY = 'inquiry'
+NON_INQUIRY = 'non_inquiry'
+UNCERTAIN = 'uncertain'
+LABELS = (INQUIRY, NON_INQUIRY)
+
+MODEL_VERSION = 1
+
+# 뉴스레터/자동 발송/반송을 드러내는 헤더 (이름이 있으면 특징, 값도 의미 있는 헤더는 값의 첫 토큰까지)
+_SIGNAL_HEADERS = (
+    'list-id', 'list-unsubscribe', 'list-unsubscribe-post', 'list-post', 'list-help', 'precedence',
+    'auto-submitted', 'x-autoreply', 'x-autorespond', 'x-auto-response-suppress', 'feedback-id',
+    'x-campaign', 'x-mailer', 'return-path', 'content-type', 'importance'
+)
+_SIGNAL_HEADER_PREFIXES = ('x-mc-', 'x-mailgun', 'x-sg-', 'x-ses-', 'x-github-', 'x-campaign')
+_VALUE_HEADERS = ('precedence', 'auto-submitted', 'x-autoreply', 'x-auto-response-suppress', 'x-mailer',
+                  'content-type', 'importance')
+
+# 발신 주소 로컬 파트의 자동 발송 표식
+_SENDER_MARKERS = ('noreply', 'no-reply', 'donotreply', 'do-not-reply', 'mailer-daemon', 'postmaster',
+                   'newsletter', 'news', 'notification', 'notifications', 'billing', 'receipt', 'marketing',
+                   'calendar', 'bounce', 'info', 'event', 'jobs', 'admin')
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z][a-z0-9'-]*|\d+")
+_URL = re.compile(r"https?://|www\.")
+_HEADER_VALUE_SPLIT = re.compile(r"[;\s]")
+# 국가 도메인의 2단계 (company.co.kr → company)
+_SECOND_LEVEL = frozenset(('co', 'or', 'ac', 'go', 'ne', 're', 'pe', 'com', 'net', 'org', 'edu'))
+
+
+@dataclass(frozen=True)
+class TriageResult:
+    label: str                      # inquiry / non_inquiry / uncertain
+    inquiry_prob: float             # 문의일 확률 (모델 추정)
+    elapsed_us: float = 0.0
+
+
+def _text_tokens(text: str) -> Iterable[str]:
+    """소문자 단어 + 한글은 어절과 글자 2-gram (조사/어미가 붙어도 같은 특징이 나오도록), 숫자는 자릿수만"""
+    for token in _TOKEN.findall(text.lower()):
+        if '가' <= token[0] <= '힣':
+            yield token
+            for i in range(len(token) - 1):
+                yield token[i:i + 2]
+        elif token[0].isdigit():
+            yield f"#{min(len(token), 6)}"
+        elif len(token) > 1:
+            yield token
+
+
+def triage_features(email: Mapping, max_body_chars: int = 2000) -> List[str]:
+    """이메일 → 특징 문자열 목록 (발신자 / 신호 헤더 / 제목 / 본문 앞부분, 중복 제거)"""
+    features = set()
+
+    sender = (email.get('sender') or '').lower()
+    address = sender[sender.rfind('<') + 1:].rstrip('>').strip() if '<' in sender else sender.strip()
+    local, _, domain = address.partition('@')
+    if domain:
+        labels = domain.split('.')
+        if len(labels) > 2 and labels[-2] in _SECOND_LEVEL:
+            labels = labels[:-1]
+        features.add(f"d:{domain}")
+        features.add(f"d:{labels[-2] if len(labels) > 1 else labels[0]}")
+    for marker in _SENDER_MARKERS:
+        if marker in local:
+            features.add(f"f:{marker}")
+
+    for name, value in (email.get('headers') or {}).items():
+        name = name.lower()
+        if name not in _SIGNAL_HEADERS and not name.startswith(_SIGNAL_HEADER_PREFIXES):
+            continue
+        value = (value or '').strip().lower()
+        if name == 'return-path':
+            if value in ('<>', ''):
+                features.add("h:return-path=<>")
+            continue
+        features.add(f"h:{name}")
+        if name in _VALUE_HEADERS and value:
+            features.add(f"h:{name}={_HEADER_VALUE_SPLIT.split(value, maxsplit=1)[0]}")
+
+    subject = email.get('subject') or ''
+    features.update(f"s:{token}" for token in _text_tokens(subject))
+
+    body = (email.get('content') or '')[:max_body_chars]
+    features.update(f"b:{token}" for token in _text_tokens(body))
+    urls = len(_URL.findall(body))
+    features.add(f"b:urls={min(urls, 3)}")
+    return list(features)
+
+
+def _bucket(feature: str, mask: int) -> int:
+    # crc32: 프로세스/파이썬 버전과 무관하게 같은 값 (hash()는 실행마다 달라짐)
+    return zlib.crc32(feature.encode('utf-8')) & mask
+
+
+def train_model(samples: Iterable[Mapping], bits: int = 18, alpha: float = 1.0,
+                max_body_chars: int = 2000) -> Dict:
+    """
+    라벨링된 메일로 학습 (특징 중복 없이 세는 다항 나이브 베이즈)
+
+    Args:
+        samples: {sender, subject, content, headers(선택), label: inquiry/non_inquiry}
+        bits: 특징 해시 버킷 수 = 2^bits (모델에는 나온 버킷만 저장)
+        alpha: 라플라스 평활
+    """
+    mask = (1 << bits) - 1
+    counts = {label: {} for label in LABELS}
+    docs = dict.fromkeys(LABELS, 0)
+    for sample in samples:
+        label = sample['label']
+        if label not in counts:
+            raise ValueError(f"알 수 없는 라벨: {label!r} ({', '.join(LABELS)})")
+        docs[label] += 1
+        for feature in triage_features(sample, max_body_chars):
+            bucket = _bucket(feature, mask)
+            counts[label][bucket] = counts[label].get(bucket, 0) + 1
+    if not all(docs.values()):
+        raise ValueError(f"두 라벨 모두 학습 데이터가 필요합니다 (현재 {docs})")
+
+    return {
+        'version': MODEL_VERSION,
+        'bits': bits,
+        'alpha': alpha,
+        'max_body_chars': max_body_chars,
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'docs': docs,
+        'counts': {label: {str(bucket): count for bucket, count in sorted(table.items())}
+                   for label, table in counts.items()}
+    }
+
+
+def save_model(model: Dict, path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(model, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def _compile(model: Dict) -> Tuple[Dict[int, float], float, int, int]:
+    """버킷별 로그 우도비 log P(f|문의) - log P(f|문의 아님), 사전 로그 오즈, 해시 마스크, 본문 길이"""
+    if model.get('version') != MODEL_VERSION:
+        raise ValueError(f"지원하지 않는 모델 버전: {model.get('version')!r}")
+    alpha = model['alpha']
+    counts = {label: {int(bucket): count for bucket, count in model['counts'][label].items()} for label in LABELS}
+    vocabulary = set(counts[INQUIRY]) | set(counts[NON_INQUIRY])
+    totals = {label: sum(table.values()) + alpha * len(vocabulary) for label, table in counts.items()}
+    weights = {
+        bucket: math.log((counts[INQUIRY].get(bucket, 0) + alpha) / totals[INQUIRY])
+        - math.log((counts[NON_INQUIRY].get(bucket, 0) + alpha) / totals[NON_INQUIRY])
+        for bucket in vocabulary
+    }
+    prior = math.log(model['docs'][INQUIRY] / model['docs'][NON_INQUIRY])
+    return weights, prior, (1 << model['bits']) - 1, model.get('max_body_chars', 2000)
+
+
+class TriageClassifier:
+    """
+    LLM 호출 전 메일 분류: 문의 확률이 INQUIRY_MIN_PROB 이상이면 문의, 1 - NON_INQUIRY_MIN_PROB 이하면 문의 아님,
+    그 사이는 불확실 (불확실은 문의와 같이 처리 - 문의를 놓치는 쪽보다 LLM 호출 1건이 싸므로)
+
+    모델 파일(scripts/train_triage.py로 학습)이 없으면 분류하지 않음 (ready=False, 모든 메일 처리)
+    """
+
+    def __init__(self, model: Optional[Dict] = None, inquiry_min_prob: float = 0.9,
+                 non_inquiry_min_prob: float = 0.99, skip_non_inquiry: bool = True,
+                 model_file: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.inquiry_min_prob = inquiry_min_prob
+        self.non_inquiry_min_prob = non_inquiry_min_prob
+        self.skip_non_inquiry = skip_non_inquiry
+        self.model_file = model_file
+        self._model_mtime: Optional[float] = None
+        self._weights: Dict[int, float] = {}
+        self._prior = 0.0
+        self._mask = 0
+        self._max_body_chars = 2000
+        self._counters = {INQUIRY: 0, NON_INQUIRY: 0, UNCERTAIN: 0, 'skipped': 0, 'elapsed_us': 0.0}
+        self._lock = threading.Lock()
+        if model is not None:
+            self._weights, self._prior, self._mask, self._max_body_chars = _compile(model)
+
+    @classmethod
+    def from_config(cls, triage_config: Mapping) -> 'TriageClassifier':
+        classifier = cls(
+            inquiry_min_prob=triage_config.get('INQUIRY_MIN_PROB', 0.9),
+            non_inquiry_min_prob=triage_config.get('NON_INQUIRY_MIN_PROB', 0.99),
+            skip_non_inquiry=triage_config.get('SKIP_NON_INQUIRY', True)
+        )
+        if triage_config.get('ENABLED', True):
+            classifier.load(triage_config.get('MODEL_FILE'))
+        return classifier
+
+    def reconfigure(self, triage_config: Mapping) -> None:
+        """기준 확률/건너뛰기 여부 변경, 모델 파일이 바뀌었거나 다시 학습되었으면 다시 로드"""
+        self.inquiry_min_prob = triage_config.get('INQUIRY_MIN_PROB', self.inquiry_min_prob)
+        self.non_inquiry_min_prob = triage_config.get('NON_INQUIRY_MIN_PROB', self.non_inquiry_min_prob)
+        self.skip_non_inquiry = triage_config.get('SKIP_NON_INQUIRY', self.skip_non_inquiry)
+        model_file = triage_config.get('MODEL_FILE') if triage_config.get('ENABLED', True) else None
+        if model_file != self.model_file or (model_file and self._file_mtime(model_file) != self._model_mtime):
+            self.load(model_file)
+
+    @staticmethod
+    def _file_mtime(path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def load(self, model_file: Optional[str]) -> bool:
+        """모델 파일 로드 (없거나 읽을 수 없으면 분류 중지 - 모든 메일 처리)"""
+        self.model_file = model_file
+        self._model_mtime = self._file_mtime(model_file) if model_file else None
+        self._weights, self._mask = {}, 0
+        if not model_file:
+            return False
+        if self._model_mtime is None:
+            self.logger.warning(f"메일 사전 분류 모델 없음 → 모든 메일 처리 (scripts/train_triage.py로 학습): {model_file}")
+            return False
+        try:
+            with open(model_file, 'r', encoding='utf-8') as f:
+                model = json.load(f)
+            self._weights, self._prior, self._mask, self._max_body_chars = _compile(model)
+        except (OSError, ValueError, KeyError, ZeroDivisionError) as e:
+            self.logger.error(f"메일 사전 분류 모델 로드 실패 → 모든 메일 처리: {e}")
+            return False
+        self.logger.info(f"메일 사전 분류 모델 로드: {model_file} (학습 {model.get('trained_at')}, "
+                         f"문의 {model['docs'][INQUIRY]} / 문의 아님 {model['docs'][NON_INQUIRY]}건)")
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._weights)
+
+    def inquiry_probability(self, email: Mapping) -> float:
+        score = self._prior
+        for feature in triage_features(email, self._max_body_chars):
+            score += self._weights.get(_bucket(feature, self._mask), 0.0)
+        # 로그 오즈 → 확률 (극단값에서 exp 넘침 방지)
+        score = max(-50.0, min(50.0, score))
+        return 1.0 / (1.0 + math.exp(-score))
+
+    def classify(self, email: Mapping) -> TriageResult:
+        """문의 / 문의 아님 / 불확실 (모델이 없으면 불확실)"""
+        started = time.perf_counter()
+        if not self.ready:
+            return TriageResult(UNCERTAIN, 0.5)
+        prob = self.inquiry_probability(email)
+        if prob >= self.inquiry_min_prob:
+            label = INQUIRY
+        elif 1.0 - prob >= self.non_inquiry_min_prob:
+            label = NON_INQUIRY
+        else:
+            label = UNCERTAIN
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        with self._lock:
+            self._counters[label] += 1
+            self._counters['skipped'] += label == NON_INQUIRY and self.skip_non_inquiry
+            self._counters['elapsed_us'] += elapsed_us
+        return TriageResult(label, prob, elapsed_us)
+
+    def stats(self) -> Dict:
+        """{inquiry, non_inquiry, uncertain, skipped, classified, mean_us} (프로세스 시작 이후 누적)"""
+        with self._lock:
+            stats = dict(self._counters)
+        classified = stats[INQUIRY] + stats[NON_INQUIRY] + stats[UNCERTAIN]
+        stats['classified'] = classified
+        stats['mean_us'] = stats.pop('elapsed_us') / classified if classified else 0.0
+        return stats
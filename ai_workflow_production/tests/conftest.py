@@ -0,0 +1,37 @@
+# tests/conftest.py - 공용 fixture (실제 외부 API 호출 없음)
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from ai_workflow_production import config
+
+
+@pytest.fixture
+def env_config(monkeypatch):
+    """development 설정 (LLM 키는 더미 값)"""
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    return config.load_environment_config('development')
+
+
+class FakeClock:
+    """time.time / time.monotonic 대역 (advance로 시간 이동)"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
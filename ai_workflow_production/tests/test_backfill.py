@@ -0,0 +1,89 @@
+# tests/test_backfill.py - 대량 처리(backfill): 모니터 모드가 이미 답장한 메일에 다시 답장/Lead 생성하지 않음
+
+import time
+
+import pytest
+
+from ai_workflow_production.core.workflow_engine import WorkflowEngine
+from ai_workflow_production.utils.tracing import configure_tracing
+from bench_batch_job import CountingSalesforceService
+from bench_mail_filter import FakeGmailAPI, _Call, make_gmail
+from soak_memory import FakeAIService
+
+OVERRIDES = {
+    'LLM_CACHE_CONFIG': {'ENABLED': False},
+    'RATE_LIMIT_CONFIG': {'ENABLED': False},
+    'MAIL_FILTER_CONFIG': {'STATE_FILE': None},
+}
+
+
+class MailboxAPI(FakeGmailAPI):
+    """보낸편지함 검색(in:sent to:주소 after:epoch)을 지원하는 Gmail API 대역"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent_at = []
+
+    def send(self, userId, body):
+        self.sent_at.append(time.time())
+        return super().send(userId, body)
+
+    def list(self, userId, q, maxResults):
+        if 'in:sent' not in q:
+            return super().list(userId, q, maxResults)
+        terms = dict(term.split(':', 1) for term in q.split() if ':' in term)
+        matches = [{'id': f"s{index}"} for index, (message, at) in enumerate(zip(self.sent, self.sent_at), 1)
+                   if terms['to'] in message['To'].lower() and at >= int(terms['after'])]
+        return _Call({'messages': matches[:maxResults]} if matches else {})
+
+
+class BackfillEngine(WorkflowEngine):
+    """실제 GmailServiceV2(가짜 API) + 가짜 AI/Salesforce"""
+
+    def __init__(self, env_config, api: MailboxAPI):
+        self._gmail = make_gmail(env_config, api, enabled=True)
+        self.salesforce = CountingSalesforceService()
+        super().__init__(environment='development', config_overrides=OVERRIDES)
+        self.tracer = configure_tracing({'ENABLED': False})
+        self.freshness.state_file = None
+        self.triage.skip_non_inquiry = False
+
+    def _setup_services(self):
+        self.service_manager.register_service("gmail", self._gmail)
+        self.service_manager.register_service("ai", FakeAIService())
+        self.service_manager.register_service("salesforce", self.salesforce)
+
+
+@pytest.fixture
+def api():
+    api = MailboxAPI()
+    for index in range(3):
+        api.deliver(f"고객{index} <customer{index}@example.com>", f"견적 문의 {index}", '견적 부탁드립니다.')
+    return api
+
+
+def test_backfill_skips_mail_answered_by_previous_process(env_config, api):
+    monitor = BackfillEngine(env_config, api)
+    assert len(monitor.process_new_emails(lookback_minutes=60, max_emails=10)) == 3
+    assert len(api.sent) == 3
+
+    # 새 프로세스 (processed_emails 비어 있음) + 그 사이 도착한 문의 1건
+    api.deliver('고객9 <customer9@example.com>', '견적 문의 9', '견적 부탁드립니다.')
+    backfill = BackfillEngine(env_config, api)
+    results = backfill.process_backfill(lookback_days=1, max_emails=10)
+
+    assert len(results) == 1
+    assert len(api.sent) == 4
+    assert 'customer9@example.com' in api.sent[-1]['To']
+    assert backfill.salesforce.leads == 1
+
+
+def test_answered_ids_treats_lookup_failure_as_answered(env_config, api):
+    gmail = make_gmail(env_config, api, enabled=True)
+    emails = gmail.get_recent_emails(60, 10)
+
+    def failing_list(userId, q, maxResults):
+        raise RuntimeError("quota")
+
+    api.list = failing_list
+    assert gmail.answered_ids(emails) == {email['id'] for email in emails}
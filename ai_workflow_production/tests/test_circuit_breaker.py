@@ -0,0 +1,82 @@
+# tests/test_circuit_breaker.py - 서킷 브레이커 상태 전이 / half-open 시험 슬롯
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production.services import circuit_breaker as circuit_breaker_module
+from ai_workflow_production.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    monkeypatch.setattr(circuit_breaker_module, 'time', SimpleNamespace(monotonic=clock))
+    return CircuitBreaker('test', failure_rate_threshold=0.5, window_seconds=60, min_calls=2,
+                          cooldown_seconds=30, half_open_max_calls=1)
+
+
+def trip(breaker: CircuitBreaker, clock) -> None:
+    """실패 2건으로 open → cooldown 경과로 half-open"""
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.advance(30)
+    assert breaker.state == HALF_OPEN
+
+
+def test_opens_on_failure_rate_and_rejects_until_cooldown(breaker, clock):
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    clock.advance(29)
+    assert not breaker.allow_request()
+    clock.advance(1)
+    assert breaker.allow_request()
+
+
+def test_below_min_calls_stays_closed(breaker):
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_allows_single_trial(breaker, clock):
+    trip(breaker, clock)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert not breaker.is_open()
+
+
+def test_half_open_success_closes(breaker, clock):
+    trip(breaker, clock)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()['window_calls'] == 0
+
+
+def test_half_open_failure_reopens(breaker, clock):
+    trip(breaker, clock)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+
+def test_release_returns_half_open_slot(breaker, clock):
+    trip(breaker, clock)
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_release_without_slot_is_noop(breaker, clock):
+    breaker.release()
+    assert breaker.state == CLOSED
+    trip(breaker, clock)
+    breaker.release()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
@@ -0,0 +1,74 @@
+# tests/test_config_reload.py - 설정 hot reload: 재시도 횟수/간격이 서비스에 적용, 일괄 추출 설정은 다음 사이클부터
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production import config
+from ai_workflow_production.services import base_service as base_service_module
+from ai_workflow_production.services.base_service import BaseService
+from ai_workflow_production.services.llm_router import LLMRouterService
+from ai_workflow_production.utils.config_watcher import split_changes
+from soak_memory import SoakEngine
+
+
+class FlakyService(BaseService):
+    """execute_with_retry 작업이 항상 실패하는 서비스 (시도 횟수만 셈)"""
+
+    def __init__(self):
+        super().__init__("Flaky")
+        self.attempts = 0
+
+    def authenticate(self) -> bool:
+        return True
+
+    def fetch(self):
+        def _fail():
+            self.attempts += 1
+            raise RuntimeError("unavailable")
+        return self.execute_with_retry("조회", _fail)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(base_service_module, 'time', SimpleNamespace(time=lambda: 0.0, sleep=slept.append))
+    return slept
+
+
+def reloaded(**workflow) -> config.AppConfig:
+    return config.load_environment_config('development', {'WORKFLOW_CONFIG': workflow})
+
+
+def test_retry_settings_are_hot_and_reach_services(sleeps):
+    engine = SoakEngine(total_emails=0, body_size=0)
+    service = FlakyService()
+    engine.service_manager.register_service("flaky", service)
+    assert (service.retry_attempts, service.retry_delay) == (3, 5.0)
+
+    new_config = reloaded(RETRY_ATTEMPTS=2, RETRY_DELAY=0.5)
+    hot, restart = split_changes(engine.config.diff(new_config))
+    assert set(hot) == {('WORKFLOW_CONFIG', 'RETRY_ATTEMPTS'), ('WORKFLOW_CONFIG', 'RETRY_DELAY')}
+    assert not restart
+
+    engine.apply_config(new_config)
+    assert service.fetch() is None
+    assert service.attempts == 2
+    assert sleeps == [0.5]
+
+
+def test_retry_policy_applies_to_services_registered_later():
+    engine = SoakEngine(total_emails=0, body_size=0)
+    engine.apply_config(reloaded(RETRY_ATTEMPTS=4, RETRY_DELAY=2))
+    engine.service_manager.register_service("flaky", FlakyService())
+    assert engine.service_manager.get_service("flaky").retry_attempts == 4
+
+
+def test_batch_extract_config_is_hot(env_config):
+    keys = ('ENABLED', 'MIN_EMAILS', 'MAX_EMAILS', 'MAX_INPUT_TOKENS')
+    assert set(config.HOT_RELOAD_KEYS['BATCH_EXTRACT_CONFIG']) == set(keys)
+
+    router = LLMRouterService(env_config, {})
+    router.reconfigure_batch({**env_config['BATCH_EXTRACT_CONFIG'], 'MAX_EMAILS': 2})
+    items = [{'id': str(index), 'tokens': 10} for index in range(5)]
+    assert [len(batch) for batch in router._split_batches(items)] == [2, 2, 1]
@@ -0,0 +1,65 @@
+# tests/test_engine_contracts.py - 엔진이 서비스를 부르는 방식과 실제/가짜 서비스 메서드 시그니처 일치
+
+import inspect
+
+import pytest
+
+from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+from ai_workflow_production.services.gmail_service_v2 import GmailServiceV2
+from ai_workflow_production.services.llm_router import LLMRouterService
+from ai_workflow_production.services.openai_service_v2 import OpenAIServiceV2
+from ai_workflow_production.services.salesforce_service_v2 import SalesforceServiceV2
+from bench_batch_job import CorpusGmailService, CountingSalesforceService
+from soak_memory import FakeAIService, FakeGmailService, FakeSalesforceService, SoakEngine
+
+CUSTOMER_INFO = {'has_all_info': True, 'name': '성춘향', 'company': '춘향서비스', 'title': '과장',
+                 'phone': '010-2333-3333', 'email': 'chun@example.com', 'missing_fields': []}
+
+# core/workflow_engine.py의 호출 인자 그대로 (메서드 이름 → (args, kwargs))
+GMAIL_CALLS = {
+    'get_recent_emails': ((10, 5), {'exclude_ids': set()}),
+    'send_reply': ((), {'to_email': 'chun@example.com', 'subject': 'Re: 문의', 'content': '감사합니다.',
+                        'original_email_id': 'm1'}),
+}
+AI_CALLS = {
+    'extract_customer_info': (('본문', 'chun@example.com'), {}),
+    'generate_reply': ((CUSTOMER_INFO, '문의', '본문'), {}),
+    'process_inquiry': (('본문', 'chun@example.com', '문의'), {}),
+    'extract_customer_info_batch': (([{'id': 'm1', 'content': '본문', 'sender': 'chun@example.com'}],), {}),
+}
+SALESFORCE_CALLS = {
+    'create_lead': ((CUSTOMER_INFO,), {}),
+}
+
+
+# 엔진이 hasattr로 확인하고 부르는 선택 메서드
+OPTIONAL_METHODS = ('process_inquiry', 'extract_customer_info_batch')
+
+
+def contract_cases():
+    for calls, services in (
+        (GMAIL_CALLS, (GmailServiceV2, FakeGmailService, CorpusGmailService)),
+        (AI_CALLS, (LLMRouterService, GeminiServiceV2, OpenAIServiceV2, FakeAIService)),
+        (SALESFORCE_CALLS, (SalesforceServiceV2, FakeSalesforceService, CountingSalesforceService)),
+    ):
+        for service in services:
+            for method, (args, kwargs) in calls.items():
+                if method in OPTIONAL_METHODS and not hasattr(service, method):
+                    continue
+                yield pytest.param(service, method, args, kwargs, id=f"{service.__name__}.{method}")
+
+
+@pytest.mark.parametrize('service, method, args, kwargs', list(contract_cases()))
+def test_service_accepts_engine_call(service, method, args, kwargs):
+    signature = inspect.signature(getattr(service, method))
+    signature.bind(None, *args, **kwargs)
+
+
+def test_soak_engine_processes_every_email():
+    """가짜 서비스로 엔진 1사이클: 모든 이메일에 답장 (시그니처가 어긋나면 이메일별 예외로 0건)"""
+    engine = SoakEngine(total_emails=5, body_size=200)
+    engine.freshness.state_file = None
+    engine.triage.skip_non_inquiry = False
+    engine.process_new_emails(lookback_minutes=1, max_emails=10)
+    assert engine._fake_gmail.sent == 5
+    assert len(engine.processed_emails) == 5
@@ -0,0 +1,11 @@
+# tests/test_import_time.py - cold start 회귀 방지: 패키지 import만으로 무거운 모듈이 로드되지 않음
+
+import pytest
+
+from bench_import_time import TARGETS, measure
+
+
+@pytest.mark.parametrize('target', [target for target, _ in TARGETS])
+def test_import_does_not_load_heavy_modules(target):
+    # 시간 예산은 환경에 따라 흔들리므로 make bench-import로 확인, 여기서는 무거운 모듈 로드 여부만
+    assert measure(target, runs=1)['heavy'] == []
@@ -0,0 +1,89 @@
+# tests/test_llm_providers.py - Gemini/OpenAI 서비스: 요청을 보내지 않거나 응답 해석에 실패해도 서킷 시험 슬롯을 남기지 않음
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production.services import circuit_breaker as circuit_breaker_module
+from ai_workflow_production.services import gemini_service_v2, openai_service_v2
+from ai_workflow_production.services.circuit_breaker import HALF_OPEN, CircuitBreaker
+from ai_workflow_production.utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def half_open_breaker(monkeypatch, clock):
+    """실패 2건으로 open → cooldown 경과로 half-open (시험 호출 1건 허용)"""
+    monkeypatch.setattr(circuit_breaker_module, 'time', SimpleNamespace(monotonic=clock))
+    breaker = CircuitBreaker('llm', min_calls=2, cooldown_seconds=30, half_open_max_calls=1)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def exhausted_limiter(key: str) -> RateLimiter:
+    """분당 1건, 이미 1건 사용 → 다음 acquire(max_wait 0)는 RateLimitExceeded"""
+    limiter = RateLimiter({key: {'RPM': 60}}, headroom=1.0, burst_seconds=1, max_wait=0)
+    limiter.acquire(key)
+    return limiter
+
+
+def no_request(*args, **kwargs):
+    pytest.fail("요청을 보내면 안 됨")
+
+
+@pytest.fixture
+def gemini(env_config, half_open_breaker):
+    service = gemini_service_v2.GeminiServiceV2(env_config)
+    service.circuit_breaker = half_open_breaker
+    return service
+
+
+def test_gemini_rate_limit_reject_releases_slot(gemini, half_open_breaker, monkeypatch):
+    limiter = exhausted_limiter('gemini')
+    monkeypatch.setattr(gemini_service_v2, 'get_rate_limiter', lambda: limiter)
+    monkeypatch.setattr(gemini.session, 'post', no_request)
+
+    assert gemini.generate_text("안녕하세요") is None
+    assert half_open_breaker.state == HALF_OPEN
+    assert half_open_breaker.allow_request()
+
+
+def test_openai_rate_limit_reject_releases_slot(env_config, half_open_breaker, monkeypatch):
+    service = openai_service_v2.OpenAIServiceV2(env_config)
+    service.circuit_breaker = half_open_breaker
+    limiter = exhausted_limiter('openai')
+    monkeypatch.setattr(openai_service_v2, 'get_rate_limiter', lambda: limiter)
+    monkeypatch.setattr(service.session, 'post', no_request)
+
+    assert service.chat_completion([{'role': 'user', 'content': '안녕하세요'}], 'reply') is None
+    assert half_open_breaker.state == HALF_OPEN
+    assert half_open_breaker.allow_request()
+
+
+class _StreamResponse:
+    """200 응답 후 SSE 줄을 돌려주는 requests.Response 대역"""
+
+    status_code = 200
+
+    def __init__(self, lines):
+        self._lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+
+def test_gemini_malformed_stream_chunk_records_failure(gemini, half_open_breaker, monkeypatch):
+    gemini.stream = True
+    monkeypatch.setattr(gemini_service_v2, 'get_rate_limiter', lambda: RateLimiter(enabled=False))
+    monkeypatch.setattr(gemini.session, 'post', lambda *args, **kwargs: _StreamResponse([b'data: {broken', b'']))
+
+    assert gemini.generate_text("안녕하세요") is None
+    assert half_open_breaker.is_open()
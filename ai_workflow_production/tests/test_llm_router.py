@@ -0,0 +1,90 @@
+# tests/test_llm_router.py - 라우터 서킷 기록: "ai" 서킷은 제공자 가용성 실패만, 타임아웃은 제공자 서킷에 1회만
+
+import threading
+
+import pytest
+
+from ai_workflow_production.services.base_service import BaseService
+from ai_workflow_production.services.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+from ai_workflow_production.services.llm_common import LLMError, ProviderUnavailable
+from ai_workflow_production.services.llm_router import LLMRouterService
+
+CUSTOMER_INFO = {'has_all_info': True, 'name': '성춘향', 'company': '춘향서비스', 'title': '과장',
+                 'phone': '010-2333-3333', 'email': 'chun@example.com', 'missing_fields': []}
+
+
+class FakeProvider(BaseService):
+    """답변 생성이 error를 던지거나, release 전까지 멈췄다가 제공자 서킷에 실패를 기록"""
+
+    def __init__(self, name: str, error: Exception = None, hang: threading.Event = None):
+        super().__init__(name)
+        self.error = error
+        self.hang = hang
+        self.finished = threading.Event()
+
+    def authenticate(self) -> bool:
+        return True
+
+    def generate_reply_or_raise(self, customer_info, original_subject, email_content=None):
+        if self.hang is not None:
+            self.hang.wait(5)
+            self._record_outcome(False)   # 실제 제공자처럼 읽기 타임아웃 후 직접 기록
+            self.finished.set()
+            raise ProviderUnavailable("읽기 타임아웃")
+        if self.error is not None:
+            raise self.error
+        return {'subject': f"Re: {original_subject}", 'body': '감사합니다.'}
+
+
+def make_router(env_config, providers, timeout: float = 45):
+    env_config = {**env_config, 'LLM_ROUTER_CONFIG': {
+        **env_config['LLM_ROUTER_CONFIG'],
+        'ROUTES': {'reply': list(providers)},
+        'TIMEOUTS': {'reply': timeout},
+        'HEDGE': {'ENABLED': False}
+    }}
+    router = LLMRouterService(env_config, {name: (lambda p=p: p) for name, p in providers.items()})
+    router.circuit_breaker = CircuitBreaker('ai', min_calls=1)
+    return router
+
+
+@pytest.mark.parametrize('error, counted', [
+    (ProviderUnavailable("OpenAI 응답 없음"), True),
+    (LLMError("reply_type 불일치"), False),
+    (KeyError('reply_body'), False),
+])
+def test_ai_breaker_counts_only_unavailable_providers(env_config, error, counted):
+    router = make_router(env_config, {'openai': FakeProvider('openai', error)})
+    reply, source = router._llm_reply(CUSTOMER_INFO, '문의', None)
+    assert source == 'fallback'
+    assert router.circuit_breaker.state == (OPEN if counted else CLOSED)
+
+
+def test_one_unavailable_provider_among_responding_ones_is_not_counted(env_config):
+    router = make_router(env_config, {
+        'openai': FakeProvider('openai', ProviderUnavailable("OpenAI 응답 없음")),
+        'gemini': FakeProvider('gemini', LLMError("reply_type 불일치")),
+    })
+    with pytest.raises(LLMError) as raised:
+        router.generate_reply_or_raise(CUSTOMER_INFO, '문의')
+    assert not isinstance(raised.value, ProviderUnavailable)
+
+
+def test_no_candidates_is_unavailable(env_config):
+    router = make_router(env_config, {'openai': FakeProvider('openai')})
+    router.routes['reply'] = []
+    with pytest.raises(ProviderUnavailable):
+        router.generate_reply_or_raise(CUSTOMER_INFO, '문의')
+
+
+def test_timeout_recorded_once_on_provider_breaker(env_config):
+    release = threading.Event()
+    slow = FakeProvider('openai', hang=release)
+    router = make_router(env_config, {'openai': slow, 'gemini': FakeProvider('gemini')}, timeout=0.05)
+    try:
+        assert router.generate_reply_or_raise(CUSTOMER_INFO, '문의')['body'] == '감사합니다.'
+        assert slow.circuit_breaker.snapshot()['window_failures'] == 0
+    finally:
+        release.set()
+    assert slow.finished.wait(5)
+    assert slow.circuit_breaker.snapshot()['window_failures'] == 1
@@ -0,0 +1,170 @@
+# tests/test_mail_filter.py - 메일 사전 필터: 헤더 규칙, 발신자별 답장 한도 window, 루프 감지, 상태 저장
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production.services import mail_filter as mail_filter_module
+from ai_workflow_production.services.mail_filter import MailPrefilter, format_stats
+
+SENDER = '홍길동 <hong@customer.co.kr>'
+CONFIG = {
+    'MAX_REPLIES_PER_SENDER': 2, 'REPLY_WINDOW_SECONDS': 3600,
+    'LOOP_MAX_MESSAGES': 5, 'LOOP_WINDOW_SECONDS': 600, 'LOOP_MAX_SUBJECT_MARKERS': 3,
+    'LOOP_COOLDOWN_SECONDS': 1800, 'STATE_FILE': None
+}
+
+
+@pytest.fixture
+def prefilter(monkeypatch, clock):
+    monkeypatch.setattr(mail_filter_module, 'time', SimpleNamespace(time=clock))
+    return MailPrefilter(CONFIG)
+
+
+def headers(sender: str = SENDER, subject: str = '견적 문의', **extra) -> dict:
+    return {'from': sender, 'subject': subject, **{name.replace('_', '-'): value for name, value in extra.items()}}
+
+
+@pytest.mark.parametrize('extra, reason', [
+    ({'auto_submitted': 'auto-replied'}, 'auto_submitted'),
+    ({'precedence': 'bulk'}, 'precedence'),
+    ({'list_id': '<news.example.com>'}, 'list'),
+    ({'x_autoreply': 'yes'}, 'autoreply_header'),
+    ({'return_path': '<>'}, 'null_return_path'),
+])
+def test_header_rules(prefilter, extra, reason):
+    assert prefilter.check('m1', headers(**extra)) == reason
+    assert prefilter.known_drop('m1')
+
+
+def test_header_rules_pass_normal_mail(prefilter):
+    assert prefilter.check('m1', headers(auto_submitted='no', precedence='normal')) is None
+    assert prefilter.check('m2', headers(sender='MAILER-DAEMON@mx.example.com')) == 'bounce_sender'
+    assert not prefilter.known_drop('m1')
+
+
+def test_decision_is_sticky_per_message(prefilter):
+    assert prefilter.check('m1', headers()) is None
+    assert prefilter.check('m1', headers(precedence='bulk')) is None
+    assert prefilter.stats()['passed'] == 1
+
+
+def test_reply_limit_counts_within_one_fetch(prefilter):
+    prefilter.begin_fetch()
+    assert prefilter.check('m1', headers()) is None
+    assert prefilter.check('m2', headers()) is None
+    assert prefilter.check('m3', headers()) == 'reply_limit'
+
+
+def test_reply_limit_ignores_unanswered_messages(prefilter):
+    """처리로 넘겼지만 답장하지 않은 메일 (사전 분류로 건너뜀 등)은 다음 조회에서 한도에 세지 않음"""
+    prefilter.begin_fetch()
+    prefilter.check('m1', headers())
+    prefilter.check('m2', headers())
+    prefilter.begin_fetch()
+    assert prefilter.check('m3', headers()) is None
+
+
+def test_reply_limit_counts_sent_replies(prefilter, clock):
+    for message_id in ('m1', 'm2'):
+        prefilter.begin_fetch()
+        prefilter.check(message_id, headers())
+        prefilter.record_reply(message_id, 'hong@customer.co.kr')
+        clock.advance(300)
+    prefilter.begin_fetch()
+    assert prefilter.check('m3', headers()) == 'reply_limit'
+
+
+def test_reply_window_expires(prefilter, clock):
+    for message_id in ('m1', 'm2'):
+        prefilter.check(message_id, headers())
+        prefilter.record_reply(message_id)
+    clock.advance(3601)
+    prefilter.begin_fetch()
+    assert prefilter.check('m3', headers()) is None
+
+
+def test_record_reply_uses_original_sender(prefilter):
+    """답장 수신자가 추출된 주소여도 원본 메시지 발신자 기준으로 셈"""
+    prefilter.check('m1', headers())
+    prefilter.record_reply('m1', 'other@customer.co.kr')
+    prefilter.check('m2', headers())
+    prefilter.record_reply('m2', 'other@customer.co.kr')
+    prefilter.begin_fetch()
+    assert prefilter.check('m3', headers()) == 'reply_limit'
+    assert prefilter.check('m4', headers(sender='other@customer.co.kr')) is None
+
+
+def test_loop_detected_by_message_burst(prefilter, clock):
+    reasons = []
+    for index in range(6):
+        prefilter.begin_fetch()
+        reasons.append(prefilter.check(f"m{index}", headers(sender='bot@helpdesk.example.com'),
+                                       received_at=clock.now))
+        prefilter.record_reply(f"m{index}")
+        clock.advance(10)
+    assert 'loop' in reasons
+    assert prefilter.stats()['suppressed'] == 1
+
+
+def test_loop_detected_by_subject_markers(prefilter, clock):
+    subject = 'Re: [추가 정보 요청] Re: [추가 정보 요청] Re: [추가 정보 요청] 견적 문의'
+    assert prefilter.check('m1', headers(subject=subject)) == 'loop'
+    clock.advance(1799)
+    assert prefilter.check('m2', headers()) == 'loop'
+    clock.advance(2)
+    assert prefilter.check('m3', headers()) is None
+
+
+def test_old_messages_outside_loop_window_not_counted(prefilter, clock):
+    for index in range(5):
+        assert prefilter.check(f"m{index}", headers(sender=f"user{index % 2}@example.com"),
+                               received_at=clock.now - 86400) in (None, 'reply_limit')
+    assert prefilter.stats()['loop'] == 0
+
+
+def test_disabled_filter_passes_everything():
+    prefilter = MailPrefilter({**CONFIG, 'ENABLED': False})
+    assert prefilter.check('m1', headers(precedence='bulk')) is None
+    prefilter.record_reply('m1', SENDER)
+    assert prefilter.stats()['passed'] == 0
+
+
+def test_state_survives_restart(monkeypatch, clock, tmp_path):
+    monkeypatch.setattr(mail_filter_module, 'time', SimpleNamespace(time=clock))
+    state_config = {**CONFIG, 'STATE_FILE': str(tmp_path / 'mail_filter_state.json')}
+    prefilter = MailPrefilter(state_config)
+    for message_id in ('m1', 'm2'):
+        prefilter.check(message_id, headers())
+        prefilter.record_reply(message_id)
+    prefilter.check('u1', headers(sender='pending@example.com'))  # 답장 전 → 저장 후 한도에 세지 않음
+    prefilter.save()
+
+    restarted = MailPrefilter(state_config)
+    assert restarted.check('m3', headers()) == 'reply_limit'
+    assert restarted.check('u2', headers(sender='pending@example.com')) is None
+
+
+def test_format_stats():
+    assert format_stats({'passed': 3, 'list': 2, 'loop': 1, 'suppressed': 1}) == \
+        '처리 3 / 제외 3 (메일링 리스트 2, 답장 루프 감지 1), 차단 중 발신자 1'
+
+
+def test_gmail_send_reply_counts_toward_limit(env_config):
+    from bench_mail_filter import FakeGmailAPI, make_gmail
+
+    api = FakeGmailAPI()
+    for index in range(3):
+        api.deliver(SENDER, f"견적 문의 {index}", '견적 부탁드립니다.')
+    gmail = make_gmail(env_config, api, enabled=True)
+    gmail.mail_filter.configure({**CONFIG, 'MAX_REPLIES_PER_SENDER': 1})
+
+    first = gmail.get_recent_emails(60, 10)
+    assert len(first) == 1
+    # 사전 분류로 건너뛴 경우 (답장 없음) → 다음 조회에서 다른 메일 처리 가능
+    second = gmail.get_recent_emails(60, 10, exclude_ids={first[0]['id']})
+    assert len(second) == 1
+    assert gmail.send_reply('hong@customer.co.kr', 'Re: 견적 문의', '감사합니다.', second[0]['id'])
+    third = gmail.get_recent_emails(60, 10, exclude_ids={first[0]['id'], second[0]['id']})
+    assert third == []
+    assert api.sent[0]['Auto-Submitted'] == 'auto-replied'
@@ -0,0 +1,69 @@
+# tests/test_probes.py - 상태 확인: Gmail은 공용 세션 사용, Salesforce는 401이면 토큰 재발급 후 1회 재시도
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production.services.gmail_service_v2 import GmailServiceV2
+from ai_workflow_production.services.salesforce_service_v2 import SalesforceServiceV2
+from ai_workflow_production.utils.http_pool import PooledSession
+
+
+class ScriptedSession:
+    """정해진 상태 코드를 순서대로 응답하고 요청 헤더를 기록"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.authorizations = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.authorizations.append(headers['Authorization'])
+        status = self.statuses.pop(0)
+        body = {'emailAddress': 'me@example.com',
+                'DailyApiRequests': {'Remaining': 14000, 'Max': 15000}}
+        return SimpleNamespace(status_code=status, json=lambda: body)
+
+
+def test_gmail_probe_uses_pooled_session(env_config, monkeypatch):
+    service = GmailServiceV2(env_config)
+    assert isinstance(service.session, PooledSession)
+    monkeypatch.setattr(service, '_load_credentials', lambda interactive=True: SimpleNamespace(token='gmail-token'))
+    service.session = ScriptedSession(200)
+    assert service.probe() == {'healthy': True, 'detail': 'me@example.com'}
+    assert service.session.authorizations == ['Bearer gmail-token']
+
+
+@pytest.fixture
+def salesforce(env_config, monkeypatch):
+    service = SalesforceServiceV2(env_config)
+    service.access_token, service.instance_url = 'expired', 'https://example.my.salesforce.com'
+    tokens = iter(['fresh-1', 'fresh-2'])
+    service.reauth_results = []
+
+    def authenticate():
+        ok = service.reauth_results.pop(0) if service.reauth_results else True
+        if ok:
+            service.access_token = next(tokens)
+        return ok
+
+    monkeypatch.setattr(service, 'authenticate', authenticate)
+    return service
+
+
+def test_salesforce_probe_reauthenticates_once_on_401(salesforce):
+    salesforce.session = ScriptedSession(401, 200)
+    assert salesforce.probe()['healthy'] is True
+    assert salesforce.session.authorizations == ['Bearer expired', 'Bearer fresh-1']
+
+
+def test_salesforce_probe_unhealthy_when_retry_still_401(salesforce):
+    salesforce.session = ScriptedSession(401, 401)
+    assert salesforce.probe() == {'healthy': False, 'detail': 'HTTP 401'}
+    assert len(salesforce.session.authorizations) == 2
+
+
+def test_salesforce_probe_unhealthy_when_reauth_fails(salesforce):
+    salesforce.reauth_results = [False]
+    salesforce.session = ScriptedSession(401)
+    assert salesforce.probe() == {'healthy': False, 'detail': 'HTTP 401 (JWT 재인증 실패)'}
+    assert salesforce.session.authorizations == ['Bearer expired']
@@ -0,0 +1,108 @@
+# tests/test_rate_limiter.py - RPM/TPM 토큰 버킷: 허용/대기/거절, 실제 토큰 보정, 429 대기, 프로세스 간 공유
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai_workflow_production.utils import rate_limiter as rate_limiter_module
+from ai_workflow_production.utils.rate_limiter import RateLimiter, RateLimitExceeded, retry_after_seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch, clock):
+    """버킷 채움/대기를 가짜 시계로 (sleep은 시계만 앞으로)"""
+    monkeypatch.setattr(rate_limiter_module, 'time', SimpleNamespace(time=clock, monotonic=clock,
+                                                                     sleep=clock.advance))
+    return clock
+
+
+def make_limiter(**limit) -> RateLimiter:
+    # headroom 1, burst 1초: 용량 = 초당 채움 속도 (RPM 60 → 1건)
+    return RateLimiter({'llm': limit}, headroom=1.0, burst_seconds=1, max_wait=5)
+
+
+def _response(headers=None, text=''):
+    return SimpleNamespace(headers=headers or {}, text=text)
+
+
+def test_disabled_or_unlimited_key_admits_immediately(fake_time):
+    assert RateLimiter(enabled=False).acquire('llm', 10_000).waited == 0.0
+    limiter = make_limiter(RPM=60)
+    for _ in range(5):
+        assert limiter.acquire('other').waited == 0.0
+
+
+def test_requests_bucket_waits_for_refill(fake_time):
+    limiter = make_limiter(RPM=60)
+    assert limiter.acquire('llm').waited == 0.0
+    admission = limiter.acquire('llm')
+    assert admission.waited == pytest.approx(1.0)
+    stats = limiter.stats()['llm']
+    assert (stats['admitted'], stats['waited']) == (2, 1)
+
+
+def test_rejects_when_wait_exceeds_max_wait(fake_time):
+    limiter = make_limiter(RPM=60)
+    limiter.acquire('llm')
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire('llm', max_wait=0.5)
+    assert limiter.stats()['llm']['rejected'] == 1
+    assert fake_time.now == 1_000_000.0  # 거절은 기다리지 않고 즉시
+
+
+def test_token_bucket_limits_by_estimate(fake_time):
+    limiter = make_limiter(TPM=6000)  # 초당 100 토큰, 용량 100
+    limiter.acquire('llm', 80)
+    assert limiter.acquire('llm', 60).waited == pytest.approx(0.4)
+
+
+def test_oversized_estimate_passes_when_bucket_full(fake_time):
+    limiter = make_limiter(TPM=6000)
+    assert limiter.acquire('llm', 1_000).waited == 0.0
+
+
+def test_settle_charges_actual_tokens(fake_time):
+    limiter = make_limiter(TPM=6000)
+    admission = limiter.acquire('llm', 10)
+    limiter.settle(admission, 100)  # 실제 100 → 잔량 0
+    assert limiter.acquire('llm', 50).waited == pytest.approx(0.5)
+
+
+def test_settle_refunds_overestimate(fake_time):
+    limiter = make_limiter(TPM=6000)
+    admission = limiter.acquire('llm', 100)
+    limiter.settle(admission, 20)
+    assert limiter.acquire('llm', 80).waited == 0.0
+
+
+def test_throttle_pauses_all_requests(fake_time):
+    limiter = make_limiter(RPM=60)
+    limiter.throttle('llm', _response({'Retry-After': '3'}))
+    assert limiter.acquire('llm').waited == pytest.approx(4.0)  # 3초 대기 후 1건 채워질 때까지
+    assert limiter.stats()['llm']['throttled'] == 1
+
+
+def test_retry_after_sources():
+    assert retry_after_seconds(_response({'Retry-After': '7'}), 10) == 7.0
+    assert retry_after_seconds(_response(text='{"retryDelay": "17s"}'), 10) == 17.0
+    assert retry_after_seconds(_response({'Retry-After': 'soon'}), 10) == 10.0
+
+
+def test_buckets_shared_through_db_file(fake_time, tmp_path):
+    db_file = str(tmp_path / 'rate_limit.sqlite3')
+    first = RateLimiter({'llm': {'RPM': 60}}, headroom=1.0, burst_seconds=1, max_wait=0, db_path=db_file)
+    second = RateLimiter({'llm': {'RPM': 60}}, headroom=1.0, burst_seconds=1, max_wait=0, db_path=db_file)
+    try:
+        first.acquire('llm')
+        with pytest.raises(RateLimitExceeded):
+            second.acquire('llm')
+    finally:
+        first.close()
+        second.close()
+
+
+def test_reconfigure_keeps_levels(fake_time):
+    limiter = make_limiter(RPM=60)
+    limiter.acquire('llm')
+    limiter.reconfigure({'LIMITS': {'llm': {'RPM': 120}}})
+    assert limiter.acquire('llm').waited == pytest.approx(0.5)
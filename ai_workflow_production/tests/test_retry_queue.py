@@ -0,0 +1,53 @@
+# tests/test_retry_queue.py - 지연 작업 재시도 큐: 다시 지연된 작업은 완료가 아님, 한도 초과 폐기는 기록
+
+import logging
+
+from ai_workflow_production.services.service_manager import ServiceManager
+
+
+def make_manager(queue_max: int = 10) -> ServiceManager:
+    return ServiceManager({'RETRY_QUEUE_MAX': queue_max, 'RETRY_MAX_ATTEMPTS': 5})
+
+
+def test_completed_job_runs_on_success():
+    manager = make_manager()
+    done = []
+    manager.defer('salesforce', 'Lead 생성', lambda: True, on_success=lambda: done.append(1))
+    assert manager.drain_retry_queue() == 1
+    assert done == [1]
+    assert manager.retry_queue_size() == 0
+
+
+def test_deferred_result_is_not_completed():
+    """이메일 처리 작업이 실행 중 다시 defer하고 {'deferred': True}를 돌려준 경우"""
+    manager = make_manager()
+    done = []
+
+    def process_email():
+        manager.defer('ai', '이메일 처리 (m1)', process_email)
+        return {'customer_info': None, 'reply_sent': False, 'deferred': True}
+
+    manager.defer('ai', '이메일 처리 (m1)', process_email, on_success=lambda: done.append(1))
+    assert manager.drain_retry_queue() == 0
+    assert done == []
+    assert manager.retry_queue_size() == 1   # 작업이 스스로 넣은 1건만 (중복 재보관 없음)
+
+
+def test_requeue_overflow_drops_oldest_with_log(caplog):
+    manager = make_manager(queue_max=2)
+
+    def failing(name):
+        def job():
+            manager.defer('gmail', f"새 작업 ({name})", lambda: True)
+            return False
+        return job
+
+    manager.defer('gmail', '오래된 작업 1', failing('1'))
+    manager.defer('gmail', '오래된 작업 2', failing('2'))
+    with caplog.at_level(logging.ERROR):
+        assert manager.drain_retry_queue() == 0
+
+    dropped = [record.getMessage() for record in caplog.records if '폐기' in record.getMessage()]
+    assert dropped == ['재시도 큐 가득 참, 가장 오래된 작업 폐기: 오래된 작업 1',
+                       '재시도 큐 가득 참, 가장 오래된 작업 폐기: 오래된 작업 2']
+    assert [item['description'] for item in manager._retry_queue] == ['새 작업 (1)', '새 작업 (2)']
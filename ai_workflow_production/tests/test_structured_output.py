@@ -0,0 +1,50 @@
+# tests/test_structured_output.py - 구조화 출력 해석: 부분 복구는 extract_batch만, extract/combined는 LLMError
+
+import json
+
+import pytest
+
+from ai_workflow_production.services.gemini_service_v2 import GeminiServiceV2
+from ai_workflow_production.services.llm_common import CUSTOMER_INFO_SCHEMA, LLMError
+from ai_workflow_production.services.structured_output import parse_structured
+
+INFO = {'name': '성춘향', 'company': '춘향서비스', 'title': '과장', 'phone': '010-2333-3333',
+        'email': 'chun@example.com'}
+TRUNCATED = json.dumps(INFO, ensure_ascii=False).split('"title"')[0] + '"title": "과'
+
+
+@pytest.fixture
+def gemini(env_config):
+    return GeminiServiceV2(env_config)
+
+
+def test_partial_result_recovered_by_default():
+    result = parse_structured(TRUNCATED, CUSTOMER_INFO_SCHEMA)
+    assert not result.complete
+    assert result.value == {'name': '성춘향', 'company': '춘향서비스'}
+
+
+def test_strict_rejects_truncated_response():
+    with pytest.raises(LLMError):
+        parse_structured(TRUNCATED, CUSTOMER_INFO_SCHEMA, strict=True)
+
+
+def test_strict_rejects_missing_required_field():
+    text = json.dumps({key: value for key, value in INFO.items() if key != 'phone'})
+    with pytest.raises(LLMError, match='phone'):
+        parse_structured(text, CUSTOMER_INFO_SCHEMA, strict=True)
+    assert parse_structured(json.dumps({**INFO, 'phone': None}), CUSTOMER_INFO_SCHEMA, strict=True).complete
+
+
+@pytest.mark.parametrize('task', ['extract', 'combined'])
+def test_gemini_extract_and_combined_reject_partial_result(gemini, task):
+    with pytest.raises(LLMError):
+        gemini._parse_json(TRUNCATED, task)
+
+
+def test_gemini_batch_keeps_completed_items(gemini):
+    text = json.dumps({'results': [{'id': 'm1', **INFO}, {'id': 'm2', **INFO}]}, ensure_ascii=False)
+    truncated = text[:text.rindex('"title"')]
+    result = gemini._parse_json(truncated, 'extract_batch')
+    assert not result.complete
+    assert [item['id'] for item in result.value['results']] == ['m1']
@@ -0,0 +1,47 @@
+# tests/test_tracing.py - 트레이스 단위 export: 루트가 끝난 뒤 끝나는 자식 스팬이 _pending에 남지 않음
+
+import contextvars
+import threading
+
+from ai_workflow_production.utils.tracing import Tracer
+
+
+class ListExporter:
+    def __init__(self):
+        self.payloads = []
+
+    def export(self, payload):
+        self.payloads.append([span['name'] for span in payload['resourceSpans'][0]['scopeSpans'][0]['spans']])
+
+
+def test_trace_exported_once_with_children():
+    exporter = ListExporter()
+    tracer = Tracer(exporters=[exporter])
+    with tracer.start_trace('email'):
+        with tracer.span('llm.extract'):
+            pass
+    assert exporter.payloads == [['email', 'llm.extract']]
+    assert tracer._pending == {}
+
+
+def test_late_child_span_exported_alone_without_leak():
+    """hedge에 진 라우터 호출처럼 루트가 export된 뒤 시작/종료되는 스팬"""
+    exporter = ListExporter()
+    tracer = Tracer(exporters=[exporter])
+    started, release = threading.Event(), threading.Event()
+
+    def abandoned_call():
+        started.wait(5)
+        with tracer.span('llm.extract', **{'llm.provider': 'gemini'}):
+            with tracer.span('HTTP POST generateContent'):
+                release.wait(5)
+
+    with tracer.start_trace('email'):
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(abandoned_call,))
+        worker.start()
+    started.set()
+    release.set()
+    worker.join(5)
+
+    assert exporter.payloads == [['email'], ['HTTP POST generateContent'], ['llm.extract']]
+    assert tracer._pending == {}
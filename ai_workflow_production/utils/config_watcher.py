@@ -0,0 +1,85 @@
+# utils/config_watcher.py - 공유 .env / 설정 파일 변경 감지 (monitor 모드 hot reload)
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from ai_workflow_production import config
+
+
+class ConfigWatcher:
+    """
+    설정 소스 파일의 mtime/크기를 주기적으로 비교하여 변경 시 설정 재컴파일
+
+    - 감시 대상: 공유 .env, 선택 설정 파일 (AI_WORKFLOW_CONFIG_FILE 또는 config.local.json)
+    - 검증에 실패한 변경은 로그만 남기고 기존 설정을 유지
+    """
+
+    def __init__(self, current: config.AppConfig, overrides: Optional[Mapping] = None,
+                 poll_seconds: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self.current = current
+        self.overrides = overrides
+        self.poll_seconds = poll_seconds
+        self._last_poll = time.monotonic()
+        self._signature = self._source_signature()
+
+    @classmethod
+    def from_config(cls, current: config.AppConfig, overrides: Optional[Mapping] = None) -> 'ConfigWatcher':
+        return cls(current, overrides, poll_seconds=current['RELOAD_CONFIG'].get('POLL_SECONDS', 5))
+
+    @staticmethod
+    def watched_paths() -> Tuple[Path, ...]:
+        paths = [config.SHARED_ENV_FILE,
+                 Path(os.getenv(config.CONFIG_FILE_ENV) or config.DEFAULT_CONFIG_FILE)]
+        return tuple(paths)
+
+    def _source_signature(self) -> Tuple:
+        """감시 파일별 (경로, mtime_ns, 크기) - 없는 파일은 None"""
+        signature = []
+        for path in self.watched_paths():
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(path), None, None))
+        return tuple(signature)
+
+    def poll(self, force: bool = False) -> Optional[config.AppConfig]:
+        """
+        poll_seconds가 지났고 파일이 변경되었으면 재컴파일
+
+        Returns:
+            Optional[AppConfig]: 값이 바뀐 새 설정 (변경 없음/검증 실패 시 None)
+        """
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_seconds:
+            return None
+        self._last_poll = now
+
+        signature = self._source_signature()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+
+        try:
+            compiled = config.reload_environment_config(self.current.environment, self.overrides)
+        except config.ConfigError as e:
+            self.logger.error(f"❌ 설정 변경 무시 (기존 설정 유지): {e}")
+            return None
+
+        if not self.current.diff(compiled):
+            return None
+        self.current = compiled
+        return compiled
+
+
+def split_changes(changes: Dict[Tuple[str, str], Tuple]) -> Tuple[Dict, Dict]:
+    """변경 항목을 (즉시 반영 가능, 재시작 필요)로 분리"""
+    hot, restart = {}, {}
+    for (section_name, key), values in changes.items():
+        target = hot if key in config.HOT_RELOAD_KEYS.get(section_name, ()) else restart
+        target[(section_name, key)] = values
+    return hot, restart
@@ -0,0 +1,229 @@
+# utils/freshness.py - 문의 수신 → 답장/Lead 생성까지 대기 시간(freshness) SLA 추적
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+# 추적 단계: reply(답장 발송), lead(Salesforce Lead 생성)
+STAGES = ('reply', 'lead')
+REPORT_PERCENTILES = (50, 90, 95, 99)
+
+AlertHook = Callable[[str, str, float, float], None]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 백분위수 (values가 비어있으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class FreshnessTracker:
+    """메일박스/단계별 최근 N건 대기 시간의 rolling 백분위수 관리"""
+
+    def __init__(self, sla_seconds: Dict[str, float], window_size: int = 500,
+                 min_samples: int = 20, alert_cooldown: float = 1800,
+                 state_file: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.sla_seconds = dict(sla_seconds)
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.alert_cooldown = alert_cooldown
+        self.state_file = Path(state_file) if state_file else None
+
+        self._windows: Dict[str, Dict[str, Deque[float]]] = {}
+        self._last_alert: Dict[tuple, float] = {}
+        self._alert_hooks: List[AlertHook] = [self._log_alert]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, freshness_config: Dict) -> 'FreshnessTracker':
+        tracker = cls(
+            sla_seconds=freshness_config['SLA_SECONDS'],
+            window_size=freshness_config.get('WINDOW_SIZE', 500),
+            min_samples=freshness_config.get('MIN_SAMPLES', 20),
+            alert_cooldown=freshness_config.get('ALERT_COOLDOWN', 1800),
+            state_file=freshness_config.get('STATE_FILE')
+        )
+        webhook_url = os.getenv(freshness_config.get('ALERT_WEBHOOK_ENV', ''))
+        if webhook_url:
+            tracker.add_alert_hook(webhook_alert_hook(webhook_url))
+        tracker.load()
+        return tracker
+
+    def reconfigure(self, freshness_config: Dict) -> None:
+        """SLA/알림 기준 변경 (수집된 샘플은 유지)"""
+        with self._lock:
+            self.sla_seconds = dict(freshness_config['SLA_SECONDS'])
+            self.min_samples = freshness_config.get('MIN_SAMPLES', self.min_samples)
+            self.alert_cooldown = freshness_config.get('ALERT_COOLDOWN', self.alert_cooldown)
+
+    def add_alert_hook(self, hook: AlertHook) -> None:
+        """SLA 초과 시 호출될 훅 등록: hook(mailbox, stage, p95, sla)"""
+        self._alert_hooks.append(hook)
+
+    def record(self, mailbox: str, stage: str, received_at: Optional[float],
+               completed_at: Optional[float] = None) -> Optional[float]:
+        """
+        완료 시점 기록
+
+        Args:
+            mailbox: 수신 메일박스 주소
+            stage: 'reply' 또는 'lead'
+            received_at: Gmail internalDate (epoch 초)
+            completed_at: 완료 시각 (기본값: 현재)
+
+        Returns:
+            Optional[float]: 대기 시간(초), received_at이 없으면 None
+        """
+        if received_at is None:
+            return None
+
+        latency = max(0.0, (completed_at or time.time()) - received_at)
+
+        with self._lock:
+            window = self._windows.setdefault(mailbox, {}).setdefault(
+                stage, deque(maxlen=self.window_size)
+            )
+            window.append(latency)
+            samples = list(window)
+
+        self.logger.info(f"⏱️ freshness [{stage}] {mailbox}: {latency:.1f}초")
+        self._check_sla(mailbox, stage, samples)
+        return latency
+
+    def _check_sla(self, mailbox: str, stage: str, samples: List[float]) -> None:
+        sla = self.sla_seconds.get(stage)
+        if sla is None or len(samples) < self.min_samples:
+            return
+
+        p95 = percentile(samples, 95)
+        if p95 <= sla:
+            return
+
+        key = (mailbox, stage)
+        now = time.time()
+        if now - self._last_alert.get(key, 0) < self.alert_cooldown:
+            return
+        self._last_alert[key] = now
+
+        for hook in self._alert_hooks:
+            try:
+                hook(mailbox, stage, p95, sla)
+            except Exception as e:
+                self.logger.error(f"freshness 알림 훅 실패: {e}")
+
+    def _log_alert(self, mailbox: str, stage: str, p95: float, sla: float) -> None:
+        self.logger.warning(f"🚨 freshness SLA 초과 [{stage}] {mailbox}: p95 {p95:.1f}초 > SLA {sla:.0f}초")
+
+    def summary(self) -> Dict[str, Dict[str, Dict]]:
+        """메일박스/단계별 통계: count, p50, p90, p95, p99, max, sla"""
+        with self._lock:
+            snapshot = {
+                mailbox: {stage: list(window) for stage, window in stages.items()}
+                for mailbox, stages in self._windows.items()
+            }
+
+        report = {}
+        for mailbox, stages in snapshot.items():
+            report[mailbox] = {}
+            for stage, samples in stages.items():
+                stats = {'count': len(samples), 'max': max(samples) if samples else None,
+                         'sla': self.sla_seconds.get(stage)}
+                for q in REPORT_PERCENTILES:
+                    stats[f'p{q}'] = percentile(samples, q)
+                report[mailbox][stage] = stats
+        return report
+
+    def save(self) -> None:
+        """rolling window 상태 저장 (--mode stats 조회용)"""
+        if not self.state_file:
+            return
+        with self._lock:
+            state = {
+                'updated_at': time.time(),
+                'windows': {
+                    mailbox: {stage: list(window) for stage, window in stages.items()}
+                    for mailbox, stages in self._windows.items()
+                }
+            }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(state), encoding='utf-8')
+            tmp_path.replace(self.state_file)
+        except Exception as e:
+            self.logger.warning(f"freshness 상태 저장 실패: {e}")
+
+    def load(self) -> None:
+        """저장된 rolling window 복원"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            state = json.loads(self.state_file.read_text(encoding='utf-8'))
+        except Exception as e:
+            self.logger.warning(f"freshness 상태 로드 실패: {e}")
+            return
+        with self._lock:
+            for mailbox, stages in state.get('windows', {}).items():
+                for stage, samples in stages.items():
+                    self._windows.setdefault(mailbox, {})[stage] = deque(
+                        samples[-self.window_size:], maxlen=self.window_size
+                    )
+
+
+def webhook_alert_hook(url: str, timeout: float = 5.0) -> AlertHook:
+    """SLA 초과 시 JSON을 POST하는 알림 훅 (Slack 호환 'text' 필드 포함)"""
+    def _hook(mailbox: str, stage: str, p95: float, sla: float) -> None:
+        payload = {
+            'text': f"freshness SLA 초과 [{stage}] {mailbox}: p95 {p95:.1f}s > SLA {sla:.0f}s",
+            'mailbox': mailbox,
+            'stage': stage,
+            'p95_seconds': p95,
+            'sla_seconds': sla
+        }
+        import urllib.request  # 전송 시점에만 로드 (CLI 시작 시간 절감)
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+    return _hook
+
+
+def format_report(report: Dict[str, Dict[str, Dict]]) -> List[str]:
+    """summary()를 로그 출력용 문자열 목록으로 변환"""
+    if not report:
+        return ["기록된 freshness 데이터 없음"]
+
+    def _fmt(value):
+        return f"{value:.1f}s" if value is not None else "-"
+
+    lines = []
+    for mailbox, stages in report.items():
+        lines.append(f"📬 {mailbox}")
+        for stage in STAGES:
+            stats = stages.get(stage)
+            if not stats:
+                continue
+            breach = stats['sla'] is not None and stats['p95'] is not None and stats['p95'] > stats['sla']
+            lines.append(
+                f"  {'🚨' if breach else '✅'} {stage:<5} n={stats['count']} "
+                f"p50={_fmt(stats['p50'])} p90={_fmt(stats['p90'])} p95={_fmt(stats['p95'])} "
+                f"p99={_fmt(stats['p99'])} max={_fmt(stats['max'])} (SLA {_fmt(stats['sla'])})"
+            )
+    return lines
@@ -0,0 +1,55 @@
+# utils/health_server.py - HTTP /healthz 엔드포인트 (캐시된 프로브 결과 제공)
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+def start_health_server(service_manager, health_config: Dict, port: int) -> ThreadingHTTPServer:
+    """
+    백그라운드 스레드에서 헬스 서버 시작
+
+    - GET /healthz: 서비스별 프로브 결과 (모두 정상이면 200, 아니면 503)
+    - GET /livez: 프로세스 생존 확인 (항상 200)
+    """
+    logger = logging.getLogger(__name__)
+    timeout = health_config.get('PROBE_TIMEOUT', 5.0)
+    cache_ttl = health_config.get('CACHE_TTL', 30.0)
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/livez':
+                self._respond(200, {'status': 'ok'})
+            elif path == '/healthz':
+                force = 'force=1' in self.path
+                results = service_manager.probe_all(timeout=timeout, cache_ttl=cache_ttl, force=force)
+                healthy = all(r['healthy'] for r in results.values())
+                self._respond(200 if healthy else 503, {
+                    'status': 'ok' if healthy else 'degraded',
+                    'services': results
+                })
+            else:
+                self._respond(404, {'error': 'not found'})
+
+        def _respond(self, status: int, body: Dict):
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug(f"healthz {self.address_string()} - {format % args}")
+
+    host = health_config.get('HTTP_HOST', '127.0.0.1')
+    server = ThreadingHTTPServer((host, int(port)), HealthHandler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, name="health-server", daemon=True)
+    thread.start()
+    logger.info(f"🩺 헬스 서버 시작: http://{host}:{server.server_port}/healthz")
+    return server
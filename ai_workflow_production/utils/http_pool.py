@@ -0,0 +1,116 @@
+# utils/http_pool.py - 외부 API 공용 HTTP 세션 (keep-alive 커넥션 풀, 연결/읽기 타임아웃 분리, 압축, 재사용 통계)
+
+import threading
+import weakref
+from typing import Dict, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# HTTP_POOL_CONFIG가 없을 때(스크립트 등) 사용할 기본값
+DEFAULT_POOL_CONFIG = {
+    'POOL_CONNECTIONS': 4,
+    'POOL_MAXSIZE': 10,
+    'POOL_BLOCK': False,
+    'CONNECT_TIMEOUT': 5,
+    'READ_TIMEOUTS': {'default': 30}
+}
+
+
+class PooledSession(requests.Session):
+    """
+    서비스별 keep-alive 세션
+
+    - 호스트마다 최대 pool_maxsize개의 연결을 유지하고 재사용 (요청마다 TCP/TLS 연결을 새로 맺지 않음)
+    - 요청에 timeout을 주지 않으면 (연결, 읽기) 기본 타임아웃 적용 (무기한 대기 방지)
+    - 응답 gzip/deflate 압축 해제는 requests가 자동 처리
+    """
+
+    def __init__(self, name: str, timeout: Tuple[float, float], pool_connections: int,
+                 pool_maxsize: int, pool_block: bool):
+        super().__init__()
+        self.name = name
+        self.timeout = timeout
+        # 재시도는 서비스/라우터 계층(서킷 브레이커, failover)에서 처리하므로 어댑터 재시도는 끔
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block, max_retries=0)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.headers['Accept-Encoding'] = 'gzip, deflate'
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 요청 수와 새로 맺은 연결 수 (urllib3 커넥션 풀 카운터)"""
+        stats: Dict[str, Dict[str, int]] = {}
+        for adapter in {id(a): a for a in self.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = stats.setdefault(f"{pool.host}:{pool.port}", {'requests': 0, 'connections': 0})
+                host['requests'] += pool.num_requests
+                host['connections'] += pool.num_connections
+        return stats
+
+
+_sessions: "weakref.WeakSet[PooledSession]" = weakref.WeakSet()
+_sessions_lock = threading.Lock()
+
+
+def create_session(name: str, pool_config: Optional[Mapping] = None, *,
+                   connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                   pool_maxsize: Optional[int] = None) -> PooledSession:
+    """
+    HTTP_POOL_CONFIG로 서비스 세션 생성 (재사용 통계 집계 대상으로 등록)
+
+    읽기 타임아웃은 READ_TIMEOUTS[name] → READ_TIMEOUTS['default'] 순, 인자로 준 값이 우선
+    """
+    settings = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+    read_timeouts = settings['READ_TIMEOUTS']
+    timeout = (
+        connect_timeout if connect_timeout is not None else settings['CONNECT_TIMEOUT'],
+        read_timeout if read_timeout is not None else read_timeouts.get(name, read_timeouts.get('default', 30))
+    )
+    session = PooledSession(name, timeout, settings['POOL_CONNECTIONS'],
+                            pool_maxsize or settings['POOL_MAXSIZE'], settings['POOL_BLOCK'])
+    with _sessions_lock:
+        _sessions.add(session)
+    return session
+
+
+def pool_stats() -> Dict[str, Dict]:
+    """
+    세션 이름별 재사용 통계
+
+    Returns:
+        {name: {'requests', 'connections', 'reuse_ratio', 'hosts': {host: {'requests', 'connections'}}}}
+        (reuse_ratio = 기존 연결로 처리한 요청 비율)
+    """
+    with _sessions_lock:
+        sessions = list(_sessions)
+
+    report: Dict[str, Dict] = {}
+    for session in sessions:
+        entry = report.setdefault(session.name, {'requests': 0, 'connections': 0, 'hosts': {}})
+        for host, counts in session.pool_stats().items():
+            totals = entry['hosts'].setdefault(host, {'requests': 0, 'connections': 0})
+            for key in ('requests', 'connections'):
+                totals[key] += counts[key]
+                entry[key] += counts[key]
+    for entry in report.values():
+        requests_made = entry['requests']
+        entry['reuse_ratio'] = max(0.0, 1 - entry['connections'] / requests_made) if requests_made else 0.0
+    return report
+
+
+def format_pool_stats(stats: Mapping[str, Mapping]) -> str:
+    """로그용 한 줄 요약 (요청이 있었던 세션만)"""
+    return ', '.join(
+        f"{name} 재사용 {entry['reuse_ratio']:.0%} (요청 {entry['requests']}, 새 연결 {entry['connections']})"
+        for name, entry in sorted(stats.items()) if entry['requests']
+    )
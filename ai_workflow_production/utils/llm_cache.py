@@ -0,0 +1,300 @@
+# utils/llm_cache.py - LLM 응답 캐시 (내용 해시 키, 메모리 LRU + SQLite 2단계)
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+# 디스크 정리(만료/상한 초과 삭제) 주기 (저장 N건마다)
+_PRUNE_EVERY = 100
+
+# 누적 통계로 SQLite에 저장하는 카운터
+_COUNTERS = ('lookups', 'memory_hits', 'disk_hits', 'misses', 'stores', 'saved_tokens')
+
+
+def normalize_content(text: str) -> str:
+    """캐시 키용 내용 정규화 (유니코드 NFC, 줄바꿈 통일, 줄 끝 공백/연속 빈 줄 제거)"""
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n').replace('\r', '\n')
+    lines = [line.rstrip() for line in text.split('\n')]
+    normalized = []
+    for line in lines:
+        if not line and normalized and not normalized[-1]:
+            continue
+        normalized.append(line)
+    return '\n'.join(normalized).strip()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    text: str
+    tokens: int
+    created_at: float
+    tier: str  # 'memory' | 'disk'
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시
+
+    키 = sha256(제공자, 모델, 프롬프트 템플릿 버전, 생성 파라미터, 정규화된 내용).
+    재시도/재시작/전달된 중복 메일/동일 문의 대량 발송처럼 같은 요청이 다시 오면
+    네트워크 호출 없이 저장된 응답을 돌려준다.
+
+    - 메모리: LRU (max_entries)
+    - 디스크: SQLite (db_path, 프로세스 재시작 후에도 유지, max_db_entries)
+    - 두 단계 모두 ttl_seconds가 지나면 만료
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 86400,
+                 db_path: Optional[str] = None, max_db_entries: int = 20000, enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_db_entries = max(1, max_db_entries)
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._flushed = dict.fromkeys(_COUNTERS, 0)
+        self._stores_since_prune = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if enabled and db_path:
+            self._db = self._open_db(db_path)
+
+    @classmethod
+    def from_config(cls, cache_config: Mapping) -> 'LLMResponseCache':
+        return cls(
+            max_entries=cache_config.get('MAX_ENTRIES', 1000),
+            ttl_seconds=cache_config.get('TTL_SECONDS', 86400),
+            db_path=cache_config.get('DB_FILE'),
+            max_db_entries=cache_config.get('MAX_DB_ENTRIES', 20000),
+            enabled=cache_config.get('ENABLED', True)
+        )
+
+    def _open_db(self, db_path: str) -> Optional[sqlite3.Connection]:
+        """SQLite 단계 열기 (실패하면 메모리 단계만 사용)"""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM 캐시 DB를 열 수 없어 메모리 캐시만 사용합니다 ({db_path}): {e}")
+            return None
+
+    def reconfigure(self, cache_config: Mapping) -> None:
+        """메모리 상한/TTL/디스크 상한 변경 (줄어들면 오래된 항목부터 즉시 제거)"""
+        with self._lock:
+            self.max_entries = max(1, cache_config.get('MAX_ENTRIES', self.max_entries))
+            self.ttl_seconds = cache_config.get('TTL_SECONDS', self.ttl_seconds)
+            self.max_db_entries = max(1, cache_config.get('MAX_DB_ENTRIES', self.max_db_entries))
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def make_key(provider: str, model: str, template_version: Any, params: Mapping, content: str) -> str:
+        """캐시 키 (파라미터는 키 순서와 무관하게 직렬화)"""
+        material = json.dumps({
+            'provider': provider,
+            'model': model,
+            'template': template_version,
+            'params': params,
+            'content': normalize_content(content)
+        }, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """캐시 조회 (메모리 → 디스크 순, 디스크 적중은 메모리로 올림)"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            self._counters['lookups'] += 1
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry.created_at, now):
+                    self._memory.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    self._counters['saved_tokens'] += entry.tokens
+                    return entry
+                del self._memory[key]
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._memory_put(key, CachedResponse(entry.text, entry.tokens, entry.created_at, 'memory'))
+                self._counters['disk_hits'] += 1
+                self._counters['saved_tokens'] += entry.tokens
+                return entry
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key: str, text: str, tokens: int = 0) -> None:
+        """응답 저장 (정상 완료된 응답만 저장할 것 - 실패/잘린 응답 제외)"""
+        if not self.enabled or not text:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._counters['stores'] += 1
+            self._memory_put(key, CachedResponse(text, int(tokens or 0), now, 'memory'))
+            self._disk_put(key, text, int(tokens or 0), now)
+
+    def invalidate(self, key: str) -> None:
+        """항목 삭제 (예: 저장된 응답이 파싱에 실패한 경우)"""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._disk_execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _memory_put(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[CachedResponse]:
+        row = self._disk_execute(
+            "SELECT text, tokens, created_at FROM responses WHERE key = ?", (key,), fetch=True
+        )
+        if not row:
+            return None
+        text, tokens, created_at = row
+        if self._expired(created_at, now):
+            self._disk_execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        self._disk_execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return CachedResponse(text, tokens, created_at, 'disk')
+
+    def _disk_put(self, key: str, text: str, tokens: int, now: float) -> None:
+        self._disk_execute(
+            "INSERT OR REPLACE INTO responses (key, text, tokens, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, text, tokens, now, now)
+        )
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= _PRUNE_EVERY:
+            self._stores_since_prune = 0
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """만료 항목과 상한 초과분(가장 오래 사용되지 않은 것부터) 삭제"""
+        if self.ttl_seconds:
+            self._disk_execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._disk_execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_db_entries,)
+        )
+
+    def _disk_execute(self, sql: str, params: tuple = (), fetch: bool = False):
+        """SQLite 실행 (오류는 경고만 - 캐시 문제로 LLM 호출이 실패하면 안 됨)"""
+        if self._db is None:
+            return None
+        try:
+            cursor = self._db.execute(sql, params)
+            return cursor.fetchone() if fetch else None
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM 캐시 DB 오류 (무시): {e}")
+            return None
+
+    def flush_stats(self) -> None:
+        """마지막 flush 이후 카운터 증가분을 SQLite 누적 통계에 더함 (stats 모드에서 조회)"""
+        with self._lock:
+            deltas = {name: self._counters[name] - self._flushed[name] for name in _COUNTERS}
+            self._flushed = dict(self._counters)
+            for name, delta in deltas.items():
+                if delta:
+                    self._disk_execute(
+                        "INSERT INTO counters (name, value) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                        (name, delta)
+                    )
+
+    def stats(self) -> Dict:
+        """현재 프로세스 통계: 조회/적중/미적중 수, 적중률, 절약한 토큰, 항목 수"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            row = self._disk_execute("SELECT COUNT(*) FROM responses", fetch=True)
+        stats['disk_entries'] = row[0] if row else 0
+        return _with_hit_rate(stats)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush_stats()
+            self._db.close()
+            self._db = None
+
+
+def _with_hit_rate(stats: Dict) -> Dict:
+    hits = stats.get('memory_hits', 0) + stats.get('disk_hits', 0)
+    stats['hit_rate'] = hits / stats['lookups'] if stats.get('lookups') else 0.0
+    return stats
+
+
+def read_persisted_stats(db_path: Optional[str]) -> Optional[Dict]:
+    """SQLite에 누적된 캐시 통계 (DB가 없으면 None)"""
+    if not db_path or not os.path.exists(db_path):
+        return None
+    try:
+        db = sqlite3.connect(db_path, timeout=5)
+        try:
+            stats = dict.fromkeys(_COUNTERS, 0)
+            stats.update(dict(db.execute("SELECT name, value FROM counters").fetchall()))
+            stats['disk_entries'] = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return None
+    return _with_hit_rate(stats)
+
+
+def format_stats(stats: Dict) -> str:
+    hits = stats['memory_hits'] + stats['disk_hits']
+    return (
+        f"조회 {stats['lookups']}건, 적중 {hits}건 ({stats['hit_rate']:.0%}, "
+        f"메모리 {stats['memory_hits']} / 디스크 {stats['disk_hits']}), "
+        f"절약 토큰 {stats['saved_tokens']}, 저장 항목 {stats['disk_entries']}"
+    )
+
+
+_cache = LLMResponseCache(enabled=False)
+
+
+def configure_llm_cache(cache_config: Mapping) -> LLMResponseCache:
+    """LLM_CACHE_CONFIG로 전역 캐시 설정"""
+    global _cache
+    _cache.close()
+    _cache = LLMResponseCache.from_config(cache_config)
+    return _cache
+
+
+def get_llm_cache() -> LLMResponseCache:
+    return _cache
@@ -5,6 +5,8 @@ import logging.handlers
 import sys
 from pathlib import Path
 
+from ai_workflow_production.utils.tracing import TraceContextFilter
+
 def setup_logging(app_name: str = "WorkflowApp", rotation_type: str = "time"):
     """
     통합 로깅 설정
@@ -28,9 +30,9 @@ def setup_logging(app_name: str = "WorkflowApp", rotation_type: str = "time"):
     # 로그 레벨 설정
     log_level = logging.INFO
     
-    # 로그 포맷터
+    # 로그 포맷터 (trace_id: 이메일별 로그 구분용)
     formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        '%(asctime)s - [%(trace_id)s] %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
@@ -57,11 +59,13 @@ def setup_logging(app_name: str = "WorkflowApp", rotation_type: str = "time"):
     
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
+    file_handler.addFilter(TraceContextFilter())
     
     # 콘솔 핸들러
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
+    console_handler.addFilter(TraceContextFilter())
     
     # 루트 로거 설정
     root_logger.setLevel(log_level)
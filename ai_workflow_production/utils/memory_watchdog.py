@@ -0,0 +1,164 @@
+# utils/memory_watchdog.py - 장기 실행 모니터 모드의 메모리 감시 및 상한 관리
+
+import logging
+import resource
+import sys
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional
+
+
+class BoundedIdSet:
+    """
+    최대 크기가 정해진 ID 집합 (가장 오래 전에 추가된 ID부터 제거)
+
+    processed_emails처럼 무한히 커지는 중복 방지용 집합에 사용.
+    조회 기간(EMAIL_LOOKBACK_MINUTES) 안에 다시 조회될 수 있는 ID 수보다
+    충분히 크게 잡으면 eviction이 중복 처리로 이어지지 않는다.
+    """
+
+    def __init__(self, maxlen: int, items: Iterable[Hashable] = ()):
+        if maxlen <= 0:
+            raise ValueError("maxlen은 1 이상이어야 합니다")
+        self.maxlen = maxlen
+        self.evicted = 0
+        self._items: "OrderedDict[Hashable, None]" = OrderedDict()
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Hashable) -> None:
+        if item in self._items:
+            self._items.move_to_end(item)
+            return
+        self._items[item] = None
+        while len(self._items) > self.maxlen:
+            self._items.popitem(last=False)
+            self.evicted += 1
+
+    def resize(self, maxlen: int) -> None:
+        """최대 크기 변경 (줄어들면 오래된 ID부터 즉시 제거)"""
+        if maxlen <= 0:
+            raise ValueError("maxlen은 1 이상이어야 합니다")
+        self.maxlen = maxlen
+        while len(self._items) > self.maxlen:
+            self._items.popitem(last=False)
+            self.evicted += 1
+
+    def discard(self, item: Hashable) -> None:
+        self._items.pop(item, None)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+def current_rss_bytes() -> int:
+    """현재 RSS (Linux는 /proc, 그 외는 최대 RSS로 대체)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 bytes, Linux는 KiB 단위
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class MemoryWatchdog:
+    """주기적으로 RSS / tracemalloc 스냅샷을 비교하여 증가하는 할당 위치 보고"""
+
+    def __init__(self, sample_every: int = 10, use_tracemalloc: bool = False,
+                 top_n: int = 10, rss_warn_mb: Optional[float] = None, frames: int = 5):
+        self.logger = logging.getLogger(__name__)
+        self.sample_every = max(1, sample_every)
+        self.use_tracemalloc = use_tracemalloc
+        self.top_n = top_n
+        self.rss_warn_mb = rss_warn_mb
+        self.frames = frames
+
+        self.samples: List[Dict] = []
+        self._baseline_rss: Optional[int] = None
+        self._baseline_snapshot = None
+
+    @classmethod
+    def from_config(cls, memory_config: Dict) -> 'MemoryWatchdog':
+        return cls(
+            sample_every=memory_config.get('SAMPLE_EVERY', 10),
+            use_tracemalloc=memory_config.get('TRACEMALLOC', False),
+            top_n=memory_config.get('TOP_N', 10),
+            rss_warn_mb=memory_config.get('RSS_WARN_MB')
+        )
+
+    def reconfigure(self, memory_config: Dict) -> None:
+        """샘플링 간격/경고 기준 변경 (기준선은 유지)"""
+        self.sample_every = max(1, memory_config.get('SAMPLE_EVERY', self.sample_every))
+        self.rss_warn_mb = memory_config.get('RSS_WARN_MB', self.rss_warn_mb)
+
+    def maybe_sample(self, cycle_number: int, extra: Optional[Dict] = None) -> Optional[Dict]:
+        """sample_every 사이클마다 sample() 호출"""
+        if cycle_number % self.sample_every != 0:
+            return None
+        return self.sample(cycle_number, extra)
+
+    def sample(self, cycle_number: int, extra: Optional[Dict] = None) -> Dict:
+        """
+        메모리 샘플 1회 수집
+
+        Args:
+            cycle_number: 모니터 사이클 번호
+            extra: 함께 기록할 구조체 크기 등 (예: {'processed_emails': 1234})
+        """
+        rss = current_rss_bytes()
+        if self._baseline_rss is None:
+            self._baseline_rss = rss
+
+        sample = {
+            'cycle': cycle_number,
+            'rss_mb': rss / (1024 * 1024),
+            'rss_growth_mb': (rss - self._baseline_rss) / (1024 * 1024),
+            **(extra or {})
+        }
+
+        if self.use_tracemalloc:
+            sample['top_growth'] = self._sample_tracemalloc()
+
+        # 샘플 이력도 제한 (최근 1000개)
+        self.samples.append(sample)
+        del self.samples[:-1000]
+
+        self.logger.info(
+            f"🧠 메모리 사이클 #{cycle_number}: RSS {sample['rss_mb']:.1f}MB "
+            f"(시작 대비 {sample['rss_growth_mb']:+.1f}MB)"
+            + (f" {extra}" if extra else "")
+        )
+        if self.rss_warn_mb and sample['rss_mb'] > self.rss_warn_mb:
+            self.logger.warning(f"⚠️ RSS {sample['rss_mb']:.1f}MB가 경고 기준 {self.rss_warn_mb}MB 초과")
+
+        return sample
+
+    def _sample_tracemalloc(self) -> List[str]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+
+        if self._baseline_snapshot is None:
+            self._baseline_snapshot = snapshot
+            return []
+
+        # 시작 시점 대비 계속 커지는 위치 = 누수 후보
+        growth = [
+            stat for stat in snapshot.compare_to(self._baseline_snapshot, 'lineno')
+            if stat.size_diff > 0
+        ][:self.top_n]
+
+        lines = [str(stat) for stat in growth]
+        for line in lines[:5]:
+            self.logger.info(f"   {line}")
+        return lines
@@ -0,0 +1,137 @@
+# utils/profiler.py - process_new_emails 사이클 단위 프로파일링
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+PROFILE_MODES = ('cpu', 'wall', 'memory')
+
+
+class CycleProfiler:
+    """
+    N번째 사이클마다 프로파일링하여 logs/profiles/에 결과 저장
+
+    - cpu: cProfile (process_time 기준, 대기 시간 제외)
+    - wall: cProfile (실제 경과 시간 기준, 네트워크 대기 포함)
+    - memory: tracemalloc 스냅샷 비교 (사이클 동안 증가한 할당 위치)
+    """
+
+    def __init__(self, mode: str, output_dir: str, every: int = 1,
+                 retention: int = 50, top_n: int = 25):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원되지 않는 프로파일 모드: {mode}")
+
+        self.logger = logging.getLogger(__name__)
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.every = max(1, every)
+        self.retention = retention
+        self.top_n = top_n
+
+    @classmethod
+    def from_config(cls, mode: str, profiling_config: Dict, every: int = None) -> 'CycleProfiler':
+        return cls(
+            mode=mode,
+            output_dir=profiling_config['OUTPUT_DIR'],
+            every=every or profiling_config.get('EVERY', 1),
+            retention=profiling_config.get('RETENTION', 50),
+            top_n=profiling_config.get('TOP_N', 25)
+        )
+
+    @contextmanager
+    def profile_cycle(self, cycle_number: int):
+        """사이클 실행 구간 프로파일링 (대상 사이클이 아니면 그대로 실행)"""
+        if cycle_number % self.every != 0:
+            yield
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"cycle_{cycle_number:06d}_{self.mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        started = time.perf_counter()
+
+        if self.mode == 'memory':
+            with self._profile_memory(stem):
+                yield
+        else:
+            with self._profile_cpu(stem):
+                yield
+
+        self.logger.info(
+            f"🔬 프로파일 저장 ({self.mode}, 사이클 #{cycle_number}, "
+            f"{time.perf_counter() - started:.2f}초): {self.output_dir / stem}.txt"
+        )
+        self._apply_retention()
+
+    @contextmanager
+    def _profile_cpu(self, stem: str):
+        timer = time.process_time if self.mode == 'cpu' else time.perf_counter
+        profiler = cProfile.Profile(timer)
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(self.output_dir / f"{stem}.prof"))
+
+            buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=buffer)
+            stats.sort_stats('tottime').print_stats(self.top_n)
+            buffer.write("\n")
+            stats.sort_stats('cumulative').print_stats(self.top_n)
+            (self.output_dir / f"{stem}.txt").write_text(buffer.getvalue(), encoding='utf-8')
+
+            self._log_top_functions(stats)
+
+    def _log_top_functions(self, stats: pstats.Stats, limit: int = 5) -> None:
+        """self time 상위 함수 로그 출력"""
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        for (filename, lineno, func), (_, ncalls, tottime, _, _) in entries:
+            self.logger.info(f"   {tottime * 1000:8.1f}ms  {ncalls:>7} calls  {func} ({Path(filename).name}:{lineno})")
+
+    @contextmanager
+    def _profile_memory(self, stem: str):
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(10)
+
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_here:
+                tracemalloc.stop()
+
+            after.dump(str(self.output_dir / f"{stem}.tracemalloc"))
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+
+            lines: List[str] = [
+                f"traced current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB",
+                f"top {self.top_n} allocation growth (lineno):",
+                ""
+            ]
+            lines.extend(str(stat) for stat in diffs[:self.top_n])
+            (self.output_dir / f"{stem}.txt").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+            for stat in diffs[:5]:
+                self.logger.info(f"   {stat}")
+
+    def _apply_retention(self) -> None:
+        """오래된 프로파일 결과 삭제 (사이클 단위 최근 N개 유지)"""
+        summaries = sorted(self.output_dir.glob("cycle_*.txt"), key=lambda p: p.stat().st_mtime)
+        stems = [p.stem for p in summaries]
+        for stem in stems[:-self.retention] if self.retention > 0 else []:
+            for path in self.output_dir.glob(f"{stem}.*"):
+                try:
+                    path.unlink()
+                except OSError as e:
+                    self.logger.warning(f"프로파일 파일 삭제 실패: {path} ({e})")
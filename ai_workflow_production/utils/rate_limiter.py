@@ -0,0 +1,252 @@
+# utils/rate_limiter.py - LLM 제공자 요청/토큰 속도 제한 (RPM + TPM 토큰 버킷, SQLite로 스레드/프로세스 간 공유)
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+# Gemini 429 응답 본문의 재시도 대기 (RetryInfo.retryDelay, 예: "17s")
+_RETRY_DELAY = re.compile(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+# 통계 카운터
+_COUNTERS = ('admitted', 'rejected', 'waited', 'wait_seconds', 'throttled')
+
+
+class RateLimitExceeded(Exception):
+    """MAX_WAIT 안에 허용량을 받지 못함 (요청을 보내지 않고 실패 → 라우터가 다른 제공자로)"""
+
+
+@dataclass(frozen=True)
+class Admission:
+    key: str
+    tokens: int     # 허용 시 차감한 추정 토큰 (settle로 실제 값과 차이 보정)
+    waited: float   # 허용까지 대기한 시간 (초)
+
+
+def retry_after_seconds(response, default: float) -> float:
+    """429 응답의 재시도 대기 (Retry-After 헤더 → 본문 retryDelay → 기본값)"""
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            pass
+    match = _RETRY_DELAY.search(response.text or '')
+    return float(match.group(1)) if match else default
+
+
+class RateLimiter:
+    """
+    제공자별 토큰 버킷 2개 (요청 수 / 토큰 수) - 실패 후 재시도가 아니라 요청 전 허용 제어
+
+    - 채움 속도 = 분당 한도(RPM/TPM) × HEADROOM / 60 (초당), 용량 = 채움 속도 × BURST_SECONDS
+    - acquire(): 두 버킷 모두 여유가 있을 때만 차감하고 통과, 없으면 채워질 때까지 대기
+      (MAX_WAIT를 넘기면 RateLimitExceeded)
+    - settle(): 응답의 실제 토큰 수로 추정치 보정 (초과분은 다음 요청들이 기다림)
+    - throttle(): 429를 받으면 Retry-After 동안 모든 워커가 멈추도록 버킷을 비움
+    - db_path를 지정하면 버킷 상태를 SQLite에 두어 여러 프로세스가 공유 (BEGIN IMMEDIATE로 직렬화),
+      없으면 프로세스 내부 스레드끼리만 공유
+    """
+
+    def __init__(self, limits: Optional[Mapping] = None, headroom: float = 0.9, burst_seconds: float = 6,
+                 max_wait: float = 30, throttle_seconds: float = 10, db_path: Optional[str] = None,
+                 enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._configure(limits or {}, headroom, burst_seconds, max_wait, throttle_seconds)
+
+        self._db: Optional[sqlite3.Connection] = None
+        if enabled:
+            self._db = self._open_db(db_path)
+
+    @classmethod
+    def from_config(cls, limit_config: Mapping) -> 'RateLimiter':
+        return cls(
+            limits=limit_config.get('LIMITS'),
+            headroom=limit_config.get('HEADROOM', 0.9),
+            burst_seconds=limit_config.get('BURST_SECONDS', 6),
+            max_wait=limit_config.get('MAX_WAIT', 30),
+            throttle_seconds=limit_config.get('THROTTLE_SECONDS', 10),
+            db_path=limit_config.get('DB_FILE'),
+            enabled=limit_config.get('ENABLED', True)
+        )
+
+    def _configure(self, limits: Mapping, headroom: float, burst_seconds: float, max_wait: float,
+                   throttle_seconds: float) -> None:
+        self.limits = {key: dict(value) for key, value in limits.items()}
+        self.headroom = headroom
+        self.burst_seconds = max(1.0, burst_seconds)
+        self.max_wait = max_wait
+        self.throttle_seconds = throttle_seconds
+
+    def reconfigure(self, limit_config: Mapping) -> None:
+        """한도/여유율/버스트/대기 상한 변경 (버킷 잔량은 유지, 새 용량으로 잘림)"""
+        with self._lock:
+            self._configure(limit_config.get('LIMITS', self.limits), limit_config.get('HEADROOM', self.headroom),
+                            limit_config.get('BURST_SECONDS', self.burst_seconds),
+                            limit_config.get('MAX_WAIT', self.max_wait),
+                            limit_config.get('THROTTLE_SECONDS', self.throttle_seconds))
+
+    def _open_db(self, db_path: Optional[str]) -> Optional[sqlite3.Connection]:
+        """버킷 저장소 (db_path가 없거나 열 수 없으면 프로세스 메모리)"""
+        try:
+            if db_path:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(db_path or ':memory:', timeout=10, check_same_thread=False, isolation_level=None)
+            if db_path:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    level REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"속도 제한 DB를 열 수 없어 프로세스 내부에서만 제한합니다 ({db_path}): {e}")
+            return self._open_db(None) if db_path else None
+
+    def _buckets(self, key: str) -> Optional[Tuple[Tuple[str, float, float], ...]]:
+        """(버킷 이름, 초당 채움 속도, 용량) - 요청 버킷, 토큰 버킷 (한도 없는 항목은 제외)"""
+        limit = self.limits.get(key)
+        if not limit:
+            return None
+        buckets = []
+        for unit, per_minute in (('requests', limit.get('RPM')), ('tokens', limit.get('TPM'))):
+            if per_minute:
+                rate = per_minute * self.headroom / 60
+                buckets.append((f"{key}:{unit}", rate, max(rate * self.burst_seconds, 1.0)))
+        return tuple(buckets) or None
+
+    def _count(self, key: str, name: str, value: float = 1) -> None:
+        counters = self._counters.setdefault(key, dict.fromkeys(_COUNTERS, 0))
+        counters[name] += value
+
+    def _update(self, key: str, needs: Tuple[float, ...], force: bool = False,
+                pause: Optional[float] = None) -> float:
+        """
+        버킷을 경과 시간만큼 채운 뒤 needs만큼 차감 시도
+
+        Returns:
+            0이면 차감 완료, 양수면 모든 버킷이 채워지기까지 더 기다려야 할 시간 (초)
+            force=True면 잔량과 관계없이 차감 (음수 허용 - 보정용),
+            pause를 지정하면 잔량을 pause초 뒤에야 0이 되는 음수로 낮춤 (429 대기용)
+        """
+        buckets = self._buckets(key)
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                levels = []
+                for (name, rate, capacity), need in zip(buckets, needs):
+                    row = self._db.execute("SELECT level, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+                    level = capacity if row is None else min(capacity, row[0] + rate * max(0.0, now - row[1]))
+                    levels.append(level)
+
+                # 추정치가 용량보다 커도 버킷이 가득 차면 통과 (영원히 대기하지 않도록)
+                shortfall = [(min(need, capacity) - level) / rate
+                             for (_, rate, capacity), need, level in zip(buckets, needs, levels)]
+                wait = 0.0 if force or pause is not None else max(0.0, *shortfall)
+                if pause is not None:
+                    levels = [min(level, -rate * pause) for (_, rate, _), level in zip(buckets, levels)]
+                elif wait == 0.0:
+                    levels = [level - need for level, need in zip(levels, needs)]
+                for (name, _, _), level in zip(buckets, levels):
+                    self._db.execute("INSERT OR REPLACE INTO buckets (name, level, updated) VALUES (?, ?, ?)",
+                                     (name, level, now))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _needs(self, key: str, requests: float, tokens: float) -> Tuple[float, ...]:
+        return tuple(requests if name.endswith(':requests') else tokens for name, _, _ in self._buckets(key))
+
+    def acquire(self, key: str, tokens: int = 0, max_wait: Optional[float] = None) -> Admission:
+        """
+        요청 1건 + 추정 토큰 허용 (여유가 생길 때까지 대기)
+
+        Raises:
+            RateLimitExceeded: max_wait(기본 MAX_WAIT) 안에 허용되지 않음
+        """
+        if not self.enabled or self._db is None or self._buckets(key) is None:
+            return Admission(key, 0, 0.0)
+
+        max_wait = self.max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+        waited = 0.0
+        while True:
+            wait = self._update(key, self._needs(key, 1, tokens))
+            if wait == 0.0:
+                with self._lock:
+                    self._count(key, 'admitted')
+                    if waited:
+                        self._count(key, 'waited')
+                        self._count(key, 'wait_seconds', waited)
+                return Admission(key, tokens, waited)
+            if waited + wait > max_wait:
+                with self._lock:
+                    self._count(key, 'rejected')
+                raise RateLimitExceeded(f"{key} 속도 제한: {wait:.1f}초 더 기다려야 함 (대기 상한 {max_wait:g}초)")
+            time.sleep(wait)
+            waited = time.monotonic() - started
+
+    def settle(self, admission: Admission, actual_tokens: int) -> None:
+        """응답의 실제 토큰 수로 토큰 버킷 보정 (추정보다 많이 쓰면 차감, 적게 쓰면 반환)"""
+        if not self.enabled or self._db is None or self._buckets(admission.key) is None or actual_tokens <= 0:
+            return
+        self._update(admission.key, self._needs(admission.key, 0, actual_tokens - admission.tokens), force=True)
+
+    def throttle(self, key: str, response) -> None:
+        """429 수신: 모든 워커가 Retry-After(없으면 THROTTLE_SECONDS) 동안 새 요청을 보내지 않도록 버킷을 음수로"""
+        buckets = self._buckets(key) if self.enabled and self._db is not None else None
+        if buckets is None:
+            return
+        seconds = retry_after_seconds(response, self.throttle_seconds)
+        self._update(key, self._needs(key, 0, 0), pause=seconds)
+        with self._lock:
+            self._count(key, 'throttled')
+        self.logger.warning(f"{key} 429 수신 → {seconds:g}초 동안 새 요청 보류 (모든 워커)")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """현재 프로세스의 키별 통계: {admitted, rejected, waited, wait_seconds, throttled}"""
+        with self._lock:
+            return {key: dict(counters) for key, counters in self._counters.items()}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def format_stats(stats: Dict[str, Dict[str, float]]) -> str:
+    return ', '.join(
+        f"{key} 허용 {int(counters['admitted'])} (대기 {int(counters['waited'])}건/{counters['wait_seconds']:.1f}초), "
+        f"거절 {int(counters['rejected'])}, 429 {int(counters['throttled'])}"
+        for key, counters in sorted(stats.items())
+    )
+
+
+_limiter = RateLimiter(enabled=False)
+
+
+def configure_rate_limiter(limit_config: Mapping) -> RateLimiter:
+    """RATE_LIMIT_CONFIG로 전역 속도 제한 설정"""
+    global _limiter
+    _limiter.close()
+    _limiter = RateLimiter.from_config(limit_config)
+    return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _limiter
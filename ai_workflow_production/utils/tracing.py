@@ -0,0 +1,275 @@
+# utils/tracing.py - 이메일 단위 경량 트레이싱 (OTLP 호환 스팬 export)
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 현재 실행 컨텍스트의 활성 스팬 (스레드/컨텍스트별로 분리됨)
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+# OTLP 상태 코드
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def _otlp_value(value: Any) -> Dict:
+    """파이썬 값을 OTLP AnyValue 형식으로 변환"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict]:
+    return [{'key': k, 'value': _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+class Span:
+    """단일 작업 구간 (HTTP 요청, 재시도, 백오프 대기 등)"""
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ''
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes) -> None:
+        self.events.append({'name': name, 'time_ns': time.time_ns(), 'attributes': attributes})
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message[:500]
+
+    def set_http_status(self, status_code: int) -> None:
+        """HTTP 응답 코드 기록 (4xx/5xx는 에러 상태)"""
+        self.attributes['http.status_code'] = status_code
+        if status_code >= 400:
+            self.set_error(f"HTTP {status_code}")
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if self.status_code == STATUS_UNSET:
+                self.status_code = STATUS_OK
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def to_otlp(self) -> Dict:
+        """OTLP/JSON Span 형식으로 직렬화"""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': _otlp_attributes(self.attributes),
+            'events': [
+                {
+                    'name': e['name'],
+                    'timeUnixNano': str(e['time_ns']),
+                    'attributes': _otlp_attributes(e['attributes'])
+                }
+                for e in self.events
+            ],
+            'status': {'code': self.status_code, 'message': self.status_message}
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        return span
+
+
+class JsonlSpanExporter:
+    """트레이스 1개 = JSONL 1줄 (OTLP ExportTraceServiceRequest 형식)"""
+
+    def __init__(self, file_path: str):
+        self.file_path = Path(file_path)
+        self._lock = threading.Lock()
+
+    def export(self, payload: Dict) -> None:
+        line = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class OtlpHttpSpanExporter:
+    """OTLP/HTTP JSON 컬렉터로 전송 (예: http://localhost:4318)"""
+
+    def __init__(self, endpoint: str, timeout: float = 2.0):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.timeout = timeout
+
+    def export(self, payload: Dict) -> None:
+        import urllib.request  # 전송 시점에만 로드 (CLI 시작 시간 절감)
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    """트레이스/스팬 생성 및 트레이스 단위 export"""
+
+    def __init__(self, service_name: str = 'ai_workflow_production', exporters: Optional[List] = None,
+                 enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.service_name = service_name
+        self.exporters = exporters or []
+        self.enabled = enabled
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes):
+        """새 트레이스의 루트 스팬 시작 (이메일 1건 = 트레이스 1개)"""
+        token = _current_span.set(None)
+        try:
+            with self.span(name, **attributes) as root:
+                yield root
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """현재 스팬의 자식 스팬 시작 (활성 트레이스가 없으면 새 트레이스 생성)"""
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        if parent is not None:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        else:
+            span = Span(name, secrets.token_hex(16), None, attributes)
+
+        # 루트가 이미 export된 트레이스의 늦은 자식 스팬 (hedge에 졌거나 타임아웃으로 버려진 라우터 호출 등)은
+        # _pending에 다시 만들지 않고 끝날 때 단독으로 export (만들면 export할 루트가 없어 계속 남음)
+        with self._lock:
+            spans = self._pending.get(span.trace_id)
+            if spans is not None:
+                spans.append(span)
+            elif parent is None:
+                self._pending[span.trace_id] = [span]
+        late = parent is not None and spans is None
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            if parent is None:
+                self._export_trace(span.trace_id)
+            elif late:
+                self._export_spans([span])
+
+    def _export_trace(self, trace_id: str) -> None:
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+        self._export_spans(spans)
+
+    def _export_spans(self, spans: List[Span]) -> None:
+        if not spans or not self.exporters:
+            return
+
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': _otlp_attributes({'service.name': self.service_name})},
+                'scopeSpans': [{
+                    'scope': {'name': 'ai_workflow_production.tracing'},
+                    'spans': [s.to_otlp() for s in spans]
+                }]
+            }]
+        }
+
+        for exporter in self.exporters:
+            try:
+                exporter.export(payload)
+            except Exception as e:
+                self.logger.warning(f"스팬 export 실패 ({type(exporter).__name__}): {e}")
+
+
+class _NoopSpan:
+    """트레이싱 비활성화 시 사용하는 빈 스팬"""
+    trace_id = None
+    span_id = None
+    duration_ms = 0.0
+
+    def set_attribute(self, key, value): pass
+    def add_event(self, name, **attributes): pass
+    def set_error(self, message): pass
+    def set_http_status(self, status_code): pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_tracer = Tracer(enabled=False)
+
+
+def configure_tracing(tracing_config: Dict) -> Tracer:
+    """TRACING_CONFIG로 전역 트레이서 설정"""
+    global _tracer
+
+    exporters = []
+    if tracing_config.get('EXPORT_FILE'):
+        exporters.append(JsonlSpanExporter(tracing_config['EXPORT_FILE']))
+    endpoint = os.getenv(tracing_config.get('OTLP_ENDPOINT_ENV', ''))
+    if endpoint:
+        exporters.append(OtlpHttpSpanExporter(endpoint))
+
+    _tracer = Tracer(
+        service_name=tracing_config.get('SERVICE_NAME', 'ai_workflow_production'),
+        exporters=exporters,
+        enabled=tracing_config.get('ENABLED', True)
+    )
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+class TraceContextFilter(logging.Filter):
+    """로그 레코드에 trace_id 추가 (이메일별 로그 구분용)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = current_trace_id()
+        record.trace_id = trace_id[:8] if trace_id else '-'
+        return True